@@ -11,12 +11,32 @@ Usage:
     app_core.publish(EventType.DETECTION_COMPLETE, data)
 """
 
-from .app_core import AppCore, FrameBuffer, SystemState
+from .app_core import AppCore, CameraState, FrameBuffer, SystemState
 from .events import EventType
+from .history import CircleRecord, HistoryBuffer, HistoryRecord
+from .metrics import MetricsRegistry, get_registry
+from .profiler import ProfileFormat, ProfileMode, ProfileResult, get_profiler, profile_checkpoint
+from .subscription import EventBatch, OverflowPolicy
+from .tracing import Tracer, get_tracer
 
 __all__ = [
     "AppCore",
+    "CameraState",
+    "CircleRecord",
+    "EventBatch",
     "EventType",
     "FrameBuffer",
+    "HistoryBuffer",
+    "HistoryRecord",
+    "MetricsRegistry",
+    "OverflowPolicy",
+    "ProfileFormat",
+    "ProfileMode",
+    "ProfileResult",
     "SystemState",
+    "Tracer",
+    "get_profiler",
+    "get_registry",
+    "get_tracer",
+    "profile_checkpoint",
 ]
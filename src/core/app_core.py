@@ -9,25 +9,45 @@ This module provides the AppCore singleton that manages:
 
 import threading
 import logging
-from typing import Dict, List, Callable, Any, Optional
-from dataclasses import dataclass, field
+from typing import Dict, List, Callable, Any, Optional, Tuple
+from dataclasses import dataclass, field, asdict, replace
 from datetime import datetime
 
 import numpy as np
 
 from .events import EventType
+from .history import HistoryBuffer, HistoryRecord
+from .subscription import AsyncSubscription, OverflowPolicy, Subscription, ThrottledSubscription
 
 logger = logging.getLogger(__name__)
 
 
 @dataclass
 class FrameBuffer:
-    """Thread-safe frame buffer for sharing images between components."""
+    """Frame buffer for sharing images between components.
+
+    Frames are stored read-only and shared by reference; version increases
+    by one on every update so readers can tell whether anything changed.
+    """
 
     raw_frame: Optional[np.ndarray] = None
     display_frame: Optional[np.ndarray] = None
     binary_frame: Optional[np.ndarray] = None
     timestamp: Optional[datetime] = None
+    version: int = 0
+    frame_seq: Optional[int] = None  # Pipeline sequence number of raw_frame, if known
+
+
+@dataclass
+class CameraState:
+    """State of a single camera station."""
+
+    camera_id: str
+    connected: bool = False
+    is_running: bool = False
+    current_recipe: Optional[str] = None
+    fps: float = 0.0
+    part_group: Optional[str] = None
 
 
 @dataclass
@@ -56,6 +76,12 @@ class AppCore:
         app_core.publish(EventType.DETECTION_COMPLETE, data)
     """
 
+    # Camera ID used by single-camera callers that don't pass one
+    DEFAULT_CAMERA_ID = "default"
+
+    # Measurement history records kept in memory
+    DEFAULT_HISTORY_CAPACITY = 1000
+
     _instance: Optional["AppCore"] = None
     _lock = threading.Lock()
 
@@ -72,12 +98,16 @@ class AppCore:
     def _initialize(self) -> None:
         """Initialize the AppCore instance."""
         # Event bus
-        self._subscribers: Dict[str, List[Callable]] = {}
+        self._subscribers: Dict[str, List[Subscription]] = {}
         self._event_lock = threading.Lock()
 
-        # Frame buffer with lock
-        self._frame_buffer = FrameBuffer()
+        # Frame buffers (one per camera) with lock; condition wakes waiting readers
+        self._frame_buffers: Dict[str, FrameBuffer] = {}
         self._frame_lock = threading.Lock()
+        self._frame_cond = threading.Condition(self._frame_lock)
+
+        # Per-camera state
+        self._cameras: Dict[str, CameraState] = {}
 
         # System state
         self._state = SystemState()
@@ -86,8 +116,8 @@ class AppCore:
         # Services container (lazy initialization)
         self._services: Dict[str, Any] = {}
 
-        # Latest detection result
-        self._latest_result: Optional[Any] = None
+        # Latest detection result per camera
+        self._latest_results: Dict[str, Any] = {}
         self._result_lock = threading.Lock()
 
         # Statistics reference
@@ -102,10 +132,11 @@ class AppCore:
         # Recipe service reference
         self._recipe_service: Optional[Any] = None
 
-        # Measurement history
-        self._history: List[Dict] = []
-        self._history_lock = threading.Lock()
-        self._max_history = 1000
+        # Measurement history (ring buffer of compact records)
+        self._history = HistoryBuffer(self.DEFAULT_HISTORY_CAPACITY)
+
+        # Persistent measurement store (optional)
+        self._measurement_store: Optional[Any] = None
 
         logger.info("AppCore initialized")
 
@@ -113,23 +144,56 @@ class AppCore:
     def reset_instance(cls) -> None:
         """Reset the singleton instance (for testing)."""
         with cls._lock:
+            if cls._instance is not None:
+                cls._instance._close_subscriptions()
             cls._instance = None
 
     # ========== Event Bus ==========
 
-    def subscribe(self, event_type: str, callback: Callable) -> None:
+    def subscribe(
+        self,
+        event_type: str,
+        callback: Callable,
+        async_dispatch: bool = False,
+        max_queue: int = 100,
+        overflow: str = OverflowPolicy.DROP_OLDEST,
+        name: Optional[str] = None,
+        min_interval_ms: float = 0,
+        aggregate: bool = False,
+    ) -> None:
         """Subscribe to an event type.
 
+        By default the callback runs synchronously on the publisher's thread.
+        With async_dispatch the subscriber gets a bounded queue and its own
+        delivery thread, so a slow handler never delays the publisher.
+        With min_interval_ms the subscriber is rate limited (always async):
+        it gets the latest event at most once per interval, or an EventBatch
+        counting the merged events when aggregate is set.
+
         Args:
             event_type: The event type to subscribe to (from EventType)
             callback: Function to call when event is published
+            async_dispatch: Deliver through a queue on a dedicated thread
+            max_queue: Queue capacity for async delivery
+            overflow: What to do when the queue is full (from OverflowPolicy)
+            name: Subscriber name used in statistics (default: callback name)
+            min_interval_ms: Minimum time between deliveries (0 = every event)
+            aggregate: Deliver EventBatch objects instead of the latest data
         """
         with self._event_lock:
-            if event_type not in self._subscribers:
-                self._subscribers[event_type] = []
-            if callback not in self._subscribers[event_type]:
-                self._subscribers[event_type].append(callback)
-                logger.debug(f"Subscribed to {event_type}")
+            subscriptions = self._subscribers.setdefault(event_type, [])
+            if any(sub.matches(callback) for sub in subscriptions):
+                return
+
+            subscription: Subscription
+            if min_interval_ms > 0:
+                subscription = ThrottledSubscription(event_type, callback, min_interval_ms, name, aggregate)
+            elif async_dispatch:
+                subscription = AsyncSubscription(event_type, callback, name, max_queue, overflow)
+            else:
+                subscription = Subscription(event_type, callback, name)
+            subscriptions.append(subscription)
+            logger.debug(f"Subscribed to {event_type} ({subscription.mode})")
 
     def unsubscribe(self, event_type: str, callback: Callable) -> None:
         """Unsubscribe from an event type.
@@ -138,95 +202,324 @@ class AppCore:
             event_type: The event type to unsubscribe from
             callback: The callback function to remove
         """
+        removed = None
         with self._event_lock:
-            if event_type in self._subscribers:
-                if callback in self._subscribers[event_type]:
-                    self._subscribers[event_type].remove(callback)
+            subscriptions = self._subscribers.get(event_type, [])
+            for subscription in subscriptions:
+                if subscription.matches(callback):
+                    removed = subscription
+                    subscriptions.remove(subscription)
                     logger.debug(f"Unsubscribed from {event_type}")
+                    break
 
-    def publish(self, event_type: str, data: Any = None) -> None:
+        if removed is not None:
+            removed.close()
+
+    def publish(self, event_type: str, data: Any = None, key: Optional[str] = None) -> None:
         """Publish an event to all subscribers.
 
+        Synchronous subscribers run before this returns; async subscribers
+        only have the event queued.
+
         Args:
             event_type: The event type to publish
             data: Optional data to pass to subscribers
+            key: Source of the event (e.g. camera ID); rate-limited
+                subscribers keep and throttle the latest event per key
         """
         with self._event_lock:
-            subscribers = self._subscribers.get(event_type, []).copy()
+            subscriptions = self._subscribers.get(event_type, []).copy()
+
+        for subscription in subscriptions:
+            subscription.dispatch(data, key)
+
+    def get_subscriber_stats(self) -> List[Dict[str, Any]]:
+        """Get delivery statistics of every subscriber.
 
-        for callback in subscribers:
-            try:
-                callback(data)
-            except Exception as e:
-                logger.error(f"Error in event handler for {event_type}: {e}")
+        Returns:
+            One dict per subscriber with delivered/error counts, handler time
+            and, for async subscribers, queue depth, drops and lag (plus
+            suppressed events for rate-limited subscribers)
+        """
+        with self._event_lock:
+            subscriptions = [sub for subs in self._subscribers.values() for sub in subs]
+        return [sub.get_stats() for sub in subscriptions]
+
+    def _close_subscriptions(self) -> None:
+        """Stop all async delivery threads."""
+        with self._event_lock:
+            subscriptions = [sub for subs in self._subscribers.values() for sub in subs]
+            self._subscribers.clear()
+        for subscription in subscriptions:
+            subscription.close()
 
     # ========== Frame Buffer ==========
+    #
+    # Frames are handed over by reference, never copied. Setters mark the
+    # array read-only (ownership passes to AppCore, the caller must not write
+    # to it afterwards) and getters return that same read-only array; copy it
+    # before drawing on it.
+
+    def _buffer(self, camera_id: str) -> FrameBuffer:
+        """Get (or create) the frame buffer of a camera. Caller holds _frame_lock."""
+        buffer = self._frame_buffers.get(camera_id)
+        if buffer is None:
+            buffer = FrameBuffer()
+            self._frame_buffers[camera_id] = buffer
+        return buffer
+
+    @staticmethod
+    def _freeze(frame: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        """Mark a frame read-only without copying it."""
+        if frame is not None and frame.flags.writeable:
+            frame.setflags(write=False)
+        return frame
+
+    def _set_frame(self, camera_id: str, frame_seq: Optional[int] = None, **frames: Optional[np.ndarray]) -> int:
+        """Store frames, bump the version and wake waiting readers."""
+        for name, frame in frames.items():
+            frames[name] = self._freeze(frame)
+
+        with self._frame_cond:
+            buffer = self._buffer(camera_id)
+            for name, frame in frames.items():
+                setattr(buffer, name, frame)
+            if "raw_frame" in frames:
+                buffer.timestamp = datetime.now()
+                buffer.frame_seq = frame_seq
+            buffer.version += 1
+            self._frame_cond.notify_all()
+            return buffer.version
+
+    def set_raw_frame(self, frame: np.ndarray, camera_id: str = DEFAULT_CAMERA_ID) -> int:
+        """Set the raw camera frame (thread-safe, no copy).
+
+        Args:
+            frame: Raw frame from camera (becomes read-only)
+            camera_id: Camera the frame belongs to
+
+        Returns:
+            New frame buffer version
+        """
+        return self._set_frame(camera_id, raw_frame=frame)
 
-    def set_raw_frame(self, frame: np.ndarray) -> None:
-        """Set the raw camera frame (thread-safe).
+    def set_display_frame(self, frame: np.ndarray, camera_id: str = DEFAULT_CAMERA_ID) -> int:
+        """Set the display frame with overlays (thread-safe, no copy).
 
         Args:
-            frame: Raw frame from camera
+            frame: Frame with detection overlays (becomes read-only)
+            camera_id: Camera the frame belongs to
+
+        Returns:
+            New frame buffer version
         """
-        with self._frame_lock:
-            self._frame_buffer.raw_frame = frame.copy() if frame is not None else None
-            self._frame_buffer.timestamp = datetime.now()
+        return self._set_frame(camera_id, display_frame=frame)
 
-    def set_display_frame(self, frame: np.ndarray) -> None:
-        """Set the display frame with overlays (thread-safe).
+    def set_binary_frame(self, frame: np.ndarray, camera_id: str = DEFAULT_CAMERA_ID) -> int:
+        """Set the binary threshold frame (thread-safe, no copy).
 
         Args:
-            frame: Frame with detection overlays
+            frame: Binary image from thresholding (becomes read-only)
+            camera_id: Camera the frame belongs to
+
+        Returns:
+            New frame buffer version
         """
-        with self._frame_lock:
-            self._frame_buffer.display_frame = frame.copy() if frame is not None else None
+        return self._set_frame(camera_id, binary_frame=frame)
+
+    def set_frames(
+        self,
+        raw_frame: Optional[np.ndarray],
+        display_frame: Optional[np.ndarray] = None,
+        binary_frame: Optional[np.ndarray] = None,
+        camera_id: str = DEFAULT_CAMERA_ID,
+        frame_seq: Optional[int] = None,
+    ) -> int:
+        """Set the frames of one processing cycle as a single version.
 
-    def set_binary_frame(self, frame: np.ndarray) -> None:
-        """Set the binary threshold frame (thread-safe).
+        Args:
+            raw_frame: Raw frame from camera
+            display_frame: Frame with detection overlays
+            binary_frame: Binary image from thresholding
+            camera_id: Camera the frames belong to
+            frame_seq: Pipeline sequence number of the frame (matches OverlayFrame.frame_seq)
+
+        Returns:
+            New frame buffer version
+        """
+        return self._set_frame(
+            camera_id, frame_seq, raw_frame=raw_frame, display_frame=display_frame, binary_frame=binary_frame
+        )
+
+    def get_raw_frame(self, camera_id: str = DEFAULT_CAMERA_ID) -> Optional[np.ndarray]:
+        """Get the raw camera frame (thread-safe, read-only, no copy).
 
         Args:
-            frame: Binary image from thresholding
+            camera_id: Camera to read from
+
+        Returns:
+            Read-only raw frame or None
         """
         with self._frame_lock:
-            self._frame_buffer.binary_frame = frame.copy() if frame is not None else None
+            buffer = self._frame_buffers.get(camera_id)
+            return buffer.raw_frame if buffer is not None else None
 
-    def get_raw_frame(self) -> Optional[np.ndarray]:
-        """Get a copy of the raw camera frame (thread-safe).
+    def get_display_frame(self, camera_id: str = DEFAULT_CAMERA_ID) -> Optional[np.ndarray]:
+        """Get the display frame (thread-safe, read-only, no copy).
+
+        Args:
+            camera_id: Camera to read from
 
         Returns:
-            Copy of raw frame or None
+            Read-only display frame or None
         """
         with self._frame_lock:
-            if self._frame_buffer.raw_frame is not None:
-                return self._frame_buffer.raw_frame.copy()
-            return None
+            buffer = self._frame_buffers.get(camera_id)
+            return buffer.display_frame if buffer is not None else None
 
-    def get_display_frame(self) -> Optional[np.ndarray]:
-        """Get a copy of the display frame (thread-safe).
+    def get_binary_frame(self, camera_id: str = DEFAULT_CAMERA_ID) -> Optional[np.ndarray]:
+        """Get the binary frame (thread-safe, read-only, no copy).
+
+        Args:
+            camera_id: Camera to read from
 
         Returns:
-            Copy of display frame or None
+            Read-only binary frame or None
         """
         with self._frame_lock:
-            if self._frame_buffer.display_frame is not None:
-                return self._frame_buffer.display_frame.copy()
-            return None
+            buffer = self._frame_buffers.get(camera_id)
+            return buffer.binary_frame if buffer is not None else None
 
-    def get_binary_frame(self) -> Optional[np.ndarray]:
-        """Get a copy of the binary frame (thread-safe).
+    def get_frames(self, camera_id: str = DEFAULT_CAMERA_ID) -> FrameBuffer:
+        """Get a consistent snapshot of all frames of a camera.
+
+        Args:
+            camera_id: Camera to read from
 
         Returns:
-            Copy of binary frame or None
+            FrameBuffer snapshot (frames shared read-only); version 0 if empty
         """
         with self._frame_lock:
-            if self._frame_buffer.binary_frame is not None:
-                return self._frame_buffer.binary_frame.copy()
-            return None
+            buffer = self._frame_buffers.get(camera_id)
+            return replace(buffer) if buffer is not None else FrameBuffer()
+
+    def get_frame_version(self, camera_id: str = DEFAULT_CAMERA_ID) -> int:
+        """Get the current frame buffer version of a camera (0 if none yet)."""
+        with self._frame_lock:
+            buffer = self._frame_buffers.get(camera_id)
+            return buffer.version if buffer is not None else 0
+
+    def wait_for_frame(
+        self, after_version: int, timeout: Optional[float] = None, camera_id: str = DEFAULT_CAMERA_ID
+    ) -> Optional[FrameBuffer]:
+        """Block until the frame buffer is newer than a known version.
+
+        Args:
+            after_version: Last version the caller has seen
+            timeout: Max seconds to wait (None waits forever)
+            camera_id: Camera to wait on
+
+        Returns:
+            FrameBuffer snapshot with version > after_version, or None on timeout
+        """
+
+        def newer() -> bool:
+            buffer = self._frame_buffers.get(camera_id)
+            return buffer is not None and buffer.version > after_version
+
+        with self._frame_cond:
+            if not self._frame_cond.wait_for(newer, timeout=timeout):
+                return None
+            return replace(self._frame_buffers[camera_id])
+
+    def clear_frames(self, camera_id: Optional[str] = None) -> None:
+        """Clear frame buffers.
+
+        Args:
+            camera_id: Camera to clear, or None for all cameras
+        """
+        with self._frame_cond:
+            if camera_id is None:
+                buffers = list(self._frame_buffers.values())
+            else:
+                buffer = self._frame_buffers.get(camera_id)
+                buffers = [buffer] if buffer is not None else []
+
+            # Keep the version counting up so waiting readers never go backwards
+            for buffer in buffers:
+                buffer.raw_frame = None
+                buffer.display_frame = None
+                buffer.binary_frame = None
+                buffer.timestamp = None
+                buffer.frame_seq = None
+                buffer.version += 1
+            self._frame_cond.notify_all()
+
+    # ========== Cameras ==========
+
+    def register_camera(self, camera_id: str, part_group: Optional[str] = None) -> None:
+        """Register a camera station so it shows up in status and API.
 
-    def clear_frames(self) -> None:
-        """Clear all frame buffers."""
+        Args:
+            camera_id: Unique camera ID
+            part_group: Optional group of cameras looking at the same part
+        """
+        with self._state_lock:
+            self._cameras[camera_id] = CameraState(camera_id=camera_id, part_group=part_group)
+        self.publish(EventType.SYSTEM_STATUS_CHANGED, self.get_status())
+
+    def unregister_camera(self, camera_id: str) -> None:
+        """Remove a camera station and its frames/results.
+
+        Args:
+            camera_id: Camera ID to remove
+        """
+        with self._state_lock:
+            self._cameras.pop(camera_id, None)
+        with self._result_lock:
+            self._latest_results.pop(camera_id, None)
+        self.clear_frames(camera_id)
         with self._frame_lock:
-            self._frame_buffer = FrameBuffer()
+            self._frame_buffers.pop(camera_id, None)
+        self.publish(EventType.SYSTEM_STATUS_CHANGED, self.get_status())
+
+    @property
+    def camera_ids(self) -> List[str]:
+        """Get IDs of registered cameras."""
+        with self._state_lock:
+            return list(self._cameras.keys())
+
+    def update_camera_state(self, camera_id: str, **fields: Any) -> None:
+        """Update fields of a camera's state (e.g. connected=True, fps=7.0).
+
+        Args:
+            camera_id: Camera ID
+            **fields: CameraState fields to set
+        """
+        with self._state_lock:
+            state = self._cameras.get(camera_id)
+            if state is None:
+                state = CameraState(camera_id=camera_id)
+                self._cameras[camera_id] = state
+            for name, value in fields.items():
+                if not hasattr(state, name):
+                    raise AttributeError(f"Unknown camera state field: {name}")
+                setattr(state, name, value)
+
+    def get_camera_status(self, camera_id: str) -> Optional[Dict]:
+        """Get status of a single camera as dictionary.
+
+        Args:
+            camera_id: Camera ID
+
+        Returns:
+            Status dictionary or None if the camera is unknown
+        """
+        with self._state_lock:
+            state = self._cameras.get(camera_id)
+            if state is None:
+                return None
+            return asdict(state)
 
     # ========== System State ==========
 
@@ -302,71 +595,131 @@ class AppCore:
                 "current_recipe": self._state.current_recipe,
                 "fps": self._state.fps,
                 "web_clients": self._state.web_clients,
+                "cameras": [asdict(state) for state in self._cameras.values()],
                 "timestamp": datetime.now().isoformat(),
             }
 
     # ========== Detection Results ==========
 
-    def set_latest_result(self, result: Any) -> None:
+    def set_latest_result(self, result: Any, camera_id: str = DEFAULT_CAMERA_ID) -> None:
         """Set the latest detection result.
 
         Args:
             result: Detection result (list of CircleResult)
+            camera_id: Camera that produced the result
         """
         with self._result_lock:
-            self._latest_result = result
+            self._latest_results[camera_id] = result
 
         # Add to history
-        self._add_to_history(result)
+        self._add_to_history(result, camera_id)
 
         # Publish event
-        self.publish(EventType.DETECTION_COMPLETE, result)
+        self.publish(EventType.DETECTION_COMPLETE, result, key=camera_id)
 
-    def get_latest_result(self) -> Optional[Any]:
-        """Get the latest detection result."""
+    def get_latest_result(self, camera_id: str = DEFAULT_CAMERA_ID) -> Optional[Any]:
+        """Get the latest detection result of a camera."""
         with self._result_lock:
-            return self._latest_result
+            return self._latest_results.get(camera_id)
 
     # ========== History ==========
 
-    def _add_to_history(self, result: Any) -> None:
-        """Add detection result to history."""
+    def _add_to_history(self, result: Any, camera_id: str = DEFAULT_CAMERA_ID) -> None:
+        """Add detection result to history (and the persistent store, if set)."""
         if result is None:
             return
 
-        with self._history_lock:
-            history_item = {
-                "timestamp": datetime.now().isoformat(),
-                "result": result,
-            }
-            self._history.insert(0, history_item)
+        with self._state_lock:
+            camera = self._cameras.get(camera_id)
+            recipe = camera.current_recipe if camera and camera.current_recipe else self._state.current_recipe
+
+        record = self._history.add_result(result, camera_id, recipe)
 
-            # Trim to max size
-            if len(self._history) > self._max_history:
-                self._history = self._history[: self._max_history]
+        store = self._measurement_store
+        if store is not None:
+            store.add_record(record)
 
-    def get_history(self, limit: int = 100, offset: int = 0) -> List[Dict]:
-        """Get measurement history.
+    def get_history(self, limit: int = 100, offset: int = 0) -> List[HistoryRecord]:
+        """Get measurement history, newest first.
 
         Args:
             limit: Maximum items to return
             offset: Skip first N items
 
         Returns:
-            List of history items
+            List of history records
         """
-        with self._history_lock:
-            return self._history[offset : offset + limit]
+        return self._history.get(limit, offset)
+
+    def query_history(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        recipe: Optional[str] = None,
+        status: Optional[str] = None,
+        hole_id: Optional[int] = None,
+        camera_id: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> Tuple[List[HistoryRecord], int]:
+        """Query measurement history with filters, newest first.
+
+        Uses the persistent measurement store when one is set, otherwise
+        scans the in-memory history.
+
+        Args:
+            start: Only measurements at or after this time
+            end: Only measurements before this time
+            recipe: Recipe name
+            status: Overall status ("OK", "NG", ...)
+            hole_id: Only measurements containing this hole
+            camera_id: Camera ID
+            limit: Maximum items to return
+            offset: Skip first N matches
+
+        Returns:
+            Page of records and the total number of matches
+        """
+        store = self._measurement_store
+        if store is not None:
+            filters = dict(start=start, end=end, recipe=recipe, status=status, hole_id=hole_id, camera_id=camera_id)
+            return store.query(limit=limit, offset=offset, **filters), store.count(**filters)
+
+        start_ts = start.timestamp() if start else None
+        end_ts = end.timestamp() if end else None
+        status = status.upper() if status else None
+
+        def matches(record: HistoryRecord) -> bool:
+            return (
+                (start_ts is None or record.timestamp >= start_ts)
+                and (end_ts is None or record.timestamp < end_ts)
+                and (recipe is None or record.recipe == recipe)
+                and (status is None or record.overall_status == status)
+                and (camera_id is None or record.camera_id == camera_id)
+                and (hole_id is None or any(c.hole_id == hole_id for c in record.circles))
+            )
+
+        return self._history.find(matches, limit, offset)
 
     def get_history_count(self) -> int:
         """Get total history count."""
-        with self._history_lock:
-            return len(self._history)
+        return len(self._history)
+
+    def get_history_seq(self) -> int:
+        """Get the sequence number of the newest history record (0 if none)."""
+        return self._history.last_seq
+
+    def set_history_capacity(self, capacity: int) -> None:
+        """Change how many history records are kept (newest are preserved).
+
+        Args:
+            capacity: Maximum number of records
+        """
+        self._history.resize(capacity)
 
     def clear_history(self) -> None:
         """Clear measurement history."""
-        with self._history_lock:
-            self._history.clear()
+        self._history.clear()
 
     # ========== Services ==========
 
@@ -380,6 +733,15 @@ class AppCore:
         self._services[name] = service
         logger.debug(f"Registered service: {name}")
 
+    def unregister_service(self, name: str) -> None:
+        """Remove a registered service (no-op if not registered).
+
+        Args:
+            name: Service name
+        """
+        if self._services.pop(name, None) is not None:
+            logger.debug(f"Unregistered service: {name}")
+
     def get_service(self, name: str) -> Optional[Any]:
         """Get a registered service.
 
@@ -423,6 +785,16 @@ class AppCore:
         """Set calibration service."""
         self._calibration_service = value
 
+    @property
+    def measurement_store(self) -> Optional[Any]:
+        """Get persistent measurement store."""
+        return self._measurement_store
+
+    @measurement_store.setter
+    def measurement_store(self, value: Any) -> None:
+        """Set persistent measurement store (receives every history record)."""
+        self._measurement_store = value
+
     @property
     def recipe_service(self) -> Optional[Any]:
         """Get recipe service."""
@@ -12,6 +12,8 @@ class EventType:
     DETECTION_STARTED = "detection_started"
     DETECTION_COMPLETE = "detection_complete"
     DETECTION_ERROR = "detection_error"
+    PART_COMPLETE = "part_complete"  # Merged result of all cameras of a part group
+    OVERLAY_UPDATE = "overlay_update"  # Circle geometry of a frame, for client-side overlays
 
     # Camera events
     CAMERA_CONNECTED = "camera_connected"
@@ -22,6 +24,7 @@ class EventType:
     # Statistics events
     STATISTICS_UPDATE = "statistics_update"
     STATISTICS_RESET = "statistics_reset"
+    SPC_VIOLATION = "spc_violation"  # Western Electric rule violated on a control chart
 
     # IO events
     IO_STATUS_CHANGED = "io_status_changed"
@@ -0,0 +1,211 @@
+"""Measurement history ring buffer.
+
+History keeps the most recent measurements in a preallocated ring of
+compact, immutable records. Appending overwrites the oldest slot in O(1) and
+paging walks back from the newest record, so cost depends on the page size,
+not on the capacity. Every record carries a global sequence number that keeps
+increasing across wrap-around, so clients can tell which records they have
+already seen.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, List, Optional, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class CircleRecord:
+    """Compact copy of one measured hole"""
+
+    hole_id: int
+    center_x: float
+    center_y: float
+    diameter_px: float
+    diameter_mm: float
+    circularity: float
+    status: str
+
+
+@dataclass(frozen=True, slots=True)
+class HistoryRecord:
+    """Compact measurement history entry
+
+    Attributes:
+        seq: Global sequence number (starts at 1, never reused)
+        timestamp: Measurement time (seconds since the epoch)
+        camera_id: Camera that produced the measurement
+        overall_status: "OK", "NG" or "NONE"
+        circles: Measured holes
+        recipe: Active recipe name, if any
+    """
+
+    seq: int
+    timestamp: float
+    camera_id: str
+    overall_status: str
+    circles: Tuple[CircleRecord, ...]
+    recipe: Optional[str] = None
+
+    @staticmethod
+    def status_string(status: Any) -> str:
+        """Convert a status enum or string to its uppercase name"""
+        if status is None:
+            return "NONE"
+        if isinstance(status, Enum):
+            return status.name
+        return str(status).upper()
+
+    @classmethod
+    def summarize(cls, result: Any) -> Tuple[Tuple[CircleRecord, ...], str]:
+        """Convert a detection result (list of CircleResult) to circle records and overall status"""
+        circles = []
+        if isinstance(result, (list, tuple)):
+            for circle in result:
+                radius = getattr(circle, "radius", 0.0)
+                circles.append(
+                    CircleRecord(
+                        hole_id=getattr(circle, "hole_id", 0),
+                        center_x=getattr(circle, "center_x", 0.0),
+                        center_y=getattr(circle, "center_y", 0.0),
+                        diameter_px=getattr(circle, "diameter_px", radius * 2),
+                        diameter_mm=getattr(circle, "diameter_mm", 0.0),
+                        circularity=getattr(circle, "circularity", 0.0),
+                        status=cls.status_string(getattr(circle, "status", None)),
+                    )
+                )
+
+        if not circles:
+            overall = "NONE"
+        elif any(c.status == "NG" for c in circles):
+            overall = "NG"
+        elif all(c.status == "OK" for c in circles):
+            overall = "OK"
+        else:
+            overall = "NONE"
+
+        return tuple(circles), overall
+
+
+class HistoryBuffer:
+    """Fixed-capacity ring buffer of HistoryRecord, newest first on read
+
+    Thread-safe. Results are converted to records before taking the lock, so
+    the lock is only held for a slot assignment.
+    """
+
+    FIND_CHUNK = 256  # Slots copied per lock acquisition in find()
+
+    def __init__(self, capacity: int = 1000):
+        if capacity < 1:
+            raise ValueError("History capacity must be at least 1")
+        self._slots: List[Optional[HistoryRecord]] = [None] * capacity
+        self._capacity = capacity
+        self._count = 0
+        self._next_seq = 1
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of records kept"""
+        return self._capacity
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest record (0 if nothing was added)"""
+        with self._lock:
+            return self._next_seq - 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count
+
+    def add_result(
+        self,
+        result: Any,
+        camera_id: str,
+        recipe: Optional[str] = None,
+        timestamp: Optional[float] = None,
+    ) -> HistoryRecord:
+        """Append a detection result, overwriting the oldest record when full (O(1))
+
+        Args:
+            result: Detection result (list of CircleResult)
+            camera_id: Camera that produced the result
+            recipe: Active recipe name
+            timestamp: Measurement time (default: now)
+
+        Returns:
+            The stored record
+        """
+        circles, overall = HistoryRecord.summarize(result)
+        timestamp = time.time() if timestamp is None else timestamp
+
+        with self._lock:
+            record = HistoryRecord(self._next_seq, timestamp, camera_id, overall, circles, recipe)
+            self._slots[record.seq % self._capacity] = record
+            self._next_seq += 1
+            if self._count < self._capacity:
+                self._count += 1
+        return record
+
+    def get(self, limit: int = 100, offset: int = 0) -> List[HistoryRecord]:
+        """Get records newest first, skipping the newest `offset` (O(limit))"""
+        with self._lock:
+            return self._get_locked(limit, offset)
+
+    def find(
+        self, predicate: Callable[[HistoryRecord], bool], limit: int = 100, offset: int = 0
+    ) -> Tuple[List[HistoryRecord], int]:
+        """Scan all records newest first for matches (O(capacity))
+
+        The lock is held only while one chunk of slots is copied; the
+        predicate runs outside it. Records overwritten during the scan are
+        skipped.
+
+        Returns:
+            Page of matching records and the total number of matches
+        """
+        with self._lock:
+            newest = self._next_seq - 1
+            oldest = newest - self._count + 1
+
+        matches: List[HistoryRecord] = []
+        for chunk_newest in range(newest, oldest - 1, -self.FIND_CHUNK):
+            seqs = range(chunk_newest, max(chunk_newest - self.FIND_CHUNK, oldest - 1), -1)
+            with self._lock:
+                capacity = self._capacity
+                slots = [self._slots[seq % capacity] for seq in seqs]
+            matches.extend(
+                record
+                for seq, record in zip(seqs, slots)
+                if record is not None and record.seq == seq and predicate(record)
+            )
+        return matches[offset : offset + limit], len(matches)
+
+    def _get_locked(self, limit: int, offset: int) -> List[HistoryRecord]:
+        """Read records newest first. Caller holds _lock."""
+        start = min(offset, self._count)
+        stop = min(offset + limit, self._count)
+        newest = self._next_seq - 1
+        slots = (self._slots[(newest - i) % self._capacity] for i in range(start, stop))
+        return [record for record in slots if record is not None]
+
+    def clear(self) -> None:
+        """Remove all records (sequence numbers keep increasing)"""
+        with self._lock:
+            self._slots = [None] * self._capacity
+            self._count = 0
+
+    def resize(self, capacity: int) -> None:
+        """Change the capacity, keeping the newest records"""
+        if capacity < 1:
+            raise ValueError("History capacity must be at least 1")
+        with self._lock:
+            records = self._get_locked(capacity, 0)
+            self._slots = [None] * capacity
+            self._capacity = capacity
+            for record in records:
+                self._slots[record.seq % capacity] = record
+            self._count = len(records)
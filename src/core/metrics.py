@@ -0,0 +1,317 @@
+"""Runtime metrics registry with Prometheus text export.
+
+Metrics are cheap enough to stay enabled in production: a labelled child is
+looked up once (and cached by the caller), after which inc()/set()/observe()
+only take a per-metric lock for a few additions. Histograms use fixed
+buckets, so memory does not grow with the number of observations. The
+registry renders all metrics in the Prometheus text exposition format.
+
+Usage:
+    from src.core.metrics import get_registry
+
+    stage_time = get_registry().histogram("pipeline_stage_seconds", "Stage time", ("stage",))
+    detect_time = stage_time.labels(stage="detect")
+    detect_time.observe(0.012)
+
+Metric names get the registry namespace prefix ("cms_"); counter names
+end in "_total" by Prometheus convention.
+"""
+
+import bisect
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+# Latency buckets in seconds (0.5 ms .. 5 s)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class MetricType:
+    """Prometheus metric types"""
+
+    COUNTER = "counter"
+    GAUGE = "gauge"
+    HISTOGRAM = "histogram"
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value (integers without a decimal point)"""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: Sequence[Tuple[str, str]]) -> str:
+    """Format a label set as {a="1",b="2"}"""
+    if not labels:
+        return ""
+    escaped = (
+        name + '="' + value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') + '"'
+        for name, value in labels
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+class Counter:
+    """Monotonically increasing value"""
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> float:
+        """Current value"""
+        return self._value
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the counter"""
+        with self._lock:
+            self._value += amount
+
+    def samples(self, name: str, labels: Tuple[Tuple[str, str], ...]) -> List[str]:
+        return [f"{name}{_format_labels(labels)} {_format_value(self._value)}"]
+
+
+class Gauge:
+    """Value that can go up and down"""
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> float:
+        """Current value"""
+        return self._value
+
+    def set(self, value: float) -> None:
+        """Set the current value"""
+        self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the value"""
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrease the value"""
+        with self._lock:
+            self._value -= amount
+
+    def samples(self, name: str, labels: Tuple[Tuple[str, str], ...]) -> List[str]:
+        return [f"{name}{_format_labels(labels)} {_format_value(self._value)}"]
+
+
+class Histogram:
+    """Distribution of observations in fixed cumulative buckets"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self._bounds = tuple(sorted(buckets))
+        self._counts = [0] * (len(self._bounds) + 1)  # Last slot is +Inf
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        """Number of observations"""
+        return sum(self._counts)
+
+    @property
+    def sum(self) -> float:
+        """Sum of observations"""
+        return self._sum
+
+    @property
+    def max(self) -> float:
+        """Largest observation (not exported; useful for logs and tests)"""
+        return self._max
+
+    def observe(self, value: float) -> None:
+        """Record one observation"""
+        index = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            if value > self._max:
+                self._max = value
+
+    def samples(self, name: str, labels: Tuple[Tuple[str, str], ...]) -> List[str]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*self._bounds, math.inf), counts):
+            cumulative += count
+            bucket_labels = (*labels, ("le", _format_value(bound)))
+            lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+# Child kinds of a metric family
+_MetricChild = Union[Counter, Gauge, Histogram]
+
+
+class Metric:
+    """Metric family: one child per label value combination
+
+    A metric without label names has a single child; inc()/set()/observe()
+    on the family forward to it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        metric_type: str,
+        labelnames: Sequence[str] = (),
+        buckets: Optional[Sequence[float]] = None,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.type = metric_type
+        self.labelnames = tuple(labelnames)
+        self._buckets = tuple(buckets) if buckets else DEFAULT_BUCKETS
+        self._children: Dict[Tuple[str, ...], _MetricChild] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self._child(())
+
+    def labels(self, **labels: str):
+        """Get (or create) the child for a label set"""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return self._child(tuple(str(labels[name]) for name in self.labelnames))
+
+    def remove(self, **labels: str) -> None:
+        """Remove the child of a label set (e.g. a removed camera)"""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._children.pop(key, None)
+
+    def _child(self, key: Tuple[str, ...]):
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    if self.type == MetricType.COUNTER:
+                        child = Counter()
+                    elif self.type == MetricType.GAUGE:
+                        child = Gauge()
+                    else:
+                        child = Histogram(self._buckets)
+                    self._children[key] = child
+        return child
+
+    # Unlabelled shortcuts
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def render(self) -> List[str]:
+        """Render HELP, TYPE and all samples"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            children = sorted(self._children.items())
+        for key, child in children:
+            lines.extend(child.samples(self.name, tuple(zip(self.labelnames, key))))
+        return lines
+
+
+class MetricsRegistry:
+    """Named metric families
+
+    Registration is idempotent: asking again for an existing name returns
+    the same family, so components can declare their metrics wherever they
+    are created.
+    """
+
+    def __init__(self, namespace: str = "cms"):
+        self._namespace = namespace
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Metric:
+        """Get or create a counter (name should end in _total)"""
+        return self._register(name, documentation, MetricType.COUNTER, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Metric:
+        """Get or create a gauge"""
+        return self._register(name, documentation, MetricType.GAUGE, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Optional[Sequence[float]] = None,
+    ) -> Metric:
+        """Get or create a histogram"""
+        return self._register(name, documentation, MetricType.HISTOGRAM, labelnames, buckets)
+
+    def get(self, name: str) -> Optional[Metric]:
+        """Get a registered metric by name (without namespace)"""
+        return self._metrics.get(self._full_name(name))
+
+    def metrics(self) -> Iterable[Metric]:
+        """All registered metrics, ordered by name"""
+        with self._lock:
+            return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in self.metrics():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Remove all metrics (for testing)"""
+        with self._lock:
+            self._metrics.clear()
+
+    def _full_name(self, name: str) -> str:
+        return f"{self._namespace}_{name}" if self._namespace else name
+
+    def _register(
+        self,
+        name: str,
+        documentation: str,
+        metric_type: str,
+        labelnames: Sequence[str],
+        buckets: Optional[Sequence[float]] = None,
+    ) -> Metric:
+        full_name = self._full_name(name)
+        with self._lock:
+            metric = self._metrics.get(full_name)
+            if metric is None:
+                metric = Metric(full_name, documentation, metric_type, labelnames, buckets)
+                self._metrics[full_name] = metric
+            elif metric.type != metric_type or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {full_name} already registered as {metric.type} {metric.labelnames}")
+            return metric
+
+
+# Process-wide registry served by the /metrics endpoint
+_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """Get the process-wide metrics registry"""
+    return _registry
@@ -0,0 +1,450 @@
+"""On-demand profiling of the running application.
+
+A profiling session runs for a fixed duration and is started on request (see
+the /api/profile endpoints); nothing is hooked while no session is active.
+
+Two modes are supported:
+
+- sampling: a sampler thread snapshots the stacks of all threads every
+  interval via sys._current_frames(). Works for every thread without their
+  cooperation and produces collapsed stacks (for flame graphs) and
+  pstats-compatible statistics. Samples are taken when the sampler gets
+  the GIL, so pure-Python bursts shorter than sys.getswitchinterval() are
+  under-represented; time in C calls that release the GIL is seen exactly.
+- cprofile: deterministic cProfile of the worker threads. cProfile can only
+  be enabled by the profiled thread itself, so long-running loops call
+  profile_checkpoint() once per iteration; a thread joins the session at its
+  next checkpoint and hands its statistics over at the first checkpoint
+  after the session ends. Threads that don't reach one within
+  CHECKPOINT_TIMEOUT_S are reported as missing_threads and released, so
+  the checkpoint is back to two global reads when idle.
+
+Either mode can add a tracemalloc snapshot diff (allocations made during the
+session, by source line).
+"""
+
+import cProfile
+import io
+import logging
+import marshal
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import FrameType
+from typing import Any, Dict, List, Optional, Tuple, cast
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileMode:
+    """Profiling modes"""
+
+    SAMPLING = "sampling"
+    CPROFILE = "cprofile"
+
+
+class ProfileFormat:
+    """Profile artifact formats"""
+
+    PSTATS = "pstats"  # Binary pstats file (pstats.Stats, snakeviz, ...)
+    TEXT = "text"  # pstats text report
+    COLLAPSED = "collapsed"  # Collapsed stacks for flame graphs (sampling only)
+
+
+@dataclass(frozen=True)
+class MemoryDiff:
+    """Allocation change of one source line during a session"""
+
+    filename: str
+    lineno: int
+    size_diff_kb: float
+    size_kb: float
+    count_diff: int
+
+
+@dataclass
+class ProfileResult:
+    """Result of one profiling session
+
+    Attributes:
+        mode: Profiling mode
+        started: Session start time
+        duration_s: Actual session duration
+        threads: Names of the profiled threads
+        samples: Number of stack samples (sampling mode)
+        stats: pstats statistics dict (merged over threads)
+        collapsed: Collapsed stacks "thread;outer;...;inner count" (sampling mode)
+        memory: Allocation diff by line, largest growth first (if requested)
+        missing_threads: Threads that joined but didn't hand their statistics
+            over in time (cprofile mode; not included in stats)
+    """
+
+    mode: str
+    started: datetime
+    duration_s: float
+    threads: List[str]
+    samples: int = 0
+    stats: Dict[Tuple, Tuple] = field(default_factory=dict, repr=False)
+    collapsed: Optional[str] = field(default=None, repr=False)
+    memory: Optional[List[MemoryDiff]] = None
+    missing_threads: List[str] = field(default_factory=list)
+
+    def pstats_bytes(self) -> bytes:
+        """Statistics in the binary format written by pstats.Stats.dump_stats()"""
+        return marshal.dumps(self.stats)
+
+    def text_report(self, limit: int = 40, sort: str = "cumulative") -> str:
+        """pstats text report of the top functions"""
+        stream = io.StringIO()
+        if self.stats:
+            report = pstats.Stats(_StatsHolder.wrap(self.stats), stream=stream)
+            report.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def top_functions(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Functions with the most own time, largest first"""
+        rows = sorted(self.stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+        return [
+            {
+                "function": f"{name} ({filename}:{lineno})",
+                "calls": nc,
+                "self_s": tt,
+                "cumulative_s": ct,
+            }
+            for (filename, lineno, name), (cc, nc, tt, ct, callers) in rows
+        ]
+
+
+class _StatsHolder:
+    """Adapter so pstats.Stats can load a statistics dict"""
+
+    def __init__(self, stats: Dict[Tuple, Tuple]):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+    @classmethod
+    def wrap(cls, stats: Dict[Tuple, Tuple]) -> cProfile.Profile:
+        """Holder typed as the profiler pstats.Stats expects
+
+        pstats.Stats only calls create_stats() and reads .stats, so any
+        object with both loads like a finished profiler.
+        """
+        return cast(cProfile.Profile, cls(stats))
+
+
+class _CProfileSession:
+    """Collects per-thread cProfile statistics"""
+
+    def __init__(self):
+        self.accepting = True
+        self.threads: List[str] = []
+        self.stats: List[Dict[Tuple, Tuple]] = []
+        self._owing: Dict[int, str] = {}  # Joined threads that still hold statistics
+        self._cond = threading.Condition()
+
+    def join(self) -> None:
+        with self._cond:
+            self._owing[threading.get_ident()] = threading.current_thread().name
+
+    def add(self, stats: Dict[Tuple, Tuple]) -> bool:
+        """Hand over the calling thread's statistics (False if it was already released)"""
+        with self._cond:
+            name = self._owing.pop(threading.get_ident(), None)
+            if name is None:
+                return False
+            self.threads.append(name)
+            self.stats.append(stats)
+            self._cond.notify_all()
+            return True
+
+    def wait_returned(self, timeout: float) -> List[str]:
+        """Wait until every joined thread handed its statistics over
+
+        Returns:
+            Names of the threads released without statistics
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: not self._owing, timeout=timeout)
+            missing = sorted(self._owing.values())
+            self._owing.clear()
+        return missing
+
+
+# Active cProfile session and number of threads still holding a profiler;
+# read without a lock by profile_checkpoint()
+_session: Optional[_CProfileSession] = None
+_holding = 0
+_holding_lock = threading.Lock()
+_thread_state = threading.local()
+
+
+def profile_checkpoint() -> None:
+    """Join or leave a cProfile session from the calling thread
+
+    Call once per iteration of long-running loops. Costs two global reads
+    when no session is active.
+    """
+    if _session is None and not _holding:
+        return
+    _checkpoint()
+
+
+def _checkpoint() -> None:
+    global _holding
+
+    profile = getattr(_thread_state, "profile", None)
+    session = _session
+
+    if profile is not None and (session is None or not session.accepting or _thread_state.session is not session):
+        # Session over: stop and hand statistics to the session that started us
+        profile.disable()
+        profile.create_stats()
+        returned = _thread_state.session.add(profile.stats)
+        _thread_state.profile = None
+        _thread_state.session = None
+        if returned:
+            # Released threads were already subtracted by _run_cprofile
+            with _holding_lock:
+                _holding -= 1
+        profile = None
+
+    if profile is None and session is not None and session.accepting:
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            # Another profiler is active in this thread (or process-wide)
+            logger.debug(f"Cannot profile {threading.current_thread().name}: {e}")
+            return
+        _thread_state.profile = profile
+        _thread_state.session = session
+        session.join()
+        with _holding_lock:
+            _holding += 1
+
+
+class Profiler:
+    """Runs one profiling session at a time"""
+
+    # Time given to threads to reach their next checkpoint after a cProfile session
+    CHECKPOINT_TIMEOUT_S = 2.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active_mode: Optional[str] = None
+        self._last_result: Optional[ProfileResult] = None
+
+    @property
+    def is_active(self) -> bool:
+        """Check if a session is running"""
+        return self._active_mode is not None
+
+    @property
+    def active_mode(self) -> Optional[str]:
+        """Mode of the running session"""
+        return self._active_mode
+
+    @property
+    def last_result(self) -> Optional[ProfileResult]:
+        """Result of the most recent session"""
+        return self._last_result
+
+    def run(
+        self,
+        duration_s: float,
+        mode: str = ProfileMode.SAMPLING,
+        interval_ms: float = 10.0,
+        memory: bool = False,
+        memory_frames: int = 1,
+        memory_top: int = 30,
+    ) -> ProfileResult:
+        """Profile the application for duration_s (blocks the caller)
+
+        Args:
+            duration_s: Session length in seconds
+            mode: ProfileMode.SAMPLING or ProfileMode.CPROFILE
+            interval_ms: Sampling interval (sampling mode)
+            memory: Also diff tracemalloc snapshots taken at start and end
+            memory_frames: Traceback depth stored by tracemalloc
+            memory_top: Number of source lines in the memory diff
+
+        Returns:
+            Session result (also kept as last_result)
+
+        Raises:
+            ValueError: Unknown mode
+            RuntimeError: Another session is running
+        """
+        if mode not in (ProfileMode.SAMPLING, ProfileMode.CPROFILE):
+            raise ValueError(f"Unknown profile mode: {mode}")
+
+        with self._lock:
+            if self._active_mode is not None:
+                raise RuntimeError(f"A {self._active_mode} profiling session is already running")
+            self._active_mode = mode
+
+        started = datetime.now()
+        logger.info(f"Profiling ({mode}) for {duration_s:.1f} s")
+        try:
+            tracing_started = False
+            if memory:
+                tracing_started = not tracemalloc.is_tracing()
+                if tracing_started:
+                    tracemalloc.start(memory_frames)
+                memory_before = tracemalloc.take_snapshot()
+
+            start = time.perf_counter()
+            if mode == ProfileMode.SAMPLING:
+                result = self._run_sampling(duration_s, interval_ms / 1000)
+            else:
+                result = self._run_cprofile(duration_s)
+            result.started = started
+            result.duration_s = time.perf_counter() - start
+
+            if memory:
+                memory_after = tracemalloc.take_snapshot()
+                if tracing_started:
+                    tracemalloc.stop()
+                result.memory = [
+                    MemoryDiff(
+                        filename=stat.traceback[0].filename,
+                        lineno=stat.traceback[0].lineno,
+                        size_diff_kb=stat.size_diff / 1024,
+                        size_kb=stat.size / 1024,
+                        count_diff=stat.count_diff,
+                    )
+                    for stat in memory_after.compare_to(memory_before, "lineno")[:memory_top]
+                ]
+        finally:
+            with self._lock:
+                self._active_mode = None
+
+        self._last_result = result
+        logger.info(f"Profiling finished: {len(result.threads)} threads, {len(result.stats)} functions")
+        return result
+
+    def _run_cprofile(self, duration_s: float) -> ProfileResult:
+        """Let worker threads profile themselves for duration_s"""
+        global _session, _holding
+
+        session = _CProfileSession()
+        _session = session
+        try:
+            time.sleep(duration_s)
+        finally:
+            session.accepting = False
+            _session = None
+        missing = session.wait_returned(self.CHECKPOINT_TIMEOUT_S)
+        if missing:
+            # Blocked threads would keep every checkpoint off the fast path
+            logger.warning(f"No cProfile statistics from {', '.join(missing)} (no checkpoint reached)")
+            with _holding_lock:
+                _holding -= len(missing)
+
+        merged: Optional[pstats.Stats] = None
+        for stats in list(session.stats):
+            if merged is None:
+                merged = pstats.Stats(_StatsHolder.wrap(stats))
+            else:
+                merged.add(_StatsHolder.wrap(stats))
+
+        return ProfileResult(
+            mode=ProfileMode.CPROFILE,
+            started=datetime.now(),
+            duration_s=duration_s,
+            threads=sorted(session.threads),
+            # Stats keeps the merged dict in the undocumented .stats attribute
+            stats=merged.stats if merged is not None else {},  # type: ignore[attr-defined]
+            missing_threads=missing,
+        )
+
+    def _run_sampling(self, duration_s: float, interval_s: float) -> ProfileResult:
+        """Sample the stacks of all other threads for duration_s"""
+        own_id = threading.get_ident()
+        stacks: Counter = Counter()
+        samples = 0
+        deadline = time.perf_counter() + duration_s
+
+        while True:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, top in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                frame: Optional[FrameType] = top
+                while frame is not None:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                stacks[(names.get(thread_id, str(thread_id)), tuple(reversed(stack)))] += 1
+            samples += 1
+
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            time.sleep(min(interval_s, remaining))
+
+        return ProfileResult(
+            mode=ProfileMode.SAMPLING,
+            started=datetime.now(),
+            duration_s=duration_s,
+            threads=sorted({thread for thread, _ in stacks}),
+            samples=samples,
+            stats=_sampled_stats(stacks, interval_s),
+            collapsed=_collapse(stacks),
+        )
+
+
+def _code_key(code) -> Tuple[str, int, str]:
+    """pstats function key of a code object"""
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+
+def _sampled_stats(stacks: Counter, interval_s: float) -> Dict[Tuple, Tuple]:
+    """Convert stack samples to a pstats dict (sample counts as calls, samples * interval as time)"""
+    own: Counter = Counter()
+    cumulative: Counter = Counter()
+    edges: Counter = Counter()
+
+    for (_, stack), count in stacks.items():
+        if not stack:
+            continue
+        keys = [_code_key(code) for code in stack]
+        own[keys[-1]] += count
+        for key in set(keys):
+            cumulative[key] += count
+        for caller, callee in set(zip(keys, keys[1:])):
+            edges[(caller, callee)] += count
+
+    callers: Dict[Tuple, Dict[Tuple, Tuple]] = {key: {} for key in cumulative}
+    for (caller, callee), count in edges.items():
+        callers[callee][caller] = (count, count, 0.0, count * interval_s)
+
+    return {
+        key: (count, count, own[key] * interval_s, count * interval_s, callers[key])
+        for key, count in cumulative.items()
+    }
+
+
+def _collapse(stacks: Counter) -> str:
+    """Render samples as collapsed stacks (one "thread;outer;...;inner count" line per stack)"""
+    lines: Counter = Counter()
+    for (thread, stack), count in stacks.items():
+        frames = [f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})" for code in stack]
+        lines[";".join([thread.replace(";", "_"), *frames])] += count
+    return "".join(f"{line} {count}\n" for line, count in sorted(lines.items()))
+
+
+# Process-wide profiler used by the API
+_profiler = Profiler()
+
+
+def get_profiler() -> Profiler:
+    """Get the process-wide profiler"""
+    return _profiler
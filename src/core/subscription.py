@@ -0,0 +1,353 @@
+"""Event bus subscriptions with synchronous or queued delivery.
+
+A Subscription wraps one subscriber callback of the AppCore event bus and
+keeps per-subscriber statistics. Synchronous subscriptions run the handler on
+the publisher's thread. AsyncSubscription gives the subscriber a bounded
+queue and its own delivery thread, so a slow handler never blocks the
+publisher; when the queue is full the subscriber's OverflowPolicy decides
+what is lost. ThrottledSubscription bounds the delivery rate instead: events
+inside a window are merged into the latest one (or into an EventBatch),
+separately for every event key (the publishing camera).
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Hashable, Optional, Tuple
+
+from .profiler import profile_checkpoint
+
+logger = logging.getLogger(__name__)
+
+
+class OverflowPolicy:
+    """What an async subscriber does when its queue is full"""
+
+    DROP_OLDEST = "drop_oldest"  # Discard the oldest queued event
+    DROP_NEWEST = "drop_newest"  # Discard the incoming event
+    COALESCE_LATEST = "coalesce_latest"  # Keep only the latest pending event
+
+
+@dataclass
+class EventBatch:
+    """Events merged by a throttled subscription in aggregate mode.
+
+    Attributes:
+        count: Number of events published in the window
+        latest: Data of the most recent event
+        window_ms: Time from the first to the last event in the window
+    """
+
+    count: int
+    latest: Any
+    window_ms: float
+
+
+@dataclass
+class _PendingEvent:
+    """Latest undelivered event of one key in a throttled subscription"""
+
+    data: Any
+    queued_at: float
+    window_start: float
+    count: int = 1
+
+
+class Subscription:
+    """Synchronous subscription: the handler runs on the publisher's thread"""
+
+    mode = "sync"
+
+    def __init__(self, event_type: str, callback: Callable, name: Optional[str] = None):
+        self.event_type = event_type
+        self.callback = callback
+        self.name = name or getattr(callback, "__qualname__", repr(callback))
+
+        self._stats_lock = threading.Lock()
+        self.delivered = 0
+        self.errors = 0
+        self.handler_time_total_ms = 0.0
+        self.handler_time_max_ms = 0.0
+
+    def matches(self, callback: Callable) -> bool:
+        """Check if this subscription wraps the given callback"""
+        return self.callback == callback
+
+    def dispatch(self, data: Any, key: Hashable = None) -> None:
+        """Deliver an event (called by the publisher; key is used by throttling only)"""
+        self._deliver(data)
+
+    def close(self) -> None:
+        """Release resources (nothing to do for synchronous delivery)"""
+
+    def _deliver(self, data: Any) -> None:
+        """Run the handler, recording handler time and errors"""
+        start = time.perf_counter()
+        try:
+            self.callback(data)
+        except Exception as e:
+            with self._stats_lock:
+                self.errors += 1
+            logger.error(f"Error in event handler {self.name} for {self.event_type}: {e}")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        with self._stats_lock:
+            self.delivered += 1
+            self.handler_time_total_ms += elapsed_ms
+            if elapsed_ms > self.handler_time_max_ms:
+                self.handler_time_max_ms = elapsed_ms
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get subscriber statistics"""
+        with self._stats_lock:
+            return {
+                "event_type": self.event_type,
+                "name": self.name,
+                "mode": self.mode,
+                "delivered": self.delivered,
+                "errors": self.errors,
+                "handler_avg_ms": self.handler_time_total_ms / self.delivered if self.delivered else 0.0,
+                "handler_max_ms": self.handler_time_max_ms,
+            }
+
+
+class AsyncSubscription(Subscription):
+    """Queued subscription with its own delivery thread
+
+    dispatch() only appends to a bounded queue and returns immediately.
+    Lag is the time an event waited in the queue before its handler started.
+    """
+
+    mode = "async"
+
+    # Longest idle wait between profile checkpoints
+    IDLE_CHECKPOINT_S = 0.5
+
+    def __init__(
+        self,
+        event_type: str,
+        callback: Callable,
+        name: Optional[str] = None,
+        max_queue: int = 100,
+        overflow: str = OverflowPolicy.DROP_OLDEST,
+    ):
+        super().__init__(event_type, callback, name)
+        self.max_queue = max(max_queue, 1)
+        self.overflow = overflow
+
+        self._queue: Deque[Tuple[Any, float]] = deque()
+        self._cond = threading.Condition()
+        self._running = True
+
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_queue_depth = 0
+        self.lag_last_ms = 0.0
+        self.lag_max_ms = 0.0
+
+        self._thread = threading.Thread(target=self._run, name=f"EventWorker-{event_type}", daemon=True)
+        self._thread.start()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of events waiting for delivery"""
+        with self._cond:
+            return len(self._queue)
+
+    def dispatch(self, data: Any, key: Hashable = None) -> None:
+        """Queue an event without blocking the publisher"""
+        item = (data, time.perf_counter())
+
+        with self._cond:
+            if not self._running:
+                return
+
+            if self.overflow == OverflowPolicy.COALESCE_LATEST:
+                if self._queue:
+                    self._queue.clear()
+                    self.coalesced += 1
+            elif len(self._queue) >= self.max_queue:
+                if self.overflow == OverflowPolicy.DROP_NEWEST:
+                    self.dropped += 1
+                    return
+                self._queue.popleft()
+                self.dropped += 1
+
+            self._queue.append(item)
+            if len(self._queue) > self.max_queue_depth:
+                self.max_queue_depth = len(self._queue)
+            self._cond.notify()
+
+    def close(self, timeout: float = 1.0) -> None:
+        """Stop the delivery thread, discarding queued events"""
+        with self._cond:
+            self._running = False
+            self._queue.clear()
+            self._cond.notify()
+
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+
+    def _run(self) -> None:
+        """Delivery loop (runs in the subscriber's own thread)"""
+        while True:
+            profile_checkpoint()
+            with self._cond:
+                if not self._cond.wait_for(lambda: self._queue or not self._running, timeout=self.IDLE_CHECKPOINT_S):
+                    continue
+                if not self._running:
+                    return
+                data, queued_at = self._queue.popleft()
+
+            lag_ms = (time.perf_counter() - queued_at) * 1000
+            with self._stats_lock:
+                self.lag_last_ms = lag_ms
+                if lag_ms > self.lag_max_ms:
+                    self.lag_max_ms = lag_ms
+
+            self._deliver(data)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get subscriber statistics including queue and lag"""
+        stats = super().get_stats()
+        with self._cond:
+            stats.update(
+                {
+                    "overflow": self.overflow,
+                    "queue_depth": len(self._queue),
+                    "max_queue": self.max_queue,
+                    "max_queue_depth": self.max_queue_depth,
+                    "dropped": self.dropped,
+                    "coalesced": self.coalesced,
+                }
+            )
+        with self._stats_lock:
+            stats.update({"lag_last_ms": self.lag_last_ms, "lag_max_ms": self.lag_max_ms})
+        return stats
+
+
+class ThrottledSubscription(AsyncSubscription):
+    """Rate-limited subscription: at most one delivery per interval and key
+
+    Events published while the handler waits for its next slot replace the
+    pending one of the same key ("latest within interval"), so the publisher
+    keeps full rate while the subscriber sees a bounded rate. Each key (the
+    publishing camera, see AppCore.publish) has its own pending event and
+    interval, so a fast camera never replaces the events of a slower one;
+    keys with a free slot are served in the order they became pending. The
+    last event of a burst is always delivered once the interval has passed;
+    a key without new events for a whole interval is forgotten. In
+    aggregate mode the handler receives an EventBatch with the number of
+    merged events.
+    """
+
+    mode = "throttled"
+
+    def __init__(
+        self,
+        event_type: str,
+        callback: Callable,
+        min_interval_ms: float,
+        name: Optional[str] = None,
+        aggregate: bool = False,
+    ):
+        self.min_interval = min_interval_ms / 1000
+        self.aggregate = aggregate
+
+        self._pending: Dict[Hashable, _PendingEvent] = {}
+        self._next_delivery: Dict[Hashable, float] = {}
+        self.suppressed = 0
+
+        super().__init__(event_type, callback, name, max_queue=1, overflow=OverflowPolicy.COALESCE_LATEST)
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of keys with an event waiting for delivery"""
+        with self._cond:
+            return len(self._pending)
+
+    def dispatch(self, data: Any, key: Hashable = None) -> None:
+        """Record an event as the pending one of its key without blocking the publisher"""
+        now = time.perf_counter()
+
+        with self._cond:
+            if not self._running:
+                return
+
+            pending = self._pending.get(key)
+            if pending is None:
+                self._pending[key] = _PendingEvent(data, now, now)
+            else:
+                pending.data = data
+                pending.queued_at = now
+                pending.count += 1
+                self.suppressed += 1
+
+            if len(self._pending) > self.max_queue_depth:
+                self.max_queue_depth = len(self._pending)
+            self._cond.notify()
+
+    def close(self, timeout: float = 1.0) -> None:
+        """Stop the delivery thread, discarding pending events"""
+        with self._cond:
+            self._pending.clear()
+        super().close(timeout)
+
+    def _run(self) -> None:
+        """Delivery loop: wait for a pending event whose key has a free slot"""
+        while True:
+            profile_checkpoint()
+            with self._cond:
+                if not self._cond.wait_for(lambda: self._pending or not self._running, timeout=self.IDLE_CHECKPOINT_S):
+                    self._forget_idle_keys(time.perf_counter())
+                    continue
+                if not self._running:
+                    return
+
+                now = time.perf_counter()
+                self._forget_idle_keys(now)
+                ready = [key for key in self._pending if self._next_delivery.get(key, 0.0) <= now]
+                if not ready:
+                    # Sleep until a slot opens; new events keep replacing the pending ones
+                    wake = min(self._next_delivery[key] for key in self._pending)
+                    self._cond.wait(timeout=wake - now)
+                    continue
+
+                key = ready[0]
+                pending = self._pending.pop(key)
+                self._next_delivery[key] = now + self.min_interval
+
+            lag_ms = (now - pending.queued_at) * 1000
+            with self._stats_lock:
+                self.lag_last_ms = lag_ms
+                if lag_ms > self.lag_max_ms:
+                    self.lag_max_ms = lag_ms
+
+            data = pending.data
+            if self.aggregate:
+                window_ms = (pending.queued_at - pending.window_start) * 1000
+                data = EventBatch(count=pending.count, latest=data, window_ms=window_ms)
+            self._deliver(data)
+
+    def _forget_idle_keys(self, now: float) -> None:
+        """Drop the slots of keys with nothing pending whose interval has passed (called with the lock held)"""
+        idle = [key for key, slot in self._next_delivery.items() if slot <= now and key not in self._pending]
+        for key in idle:
+            del self._next_delivery[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get subscriber statistics including suppressed events"""
+        stats = super().get_stats()
+        with self._cond:
+            stats.update(
+                {
+                    "queue_depth": len(self._pending),
+                    "min_interval_ms": self.min_interval * 1000,
+                    "aggregate": self.aggregate,
+                    "suppressed": self.suppressed,
+                    "keys": len(self._next_delivery),
+                }
+            )
+        return stats
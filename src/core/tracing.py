@@ -0,0 +1,240 @@
+"""Per-frame trace spans in a fixed-size ring.
+
+Averages hide single slow cycles (a GC pause, an NG image write). The tracer
+keeps the most recent spans (name, start, duration, thread, frame) in a
+preallocated ring and exports a time range as Chrome trace JSON, which
+chrome://tracing and https://ui.perfetto.dev show on a per-thread timeline.
+
+Spans are tagged with the frame sequence number and camera set for the
+current thread by set_frame(), so the stages of one frame can be followed
+across the camera and processing threads. Garbage collector runs are
+recorded as "gc" spans.
+
+Usage:
+    tracer = get_tracer()
+    tracer.set_frame(seq, camera_id)
+    with tracer.span("preprocess"):
+        ...
+"""
+
+import gc
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# (name, start_ns, duration_ns, thread_id, frame_seq, camera_id, args)
+_SpanTuple = Tuple[str, int, int, int, Optional[int], Optional[str], Optional[Dict[str, Any]]]
+
+
+class _SpanContext:
+    """Context manager recording one span on exit"""
+
+    __slots__ = ("_tracer", "_name", "_args", "_start")
+
+    def __init__(self, tracer: "Tracer", name: str, args: Optional[Dict[str, Any]]):
+        self._tracer = tracer
+        self._name = name
+        self._args = args
+
+    def __enter__(self) -> "_SpanContext":
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._tracer.record(self._name, self._start, time.perf_counter_ns(), args=self._args)
+
+
+class _NullSpan:
+    """Span used while tracing is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Ring buffer of trace spans with Chrome trace export
+
+    Thread-safe. Recording a span costs one tuple and a slot assignment
+    under a lock; when the ring is full the oldest spans are overwritten.
+    The lock is reentrant: an allocation made while holding it can start a
+    garbage collection, whose gc.callbacks hook records a span on the same
+    thread.
+    """
+
+    def __init__(self, capacity: int = 50000, enabled: bool = True, trace_gc: bool = True):
+        if capacity < 1:
+            raise ValueError("Trace capacity must be at least 1")
+        self._slots: List[Optional[_SpanTuple]] = [None] * capacity
+        self._capacity = capacity
+        self._next = 0
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._thread_names: Dict[int, str] = {}
+        self._gc_start_ns = 0
+        self._trace_gc = trace_gc
+        self._enabled = False
+        if enabled:
+            self.enable()
+
+    @property
+    def enabled(self) -> bool:
+        """Check if spans are recorded"""
+        return self._enabled
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of spans kept"""
+        return self._capacity
+
+    def enable(self) -> None:
+        """Start recording spans (and garbage collector runs if trace_gc)"""
+        if not self._enabled:
+            self._enabled = True
+            if self._trace_gc:
+                gc.callbacks.append(self._on_gc)
+
+    def disable(self) -> None:
+        """Stop recording spans"""
+        if self._enabled:
+            self._enabled = False
+            if self._on_gc in gc.callbacks:
+                gc.callbacks.remove(self._on_gc)
+
+    # ========== Recording ==========
+
+    def set_frame(self, frame_seq: Optional[int], camera_id: Optional[str] = None) -> None:
+        """Tag spans recorded by the calling thread with a frame (None to clear)"""
+        self._local.frame = frame_seq
+        self._local.camera = camera_id
+
+    def span(self, name: str, args: Optional[Dict[str, Any]] = None):
+        """Context manager recording a span around its body"""
+        if not self._enabled:
+            return _NULL_SPAN
+        return _SpanContext(self, name, args)
+
+    def record(
+        self,
+        name: str,
+        start_ns: int,
+        end_ns: int,
+        frame_seq: Optional[int] = None,
+        camera_id: Optional[str] = None,
+        args: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Record a finished span (times from time.perf_counter_ns())
+
+        frame_seq and camera_id default to the calling thread's set_frame().
+        """
+        if not self._enabled:
+            return
+
+        thread_id = threading.get_ident()
+        if thread_id not in self._thread_names:
+            self._thread_names[thread_id] = threading.current_thread().name
+        if frame_seq is None:
+            frame_seq = getattr(self._local, "frame", None)
+            if camera_id is None:
+                camera_id = getattr(self._local, "camera", None)
+
+        span = (name, start_ns, end_ns - start_ns, thread_id, frame_seq, camera_id, args)
+        with self._lock:
+            self._slots[self._next % self._capacity] = span
+            self._next += 1
+
+    def _on_gc(self, phase: str, info: Dict[str, Any]) -> None:
+        """gc.callbacks hook: record collections as spans"""
+        if phase == "start":
+            self._gc_start_ns = time.perf_counter_ns()
+        elif self._gc_start_ns:
+            self.record(
+                "gc",
+                self._gc_start_ns,
+                time.perf_counter_ns(),
+                args={"generation": info.get("generation"), "collected": info.get("collected")},
+            )
+            self._gc_start_ns = 0
+
+    # ========== Export ==========
+
+    def get_spans(self, last_s: Optional[float] = None) -> List[_SpanTuple]:
+        """Get recorded spans, oldest first, optionally only those ending in the last last_s seconds"""
+        with self._lock:
+            count = min(self._next, self._capacity)
+            first = self._next - count
+            slots = [self._slots[i % self._capacity] for i in range(first, self._next)]
+        spans = [span for span in slots if span is not None]
+
+        if last_s is not None:
+            cutoff = time.perf_counter_ns() - int(last_s * 1e9)
+            spans = [span for span in spans if span[1] + span[2] >= cutoff]
+        return spans
+
+    def export_chrome(self, last_s: Optional[float] = None) -> Dict[str, Any]:
+        """Export spans as Chrome trace JSON (Trace Event Format, complete events)
+
+        Args:
+            last_s: Only spans ending in the last last_s seconds (default: all)
+
+        Returns:
+            JSON-serializable trace object
+        """
+        pid = os.getpid()
+        spans = self.get_spans(last_s)
+
+        events: List[Dict[str, Any]] = []
+        for thread_id in sorted({span[3] for span in spans}):
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": thread_id,
+                    "args": {"name": self._thread_names.get(thread_id, str(thread_id))},
+                }
+            )
+
+        for name, start_ns, duration_ns, thread_id, frame_seq, camera_id, extra in spans:
+            args: Dict[str, Any] = dict(extra) if extra else {}
+            if frame_seq is not None:
+                args["frame"] = frame_seq
+            if camera_id is not None:
+                args["camera"] = camera_id
+            events.append(
+                {
+                    "name": name,
+                    "cat": "gc" if name == "gc" else "pipeline",
+                    "ph": "X",
+                    "ts": start_ns / 1000,
+                    "dur": duration_ns / 1000,
+                    "pid": pid,
+                    "tid": thread_id,
+                    "args": args,
+                }
+            )
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def clear(self) -> None:
+        """Remove all spans"""
+        with self._lock:
+            self._slots = [None] * self._capacity
+            self._next = 0
+
+
+# Process-wide tracer served by the /api/trace endpoint
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer"""
+    return _tracer
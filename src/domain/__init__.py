@@ -1,7 +1,7 @@
 """Domain layer - Business entities and configurations"""
 
 from .enums import MeasureStatus
-from .config import DetectionConfig, ToleranceConfig
+from .config import DetectionConfig, HoleTolerance, ToleranceConfig
 from .entities import CircleResult, CalibrationData
 from .recipe import Recipe
 from .io_config import IOConfig, IOStatus, IOMode
@@ -10,6 +10,7 @@ __all__ = [
     "MeasureStatus",
     "DetectionConfig",
     "ToleranceConfig",
+    "HoleTolerance",
     "CircleResult",
     "CalibrationData",
     "Recipe",
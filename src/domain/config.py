@@ -1,6 +1,8 @@
 """Configuration data classes"""
 
 from dataclasses import dataclass, field
+from typing import List, Optional
+
 from .enums import MeasureStatus
 
 
@@ -19,6 +21,17 @@ class DetectionConfig:
     show_label: bool = True
 
 
+@dataclass
+class HoleTolerance:
+    """Per-hole tolerance overrides (None: use the recipe-wide value)"""
+
+    hole_id: int
+    nominal_mm: Optional[float] = None
+    tolerance_mm: Optional[float] = None
+    x_px: Optional[float] = None  # Expected center, checked when both are set
+    y_px: Optional[float] = None
+
+
 @dataclass
 class ToleranceConfig:
     """Configuration for tolerance checking"""
@@ -26,6 +39,9 @@ class ToleranceConfig:
     enabled: bool = False
     nominal_mm: float = 10.0
     tolerance_mm: float = 0.05
+    min_circularity: float = 0.0  # Holes below this are NG (0 = not checked)
+    position_tolerance_px: float = 0.0  # Max center offset from HoleTolerance x/y (0 = not checked)
+    holes: List[HoleTolerance] = field(default_factory=list)
 
     @property
     def min_mm(self) -> float:
@@ -64,3 +80,38 @@ class CameraConfig:
     default_exposure_us: float = 50.0
     trigger_mode: str = "software"
     pixel_format: str = "BGR8"
+    gain_db: Optional[float] = None  # None: keep the camera's gain
+
+
+@dataclass
+class VirtualCameraConfig:
+    """Configuration for the virtual (simulated) camera backend"""
+
+    # Synthetic frame generation (ignored when replaying a source)
+    width: int = 4608  # acA4600-7gc sensor width
+    height: int = 3288  # acA4600-7gc sensor height
+    fps: float = 7.0  # Free-run frame rate, <= 0 for unthrottled
+    hole_rows: int = 2
+    hole_cols: int = 3
+    radius_jitter_px: float = 2.0  # Per-frame radius variation of synthetic holes
+    frame_pool_size: int = 2  # Pre-rendered synthetic frames cycled on grab
+    seed: int = 0
+
+    # Replay source: image folder, .npy sequence or video file
+    source: Optional[str] = None
+    loop: bool = True
+    preload: bool = True  # Decode folder images once at connect
+
+    # Transport simulation
+    transport_delay_ms: float = 0.0  # Added latency between exposure and delivery
+
+
+@dataclass
+class SPCConfig:
+    """Configuration for statistical process control charts"""
+
+    chart_type: str = "individuals"  # "individuals" (I-MR) or "xbar_r"
+    subgroup_size: int = 5  # Measurements per subgroup for X-bar/R (2-10)
+    baseline_points: int = 25  # Plotted points used to fix the control limits
+    rules: tuple = (1, 2, 3, 4)  # Western Electric rules to evaluate
+    raise_io_error: bool = False  # Set the PLC error output on a violation
@@ -1,8 +1,8 @@
 """Domain entities"""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from .enums import MeasureStatus
 
@@ -22,6 +22,17 @@ class CircleResult:
     confidence: float = 1.0
 
 
+@dataclass
+class OverlayFrame:
+    """Overlay geometry of one processed frame, drawn by web clients"""
+
+    camera_id: str
+    frame_seq: int  # Matches the frame sequence number of the streamed image
+    width: int  # Source frame size, pixels
+    height: int
+    circles: List[CircleResult] = field(default_factory=list)
+
+
 @dataclass
 class CalibrationData:
     """Calibration data for pixel to mm conversion"""
@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import Optional, Dict, Any
 import json
 
-from .config import DetectionConfig, ToleranceConfig
+from .config import CameraConfig, DetectionConfig, HoleTolerance, ToleranceConfig
 
 
 @dataclass
@@ -17,13 +17,15 @@ class Recipe:
     detection_config: DetectionConfig = field(default_factory=DetectionConfig)
     tolerance_config: ToleranceConfig = field(default_factory=ToleranceConfig)
     pixel_to_mm: float = 0.00644
+    camera_config: Optional[CameraConfig] = None  # None: camera settings are left as they are
+    plc_index: Optional[int] = None  # PLC recipe bits selecting this recipe (None: manual only)
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     version: str = "1.0"
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert recipe to dictionary for JSON serialization"""
-        return {
+        data: Dict[str, Any] = {
             "name": self.name,
             "description": self.description,
             "version": self.version,
@@ -44,8 +46,20 @@ class Recipe:
                 "enabled": self.tolerance_config.enabled,
                 "nominal_mm": self.tolerance_config.nominal_mm,
                 "tolerance_mm": self.tolerance_config.tolerance_mm,
+                "min_circularity": self.tolerance_config.min_circularity,
+                "position_tolerance_px": self.tolerance_config.position_tolerance_px,
+                "holes": [asdict(hole) for hole in self.tolerance_config.holes],
             },
         }
+        if self.camera_config is not None:
+            data["camera"] = {
+                "exposure_us": self.camera_config.default_exposure_us,
+                "gain_db": self.camera_config.gain_db,
+                "trigger_mode": self.camera_config.trigger_mode,
+            }
+        if self.plc_index is not None:
+            data["plc_index"] = self.plc_index
+        return data
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Recipe":
@@ -69,8 +83,20 @@ class Recipe:
             enabled=tolerance_data.get("enabled", False),
             nominal_mm=tolerance_data.get("nominal_mm", 10.0),
             tolerance_mm=tolerance_data.get("tolerance_mm", 0.05),
+            min_circularity=tolerance_data.get("min_circularity", 0.0),
+            position_tolerance_px=tolerance_data.get("position_tolerance_px", 0.0),
+            holes=[HoleTolerance(**hole) for hole in tolerance_data.get("holes", [])],
         )
 
+        camera_config = None
+        if "camera" in data:
+            camera_data = data["camera"]
+            camera_config = CameraConfig(
+                default_exposure_us=camera_data.get("exposure_us", 50.0),
+                gain_db=camera_data.get("gain_db"),
+                trigger_mode=camera_data.get("trigger_mode", "software"),
+            )
+
         created_at = datetime.fromisoformat(data.get("created_at", datetime.now().isoformat()))
         updated_at = datetime.fromisoformat(data.get("updated_at", datetime.now().isoformat()))
 
@@ -83,6 +109,8 @@ class Recipe:
             detection_config=detection_config,
             tolerance_config=tolerance_config,
             pixel_to_mm=detection_data.get("pixel_to_mm", 0.00644),
+            camera_config=camera_config,
+            plc_index=data.get("plc_index"),
         )
 
     def to_json(self) -> str:
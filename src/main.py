@@ -26,6 +26,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.infrastructure.logger import setup_logging
 from src.ui.main_window import MainWindow
+from src.services.camera_service import PYLON_AVAILABLE
+from src.services.virtual_camera import VirtualCamera
 from src.utils.constants import APP_NAME, APP_VERSION
 
 logger = logging.getLogger(__name__)
@@ -107,8 +109,9 @@ def main() -> int:
         return 1
 
     try:
-        # Create and run main window
-        app = MainWindow()
+        # Create and run main window (virtual camera when pypylon is missing)
+        camera = None if PYLON_AVAILABLE else VirtualCamera()
+        app = MainWindow(camera)
         logger.info("Application initialized successfully")
         app.run()
         logger.info("Application closed normally")
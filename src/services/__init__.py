@@ -1,23 +1,59 @@
 """Services layer - Business logic"""
 
-from .camera_service import BaslerGigECamera, TriggerMode
+from .camera_service import BaslerGigECamera, CameraNodeMap, FeatureWriteReport, TriggerMode
+from .virtual_camera import VirtualCamera
 from .detector_service import CircleDetector
+from .classifier_service import CircleClassifier, ClassificationResult
 from .visualizer_service import CircleVisualizer
-from .calibration_service import CalibrationService
-from .thread_manager import ThreadManager, ProcessResult
+from .calibration_service import CalibrationJob, CalibrationService, ScaleField
+from .thread_manager import ThreadManager, ProcessResult, RecipePipeline
+from .camera_manager import CameraManager, CameraStation, PartResult
 from .recipe_service import RecipeService
-from .image_saver import ImageSaver
+from .recipe_switcher import RecipeSwitcher
+from .image_saver import ImageCodec, ImageSaver, SavePolicy
+from .image_archive import ArchivedImage, ImageArchive
+from .measurement_store import MeasurementStore
+from .measurement_log import MeasurementLog
+from .flight_recorder import FlightRecorder
+from .thumbnail_service import ThumbnailService, ThumbnailSize
+from .statistics_service import StatisticsService, StatisticsSnapshot
+from .spc_service import SPCService, SPCViolation
 from .io_service import IOService
 
 __all__ = [
     "BaslerGigECamera",
     "TriggerMode",
+    "CameraNodeMap",
+    "FeatureWriteReport",
+    "VirtualCamera",
     "CircleDetector",
+    "CircleClassifier",
+    "ClassificationResult",
     "CircleVisualizer",
     "CalibrationService",
+    "ScaleField",
+    "CalibrationJob",
     "ThreadManager",
     "ProcessResult",
+    "RecipePipeline",
+    "CameraManager",
+    "CameraStation",
+    "PartResult",
     "RecipeService",
+    "RecipeSwitcher",
+    "ImageCodec",
     "ImageSaver",
+    "SavePolicy",
+    "ImageArchive",
+    "ArchivedImage",
+    "MeasurementStore",
+    "MeasurementLog",
+    "FlightRecorder",
+    "ThumbnailService",
+    "ThumbnailSize",
+    "StatisticsService",
+    "StatisticsSnapshot",
+    "SPCService",
+    "SPCViolation",
     "IOService",
 ]
@@ -2,9 +2,12 @@
 
 import json
 import logging
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Callable, List, Optional, Sequence, Tuple, Union
 
 import cv2
 import numpy as np
@@ -15,14 +18,74 @@ from ..domain.config import DetectionConfig
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class ScaleField:
+    """Spatially varying pixel-to-mm correction on a coarse grid
+
+    factor[row, col] multiplies the global pixel_to_mm at evenly spaced
+    grid nodes spanning the image (node (0, 0) at pixel (0, 0), the last
+    node at (width - 1, height - 1)). Positions between nodes are
+    interpolated bilinearly; positions outside the image are clamped.
+    """
+
+    width: int
+    height: int
+    factor: np.ndarray  # (rows, cols), 1.0 = global pixel_to_mm
+    samples: int = 0  # Grid-plate measurements the field was fitted to
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """Grid nodes (rows, cols)"""
+        return self.factor.shape
+
+    def sample(self, x: Union[float, np.ndarray], y: Union[float, np.ndarray]) -> np.ndarray:
+        """Correction factor at pixel positions (vectorized bilinear lookup)"""
+        rows, cols = self.factor.shape
+        fx = np.clip(np.asarray(x, dtype=np.float64) * ((cols - 1) / max(self.width - 1, 1)), 0, cols - 1)
+        fy = np.clip(np.asarray(y, dtype=np.float64) * ((rows - 1) / max(self.height - 1, 1)), 0, rows - 1)
+        ix = np.minimum(fx.astype(np.intp), cols - 2)
+        iy = np.minimum(fy.astype(np.intp), rows - 2)
+        tx = fx - ix
+        ty = fy - iy
+
+        f = self.factor
+        top = f[iy, ix] * (1 - tx) + f[iy, ix + 1] * tx
+        bottom = f[iy + 1, ix] * (1 - tx) + f[iy + 1, ix + 1] * tx
+        return top * (1 - ty) + bottom * ty
+
+    def save(self, path: Path) -> None:
+        """Write the grid to an .npz file"""
+        np.savez(path, width=self.width, height=self.height, factor=self.factor, samples=self.samples)
+
+    @classmethod
+    def load(cls, path: Path) -> "ScaleField":
+        """Read a grid written by save()"""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                width=int(data["width"]),
+                height=int(data["height"]),
+                factor=data["factor"].astype(np.float64),
+                samples=int(data["samples"]),
+            )
+
+
 class CalibrationService:
-    """Service for managing camera calibration"""
+    """Service for managing camera calibration
+
+    Besides the global pixel_to_mm, a grid-plate calibration stores a
+    ScaleField: a coarse grid of correction factors for lens distortion
+    and perspective, saved next to the calibration file.
+    """
 
     DEFAULT_CALIBRATION_FILE = "config/calibration.json"
+    # Reference circles are first located on a frame downscaled to this long edge
+    COARSE_MAX_EDGE = 1024
 
     def __init__(self, config_path: Optional[str] = None):
         self._config_path = Path(config_path or self.DEFAULT_CALIBRATION_FILE)
+        self._field_path = self._config_path.with_name(f"{self._config_path.stem}_field.npz")
         self._calibration_data: Optional[CalibrationData] = None
+        self._scale_field: Optional[ScaleField] = None
         self._load_calibration()
 
     @property
@@ -37,13 +100,21 @@ class CalibrationService:
             return self._calibration_data.pixel_to_mm
         return DetectionConfig().pixel_to_mm  # Default value
 
+    @property
+    def scale_field(self) -> Optional[ScaleField]:
+        """Field correction from the last grid-plate calibration (None: uniform scale)"""
+        return self._scale_field
+
     @property
     def is_calibrated(self) -> bool:
         """Check if calibration data exists"""
         return self._calibration_data is not None
 
     def set_pixel_to_mm(self, value: float) -> None:
-        """Set pixel to mm ratio directly (used when loading recipes)"""
+        """Set pixel to mm ratio directly (used when loading recipes)
+
+        The scale field is relative to pixel_to_mm and is kept.
+        """
         if value <= 0:
             raise ValueError("Pixel to mm ratio must be positive")
 
@@ -97,15 +168,145 @@ class CalibrationService:
 
         return self.calibrate(reference_size_mm=known_diameter_mm, reference_size_px=diameter_px)
 
-    def _detect_calibration_circle(self, frame: np.ndarray) -> Optional[Tuple[float, float, float]]:
+    def measure_reference_diameter(self, frame: np.ndarray) -> Optional[float]:
+        """Diameter in pixels of the reference circle in frame (None if not found)"""
+        circle_px = self._detect_calibration_circle(frame)
+        return circle_px[2] * 2 if circle_px is not None else None
+
+    def start_auto_calibration(
+        self,
+        get_frame: Callable[[], Optional[np.ndarray]],
+        known_diameter_mm: float,
+        frames: int = 10,
+        frame_timeout: float = 2.0,
+    ) -> "CalibrationJob":
         """
-        Detect the largest circle in frame for calibration
+        Start calibrating from a reference circle over consecutive frames
 
         Args:
-            frame: BGR image
+            get_frame: Returns the latest camera frame (a new array per frame)
+            known_diameter_mm: Known diameter of the circle in mm
+            frames: Frames to measure
+            frame_timeout: Maximum wait for a new frame (seconds)
 
         Returns:
-            (center_x, center_y, radius) if found, None otherwise
+            Running job; poll progress/is_done and read result
+        """
+        if known_diameter_mm <= 0:
+            raise ValueError("Reference size in mm must be positive")
+
+        job = CalibrationJob(self, get_frame, known_diameter_mm, frames, frame_timeout)
+        job.start()
+        return job
+
+    @staticmethod
+    def reject_outliers(values: Sequence[float], limit: float = 3.0) -> np.ndarray:
+        """
+        Mask of values within limit robust standard deviations of the median
+
+        The spread is estimated from the median absolute deviation, with a
+        floor of 0.1% of the median so identical measurements are kept.
+        """
+        arr = np.asarray(values, dtype=np.float64)
+        median = np.median(arr)
+        spread = max(1.4826 * np.median(np.abs(arr - median)), 1e-3 * abs(median))
+        return np.abs(arr - median) <= limit * spread
+
+    def calibrate_from_grid(
+        self,
+        frame: np.ndarray,
+        pitch_mm: float,
+        grid_cols: int = 16,
+        grid_rows: int = 12,
+    ) -> Optional[CalibrationData]:
+        """
+        Calibrate from an image of a dot grid plate
+
+        Each pair of neighboring dots gives the local mm/px at its midpoint
+        (pitch_mm / pixel distance). The median becomes pixel_to_mm; the
+        local deviations are smoothed onto a grid_rows x grid_cols
+        ScaleField and saved with the calibration.
+
+        Args:
+            frame: BGR or grayscale image of the plate
+            pitch_mm: Center distance of neighboring dots in mm
+            grid_cols: Field nodes across the image
+            grid_rows: Field nodes down the image
+
+        Returns:
+            CalibrationData if enough dots were found, None otherwise
+        """
+        if pitch_mm <= 0:
+            raise ValueError("Grid pitch must be positive")
+        if grid_cols < 2 or grid_rows < 2:
+            raise ValueError("Scale field needs at least 2x2 nodes")
+
+        dots = self._detect_circles(frame)
+        if len(dots) >= 4:
+            # Keep the plate's dots (similar size), drop specks and large blobs
+            median_radius = np.median(dots[:, 2])
+            dots = dots[(dots[:, 2] > median_radius * 0.7) & (dots[:, 2] < median_radius * 1.4)]
+        if len(dots) < 4:
+            logger.warning(f"Grid calibration needs at least 4 dots, found {len(dots)}")
+            return None
+
+        centers = dots[:, :2]
+        distance = np.linalg.norm(centers[:, None, :] - centers[None, :, :], axis=2)
+        np.fill_diagonal(distance, np.inf)
+        pitch_px = np.median(distance.min(axis=1))
+
+        # Horizontal/vertical neighbors only (diagonals are ~1.41 pitches away)
+        first, second = np.nonzero(np.triu(distance < pitch_px * 1.25))
+        if len(first) < 3:
+            logger.warning("Grid calibration found no regular dot spacing")
+            return None
+
+        positions = (centers[first] + centers[second]) / 2
+        scales = pitch_mm / distance[first, second]
+        pixel_to_mm = float(np.median(scales))
+
+        height, width = frame.shape[:2]
+        field = self._fit_scale_field(positions, scales / pixel_to_mm, width, height, grid_cols, grid_rows)
+
+        self._calibration_data = CalibrationData(
+            pixel_to_mm=pixel_to_mm,
+            calibrated_at=datetime.now(),
+            reference_size_mm=pitch_mm,
+            reference_size_px=float(pitch_mm / pixel_to_mm),
+        )
+        self._scale_field = field
+        self._save_calibration()
+        logger.info(
+            f"Grid calibration complete: {pixel_to_mm:.6f} mm/px, {len(dots)} dots, "
+            f"field {field.factor.min():.4f}-{field.factor.max():.4f}"
+        )
+        return self._calibration_data
+
+    @staticmethod
+    def _fit_scale_field(
+        positions: np.ndarray, factors: np.ndarray, width: int, height: int, cols: int, rows: int
+    ) -> ScaleField:
+        """Gaussian-weighted average of the samples at each grid node"""
+        node_x, node_y = np.meshgrid(np.linspace(0, width - 1, cols), np.linspace(0, height - 1, rows))
+        nodes = np.stack([node_x.ravel(), node_y.ravel()], axis=1)
+        sigma = max((width - 1) / (cols - 1), (height - 1) / (rows - 1))
+
+        squared = ((nodes[:, None, :] - positions[None, :, :]) ** 2).sum(axis=2)
+        # Relative to the nearest sample, so nodes beyond the plate take its values
+        weights = np.exp(-(squared - squared.min(axis=1, keepdims=True)) / (2 * sigma**2))
+        factor = (weights @ factors) / weights.sum(axis=1)
+        return ScaleField(width=width, height=height, factor=factor.reshape(rows, cols), samples=len(factors))
+
+    def _detect_circles(self, frame: np.ndarray, min_circularity: float = 0.8) -> np.ndarray:
+        """
+        Detect all circular blobs (either polarity)
+
+        Args:
+            frame: BGR or grayscale image
+            min_circularity: Minimum 4*pi*area/perimeter^2
+
+        Returns:
+            (N, 3) array of center_x, center_y, radius
         """
         # Convert to grayscale
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if len(frame.shape) == 3 else frame
@@ -119,13 +320,7 @@ class CalibrationService:
         # Find contours
         contours, _ = cv2.findContours(binary, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
 
-        if not contours:
-            return None
-
-        # Find the largest circular contour
-        best_circle = None
-        best_area: float = 0.0
-
+        circles = []
         for contour in contours:
             area = cv2.contourArea(contour)
             perimeter = cv2.arcLength(contour, True)
@@ -136,12 +331,52 @@ class CalibrationService:
             # Check circularity
             circularity = 4 * np.pi * area / (perimeter**2)
 
-            if circularity > 0.8 and area > best_area:
+            if circularity > min_circularity:
                 (cx, cy), radius = cv2.minEnclosingCircle(contour)
-                best_circle = (cx, cy, radius)
-                best_area = area
+                circles.append((cx, cy, radius))
+
+        return np.array(circles, dtype=np.float64).reshape(-1, 3)
+
+    def _detect_calibration_circle(self, frame: np.ndarray) -> Optional[Tuple[float, float, float]]:
+        """
+        Detect the largest circle in frame for calibration
 
-        return best_circle
+        Args:
+            frame: BGR image
+
+        Returns:
+            (center_x, center_y, radius) if found, None otherwise
+        """
+        height, width = frame.shape[:2]
+        step = -(-max(height, width) // self.COARSE_MAX_EDGE)
+        if step == 1:
+            circles = self._detect_circles(frame)
+            if not len(circles):
+                return None
+            cx, cy, radius = circles[np.argmax(circles[:, 2])]
+            return float(cx), float(cy), float(radius)
+
+        # Coarse: find the largest circle on a subsampled frame (a strided view,
+        # much cheaper than resizing; the blur before thresholding hides aliasing)
+        circles = self._detect_circles(np.ascontiguousarray(frame[::step, ::step]))
+        if not len(circles):
+            return None
+        cx, cy, radius = circles[np.argmax(circles[:, 2])] * step
+
+        # Fine: measure it at full resolution in a window around the coarse estimate
+        margin = radius * 0.25 + 4 * step
+        x0, y0 = max(int(cx - radius - margin), 0), max(int(cy - radius - margin), 0)
+        x1, y1 = min(int(cx + radius + margin) + 1, width), min(int(cy + radius + margin) + 1, height)
+        fine = self._detect_circles(frame[y0:y1, x0:x1])
+        if len(fine):
+            offset = np.hypot(fine[:, 0] + x0 - cx, fine[:, 1] + y0 - cy)
+            fine = fine[offset < radius * 0.25]
+        if not len(fine):
+            logger.debug("Reference circle not refined, using coarse estimate")
+            return float(cx), float(cy), float(radius)
+
+        fx, fy, fine_radius = fine[np.argmax(fine[:, 2])]
+        return float(fx + x0), float(fy + y0), float(fine_radius)
 
     def _save_calibration(self) -> None:
         """Save calibration data to file"""
@@ -157,6 +392,9 @@ class CalibrationService:
                 "reference_size_mm": self._calibration_data.reference_size_mm,
                 "reference_size_px": self._calibration_data.reference_size_px,
             }
+            if self._scale_field is not None:
+                self._scale_field.save(self._field_path)
+                data["scale_field"] = self._field_path.name
 
             with open(self._config_path, "w") as f:
                 json.dump(data, f, indent=2)
@@ -182,19 +420,24 @@ class CalibrationService:
                 reference_size_mm=data["reference_size_mm"],
                 reference_size_px=data["reference_size_px"],
             )
+            if data.get("scale_field"):
+                self._scale_field = ScaleField.load(self._config_path.with_name(data["scale_field"]))
 
             logger.info(f"Calibration loaded: {self._calibration_data.pixel_to_mm:.6f} mm/px")
 
         except Exception as e:
             logger.error(f"Failed to load calibration: {e}")
             self._calibration_data = None
+            self._scale_field = None
 
     def reset_calibration(self) -> None:
         """Reset to default calibration"""
         self._calibration_data = None
+        self._scale_field = None
         if self._config_path.exists():
             try:
                 self._config_path.unlink()
+                self._field_path.unlink(missing_ok=True)
                 logger.info("Calibration reset to defaults")
             except Exception as e:
                 logger.error(f"Failed to delete calibration file: {e}")
@@ -211,4 +454,133 @@ class CalibrationService:
             "reference_mm": self._calibration_data.reference_size_mm,
             "reference_px": self._calibration_data.reference_size_px,
             "source": str(self._config_path),
+            "scale_field": (
+                {
+                    "rows": self._scale_field.shape[0],
+                    "cols": self._scale_field.shape[1],
+                    "min_factor": float(self._scale_field.factor.min()),
+                    "max_factor": float(self._scale_field.factor.max()),
+                    "samples": self._scale_field.samples,
+                }
+                if self._scale_field is not None
+                else None
+            ),
         }
+
+
+class CalibrationJob:
+    """Reference-circle calibration averaged over consecutive frames
+
+    Runs on its own thread so the UI stays responsive: each new frame
+    from get_frame is measured coarse-to-fine, outliers (e.g. a frame with
+    the part moving) are rejected, and the mean diameter of the rest is
+    used for calibration. Poll progress and is_done from the UI thread.
+    """
+
+    def __init__(
+        self,
+        service: CalibrationService,
+        get_frame: Callable[[], Optional[np.ndarray]],
+        known_diameter_mm: float,
+        frames: int = 10,
+        frame_timeout: float = 2.0,
+    ):
+        self._service = service
+        self._get_frame = get_frame
+        self._known_diameter_mm = known_diameter_mm
+        self._frames = max(frames, 1)
+        self._frame_timeout = frame_timeout
+
+        self._thread: Optional[threading.Thread] = None
+        self._done = threading.Event()
+        self._cancelled = False
+        self._measured = 0
+        self._diameters: List[float] = []
+        self._rejected = 0
+        self._result: Optional[CalibrationData] = None
+        self._error: Optional[str] = None
+
+    @property
+    def progress(self) -> Tuple[int, int]:
+        """(frames measured, frames to measure)"""
+        return self._measured, self._frames
+
+    @property
+    def is_done(self) -> bool:
+        """Check if the job finished, failed or was cancelled"""
+        return self._done.is_set()
+
+    @property
+    def result(self) -> Optional[CalibrationData]:
+        """Calibration applied by the job (None until done or if it failed)"""
+        return self._result
+
+    @property
+    def error(self) -> Optional[str]:
+        """Why the job failed (None if it succeeded)"""
+        return self._error
+
+    @property
+    def diameters_px(self) -> List[float]:
+        """Reference diameter measured in each frame it was found in"""
+        return list(self._diameters)
+
+    @property
+    def rejected(self) -> int:
+        """Measurements discarded as outliers"""
+        return self._rejected
+
+    def start(self) -> None:
+        """Start measuring in the background"""
+        self._thread = threading.Thread(target=self._run, name="CalibrationJob", daemon=True)
+        self._thread.start()
+
+    def cancel(self) -> None:
+        """Stop after the current frame without changing the calibration"""
+        self._cancelled = True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until done; True if the job finished within timeout"""
+        return self._done.wait(timeout)
+
+    def _run(self) -> None:
+        try:
+            self._collect()
+            if self._cancelled:
+                self._error = "Cancelled"
+            elif not self._diameters:
+                self._error = "No reference circle detected"
+            else:
+                inliers = self._service.reject_outliers(self._diameters)
+                self._rejected = int(len(inliers) - inliers.sum())
+                diameter_px = float(np.mean(np.asarray(self._diameters)[inliers]))
+                self._result = self._service.calibrate(self._known_diameter_mm, diameter_px)
+                logger.info(
+                    f"Auto-calibration from {len(self._diameters)} frames "
+                    f"({self._rejected} rejected): {diameter_px:.2f} px"
+                )
+        except Exception as e:
+            logger.error(f"Auto-calibration failed: {e}")
+            self._error = str(e)
+        finally:
+            self._done.set()
+
+    def _collect(self) -> None:
+        """Measure the reference circle in consecutive new frames"""
+        last_frame = None
+        deadline = time.monotonic() + self._frame_timeout
+        while self._measured < self._frames and not self._cancelled:
+            frame = self._get_frame()
+            if frame is None or frame is last_frame:
+                if time.monotonic() > deadline:
+                    logger.warning(f"No new frame within {self._frame_timeout}s, using {self._measured} frames")
+                    return
+                time.sleep(0.01)
+                continue
+
+            last_frame = frame
+            deadline = time.monotonic() + self._frame_timeout
+            diameter_px = self._service.measure_reference_diameter(frame)
+            if diameter_px is not None:
+                self._diameters.append(diameter_px)
+            self._measured += 1
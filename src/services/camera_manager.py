@@ -0,0 +1,463 @@
+"""Camera Manager - Multi-camera orchestration with per-camera pipelines"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Union
+
+from .camera_service import BaslerGigECamera
+from .virtual_camera import VirtualCamera
+from .detector_service import CircleDetector
+from .visualizer_service import CircleVisualizer
+from .thread_manager import ThreadManager, ProcessResult
+from ..core import AppCore, EventType
+from ..domain.entities import CircleResult, OverlayFrame
+from ..domain.enums import MeasureStatus
+from ..domain.recipe import Recipe
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CameraStation:
+    """One camera with its own acquisition and detection pipeline"""
+
+    camera_id: str
+    camera: Union[BaslerGigECamera, VirtualCamera]
+    detector: CircleDetector
+    visualizer: CircleVisualizer
+    thread_manager: ThreadManager
+    device_index: int = 0
+    part_group: Optional[str] = None
+    recipe: Optional[Recipe] = None
+    fps: float = 0.0
+    _fps_count: int = field(default=0, repr=False)
+    _fps_start: float = field(default=0.0, repr=False)
+
+
+@dataclass
+class PartResult:
+    """Merged result of all cameras looking at the same part"""
+
+    part_id: int
+    part_group: str
+    timestamp: datetime
+    expected_cameras: List[str]
+    results: Dict[str, List[CircleResult]] = field(default_factory=dict)
+
+    @property
+    def complete(self) -> bool:
+        """True when every camera of the group reported"""
+        return all(camera_id in self.results for camera_id in self.expected_cameras)
+
+    @property
+    def circles(self) -> List[CircleResult]:
+        """All circles of the part, in camera order"""
+        return [c for camera_id in self.expected_cameras for c in self.results.get(camera_id, [])]
+
+    @property
+    def overall_status(self) -> MeasureStatus:
+        """NG if any circle is NG, PARTIAL if a camera is missing, else OK"""
+        if any(c.status == MeasureStatus.NG for c in self.circles):
+            return MeasureStatus.NG
+        if not self.complete:
+            return MeasureStatus.PARTIAL
+        return MeasureStatus.OK
+
+
+class PartResultMerger:
+    """
+    Merges per-camera results into per-part results
+
+    A result joins the oldest pending part of its group that the camera has not
+    reported for yet and that started within the merge window; otherwise it
+    starts a new part. Parts are emitted once all cameras of the group reported,
+    or as incomplete (PARTIAL) when the merge window expires.
+    """
+
+    def __init__(self, merge_window_ms: float = 200.0):
+        self._window_s = merge_window_ms / 1000.0
+        self._groups: Dict[str, List[str]] = {}
+        self._pending: Dict[str, List[PartResult]] = {}
+        self._next_part_id = 1
+        self._lock = threading.Lock()
+
+    @property
+    def part_groups(self) -> List[str]:
+        """Get names of configured part groups"""
+        with self._lock:
+            return list(self._groups.keys())
+
+    def set_group(self, part_group: str, camera_ids: List[str]) -> None:
+        """Define which cameras look at the parts of a group"""
+        with self._lock:
+            if camera_ids:
+                self._groups[part_group] = list(camera_ids)
+            else:
+                self._groups.pop(part_group, None)
+                self._pending.pop(part_group, None)
+
+    def add_result(
+        self, part_group: str, camera_id: str, circles: List[CircleResult], timestamp: datetime
+    ) -> List[PartResult]:
+        """
+        Add one camera result
+
+        Returns:
+            Parts finished by this call (completed or expired), oldest first
+        """
+        with self._lock:
+            expected = self._groups.get(part_group)
+            if not expected:
+                return []
+
+            finished = self._expire(timestamp)
+            pending = self._pending.setdefault(part_group, [])
+
+            part = next(
+                (
+                    p
+                    for p in pending
+                    if camera_id not in p.results and (timestamp - p.timestamp).total_seconds() <= self._window_s
+                ),
+                None,
+            )
+            if part is None:
+                part = PartResult(
+                    part_id=self._next_part_id,
+                    part_group=part_group,
+                    timestamp=timestamp,
+                    expected_cameras=list(expected),
+                )
+                self._next_part_id += 1
+                pending.append(part)
+
+            part.results[camera_id] = circles
+
+            if part.complete:
+                pending.remove(part)
+                finished.append(part)
+
+            return finished
+
+    def flush(self, now: Optional[datetime] = None) -> List[PartResult]:
+        """
+        Emit pending parts
+
+        Args:
+            now: Only emit parts whose merge window expired before this time,
+                 or all pending parts when None
+        """
+        with self._lock:
+            if now is not None:
+                return self._expire(now)
+
+            finished = [p for parts in self._pending.values() for p in parts]
+            self._pending.clear()
+            return sorted(finished, key=lambda p: p.part_id)
+
+    def _expire(self, now: datetime) -> List[PartResult]:
+        """Remove and return parts older than the merge window. Caller holds lock."""
+        expired: List[PartResult] = []
+        for parts in self._pending.values():
+            while parts and (now - parts[0].timestamp).total_seconds() > self._window_s:
+                expired.append(parts.pop(0))
+        return sorted(expired, key=lambda p: p.part_id)
+
+
+class CameraManager:
+    """
+    Runs N cameras, each with its own detector, visualizer, recipe and
+    ThreadManager, optionally sharing one detection worker pool.
+
+    Results are published to AppCore keyed by camera ID. Cameras assigned to
+    the same part group are merged into PartResult objects, published as
+    EventType.PART_COMPLETE.
+
+    Overlays are drawn by the web dashboard: frames are published clean,
+    tagged with their sequence number, and the circle geometry of each frame
+    is published as an OverlayFrame (EventType.OVERLAY_UPDATE).
+    """
+
+    def __init__(
+        self,
+        app_core: Optional[AppCore] = None,
+        worker_count: Optional[int] = None,
+        merge_window_ms: float = 200.0,
+        server_overlay: bool = False,
+    ):
+        """
+        Args:
+            app_core: AppCore to publish frames/results to (None to disable)
+            worker_count: Size of a detection pool shared by all cameras,
+                          or None for one processing thread per camera
+            merge_window_ms: Max time between camera results of the same part
+            server_overlay: Also draw overlays into the display frame
+                            (CircleVisualizer.draw on every frame)
+        """
+        self._app_core = app_core
+        self._server_overlay = server_overlay
+        self._stations: Dict[str, CameraStation] = {}
+        self._lock = threading.Lock()
+        self._merger = PartResultMerger(merge_window_ms)
+        self._on_part: Optional[Callable[[PartResult], None]] = None
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if worker_count:
+            self._executor = ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="DetectionWorker")
+
+    @property
+    def camera_ids(self) -> List[str]:
+        """Get IDs of all managed cameras"""
+        with self._lock:
+            return list(self._stations.keys())
+
+    @property
+    def stations(self) -> List[CameraStation]:
+        """Get all camera stations"""
+        with self._lock:
+            return list(self._stations.values())
+
+    @property
+    def uses_shared_pool(self) -> bool:
+        """Check if cameras share a detection worker pool"""
+        return self._executor is not None
+
+    def get_station(self, camera_id: str) -> Optional[CameraStation]:
+        """Get camera station by ID"""
+        with self._lock:
+            return self._stations.get(camera_id)
+
+    def set_part_callback(self, callback: Callable[[PartResult], None]) -> None:
+        """Set callback for merged part results"""
+        self._on_part = callback
+
+    def add_camera(
+        self,
+        camera_id: str,
+        camera: Union[BaslerGigECamera, VirtualCamera],
+        recipe: Optional[Recipe] = None,
+        part_group: Optional[str] = None,
+        device_index: int = 0,
+    ) -> CameraStation:
+        """
+        Add a camera with its own pipeline
+
+        Args:
+            camera_id: Unique camera ID (used as key in AppCore, API and stream)
+            camera: Camera backend instance
+            recipe: Optional recipe to apply to this camera's pipeline
+            part_group: Cameras with the same group inspect the same part
+            device_index: Device index passed to camera.connect()
+
+        Returns:
+            The created CameraStation
+        """
+        with self._lock:
+            if camera_id in self._stations:
+                raise ValueError(f"Camera already added: {camera_id}")
+
+        detector = CircleDetector()
+        visualizer = CircleVisualizer()
+        thread_manager = ThreadManager(camera, detector, visualizer, executor=self._executor, name=camera_id)
+        thread_manager.set_render_overlay(self._server_overlay)
+        station = CameraStation(
+            camera_id=camera_id,
+            camera=camera,
+            detector=detector,
+            visualizer=visualizer,
+            thread_manager=thread_manager,
+            device_index=device_index,
+            part_group=part_group,
+        )
+        thread_manager.set_result_callback(lambda result: self._on_station_result(station, result))
+
+        with self._lock:
+            self._stations[camera_id] = station
+            self._update_part_groups()
+
+        if self._app_core:
+            self._app_core.register_camera(camera_id, part_group)
+
+        if recipe:
+            self.apply_recipe(camera_id, recipe)
+
+        logger.info(f"Camera added: {camera_id} (group={part_group})")
+        return station
+
+    def remove_camera(self, camera_id: str) -> None:
+        """Stop, disconnect and remove a camera"""
+        with self._lock:
+            station = self._stations.pop(camera_id, None)
+            self._update_part_groups()
+
+        if station is None:
+            return
+
+        station.thread_manager.stop()
+        station.camera.disconnect()
+
+        if self._app_core:
+            self._app_core.unregister_camera(camera_id)
+
+        logger.info(f"Camera removed: {camera_id}")
+
+    def apply_recipe(self, camera_id: str, recipe: Recipe) -> None:
+        """
+        Apply a recipe to one camera's pipeline
+
+        Args:
+            camera_id: Camera ID
+            recipe: Recipe to apply
+        """
+        station = self.get_station(camera_id)
+        if station is None:
+            raise KeyError(camera_id)
+
+        # Copy so cameras sharing a recipe never share mutable config
+        detection_config = replace(recipe.detection_config, pixel_to_mm=recipe.pixel_to_mm)
+        station.detector.update_config(detection_config)
+        station.visualizer.update_config(detection_config)
+        station.thread_manager.set_tolerance_config(replace(recipe.tolerance_config))
+        station.recipe = recipe
+
+        # Only features that differ from the camera's cached state are written
+        if recipe.camera_config is not None and station.camera.is_connected:
+            station.camera.apply_settings(recipe.camera_config)
+
+        if self._app_core:
+            self._app_core.update_camera_state(camera_id, current_recipe=recipe.name)
+
+        logger.info(f"Recipe applied to {camera_id}: {recipe.name}")
+
+    def connect(self, camera_id: Optional[str] = None, exposure_us: float = 50.0) -> Dict[str, bool]:
+        """
+        Connect cameras
+
+        Args:
+            camera_id: Camera to connect, or None for all
+            exposure_us: Initial exposure time
+
+        Returns:
+            Connection result per camera ID
+        """
+        results = {}
+        for station in self._select(camera_id):
+            ok = station.camera.connect(station.device_index, exposure_us)
+            results[station.camera_id] = ok
+            if self._app_core:
+                self._app_core.update_camera_state(station.camera_id, connected=ok)
+        return results
+
+    def start(self, camera_id: Optional[str] = None) -> None:
+        """Start acquisition and processing of one or all cameras"""
+        for station in self._select(camera_id):
+            station._fps_count = 0
+            station._fps_start = time.perf_counter()
+            station.thread_manager.start()
+            if self._app_core:
+                self._app_core.update_camera_state(station.camera_id, is_running=True)
+
+    def stop(self, camera_id: Optional[str] = None) -> None:
+        """Stop acquisition and processing of one or all cameras"""
+        for station in self._select(camera_id):
+            station.thread_manager.stop()
+            if self._app_core:
+                self._app_core.update_camera_state(station.camera_id, is_running=False)
+
+        if camera_id is None:
+            for part in self._merger.flush():
+                self._emit_part(part)
+
+    def shutdown(self) -> None:
+        """Stop and disconnect all cameras and release the worker pool"""
+        self.stop()
+        for station in self.stations:
+            station.camera.disconnect()
+            if self._app_core:
+                self._app_core.update_camera_state(station.camera_id, connected=False)
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def get_result(self, camera_id: str, timeout: float = 0.1) -> Optional[ProcessResult]:
+        """Get latest processing result of a camera"""
+        station = self.get_station(camera_id)
+        if station is None:
+            return None
+        return station.thread_manager.get_result(timeout=timeout)
+
+    def _select(self, camera_id: Optional[str]) -> List[CameraStation]:
+        """Select one station by ID, or all stations"""
+        if camera_id is None:
+            return self.stations
+        station = self.get_station(camera_id)
+        if station is None:
+            raise KeyError(camera_id)
+        return [station]
+
+    def _update_part_groups(self) -> None:
+        """Recompute camera lists of part groups. Caller holds lock."""
+        groups: Dict[str, List[str]] = {}
+        for station in self._stations.values():
+            if station.part_group:
+                groups.setdefault(station.part_group, []).append(station.camera_id)
+
+        for group in self._merger.part_groups:
+            if group not in groups:
+                self._merger.set_group(group, [])
+        for group, camera_ids in groups.items():
+            self._merger.set_group(group, camera_ids)
+
+    def _on_station_result(self, station: CameraStation, result: ProcessResult) -> None:
+        """Handle a processing result (called on the processing/worker thread)"""
+        self._update_fps(station)
+
+        if self._app_core:
+            self._app_core.set_frames(
+                result.frame, result.display_frame, camera_id=station.camera_id, frame_seq=result.frame_seq
+            )
+            height, width = result.frame.shape[:2]
+            self._app_core.publish(
+                EventType.OVERLAY_UPDATE,
+                OverlayFrame(station.camera_id, result.frame_seq, width, height, result.circles),
+                key=station.camera_id,
+            )
+            self._app_core.set_latest_result(result.circles, station.camera_id)
+
+        if station.part_group:
+            for part in self._merger.add_result(
+                station.part_group, station.camera_id, result.circles, result.timestamp
+            ):
+                self._emit_part(part)
+
+    def _update_fps(self, station: CameraStation) -> None:
+        """Update per-camera FPS once per second"""
+        station._fps_count += 1
+        now = time.perf_counter()
+        elapsed = now - station._fps_start
+        if elapsed >= 1.0:
+            station.fps = station._fps_count / elapsed
+            station._fps_count = 0
+            station._fps_start = now
+            if self._app_core:
+                self._app_core.update_camera_state(station.camera_id, fps=station.fps)
+
+    def _emit_part(self, part: PartResult) -> None:
+        """Publish a merged part result"""
+        if not part.complete:
+            missing = [c for c in part.expected_cameras if c not in part.results]
+            logger.warning(f"Part {part.part_id} ({part.part_group}) incomplete, missing: {missing}")
+
+        if self._app_core:
+            self._app_core.publish(EventType.PART_COMPLETE, part)
+
+        if self._on_part:
+            try:
+                self._on_part(part)
+            except Exception as e:
+                logger.error(f"Part callback error: {e}")
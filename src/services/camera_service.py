@@ -1,10 +1,16 @@
 """Camera Service - Basler GigE Camera Management"""
 
 import logging
+import threading
+import time
+from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 
 import numpy as np
 
+from ..core.metrics import get_registry
+from ..domain.config import CameraConfig
+
 try:
     from pypylon import pylon
 
@@ -23,11 +29,172 @@ class TriggerMode:
     HARDWARE = "hardware"
 
 
+@dataclass
+class FeatureWriteReport:
+    """Outcome of applying a set of camera features"""
+
+    written: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)  # Feature -> error
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """True if every feature has its target value"""
+        return not self.failed
+
+
+class CameraNodeMap:
+    """Cached view of a camera's GenICam features
+
+    Every feature access over GigE is a network round trip. Node lookups
+    (including the SFNC 1.x alias, e.g. ExposureTimeAbs) are resolved once
+    per connection, and the last value written to or read from each feature
+    is kept, so apply() writes only the features that differ from the
+    target, in dependency-safe order. Values written by other programs
+    (e.g. pylon Viewer) are not seen until invalidate().
+    """
+
+    # Write order: automatic modes before their values, trigger source before enabling the trigger
+    FEATURE_ORDER = (
+        "ExposureAuto",
+        "ExposureTime",
+        "GainAuto",
+        "Gain",
+        "TriggerSelector",
+        "TriggerSource",
+        "TriggerActivation",
+        "TriggerMode",
+    )
+
+    # Node names per feature, SFNC 2.0 name first
+    FEATURE_ALIASES = {
+        "ExposureTime": ("ExposureTime", "ExposureTimeAbs"),
+        "Gain": ("Gain", "GainAbs"),
+    }
+
+    def __init__(self, camera: Any):
+        self._camera = camera
+        self._nodes: Dict[str, Optional[Any]] = {}
+        self._values: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+        registry = get_registry()
+        self._apply_time = registry.histogram("camera_feature_apply_seconds", "Time to apply a set of camera features")
+        writes = registry.counter("camera_feature_writes_total", "Camera feature writes by outcome", ("result",))
+        self._written_metric = writes.labels(result="written")
+        self._unchanged_metric = writes.labels(result="unchanged")
+        self._failed_metric = writes.labels(result="failed")
+
+    def node(self, feature: str) -> Optional[Any]:
+        """Node of a feature (None if the camera doesn't have it)"""
+        if feature not in self._nodes:
+            node = None
+            for name in self.FEATURE_ALIASES.get(feature, (feature,)):
+                node = getattr(self._camera, name, None)
+                if node is not None:
+                    break
+            self._nodes[feature] = node
+        return self._nodes[feature]
+
+    def has(self, feature: str) -> bool:
+        """Check if the camera has a feature"""
+        return self.node(feature) is not None
+
+    def get(self, feature: str) -> Any:
+        """Value of a feature (cached; read from the camera on first use)"""
+        with self._lock:
+            if feature in self._values:
+                return self._values[feature]
+            node = self.node(feature)
+            if node is None:
+                return None
+            value = node.GetValue()
+            self._values[feature] = value
+            return value
+
+    def set(self, feature: str, value: Any) -> bool:
+        """
+        Write one feature unless it already has the value
+
+        Returns:
+            True if written, False if unchanged
+
+        Raises:
+            RuntimeError: If the camera lacks the feature or rejected the value
+        """
+        report = self.apply({feature: value})
+        if not report.ok:
+            raise RuntimeError(report.failed[feature])
+        return bool(report.written)
+
+    def apply(self, features: Dict[str, Any]) -> FeatureWriteReport:
+        """
+        Write the features that differ from the cached values
+
+        Features not in FEATURE_ORDER are written last, in the given order.
+        Turning the trigger off is written first so no frame is triggered
+        from a half-configured source.
+
+        Args:
+            features: Target value per feature name
+
+        Returns:
+            Features written, unchanged and failed, with the batch time
+        """
+        order = {name: i for i, name in enumerate(self.FEATURE_ORDER)}
+        names = sorted(features, key=lambda name: order.get(name, len(order)))
+        if features.get("TriggerMode") == "Off":
+            names.remove("TriggerMode")
+            names.insert(0, "TriggerMode")
+
+        report = FeatureWriteReport()
+        start = time.perf_counter()
+        with self._lock:
+            for name in names:
+                value = features[name]
+                if name in self._values and self._values[name] == value:
+                    report.unchanged.append(name)
+                    continue
+
+                node = self.node(name)
+                if node is None:
+                    report.failed[name] = f"Camera has no feature {name}"
+                    continue
+                try:
+                    node.SetValue(value)
+                except Exception as e:
+                    # Unknown state after a failed write: read it again next time
+                    self._values.pop(name, None)
+                    report.failed[name] = str(e)
+                    continue
+                self._values[name] = value
+                report.written.append(name)
+
+        elapsed = time.perf_counter() - start
+        report.elapsed_ms = elapsed * 1000
+        self._apply_time.observe(elapsed)
+        self._written_metric.inc(len(report.written))
+        self._unchanged_metric.inc(len(report.unchanged))
+        self._failed_metric.inc(len(report.failed))
+        return report
+
+    def invalidate(self) -> None:
+        """Forget cached values (next apply writes every feature)"""
+        with self._lock:
+            self._values.clear()
+
+
 class BaslerGigECamera:
-    """Service for managing Basler GigE camera connection and frame grabbing"""
+    """Service for managing Basler GigE camera connection and frame grabbing
+
+    Features are written through a CameraNodeMap, so settings that already
+    have the requested value cost no network round trip.
+    """
 
     def __init__(self):
         self._camera: Optional[Any] = None
+        self._node_map: Optional[CameraNodeMap] = None
         self._converter: Optional[Any] = None
         self._is_connected: bool = False
         self._is_grabbing: bool = False
@@ -59,6 +226,18 @@ class BaslerGigECamera:
         """Get current trigger mode"""
         return self._trigger_mode
 
+    @property
+    def node_map(self) -> Optional[CameraNodeMap]:
+        """Cached feature view of the connected camera"""
+        return self._node_map
+
+    @staticmethod
+    def trigger_features(mode: str) -> Dict[str, Any]:
+        """GenICam features of a trigger mode"""
+        if mode == TriggerMode.HARDWARE:
+            return {"TriggerSource": "Line1", "TriggerActivation": "RisingEdge", "TriggerMode": "On"}
+        return {"TriggerMode": "Off"}
+
     @staticmethod
     def list_devices() -> List[Dict[str, Any]]:
         """List all available Basler GigE cameras"""
@@ -118,6 +297,7 @@ class BaslerGigECamera:
 
             self._camera = pylon.InstantCamera(tlFactory.CreateDevice(devices[device_index]))
             self._camera.Open()
+            self._node_map = CameraNodeMap(self._camera)
 
             # Store device info
             self._device_info = {
@@ -136,6 +316,7 @@ class BaslerGigECamera:
         except Exception as e:
             logger.error(f"Failed to connect to camera: {e}")
             self._camera = None
+            self._node_map = None
             self._is_connected = False
             return False
 
@@ -144,21 +325,46 @@ class BaslerGigECamera:
         if not self._camera:
             return
 
-        try:
-            # Set exposure time
-            if hasattr(self._camera, "ExposureTimeAbs"):
-                self._camera.ExposureTimeAbs.SetValue(exposure_us)
-            elif hasattr(self._camera, "ExposureTime"):
-                self._camera.ExposureTime.SetValue(exposure_us)
-
-            # Set software trigger mode by default
-            self._camera.TriggerMode.SetValue("Off")
+        # Exposure time and software trigger mode by default
+        features = {"ExposureTime": exposure_us, **self.trigger_features(TriggerMode.SOFTWARE)}
+        report = self._node_map.apply(features)
+        if report.ok:
             self._trigger_mode = TriggerMode.SOFTWARE
-
             logger.info(f"Camera configured: exposure={exposure_us}us, trigger=software")
+        else:
+            logger.warning(f"Error configuring camera: {report.failed}")
 
-        except Exception as e:
-            logger.warning(f"Error configuring camera: {e}")
+    def apply_settings(self, config: CameraConfig) -> Optional[FeatureWriteReport]:
+        """
+        Apply a recipe's camera settings, writing only the features that changed
+
+        Args:
+            config: Target camera settings (gain_db None: gain unchanged)
+
+        Returns:
+            Features written, unchanged and failed, or None if not connected
+        """
+        if not self._node_map or not self._is_connected:
+            logger.warning("Cannot apply camera settings - camera not connected")
+            return None
+
+        features: Dict[str, Any] = {"ExposureTime": config.default_exposure_us}
+        if config.gain_db is not None:
+            features["Gain"] = config.gain_db
+        features.update(self.trigger_features(config.trigger_mode))
+
+        report = self._node_map.apply(features)
+        if "TriggerMode" not in report.failed:
+            hardware = config.trigger_mode == TriggerMode.HARDWARE
+            self._trigger_mode = TriggerMode.HARDWARE if hardware else TriggerMode.SOFTWARE
+        if report.ok:
+            logger.info(
+                f"Camera settings applied: {len(report.written)} written, "
+                f"{len(report.unchanged)} unchanged in {report.elapsed_ms:.1f} ms"
+            )
+        else:
+            logger.error(f"Failed to apply camera settings: {report.failed}")
+        return report
 
     def set_trigger_mode(self, mode: str) -> bool:
         """
@@ -174,26 +380,20 @@ class BaslerGigECamera:
             logger.warning("Cannot set trigger mode - camera not connected")
             return False
 
-        try:
-            if mode == TriggerMode.HARDWARE:
-                # Configure for hardware trigger (Line1)
-                self._camera.TriggerMode.SetValue("On")
-                self._camera.TriggerSource.SetValue("Line1")
-                self._camera.TriggerActivation.SetValue("RisingEdge")
-                self._trigger_mode = TriggerMode.HARDWARE
-                logger.info("Hardware trigger mode enabled (Line1, Rising Edge)")
-            else:
-                # Configure for continuous/software mode
-                self._camera.TriggerMode.SetValue("Off")
-                self._trigger_mode = TriggerMode.SOFTWARE
-                logger.info("Software trigger mode enabled (continuous)")
-
-            return True
-
-        except Exception as e:
-            logger.error(f"Failed to set trigger mode: {e}")
+        # Hardware: Line1, rising edge; software: continuous
+        report = self._node_map.apply(self.trigger_features(mode))
+        if not report.ok:
+            logger.error(f"Failed to set trigger mode: {report.failed}")
             return False
 
+        if mode == TriggerMode.HARDWARE:
+            self._trigger_mode = TriggerMode.HARDWARE
+            logger.info("Hardware trigger mode enabled (Line1, Rising Edge)")
+        else:
+            self._trigger_mode = TriggerMode.SOFTWARE
+            logger.info("Software trigger mode enabled (continuous)")
+        return True
+
     def execute_software_trigger(self) -> bool:
         """
         Execute a software trigger (for testing in hardware trigger mode)
@@ -207,10 +407,10 @@ class BaslerGigECamera:
         try:
             if self._trigger_mode == TriggerMode.HARDWARE:
                 # Temporarily switch to software trigger for single shot
-                self._camera.TriggerSource.SetValue("Software")
+                self._node_map.set("TriggerSource", "Software")
                 self._camera.TriggerSoftware.Execute()
                 # Switch back to hardware trigger
-                self._camera.TriggerSource.SetValue("Line1")
+                self._node_map.set("TriggerSource", "Line1")
             logger.debug("Software trigger executed")
             return True
         except Exception as e:
@@ -229,6 +429,7 @@ class BaslerGigECamera:
                 logger.error(f"Error disconnecting camera: {e}")
             finally:
                 self._camera = None
+                self._node_map = None
                 self._is_connected = False
                 self._device_info = None
 
@@ -303,11 +504,8 @@ class BaslerGigECamera:
             return
 
         try:
-            if hasattr(self._camera, "ExposureTimeAbs"):
-                self._camera.ExposureTimeAbs.SetValue(exposure_us)
-            elif hasattr(self._camera, "ExposureTime"):
-                self._camera.ExposureTime.SetValue(exposure_us)
-            logger.info(f"Exposure set to {exposure_us}us")
+            if self._node_map.set("ExposureTime", exposure_us):
+                logger.info(f"Exposure set to {exposure_us}us")
         except Exception as e:
             logger.error(f"Failed to set exposure: {e}")
 
@@ -318,13 +516,12 @@ class BaslerGigECamera:
 
         info = {"connected": True, **self._device_info}
 
-        if self._camera:
+        if self._node_map:
             try:
-                if hasattr(self._camera, "ExposureTimeAbs"):
-                    info["exposure_us"] = self._camera.ExposureTimeAbs.GetValue()
-                elif hasattr(self._camera, "ExposureTime"):
-                    info["exposure_us"] = self._camera.ExposureTime.GetValue()
-            except:
+                exposure_us = self._node_map.get("ExposureTime")
+                if exposure_us is not None:
+                    info["exposure_us"] = exposure_us
+            except Exception:
                 pass
 
         return info
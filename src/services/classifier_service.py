@@ -0,0 +1,166 @@
+"""Classifier Service - Vectorized OK/NG classification of detected circles"""
+
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..domain.config import ToleranceConfig
+from ..domain.entities import CircleResult
+from ..domain.enums import MeasureStatus
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ClassificationResult:
+    """Per-criterion pass masks of one frame, in circle order"""
+
+    diameter_ok: np.ndarray
+    circularity_ok: np.ndarray
+    position_ok: np.ndarray
+
+    @property
+    def ok(self) -> np.ndarray:
+        """Circles passing every criterion"""
+        return self.diameter_ok & self.circularity_ok & self.position_ok
+
+    @property
+    def statuses(self) -> List[MeasureStatus]:
+        """OK/NG status per circle"""
+        return [MeasureStatus.OK if ok else MeasureStatus.NG for ok in self.ok.tolist()]
+
+
+class _HoleTable:
+    """Per-hole limits of a tolerance config as sorted arrays"""
+
+    def __init__(self, tolerance: ToleranceConfig):
+        holes = sorted(tolerance.holes, key=lambda hole: hole.hole_id)
+        self.ids = np.array([hole.hole_id for hole in holes], dtype=np.int64)
+
+        def values(name: str, default: float) -> np.ndarray:
+            return np.array(
+                [default if getattr(hole, name) is None else getattr(hole, name) for hole in holes], dtype=np.float64
+            )
+
+        self.nominal = values("nominal_mm", tolerance.nominal_mm)
+        self.tolerance = values("tolerance_mm", tolerance.tolerance_mm)
+        self.x = values("x_px", np.nan)
+        self.y = values("y_px", np.nan)
+
+
+class CircleClassifier:
+    """Classify all circles of a frame against a recipe's tolerances
+
+    Diameter, circularity and center of every circle are gathered into
+    arrays and checked with NumPy in one pass. Per-hole nominal/tolerance
+    overrides and expected positions (ToleranceConfig.holes) are looked up
+    from a table built once per tolerance config.
+    """
+
+    def __init__(self, tolerance: Optional[ToleranceConfig] = None):
+        self._tolerance = tolerance or ToleranceConfig()
+        self._table: Optional[_HoleTable] = None
+        self._table_key: Optional[Tuple] = None
+
+    @property
+    def config(self) -> ToleranceConfig:
+        """Current tolerance config"""
+        return self._tolerance
+
+    def update_config(self, tolerance: ToleranceConfig) -> None:
+        """Update tolerance config"""
+        self._tolerance = tolerance
+
+    def prepare(self) -> None:
+        """Build the per-hole table now instead of on the first frame"""
+        if self._tolerance.holes:
+            self._hole_table(self._tolerance)
+
+    def classify(
+        self, circles: List[CircleResult], tolerance: Optional[ToleranceConfig] = None
+    ) -> Optional[ClassificationResult]:
+        """
+        Evaluate circles without changing them
+
+        Args:
+            circles: Circles of one frame
+            tolerance: Tolerance to check against (default: current config)
+
+        Returns:
+            Pass masks per criterion, or None if tolerance checking is disabled
+        """
+        tolerance = tolerance or self._tolerance
+        if not tolerance.enabled:
+            return None
+
+        count = len(circles)
+        diameter = np.fromiter((c.diameter_mm for c in circles), dtype=np.float64, count=count)
+        nominal = np.full(count, tolerance.nominal_mm)
+        limit = np.full(count, tolerance.tolerance_mm)
+        expected_x = np.full(count, np.nan)
+        expected_y = np.full(count, np.nan)
+
+        if tolerance.holes and count:
+            table = self._hole_table(tolerance)
+            hole_ids = np.fromiter((c.hole_id for c in circles), dtype=np.int64, count=count)
+            index = np.minimum(np.searchsorted(table.ids, hole_ids), len(table.ids) - 1)
+            matched = table.ids[index] == hole_ids
+            nominal = np.where(matched, table.nominal[index], nominal)
+            limit = np.where(matched, table.tolerance[index], limit)
+            expected_x = np.where(matched, table.x[index], np.nan)
+            expected_y = np.where(matched, table.y[index], np.nan)
+
+        # Same bounds as ToleranceConfig.check
+        diameter_ok = (diameter >= nominal - limit) & (diameter <= nominal + limit)
+
+        if tolerance.min_circularity > 0:
+            circularity = np.fromiter((c.circularity for c in circles), dtype=np.float64, count=count)
+            circularity_ok = circularity >= tolerance.min_circularity
+        else:
+            circularity_ok = np.ones(count, dtype=bool)
+
+        if tolerance.position_tolerance_px > 0:
+            center_x = np.fromiter((c.center_x for c in circles), dtype=np.float64, count=count)
+            center_y = np.fromiter((c.center_y for c in circles), dtype=np.float64, count=count)
+            offset = np.hypot(center_x - expected_x, center_y - expected_y)
+            # Holes without an expected position always pass
+            position_ok = np.isnan(offset) | (offset <= tolerance.position_tolerance_px)
+        else:
+            position_ok = np.ones(count, dtype=bool)
+
+        return ClassificationResult(diameter_ok, circularity_ok, position_ok)
+
+    def apply(
+        self, circles: List[CircleResult], tolerance: Optional[ToleranceConfig] = None
+    ) -> Optional[ClassificationResult]:
+        """
+        Classify circles and set their status
+
+        Circles keep the detector's status when tolerance checking is disabled.
+
+        Args:
+            circles: Circles of one frame (status updated in place)
+            tolerance: Tolerance to check against (default: current config)
+
+        Returns:
+            Pass masks per criterion, or None if tolerance checking is disabled
+        """
+        result = self.classify(circles, tolerance)
+        if result is not None:
+            for circle, status in zip(circles, result.statuses):
+                circle.status = status
+        return result
+
+    def _hole_table(self, tolerance: ToleranceConfig) -> _HoleTable:
+        """Get the per-hole table, rebuilt when the config's values changed"""
+        key = (
+            tolerance.nominal_mm,
+            tolerance.tolerance_mm,
+            tuple((h.hole_id, h.nominal_mm, h.tolerance_mm, h.x_px, h.y_px) for h in tolerance.holes),
+        )
+        if self._table is None or key != self._table_key:
+            self._table = _HoleTable(tolerance)
+            self._table_key = key
+        return self._table
@@ -7,18 +7,26 @@ from typing import List, Tuple, Optional
 import cv2
 import numpy as np
 
+from ..core.tracing import get_tracer
 from ..domain.entities import CircleResult
 from ..domain.enums import MeasureStatus
 from ..domain.config import DetectionConfig
+from .calibration_service import ScaleField
 
 logger = logging.getLogger(__name__)
 
 
 class CircleDetector:
-    """Service for automatic circle detection in images"""
+    """Service for automatic circle detection in images
 
-    def __init__(self, config: Optional[DetectionConfig] = None):
+    With a ScaleField, millimeter sizes use the local scale at each
+    circle's center (one vectorized lookup per frame) instead of the
+    uniform pixel_to_mm; the image itself is never warped.
+    """
+
+    def __init__(self, config: Optional[DetectionConfig] = None, scale_field: Optional[ScaleField] = None):
         self._config = config or DetectionConfig()
+        self._scale_field = scale_field
         self._min_area_px: float = 0
         self._max_area_px: float = 0
         self._calc_pixel_limits()
@@ -33,6 +41,21 @@ class CircleDetector:
         self._config = config
         self._calc_pixel_limits()
 
+    @property
+    def scale_field(self) -> Optional[ScaleField]:
+        """Get field correction (None: uniform pixel_to_mm)"""
+        return self._scale_field
+
+    def set_scale_field(self, scale_field: Optional[ScaleField]) -> None:
+        """Set field correction from a grid-plate calibration"""
+        self._scale_field = scale_field
+
+    def _pixel_to_mm_at(self, center_x: np.ndarray, center_y: np.ndarray) -> np.ndarray:
+        """mm per pixel at circle centers"""
+        if self._scale_field is None:
+            return np.full(len(center_x), self._config.pixel_to_mm)
+        return self._config.pixel_to_mm * self._scale_field.sample(center_x, center_y)
+
     def _calc_pixel_limits(self) -> None:
         """Calculate pixel area limits from mm diameter limits"""
         px_per_mm = 1.0 / self._config.pixel_to_mm
@@ -59,11 +82,15 @@ class CircleDetector:
         if frame is None or frame.size == 0:
             return [], np.array([])
 
+        tracer = get_tracer()
+
         # Preprocessing
-        binary = self._preprocess(frame)
+        with tracer.span("preprocess"):
+            binary = self._preprocess(frame)
 
         # Find and filter circles
-        circles = self._find_circles(binary, frame.shape[:2])
+        with tracer.span("contours"):
+            circles = self._find_circles(binary, frame.shape[:2])
 
         return circles, binary
 
@@ -106,12 +133,12 @@ class CircleDetector:
             List of CircleResult
         """
         height, width = image_shape
-        circles: List[CircleResult] = []
+        # (cx, cy, radius, area_px, circularity) of accepted contours
+        found: List[Tuple[float, float, float, float, float]] = []
 
         # Find contours
         contours, _ = cv2.findContours(binary, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
 
-        hole_id = 0
         for contour in contours:
             # Calculate contour properties
             area = cv2.contourArea(contour)
@@ -145,23 +172,27 @@ class CircleDetector:
             ):
                 continue
 
-            # Calculate measurements
-            hole_id += 1
-            diameter_px = 2 * radius
-            diameter_mm = diameter_px * self._config.pixel_to_mm
-            area_mm2 = area * (self._config.pixel_to_mm**2)
+            found.append((cx, cy, radius, area, circularity))
+
+        # Calculate measurements with the scale at each center
+        values = np.array(found, dtype=np.float64).reshape(-1, 5)
+        scale = self._pixel_to_mm_at(values[:, 0], values[:, 1])
+        diameter_mm = 2 * values[:, 2] * scale
+        area_mm2 = values[:, 3] * scale**2
 
-            circle = CircleResult(
-                hole_id=hole_id,
+        circles = [
+            CircleResult(
+                hole_id=i + 1,
                 center_x=cx,
                 center_y=cy,
                 radius=radius,
-                diameter_mm=diameter_mm,
+                diameter_mm=float(diameter_mm[i]),
                 circularity=circularity,
-                area_mm2=area_mm2,
+                area_mm2=float(area_mm2[i]),
                 status=MeasureStatus.OK,
             )
-            circles.append(circle)
+            for i, (cx, cy, radius, _, circularity) in enumerate(found)
+        ]
 
         logger.debug(f"Detected {len(circles)} circle(s)")
         return circles
@@ -199,9 +230,11 @@ class CircleDetector:
 
         circles: List[CircleResult] = []
         if hough_circles is not None:
-            for i, (x, y, r) in enumerate(hough_circles[0]):
-                diameter_mm = 2 * r * self._config.pixel_to_mm
-                area_mm2 = math.pi * (r**2) * (self._config.pixel_to_mm**2)
+            found = hough_circles[0].astype(np.float64)
+            scale = self._pixel_to_mm_at(found[:, 0], found[:, 1])
+            for i, (x, y, r) in enumerate(found):
+                diameter_mm = float(2 * r * scale[i])
+                area_mm2 = float(math.pi * (r**2) * (scale[i] ** 2))
 
                 circle = CircleResult(
                     hole_id=i + 1,
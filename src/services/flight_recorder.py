@@ -0,0 +1,433 @@
+"""Flight Recorder - Keep recent raw frames and dump them around events"""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Union
+
+import cv2
+import numpy as np
+
+from ..core import AppCore, EventType, get_registry
+from ..domain.entities import CircleResult
+from ..domain.enums import MeasureStatus
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class _RecordedFrame:
+    """One frame in the ring (raw/downsampled array or JPEG bytes)"""
+
+    data: Union[np.ndarray, bytes]
+    nbytes: int
+    frame_seq: Optional[int]
+    monotonic: float
+    wall_time: float
+    pins: int = 0  # Dumps still holding this frame
+    in_ring: bool = True
+
+
+@dataclass
+class _Dump:
+    """A pending dump: event time and window"""
+
+    reason: str
+    event_time: float
+    wall_time: float
+    pre_seconds: float
+    post_seconds: float
+    frames: List[_RecordedFrame] = field(default_factory=list)
+    path: Optional[Path] = None
+
+
+class FlightRecorder:
+    """Ring of the last few seconds of raw frames, dumped to disk on events
+
+    record() is called on the camera thread and only hands the frame over
+    by reference (O(1), never blocks); a recorder thread downsamples or
+    JPEG-compresses it into the ring. trigger() marks an event; once the
+    post-event window has passed, the frames around it are written to a
+    dump directory by a separate writer thread.
+
+    Memory is capped at max_bytes for the ring plus frames still held by
+    pending dumps; when the cap is reached, the oldest frames are evicted,
+    and incoming frames are dropped if dumps hold the whole budget.
+    """
+
+    DEFAULT_DUMP_DIR = "output/flight_recorder"
+
+    def __init__(
+        self,
+        seconds: float = 5.0,
+        max_bytes: int = 512 * 1024 * 1024,
+        downsample: int = 1,
+        jpeg_quality: Optional[int] = None,
+        pre_seconds: Optional[float] = None,
+        post_seconds: float = 1.0,
+        max_pending_dumps: int = 2,
+        dump_dir: Optional[str] = None,
+        camera_id: str = "default",
+    ):
+        """
+        Initialize recorder
+
+        Args:
+            seconds: Time span of frames kept in the ring
+            max_bytes: Memory cap of recorded frames
+            downsample: Keep every frame at 1/downsample resolution (1: full size)
+            jpeg_quality: Store frames JPEG-compressed at this quality (None: raw arrays)
+            pre_seconds: Default time before an event to dump (default: seconds)
+            post_seconds: Default time after an event to dump
+            max_pending_dumps: Dumps waiting or writing; further triggers are dropped
+            dump_dir: Output directory of dumps
+            camera_id: Camera the frames come from (written to the manifest)
+        """
+        self._seconds = seconds
+        self._max_bytes = max_bytes
+        self._downsample = max(int(downsample), 1)
+        self._jpeg_quality = jpeg_quality
+        self._pre_seconds = seconds if pre_seconds is None else min(pre_seconds, seconds)
+        self._post_seconds = post_seconds
+        self._max_pending_dumps = max(max_pending_dumps, 1)
+        self._dump_dir = Path(dump_dir or self.DEFAULT_DUMP_DIR)
+        self._camera_id = camera_id
+
+        self._cond = threading.Condition()
+        self._inbox: Deque[tuple] = deque()
+        self._ring: Deque[_RecordedFrame] = deque()
+        self._ring_bytes = 0
+        self._pinned_bytes = 0  # Evicted from the ring but still held by dumps
+        self._dumps: List[_Dump] = []  # Waiting for the post-event window
+        self._ready: Deque[_Dump] = deque()  # Waiting for the writer
+
+        self._running = False
+        self._recording_done = False
+        self._threads: List[threading.Thread] = []
+        self._app_core: Optional[AppCore] = None
+        self._feed = False
+
+        self._recorded = 0
+        self._dropped = 0
+        self._dumps_written = 0
+        self._dumps_dropped = 0
+
+        registry = get_registry()
+        self._bytes_metric = registry.gauge(
+            "flight_recorder_bytes", "Memory held by flight recorder frames", ("camera",)
+        ).labels(camera=camera_id)
+        self._dropped_metric = registry.counter(
+            "flight_recorder_dropped_frames_total", "Frames the flight recorder could not keep", ("camera",)
+        ).labels(camera=camera_id)
+        self._dumps_metric = registry.counter(
+            "flight_recorder_dumps_total", "Flight recorder dumps by outcome", ("camera", "outcome")
+        )
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the recorder threads are running"""
+        return self._running
+
+    @property
+    def dump_dir(self) -> Path:
+        """Output directory of dumps"""
+        return self._dump_dir
+
+    # ========== Lifecycle ==========
+
+    def start(self) -> None:
+        """Start the recorder and dump writer threads"""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._recording_done = False
+
+        self._threads = [
+            threading.Thread(target=self._record_loop, name=f"FlightRecorder-{self._camera_id}", daemon=True),
+            threading.Thread(target=self._dump_loop, name=f"FlightRecorderDump-{self._camera_id}", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Flight recorder started ({self._seconds}s, {self._max_bytes} bytes max)")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write pending dumps (windows cut short at stop), then stop the threads"""
+        with self._cond:
+            if not self._running:
+                return
+            self._running = False
+            self._cond.notify_all()
+
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(timeout=max(deadline - time.monotonic(), 0))
+        self._threads = []
+
+    def attach(self, app_core: AppCore, feed: bool = True) -> None:
+        """Register as AppCore service "flight_recorder"
+
+        Args:
+            app_core: AppCore instance
+            feed: Also dump on NG results (DETECTION_COMPLETE) and SPC alarms
+                published on app_core; set False when trigger() is called directly
+        """
+        self._app_core = app_core
+        self._feed = feed
+        if feed:
+            app_core.subscribe(EventType.DETECTION_COMPLETE, self._on_detection, name="flight_recorder")
+            app_core.subscribe(EventType.SPC_VIOLATION, self._on_alarm, name="flight_recorder")
+        app_core.register_service("flight_recorder", self)
+
+    def detach(self) -> None:
+        """Stop receiving events from AppCore"""
+        if self._app_core is not None:
+            if self._feed:
+                self._app_core.unsubscribe(EventType.DETECTION_COMPLETE, self._on_detection)
+                self._app_core.unsubscribe(EventType.SPC_VIOLATION, self._on_alarm)
+            self._app_core = None
+
+    def _on_detection(self, circles: Optional[List[CircleResult]]) -> None:
+        if circles and any(c.status == MeasureStatus.NG for c in circles):
+            self.trigger("ng")
+
+    def _on_alarm(self, violation: Any) -> None:
+        self.trigger("alarm")
+
+    # ========== Recording ==========
+
+    def record(self, frame: np.ndarray, frame_seq: Optional[int] = None) -> None:
+        """Hand a frame to the recorder (by reference; must not be modified afterwards)"""
+        if not self._running:
+            return
+
+        with self._cond:
+            # The recorder thread is behind: drop the oldest handed-over frame
+            if len(self._inbox) >= 2:
+                self._inbox.popleft()
+                self._dropped += 1
+                self._dropped_metric.inc()
+            self._inbox.append((frame, frame_seq, time.monotonic(), time.time()))
+            self._cond.notify_all()
+
+    def _record_loop(self) -> None:
+        """Store handed-over frames in the ring and release dumps whose window passed"""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._inbox or self._dumps or not self._running, timeout=0.1)
+                if not self._running:
+                    self._release_dumps(force=True)
+                    self._recording_done = True
+                    self._cond.notify_all()
+                    return
+                item = self._inbox.popleft() if self._inbox else None
+
+            if item is not None:
+                frame, frame_seq, monotonic, wall_time = item
+                try:
+                    data = self._encode(frame)
+                except Exception as e:
+                    logger.error(f"Flight recorder failed to store frame: {e}")
+                    continue
+                nbytes = data.nbytes if isinstance(data, np.ndarray) else len(data)
+                self._store(_RecordedFrame(data, nbytes, frame_seq, monotonic, wall_time))
+
+            with self._cond:
+                self._release_dumps()
+
+    def _encode(self, frame: np.ndarray) -> Union[np.ndarray, bytes]:
+        """Downsample and/or compress a frame for the ring"""
+        if self._downsample > 1:
+            height, width = frame.shape[:2]
+            frame = cv2.resize(
+                frame, (width // self._downsample, height // self._downsample), interpolation=cv2.INTER_AREA
+            )
+        if self._jpeg_quality is not None:
+            ok, encoded = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, int(self._jpeg_quality)])
+            if not ok:
+                raise ValueError("JPEG encoding failed")
+            return encoded.tobytes()
+        return frame
+
+    def _store(self, recorded: _RecordedFrame) -> None:
+        """Append a frame, evicting old frames to stay within time span and memory cap"""
+        with self._cond:
+            cutoff = recorded.monotonic - self._seconds
+            while self._ring and (
+                self._ring[0].monotonic < cutoff
+                or self._ring_bytes + self._pinned_bytes + recorded.nbytes > self._max_bytes
+            ):
+                self._evict_oldest()
+
+            if self._ring_bytes + self._pinned_bytes + recorded.nbytes > self._max_bytes:
+                # Pending dumps hold the whole budget
+                self._dropped += 1
+                self._dropped_metric.inc()
+                return
+
+            self._ring.append(recorded)
+            self._ring_bytes += recorded.nbytes
+            self._recorded += 1
+            self._bytes_metric.set(self._ring_bytes + self._pinned_bytes)
+
+    def _evict_oldest(self) -> None:
+        """Remove the oldest ring frame (called with the lock held)"""
+        oldest = self._ring.popleft()
+        oldest.in_ring = False
+        self._ring_bytes -= oldest.nbytes
+        if oldest.pins:
+            self._pinned_bytes += oldest.nbytes
+
+    def _unpin(self, recorded: _RecordedFrame) -> None:
+        """Release a dump's hold on a frame (called with the lock held)"""
+        recorded.pins -= 1
+        if not recorded.pins and not recorded.in_ring:
+            self._pinned_bytes -= recorded.nbytes
+            self._bytes_metric.set(self._ring_bytes + self._pinned_bytes)
+
+    # ========== Dumps ==========
+
+    def trigger(
+        self, reason: str = "manual", pre_seconds: Optional[float] = None, post_seconds: Optional[float] = None
+    ) -> bool:
+        """Dump the frames around now once the post-event window has passed
+
+        Returns:
+            True if the dump was scheduled, False if too many dumps are pending
+        """
+        if not self._running:
+            return False
+
+        dump = _Dump(
+            reason=reason,
+            event_time=time.monotonic(),
+            wall_time=time.time(),
+            pre_seconds=self._pre_seconds if pre_seconds is None else min(pre_seconds, self._seconds),
+            post_seconds=self._post_seconds if post_seconds is None else post_seconds,
+        )
+        with self._cond:
+            if len(self._dumps) + len(self._ready) >= self._max_pending_dumps:
+                self._dumps_dropped += 1
+                self._dumps_metric.labels(camera=self._camera_id, outcome="dropped").inc()
+                logger.warning(f"Flight recorder dump '{reason}' dropped: {self._max_pending_dumps} pending")
+                return False
+
+            # Pin the frames already recorded in the window so eviction can't free them
+            start = dump.event_time - dump.pre_seconds
+            for recorded in self._ring:
+                if recorded.monotonic >= start:
+                    recorded.pins += 1
+                    dump.frames.append(recorded)
+            self._dumps.append(dump)
+            self._cond.notify_all()
+        return True
+
+    def _release_dumps(self, force: bool = False) -> None:
+        """Complete dumps whose window has passed (called with the lock held)"""
+        now = time.monotonic()
+        for dump in list(self._dumps):
+            end = dump.event_time + dump.post_seconds
+            last = dump.frames[-1].monotonic if dump.frames else dump.event_time - dump.pre_seconds
+
+            # Add frames recorded after the event so far
+            for recorded in self._ring:
+                if last < recorded.monotonic <= end:
+                    recorded.pins += 1
+                    dump.frames.append(recorded)
+
+            if force or now >= end:
+                self._dumps.remove(dump)
+                self._ready.append(dump)
+                self._cond.notify_all()
+
+    def _dump_loop(self) -> None:
+        """Write completed dumps to disk"""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._ready or self._recording_done)
+                if not self._ready:
+                    return
+                dump = self._ready[0]
+
+            self._write_dump(dump)
+
+            with self._cond:
+                self._ready.popleft()
+                for recorded in dump.frames:
+                    self._unpin(recorded)
+                self._cond.notify_all()
+
+    def _write_dump(self, dump: _Dump) -> None:
+        """Write the frames and a manifest of one dump"""
+        stamp = datetime.fromtimestamp(dump.wall_time).strftime("%Y%m%d_%H%M%S_%f")[:-3]
+        path = self._dump_dir / f"{stamp}_{dump.reason}"
+        extension = ".jpg" if self._jpeg_quality is not None else ".npy"
+
+        frames: List[Dict[str, Any]] = []
+        manifest = {
+            "reason": dump.reason,
+            "camera_id": self._camera_id,
+            "event_time": datetime.fromtimestamp(dump.wall_time).isoformat(),
+            "pre_seconds": dump.pre_seconds,
+            "post_seconds": dump.post_seconds,
+            "downsample": self._downsample,
+            "frames": frames,
+        }
+        try:
+            path.mkdir(parents=True, exist_ok=True)
+            for index, recorded in enumerate(dump.frames):
+                name = f"frame_{index:04d}{extension}"
+                if isinstance(recorded.data, np.ndarray):
+                    np.save(path / name, recorded.data, allow_pickle=False)
+                else:
+                    (path / name).write_bytes(recorded.data)
+                frames.append(
+                    {
+                        "file": name,
+                        "frame_seq": recorded.frame_seq,
+                        "offset_s": round(recorded.monotonic - dump.event_time, 6),
+                        "time": datetime.fromtimestamp(recorded.wall_time).isoformat(),
+                    }
+                )
+            with open(path / "manifest.json", "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+        except Exception as e:
+            logger.error(f"Failed to write flight recorder dump {path}: {e}")
+            self._dumps_metric.labels(camera=self._camera_id, outcome="failed").inc()
+            return
+
+        dump.path = path
+        with self._cond:
+            self._dumps_written += 1
+        self._dumps_metric.labels(camera=self._camera_id, outcome="written").inc()
+        logger.info(f"Flight recorder dump written: {path} ({len(dump.frames)} frames)")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until all triggered dumps are written
+
+        Returns:
+            True if no dump is pending within timeout
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._dumps and not self._ready, timeout=timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get recorder statistics"""
+        with self._cond:
+            span = self._ring[-1].monotonic - self._ring[0].monotonic if len(self._ring) > 1 else 0.0
+            return {
+                "frames": len(self._ring),
+                "span_s": span,
+                "bytes": self._ring_bytes + self._pinned_bytes,
+                "max_bytes": self._max_bytes,
+                "recorded": self._recorded,
+                "dropped": self._dropped,
+                "pending_dumps": len(self._dumps) + len(self._ready),
+                "dumps_written": self._dumps_written,
+                "dumps_dropped": self._dumps_dropped,
+            }
@@ -0,0 +1,447 @@
+"""Image Archive - Index of saved images with disk quota retention"""
+
+import logging
+import sqlite3
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..core import get_registry
+
+logger = logging.getLogger(__name__)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    data_path TEXT,
+    timestamp REAL NOT NULL,
+    day TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    codec TEXT,
+    size_bytes INTEGER NOT NULL,
+    frame_seq INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_images_timestamp ON images(timestamp);
+CREATE INDEX IF NOT EXISTS idx_images_frame_seq ON images(frame_seq);
+"""
+
+
+@dataclass
+class ArchivedImage:
+    """One indexed image file
+
+    Attributes:
+        id: Archive row ID (increases with save order)
+        path: Image file
+        data_path: Measurement data (JSON) saved with the image, if any
+        timestamp: Save time (epoch seconds)
+        kind: File name prefix ("NG", "IMG", ...)
+        status: Overall measurement status of the image
+        codec: ImageCodec of the file
+        size_bytes: Bytes on disk (image and data file)
+        frame_seq: Pipeline frame sequence number, if known
+    """
+
+    id: int
+    path: str
+    data_path: Optional[str]
+    timestamp: float
+    kind: str
+    status: str
+    codec: Optional[str]
+    size_bytes: int
+    frame_seq: Optional[int] = None
+
+
+class ImageArchive:
+    """SQLite index of every saved image file
+
+    Counts and byte totals per kind and day are kept in memory (loaded
+    from the index once on open), so count queries never touch the disk
+    or database and survive restarts. With a disk quota, an eviction
+    thread deletes the oldest files in small batches whenever the archive
+    grows past the quota, until it is back under low_watermark * quota.
+    """
+
+    DEFAULT_DB_NAME = "images.db"
+
+    def __init__(
+        self,
+        db_path: str,
+        quota_bytes: Optional[int] = None,
+        low_watermark: float = 0.9,
+        evict_batch: int = 50,
+    ):
+        """
+        Initialize archive
+
+        Args:
+            db_path: SQLite index file
+            quota_bytes: Maximum bytes of archived files (None: unlimited)
+            low_watermark: Eviction stops below this fraction of the quota
+            evict_batch: Files deleted per eviction step
+        """
+        self._db_path = Path(db_path)
+        self._quota_bytes = quota_bytes
+        self._low_watermark = low_watermark
+        self._evict_batch = max(evict_batch, 1)
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        # Serializes select + remove, so eviction and retention never pick the same rows
+        self._remove_lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._totals: Dict[str, int] = defaultdict(int)
+        self._total_bytes = 0
+        self._evicted = 0
+        self._next_id = 1
+        self._remove_listeners: List[Callable[[List[int]], None]] = []
+
+        self._evict_event = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        registry = get_registry()
+        self._bytes_metric = registry.gauge("image_archive_bytes", "Bytes of indexed image files")
+        self._evicted_metric = registry.counter(
+            "image_archive_evicted_total", "Image files deleted to stay within the disk quota"
+        )
+
+    @property
+    def db_path(self) -> Path:
+        """Get index file path"""
+        return self._db_path
+
+    @property
+    def quota_bytes(self) -> Optional[int]:
+        """Disk quota in bytes (None: unlimited)"""
+        return self._quota_bytes
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes of all indexed files"""
+        return self._total_bytes
+
+    # ========== Lifecycle ==========
+
+    def open(self) -> bool:
+        """Open (or create) the index, load counters and start eviction"""
+        if self._conn is not None:
+            return True
+
+        try:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._db_path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            rows = conn.execute("SELECT kind, day, COUNT(*), SUM(size_bytes) FROM images GROUP BY kind, day").fetchall()
+            max_id = conn.execute("SELECT MAX(id) FROM images").fetchone()[0]
+        except sqlite3.Error as e:
+            logger.error(f"Failed to open image archive {self._db_path}: {e}")
+            return False
+
+        with self._lock:
+            self._conn = conn
+            self._next_id = max(self._next_id, (max_id or 0) + 1)
+            for kind, day, count, size in rows:
+                self._counts[kind][day] = count
+                self._totals[kind] += count
+                self._total_bytes += size or 0
+            self._bytes_metric.set(self._total_bytes)
+
+        if self._quota_bytes is not None:
+            self._running = True
+            self._thread = threading.Thread(target=self._evict_loop, name="ImageArchiveEvictor", daemon=True)
+            self._thread.start()
+            self._evict_event.set()
+
+        logger.info(f"Image archive opened: {self._db_path} ({self.count()} files, {self._total_bytes} bytes)")
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop eviction and close the index"""
+        if self._running:
+            self._running = False
+            self._evict_event.set()
+            if self._thread is not None:
+                self._thread.join(timeout=timeout)
+                self._thread = None
+
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def add_remove_listener(self, callback: Callable[[List[int]], None]) -> None:
+        """Call callback with the IDs of removed files (to drop files derived from them)"""
+        self._remove_listeners.append(callback)
+
+    # ========== Recording ==========
+
+    def allocate_id(self) -> int:
+        """Reserve the ID of an image before it is written (to link measurements to it)"""
+        with self._lock:
+            image_id = self._next_id
+            self._next_id += 1
+            return image_id
+
+    def add(
+        self,
+        path: Path,
+        timestamp: datetime,
+        kind: str,
+        status: str,
+        codec: Optional[str] = None,
+        data_path: Optional[Path] = None,
+        frame_seq: Optional[int] = None,
+        image_id: Optional[int] = None,
+    ) -> Optional[int]:
+        """Index a written file (size is read from disk)
+
+        Args:
+            image_id: ID from allocate_id() (default: next free ID)
+
+        Returns:
+            Archive row ID, or None if the index is closed or the write failed
+        """
+        size = path.stat().st_size
+        if data_path is not None:
+            size += data_path.stat().st_size
+        day = timestamp.strftime("%Y%m%d")
+
+        with self._lock:
+            if self._conn is None:
+                return None
+            if image_id is None:
+                image_id = self._next_id
+                self._next_id += 1
+            try:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT INTO images "
+                        "(id, path, data_path, timestamp, day, kind, status, codec, size_bytes, frame_seq) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            image_id,
+                            str(path),
+                            str(data_path) if data_path is not None else None,
+                            timestamp.timestamp(),
+                            day,
+                            kind,
+                            status,
+                            codec,
+                            size,
+                            frame_seq,
+                        ),
+                    )
+            except sqlite3.Error as e:
+                logger.error(f"Failed to index {path}: {e}")
+                return None
+
+            self._counts[kind][day] += 1
+            self._totals[kind] += 1
+            self._total_bytes += size
+            self._bytes_metric.set(self._total_bytes)
+            over_quota = self._quota_bytes is not None and self._total_bytes > self._quota_bytes
+
+        if over_quota:
+            self._evict_event.set()
+        return image_id
+
+    # ========== Queries ==========
+
+    def count(self, kind: Optional[str] = None, date: Optional[datetime] = None) -> int:
+        """Number of indexed files, optionally of one kind and/or day (O(1))"""
+        with self._lock:
+            kinds = [kind] if kind is not None else list(self._totals)
+            if date is None:
+                return sum(self._totals.get(k, 0) for k in kinds)
+            day = date.strftime("%Y%m%d")
+            return sum(self._counts[k].get(day, 0) for k in kinds if k in self._counts)
+
+    def get(self, path: str) -> Optional[ArchivedImage]:
+        """Look up a file by path"""
+        rows = self._select("WHERE path = ?", (str(path),))
+        return rows[0] if rows else None
+
+    def get_by_id(self, image_id: int) -> Optional[ArchivedImage]:
+        """Look up a file by image ID"""
+        rows = self._select("WHERE id = ?", (image_id,))
+        return rows[0] if rows else None
+
+    def find_frame(self, frame_seq: int) -> List[ArchivedImage]:
+        """Files saved for a pipeline frame"""
+        return self._select("WHERE frame_seq = ? ORDER BY id", (frame_seq,))
+
+    def latest(self, limit: int = 100, kind: Optional[str] = None) -> List[ArchivedImage]:
+        """Most recently saved files, newest first"""
+        if kind is not None:
+            return self._select("WHERE kind = ? ORDER BY id DESC LIMIT ?", (kind, limit))
+        return self._select("ORDER BY id DESC LIMIT ?", (limit,))
+
+    def page(
+        self,
+        limit: int = 50,
+        offset: int = 0,
+        kind: Optional[str] = None,
+        status: Optional[str] = None,
+        date: Optional[datetime] = None,
+    ) -> Tuple[List[ArchivedImage], int]:
+        """One page of files, newest first
+
+        Returns:
+            (files of the page, number of matching files)
+        """
+        conditions = []
+        params: List[Any] = []
+        for column, value in (("kind", kind), ("status", status), ("day", date and date.strftime("%Y%m%d"))):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+
+        with self._lock:
+            if self._conn is None:
+                return [], 0
+            total = self._conn.execute(f"SELECT COUNT(*) FROM images {where}", params).fetchone()[0]
+        items = self._select(f"{where}ORDER BY id DESC LIMIT ? OFFSET ?", (*params, limit, offset))
+        return items, total
+
+    def _select(self, clause: str, params: tuple) -> List[ArchivedImage]:
+        with self._lock:
+            if self._conn is None:
+                return []
+            rows = self._conn.execute(
+                "SELECT id, path, data_path, timestamp, kind, status, codec, size_bytes, frame_seq "
+                f"FROM images {clause}",
+                params,
+            ).fetchall()
+        return [ArchivedImage(*row) for row in rows]
+
+    # ========== Retention ==========
+
+    def evict_oldest(self, limit: int) -> int:
+        """Delete up to limit oldest files and their index rows
+
+        Returns:
+            Number of files evicted
+        """
+        with self._remove_lock:
+            with self._lock:
+                if self._conn is None:
+                    return 0
+                rows = self._conn.execute(
+                    "SELECT id, path, data_path, day, kind, size_bytes FROM images ORDER BY id LIMIT ?", (limit,)
+                ).fetchall()
+            return self._remove(rows)
+
+    def remove_before(self, cutoff: datetime) -> int:
+        """Delete files saved before cutoff and their index rows
+
+        Returns:
+            Number of files removed
+        """
+        removed = 0
+        while True:
+            with self._remove_lock:
+                with self._lock:
+                    if self._conn is None:
+                        return removed
+                    rows = self._conn.execute(
+                        "SELECT id, path, data_path, day, kind, size_bytes FROM images "
+                        "WHERE timestamp < ? ORDER BY id LIMIT ?",
+                        (cutoff.timestamp(), self._evict_batch),
+                    ).fetchall()
+                count = self._remove(rows) if rows else 0
+            if not count:
+                return removed
+            removed += count
+
+    def _remove(self, rows: List[tuple]) -> int:
+        """Unlink files of index rows, then drop the rows and counters
+
+        Caller holds _remove_lock. Counters only change for rows this call
+        actually deleted.
+        """
+        directories = set()
+        for _, path, data_path, _, _, _ in rows:
+            for file_path in (path, data_path):
+                if file_path is None:
+                    continue
+                file_path = Path(file_path)
+                try:
+                    file_path.unlink(missing_ok=True)
+                except OSError as e:
+                    logger.warning(f"Failed to delete {file_path}: {e}")
+                directories.add(file_path.parent)
+
+        with self._lock:
+            if self._conn is None:
+                return 0
+            try:
+                with self._conn:
+                    deleted = [
+                        row for row in rows if self._conn.execute("DELETE FROM images WHERE id = ?", (row[0],)).rowcount
+                    ]
+            except sqlite3.Error as e:
+                logger.error(f"Failed to remove {len(rows)} archive rows: {e}")
+                return 0
+
+            for _, _, _, day, kind, size in deleted:
+                self._counts[kind][day] -= 1
+                if not self._counts[kind][day]:
+                    del self._counts[kind][day]
+                self._totals[kind] -= 1
+                self._total_bytes -= size
+            self._bytes_metric.set(self._total_bytes)
+
+        removed_ids = [row[0] for row in deleted]
+        for callback in self._remove_listeners:
+            try:
+                callback(removed_ids)
+            except Exception as e:
+                logger.error(f"Image archive remove listener failed: {e}")
+
+        # Drop emptied date directories
+        for directory in directories:
+            try:
+                directory.rmdir()
+            except OSError:
+                pass
+        return len(deleted)
+
+    def _evict_loop(self) -> None:
+        """Evict oldest files in batches while over quota"""
+        while self._running:
+            self._evict_event.wait()
+            self._evict_event.clear()
+            quota = self._quota_bytes
+            if quota is None or self._total_bytes <= quota:
+                continue
+
+            target = quota * self._low_watermark
+            while self._running and self._total_bytes > target:
+                evicted = self.evict_oldest(self._evict_batch)
+                if not evicted:
+                    break
+                self._evicted += evicted
+                self._evicted_metric.inc(evicted)
+            logger.info(f"Image archive evicted to {self._total_bytes} bytes (quota {quota})")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get archive statistics"""
+        with self._lock:
+            return {
+                "files": sum(self._totals.values()),
+                "bytes": self._total_bytes,
+                "quota_bytes": self._quota_bytes,
+                "evicted": self._evicted,
+                "by_kind": dict(self._totals),
+            }
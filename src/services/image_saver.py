@@ -1,26 +1,123 @@
 """Image Saver Service - Save NG images and measurements"""
 
+import io
 import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Callable, Deque, Dict, List, Optional
 import json
 
 import cv2
 import numpy as np
 
+from ..core import HistoryRecord, OverflowPolicy, get_registry, get_tracer
 from ..domain.entities import CircleResult
 from ..domain.enums import MeasureStatus
+from .image_archive import ImageArchive
+from .thumbnail_service import ThumbnailService
 
 logger = logging.getLogger(__name__)
 
 
+class SavePolicy:
+    """What ImageSaver does when its write queue is full"""
+
+    BLOCK = "block"  # Wait for a free slot (up to block_timeout), then drop the new image
+    DROP_NEWEST = OverflowPolicy.DROP_NEWEST  # Discard the incoming image
+    DROP_OLDEST = OverflowPolicy.DROP_OLDEST  # Discard the oldest queued image
+
+
+class ImageCodec:
+    """File format of saved images"""
+
+    JPEG = "jpeg"  # Lossy, fastest to encode and smallest
+    PNG = "png"  # Lossless; png_compression trades size for encode time
+    WEBP = "webp"  # Lossless WebP (smaller than PNG, slower to encode)
+    NPY = "npy"  # Raw NumPy array, bit-exact replay without decoding
+
+
+_EXTENSIONS = {ImageCodec.JPEG: ".jpg", ImageCodec.PNG: ".png", ImageCodec.WEBP: ".webp", ImageCodec.NPY: ".npy"}
+
+# WebP quality above 100 selects lossless compression
+_WEBP_LOSSLESS = 101
+
+
+@dataclass
+class _SaveJob:
+    """One queued image write"""
+
+    image: np.ndarray
+    image_path: Path
+    timestamp: datetime
+    kind: str
+    status: str
+    circles: Optional[List[CircleResult]] = None  # Measurement data written next to the image
+    frame_seq: Optional[int] = None
+    image_id: Optional[int] = None
+    on_done: Optional[Callable[[Optional[int]], None]] = None  # Called with the archive ID, None if lost
+    queued_at: float = 0.0
+
+
 class ImageSaver:
-    """Service for saving NG images and measurement data"""
+    """Service for saving NG images and measurement data
+
+    save_ng_image()/save_all_image() only queue the image and return its
+    path; a small pool of writer threads encodes and writes it (OpenCV
+    encoders release the GIL, so several images are encoded in parallel).
+    The ImageCodec sets the file format. Every written file is recorded in
+    an ImageArchive, which answers counts and enforces the disk quota.
+    Frames are queued by
+    reference and must not be modified afterwards; pipeline frames are
+    read-only. When the disk can't keep up, the SavePolicy decides which
+    images are lost; an on_done callback learns the outcome of each image
+    (archive ID once written, None if dropped or failed). Call flush() to
+    wait for pending writes and close() on shutdown.
+    """
 
     DEFAULT_SAVE_DIR = "output"
 
-    def __init__(self, save_dir: Optional[str] = None):
+    def __init__(
+        self,
+        save_dir: Optional[str] = None,
+        workers: int = 2,
+        max_pending: int = 4,
+        policy: str = SavePolicy.DROP_OLDEST,
+        block_timeout: float = 1.0,
+        codec: str = ImageCodec.JPEG,
+        jpeg_quality: int = 95,
+        png_compression: int = 1,
+        quota_bytes: Optional[int] = None,
+        archive: Optional[ImageArchive] = None,
+        sidecar_json: bool = True,
+        thumbnails: bool = False,
+    ):
+        """
+        Initialize saver
+
+        Args:
+            save_dir: Output directory
+            workers: Number of writer threads
+            max_pending: Queue capacity (each entry holds a full frame)
+            policy: SavePolicy applied when the queue is full
+            block_timeout: Maximum wait for a free slot with SavePolicy.BLOCK (seconds)
+            codec: ImageCodec of saved images
+            jpeg_quality: JPEG quality (0-100)
+            png_compression: PNG compression level (0-9, low is fast)
+            quota_bytes: Disk quota of saved files, oldest evicted first (None: unlimited)
+            archive: Image index to use (default: data/images.db, opened here)
+            sidecar_json: Write measurement JSON next to NG images (off when a
+                MeasurementLog records the measurements)
+            thumbnails: Generate gallery thumbnails and previews of written images
+        """
+        if policy not in (SavePolicy.BLOCK, SavePolicy.DROP_NEWEST, SavePolicy.DROP_OLDEST):
+            raise ValueError(f"Unknown save policy: {policy}")
+        if codec not in _EXTENSIONS:
+            raise ValueError(f"Unknown image codec: {codec}")
+
         self._save_dir = Path(save_dir or self.DEFAULT_SAVE_DIR)
         self._ng_dir = self._save_dir / "ng_images"
         self._data_dir = self._save_dir / "data"
@@ -29,7 +126,57 @@ class ImageSaver:
         self._ng_dir.mkdir(parents=True, exist_ok=True)
         self._data_dir.mkdir(parents=True, exist_ok=True)
 
-        self._save_count = 0
+        self._workers = max(workers, 1)
+        self._max_pending = max(max_pending, 1)
+        self._policy = policy
+        self._block_timeout = block_timeout
+        self._sidecar_json = sidecar_json
+        self._codec = codec
+        self._extension = _EXTENSIONS[codec]
+        if codec == ImageCodec.JPEG:
+            self._encode_params = [cv2.IMWRITE_JPEG_QUALITY, int(jpeg_quality)]
+        elif codec == ImageCodec.PNG:
+            self._encode_params = [cv2.IMWRITE_PNG_COMPRESSION, int(png_compression)]
+        elif codec == ImageCodec.WEBP:
+            self._encode_params = [cv2.IMWRITE_WEBP_QUALITY, _WEBP_LOSSLESS]
+        else:
+            self._encode_params = []
+
+        self._queue: Deque[_SaveJob] = deque()
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._running = False
+        self._active = 0
+        self._last_name = ""
+        self._name_repeat = 0
+
+        self._written = 0
+        self._dropped = 0
+        self._failed = 0
+        self._last_write_ms = 0.0
+        self._max_write_ms = 0.0
+        self._bytes_written = 0
+        self._encode_time_total = 0.0
+
+        if archive is None:
+            archive = ImageArchive(str(self._data_dir / ImageArchive.DEFAULT_DB_NAME), quota_bytes=quota_bytes)
+            archive.open()
+        self._archive = archive
+        self._thumbnails = ThumbnailService(archive, str(self._save_dir / "thumbnails")) if thumbnails else None
+
+        registry = get_registry()
+        self._queue_depth = registry.gauge("image_saver_queue_depth", "Images waiting to be written")
+        self._write_time = registry.histogram("image_write_seconds", "Time to encode and write one image")
+        self._dropped_metric = registry.counter(
+            "image_saver_dropped_total", "Images not written because the write queue was full"
+        )
+        self._failed_metric = registry.counter("image_saver_failed_total", "Images that failed to write")
+        self._encode_time = registry.histogram(
+            "image_encode_seconds", "Time to encode one saved image", ("codec",)
+        ).labels(codec=codec)
+        self._bytes_metric = registry.counter(
+            "image_written_bytes_total", "Bytes of saved image files", ("codec",)
+        ).labels(codec=codec)
 
     @property
     def ng_image_dir(self) -> Path:
@@ -41,53 +188,79 @@ class ImageSaver:
         """Get data directory"""
         return self._data_dir
 
+    @property
+    def archive(self) -> ImageArchive:
+        """Index of saved images"""
+        return self._archive
+
+    @property
+    def thumbnails(self) -> Optional[ThumbnailService]:
+        """Thumbnail generator (None if disabled)"""
+        return self._thumbnails
+
+    @property
+    def codec(self) -> str:
+        """ImageCodec of saved images"""
+        return self._codec
+
+    @property
+    def pending(self) -> int:
+        """Images queued or being written"""
+        with self._cond:
+            return len(self._queue) + self._active
+
     def save_ng_image(
-        self, frame: np.ndarray, circles: List[CircleResult], display_frame: Optional[np.ndarray] = None
+        self,
+        frame: np.ndarray,
+        circles: List[CircleResult],
+        display_frame: Optional[np.ndarray] = None,
+        frame_seq: Optional[int] = None,
+        image_id: Optional[int] = None,
+        on_done: Optional[Callable[[Optional[int]], None]] = None,
     ) -> Optional[str]:
         """
-        Save NG image with measurement data
+        Queue NG image with measurement data
 
         Args:
             frame: Original frame
             circles: List of detected circles
-            display_frame: Optional frame with overlay
+            display_frame: Optional frame with overlay (saved instead of frame)
+            frame_seq: Pipeline frame sequence number (tags the write trace span)
+            image_id: Archive ID from archive.allocate_id() (default: assigned on write)
+            on_done: Called once with the archive ID after the image is written,
+                or with None if it is dropped or fails (writer or queueing thread)
 
         Returns:
-            Path to saved image, or None if no NG circles
+            Path the image will be written to, or None if no NG circles or dropped
         """
         # Check if any circles are NG
         ng_circles = [c for c in circles if c.status == MeasureStatus.NG]
         if not ng_circles:
+            self._notify(on_done, None)
             return None
 
-        try:
-            timestamp = datetime.now()
-            date_dir = self._ng_dir / timestamp.strftime("%Y%m%d")
-            date_dir.mkdir(exist_ok=True)
-
-            # Generate filename
-            filename = timestamp.strftime("%H%M%S_%f")[:-3]
-            self._save_count += 1
-
-            # Save display frame (with overlay)
-            if display_frame is not None:
-                img_path = date_dir / f"NG_{filename}.jpg"
-                cv2.imwrite(str(img_path), display_frame)
-            else:
-                img_path = date_dir / f"NG_{filename}.jpg"
-                cv2.imwrite(str(img_path), frame)
-
-            # Save measurement data
-            data_path = date_dir / f"NG_{filename}.json"
-            self._save_measurement_data(data_path, timestamp, circles)
-
-            logger.info(f"Saved NG image: {img_path}")
-            return str(img_path)
-
-        except Exception as e:
-            logger.error(f"Failed to save NG image: {e}")
+        image = display_frame if display_frame is not None else frame
+        if image is None:
+            logger.error("Failed to save NG image: no frame")
+            self._notify(on_done, None)
             return None
 
+        timestamp = datetime.now()
+        img_path = self._ng_dir / timestamp.strftime("%Y%m%d") / f"NG_{self._unique_name(timestamp)}{self._extension}"
+
+        job = _SaveJob(
+            image,
+            img_path,
+            timestamp,
+            "NG",
+            "NG",
+            circles=list(circles) if self._sidecar_json else None,
+            frame_seq=frame_seq,
+            image_id=image_id,
+            on_done=on_done,
+        )
+        return str(img_path) if self._submit(job) else None
+
     def _save_measurement_data(self, file_path: Path, timestamp: datetime, circles: List[CircleResult]) -> None:
         """Save measurement data to JSON file"""
         data = {
@@ -112,45 +285,241 @@ class ImageSaver:
         with open(file_path, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=2)
 
-    def save_all_image(self, frame: np.ndarray, circles: List[CircleResult], prefix: str = "IMG") -> Optional[str]:
-        """Save any image (not just NG)"""
-        try:
-            timestamp = datetime.now()
-            date_dir = self._data_dir / timestamp.strftime("%Y%m%d")
-            date_dir.mkdir(exist_ok=True)
-
-            filename = timestamp.strftime("%H%M%S_%f")[:-3]
-            img_path = date_dir / f"{prefix}_{filename}.jpg"
-
-            cv2.imwrite(str(img_path), frame)
-            logger.debug(f"Saved image: {img_path}")
-            return str(img_path)
+    def save_all_image(
+        self,
+        frame: np.ndarray,
+        circles: List[CircleResult],
+        prefix: str = "IMG",
+        image_id: Optional[int] = None,
+        on_done: Optional[Callable[[Optional[int]], None]] = None,
+    ) -> Optional[str]:
+        """Queue any image (not just NG); returns its path, or None if dropped"""
+        if frame is None:
+            logger.error("Failed to save image: no frame")
+            self._notify(on_done, None)
+            return None
 
+        timestamp = datetime.now()
+        img_path = (
+            self._data_dir / timestamp.strftime("%Y%m%d") / f"{prefix}_{self._unique_name(timestamp)}{self._extension}"
+        )
+        status = HistoryRecord.summarize(circles)[1]
+        job = _SaveJob(frame, img_path, timestamp, prefix, status, image_id=image_id, on_done=on_done)
+        return str(img_path) if self._submit(job) else None
+
+    def _unique_name(self, timestamp: datetime) -> str:
+        """File name from the time, with a counter when queued within the same millisecond"""
+        name = timestamp.strftime("%H%M%S_%f")[:-3]
+        with self._cond:
+            if name == self._last_name:
+                self._name_repeat += 1
+                return f"{name}_{self._name_repeat}"
+            self._last_name = name
+            self._name_repeat = 0
+        return name
+
+    # ========== Writer pool ==========
+
+    def _submit(self, job: _SaveJob) -> bool:
+        """Queue a job according to the save policy; False if it was dropped"""
+        job.queued_at = time.perf_counter()
+        dropped: Optional[_SaveJob] = None
+
+        with self._cond:
+            if not self._running:
+                self._start_workers()
+
+            if len(self._queue) >= self._max_pending:
+                if self._policy == SavePolicy.BLOCK:
+                    self._cond.wait_for(lambda: len(self._queue) < self._max_pending, timeout=self._block_timeout)
+                elif self._policy == SavePolicy.DROP_OLDEST:
+                    dropped = self._queue.popleft()
+                    logger.warning(f"Image write queue full, dropped {dropped.image_path.name}")
+                    self._count_drop()
+
+            if len(self._queue) >= self._max_pending:
+                logger.warning(f"Image write queue full, dropped {job.image_path.name}")
+                self._count_drop()
+                dropped = job
+            else:
+                self._queue.append(job)
+                self._queue_depth.set(len(self._queue))
+                self._cond.notify_all()
+
+        if dropped is not None:
+            self._notify(dropped.on_done, None)
+        return dropped is not job
+
+    @staticmethod
+    def _notify(on_done: Optional[Callable[[Optional[int]], None]], image_id: Optional[int]) -> None:
+        """Report the outcome of an image to its on_done callback"""
+        if on_done is None:
+            return
+        try:
+            on_done(image_id)
         except Exception as e:
-            logger.error(f"Failed to save image: {e}")
-            return None
+            logger.error(f"Image saved callback error: {e}")
+
+    def _count_drop(self) -> None:
+        """Count a dropped job (called with the queue lock held)"""
+        self._dropped += 1
+        self._dropped_metric.inc()
+
+    def _start_workers(self) -> None:
+        """Start the writer threads (called with the queue lock held)"""
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._writer_loop, name=f"ImageWriter-{i}", daemon=True)
+            for i in range(self._workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _writer_loop(self) -> None:
+        """Take queued jobs and write them until closed and drained"""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or not self._running)
+                if not self._queue:
+                    return
+                job = self._queue.popleft()
+                self._active += 1
+                self._queue_depth.set(len(self._queue))
+                self._cond.notify_all()
 
-    def get_ng_image_count(self, date: Optional[datetime] = None) -> int:
-        """Get count of NG images for a specific date"""
-        if date is None:
-            date = datetime.now()
+            try:
+                self._write_job(job)
+            finally:
+                with self._cond:
+                    self._active -= 1
+                    self._cond.notify_all()
+
+    def _write_job(self, job: _SaveJob) -> None:
+        """Encode and write one image (and its measurement data)"""
+        start_ns = time.perf_counter_ns()
+        try:
+            data = self._encode(job.image)
+            encode_s = (time.perf_counter_ns() - start_ns) / 1e9
+            job.image_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(job.image_path, "wb") as f:
+                f.write(data)
+            data_path = None
+            if job.circles is not None:
+                data_path = job.image_path.with_suffix(".json")
+                self._save_measurement_data(data_path, job.timestamp, job.circles)
+            image_id = self._archive.add(
+                job.image_path,
+                job.timestamp,
+                job.kind,
+                job.status,
+                self._codec,
+                data_path,
+                job.frame_seq,
+                job.image_id,
+            )
+        except Exception as e:
+            logger.error(f"Failed to save image {job.image_path}: {e}")
+            with self._cond:
+                self._failed += 1
+            self._failed_metric.inc()
+            self._notify(job.on_done, None)
+            return
+
+        end_ns = time.perf_counter_ns()
+        elapsed_ms = (end_ns - start_ns) / 1e6
+        self._write_time.observe(elapsed_ms / 1000)
+        self._encode_time.observe(encode_s)
+        self._bytes_metric.inc(len(data))
+        get_tracer().record("write_image", start_ns, end_ns, frame_seq=job.frame_seq)
+        if self._thumbnails is not None and image_id is not None:
+            self._thumbnails.submit(image_id, job.image)
+        with self._cond:
+            self._written += 1
+            self._last_write_ms = elapsed_ms
+            self._max_write_ms = max(self._max_write_ms, elapsed_ms)
+            self._bytes_written += len(data)
+            self._encode_time_total += encode_s
+        logger.debug(f"Saved image: {job.image_path}")
+        self._notify(job.on_done, image_id)
+
+    def _encode(self, image: np.ndarray) -> memoryview:
+        """Encode an image with the configured codec"""
+        if self._codec == ImageCodec.NPY:
+            buffer = io.BytesIO()
+            np.save(buffer, image, allow_pickle=False)
+            return buffer.getbuffer()
+
+        ok, encoded = cv2.imencode(self._extension, image, self._encode_params)
+        if not ok:
+            raise ValueError(f"{self._codec} encoding failed")
+        return encoded.data
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until all queued images are written
 
-        date_dir = self._ng_dir / date.strftime("%Y%m%d")
-        if not date_dir.exists():
-            return 0
+        Returns:
+            True if the queue was drained within timeout
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._active, timeout=timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write pending images, stop the writer and thumbnail threads and close the archive"""
+        with self._cond:
+            running = self._running
+            self._running = False
+            self._cond.notify_all()
+
+        if running:
+            deadline = time.monotonic() + timeout
+            for thread in self._threads:
+                thread.join(timeout=max(deadline - time.monotonic(), 0))
+            self._threads = []
+        if self._thumbnails is not None:
+            self._thumbnails.close(timeout)
+        self._archive.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get writer statistics"""
+        with self._cond:
+            return {
+                "pending": len(self._queue),
+                "writing": self._active,
+                "written": self._written,
+                "dropped": self._dropped,
+                "failed": self._failed,
+                "last_write_ms": self._last_write_ms,
+                "max_write_ms": self._max_write_ms,
+                "avg_encode_ms": self._encode_time_total * 1000 / self._written if self._written else 0.0,
+                "bytes_written": self._bytes_written,
+                "codec": self._codec,
+                "policy": self._policy,
+            }
 
-        return len(list(date_dir.glob("NG_*.jpg")))
+    def get_ng_image_count(self, date: Optional[datetime] = None) -> int:
+        """Get count of NG images for a specific date (default: today)"""
+        return self._archive.count("NG", date or datetime.now())
 
     def get_total_ng_count(self) -> int:
-        """Get total NG image count"""
-        return self._save_count
+        """Get total count of archived NG images (kept across restarts)"""
+        return self._archive.count("NG")
 
     def cleanup_old_images(self, days: int = 30) -> int:
-        """Remove images older than specified days"""
+        """Remove images older than specified days
+
+        Indexed files are removed through the archive; date directories
+        older than the cutoff (e.g. from before the index existed) are
+        deleted as a whole.
+
+        Returns:
+            Number of date directories removed
+        """
         import shutil
         from datetime import timedelta
 
         cutoff = datetime.now() - timedelta(days=days)
+        # Whole days, like the directory walk below
+        self._archive.remove_before(datetime.combine(cutoff.date() + timedelta(days=1), datetime.min.time()))
         removed = 0
 
         for date_dir in self._ng_dir.iterdir():
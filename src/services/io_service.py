@@ -8,6 +8,9 @@ from queue import Queue, Empty
 from dataclasses import dataclass
 from enum import Enum
 
+from ..core.metrics import get_registry
+from ..core.profiler import profile_checkpoint
+from ..core.tracing import get_tracer
 from ..domain.io_config import IOConfig, IOStatus, IOMode
 
 logger = logging.getLogger(__name__)
@@ -170,7 +173,22 @@ class IOService:
 
     def _io_loop(self) -> None:
         """Main IO polling loop"""
+        registry = get_registry()
+        period_metric = registry.histogram("io_loop_period_seconds", "Time between IO polling iterations")
+        jitter_metric = registry.histogram(
+            "io_loop_jitter_seconds", "Deviation of the IO polling period from the configured interval"
+        )
+        last_start = None
+
         while self._running:
+            profile_checkpoint()
+            start = time.perf_counter()
+            if last_start is not None:
+                period = start - last_start
+                period_metric.observe(period)
+                jitter_metric.observe(abs(period - self._config.polling_interval_ms / 1000.0))
+            last_start = start
+
             try:
                 # Process commands
                 self._process_commands()
@@ -263,9 +281,10 @@ class IOService:
 
     def _pulse_output(self, name: str) -> None:
         """Pulse digital output for configured duration"""
-        self._write_output(name, True)
-        time.sleep(self._config.result_pulse_ms / 1000.0)
-        self._write_output(name, False)
+        with get_tracer().span(f"io_pulse_{name}"):
+            self._write_output(name, True)
+            time.sleep(self._config.result_pulse_ms / 1000.0)
+            self._write_output(name, False)
 
     def _update_status(self) -> None:
         """Update output status from current state"""
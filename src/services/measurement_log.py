@@ -0,0 +1,322 @@
+"""Measurement Log - Append-only daily JSONL log of every inspection"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple
+
+from ..core import CircleRecord, HistoryRecord, get_registry
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _LogEntry:
+    """One queued inspection (serialized on the writer thread)"""
+
+    timestamp: float
+    camera_id: str
+    recipe: Optional[str]
+    overall_status: str
+    circles: Tuple[CircleRecord, ...]
+    frame_seq: Optional[int]
+    image_id: Optional[int]
+
+
+class MeasurementLog:
+    """Append-only measurement log, one JSON line per inspection
+
+    log() only queues the inspection and never blocks. A writer thread
+    gathers queued inspections and appends them with one write and one
+    fsync per batch (group commit). Files rotate daily
+    (measurements_YYYYMMDD.jsonl); OK parts are logged as well, and saved
+    images are linked by their ImageArchive ID.
+    """
+
+    DEFAULT_LOG_DIR = "output/logs"
+    FILE_PREFIX = "measurements_"
+
+    def __init__(
+        self,
+        log_dir: Optional[str] = None,
+        batch_size: int = 500,
+        flush_interval_ms: float = 200,
+        max_pending: int = 10000,
+        fsync: bool = True,
+    ):
+        """
+        Initialize log
+
+        Args:
+            log_dir: Directory of the daily log files
+            batch_size: Maximum inspections appended per commit
+            flush_interval_ms: Maximum time an inspection waits before being committed
+            max_pending: Queue capacity; further inspections are dropped
+            fsync: Sync each commit to disk (survives power loss)
+        """
+        self._log_dir = Path(log_dir or self.DEFAULT_LOG_DIR)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval_ms / 1000
+        self._fsync = fsync
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._file: Optional[IO[str]] = None
+        self._file_day = ""
+
+        self._stats_lock = threading.Lock()
+        self._written = 0
+        self._dropped = 0
+        self._commits = 0
+        self._last_commit_ms = 0.0
+
+        registry = get_registry()
+        self._records_metric = registry.counter("measurement_log_records_total", "Inspections written to the log")
+        self._dropped_metric = registry.counter(
+            "measurement_log_dropped_total", "Inspections not logged because the queue was full or a write failed"
+        )
+        self._commit_time = registry.histogram("measurement_log_commit_seconds", "Time to append and sync one batch")
+
+    @property
+    def log_dir(self) -> Path:
+        """Get log directory"""
+        return self._log_dir
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the writer thread is running"""
+        return self._running
+
+    def path_for(self, date: datetime) -> Path:
+        """Log file of a day"""
+        return self._log_dir / f"{self.FILE_PREFIX}{date.strftime('%Y%m%d')}.jsonl"
+
+    # ========== Lifecycle ==========
+
+    def start(self) -> bool:
+        """Create the log directory and start the writer thread"""
+        if self._running:
+            return True
+
+        try:
+            self._log_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.error(f"Failed to create measurement log directory {self._log_dir}: {e}")
+            return False
+
+        self._running = True
+        self._thread = threading.Thread(target=self._writer_loop, name="MeasurementLogWriter", daemon=True)
+        self._thread.start()
+        logger.info(f"Measurement log opened: {self._log_dir}")
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write pending inspections and stop the writer thread"""
+        if not self._running:
+            return
+
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        logger.info("Measurement log closed")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until all queued inspections are committed
+
+        Returns:
+            True if the queue was drained within timeout
+        """
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    # ========== Writing ==========
+
+    def log(
+        self,
+        result: Any,
+        camera_id: str = "default",
+        recipe: Optional[str] = None,
+        frame_seq: Optional[int] = None,
+        image_id: Optional[int] = None,
+        timestamp: Optional[float] = None,
+    ) -> bool:
+        """Queue one inspection (list of CircleResult) for the log (never blocks)
+
+        Args:
+            result: Circles of the inspection
+            camera_id: Camera ID
+            recipe: Active recipe name
+            frame_seq: Pipeline frame sequence number
+            image_id: ImageArchive ID of the image saved for this inspection
+            timestamp: Inspection time (default: now)
+
+        Returns:
+            True if queued, False if dropped
+        """
+        circles, overall = HistoryRecord.summarize(result)
+        entry = _LogEntry(
+            timestamp=time.time() if timestamp is None else timestamp,
+            camera_id=camera_id,
+            recipe=recipe,
+            overall_status=overall,
+            circles=circles,
+            frame_seq=frame_seq,
+            image_id=image_id,
+        )
+        try:
+            self._queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            with self._stats_lock:
+                self._dropped += 1
+            self._dropped_metric.inc()
+            return False
+
+    def _writer_loop(self) -> None:
+        """Collect queued inspections into batches and commit them"""
+        try:
+            while self._running or not self._queue.empty():
+                batch = self._collect_batch()
+                if batch:
+                    self._commit(batch)
+        finally:
+            self._close_file()
+
+    def _collect_batch(self) -> List[_LogEntry]:
+        """Wait for the first inspection, then gather more until batch_size or flush interval"""
+        try:
+            batch = [self._queue.get(timeout=self._flush_interval)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self._flush_interval
+        while len(batch) < self._batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0 and self._running:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _commit(self, batch: List[_LogEntry]) -> None:
+        """Append a batch (split at day boundaries) with one write and sync per file"""
+        start = time.perf_counter()
+        written = 0
+        try:
+            day_lines: Dict[str, List[str]] = {}
+            for entry in batch:
+                day = datetime.fromtimestamp(entry.timestamp).strftime("%Y%m%d")
+                day_lines.setdefault(day, []).append(self._serialize(entry))
+
+            for day, lines in day_lines.items():
+                f = self._open_file(day)
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+                if self._fsync:
+                    os.fsync(f.fileno())
+                written += len(lines)
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Failed to write {len(batch) - written} measurements to log: {e}")
+            self._close_file()
+            with self._stats_lock:
+                self._dropped += len(batch) - written
+            self._dropped_metric.inc(len(batch) - written)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._commit_time.observe(elapsed)
+            self._records_metric.inc(written)
+            with self._stats_lock:
+                self._written += written
+                self._commits += 1
+                self._last_commit_ms = elapsed * 1000
+            for _ in batch:
+                self._queue.task_done()
+
+    @staticmethod
+    def _serialize(entry: _LogEntry) -> str:
+        """One JSON line (same field names as the NG image sidecar JSON)"""
+        return json.dumps(
+            {
+                "timestamp": datetime.fromtimestamp(entry.timestamp).isoformat(),
+                "camera_id": entry.camera_id,
+                "recipe": entry.recipe,
+                "status": entry.overall_status,
+                "frame_seq": entry.frame_seq,
+                "image_id": entry.image_id,
+                "circles": [
+                    {
+                        "hole_id": c.hole_id,
+                        "center_x": c.center_x,
+                        "center_y": c.center_y,
+                        "diameter_px": c.diameter_px,
+                        "diameter_mm": c.diameter_mm,
+                        "circularity": c.circularity,
+                        "status": c.status,
+                    }
+                    for c in entry.circles
+                ],
+            },
+            separators=(",", ":"),
+        )
+
+    def _open_file(self, day: str) -> IO[str]:
+        """Get the append handle of a day's file (rotates when the day changes)"""
+        if self._file is None or day != self._file_day:
+            self._close_file()
+            self._log_dir.mkdir(parents=True, exist_ok=True)
+            path = self._log_dir / f"{self.FILE_PREFIX}{day}.jsonl"
+            self._file = open(path, "a", encoding="utf-8")
+            self._file_day = day
+        return self._file
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError as e:
+                logger.warning(f"Failed to close measurement log: {e}")
+            self._file = None
+            self._file_day = ""
+
+    # ========== Reading ==========
+
+    def read(self, date: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Iterate the inspections logged on a day (default: today), oldest first
+
+        Lines of a batch that was cut off mid-write are skipped.
+        """
+        path = self.path_for(date or datetime.now())
+        if not path.exists():
+            return
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get writer statistics"""
+        with self._stats_lock:
+            return {
+                "pending": self._queue.qsize(),
+                "written": self._written,
+                "dropped": self._dropped,
+                "commits": self._commits,
+                "last_commit_ms": self._last_commit_ms,
+            }
@@ -0,0 +1,382 @@
+"""Measurement Store - Persistent, indexed measurement history"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core import CircleRecord, HistoryRecord
+
+logger = logging.getLogger(__name__)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS measurements (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    camera_id TEXT NOT NULL,
+    recipe TEXT,
+    overall_status TEXT NOT NULL,
+    hole_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS holes (
+    measurement_id INTEGER NOT NULL REFERENCES measurements(id),
+    hole_id INTEGER NOT NULL,
+    center_x REAL,
+    center_y REAL,
+    diameter_px REAL,
+    diameter_mm REAL,
+    circularity REAL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_measurements_timestamp ON measurements(timestamp);
+CREATE INDEX IF NOT EXISTS idx_measurements_recipe ON measurements(recipe, timestamp);
+CREATE INDEX IF NOT EXISTS idx_measurements_status ON measurements(overall_status, timestamp);
+CREATE INDEX IF NOT EXISTS idx_holes_measurement ON holes(measurement_id);
+CREATE INDEX IF NOT EXISTS idx_holes_hole ON holes(hole_id, measurement_id);
+"""
+
+
+class MeasurementStore:
+    """SQLite measurement store with a batched background writer
+
+    add_result()/add_record() only queue the measurement and never block;
+    a writer thread inserts queued measurements in batches, one transaction
+    per batch. The database runs in WAL mode so queries (each on its own
+    connection) don't wait for the writer. If the queue is full, new
+    measurements are dropped and counted rather than stalling the caller.
+    """
+
+    DEFAULT_DB_PATH = "output/data/measurements.db"
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        batch_size: int = 200,
+        flush_interval_ms: float = 500,
+        max_pending: int = 10000,
+    ):
+        """
+        Initialize store
+
+        Args:
+            db_path: SQLite database file
+            batch_size: Maximum measurements written per transaction
+            flush_interval_ms: Maximum time a measurement waits before being written
+            max_pending: Queue capacity; further measurements are dropped
+        """
+        self._db_path = Path(db_path or self.DEFAULT_DB_PATH)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval_ms / 1000
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        self._stats_lock = threading.Lock()
+        self._written = 0
+        self._dropped = 0
+        self._batches = 0
+        self._last_batch_ms = 0.0
+
+    @property
+    def db_path(self) -> Path:
+        """Get database file path"""
+        return self._db_path
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the writer thread is running"""
+        return self._running
+
+    # ========== Lifecycle ==========
+
+    def start(self) -> bool:
+        """Create the database (if needed) and start the writer thread"""
+        if self._running:
+            return True
+
+        try:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(self._connect()) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to open measurement store {self._db_path}: {e}")
+            return False
+
+        self._running = True
+        self._thread = threading.Thread(target=self._writer_loop, name="MeasurementStoreWriter", daemon=True)
+        self._thread.start()
+        logger.info(f"Measurement store opened: {self._db_path}")
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write pending measurements and stop the writer thread"""
+        if not self._running:
+            return
+
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        logger.info("Measurement store closed")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until all queued measurements are written
+
+        Returns:
+            True if the queue was drained within timeout
+        """
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    # ========== Writing ==========
+
+    def add_result(
+        self,
+        result: Any,
+        camera_id: str = "default",
+        recipe: Optional[str] = None,
+        timestamp: Optional[float] = None,
+    ) -> bool:
+        """Queue a detection result (list of CircleResult) for storage
+
+        Returns:
+            True if queued, False if dropped
+        """
+        circles, overall = HistoryRecord.summarize(result)
+        record = HistoryRecord(
+            seq=0,
+            timestamp=time.time() if timestamp is None else timestamp,
+            camera_id=camera_id,
+            overall_status=overall,
+            circles=circles,
+            recipe=recipe,
+        )
+        return self.add_record(record)
+
+    def add_record(self, record: HistoryRecord) -> bool:
+        """Queue a history record for storage (never blocks)
+
+        Returns:
+            True if queued, False if dropped
+        """
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            with self._stats_lock:
+                self._dropped += 1
+            return False
+
+    def _writer_loop(self) -> None:
+        """Collect queued records into batches and write them"""
+        conn = self._connect()
+        try:
+            while self._running or not self._queue.empty():
+                batch = self._collect_batch()
+                if batch:
+                    self._write_batch(conn, batch)
+        finally:
+            conn.close()
+
+    def _collect_batch(self) -> List[HistoryRecord]:
+        """Wait for the first record, then gather more until batch_size or flush interval"""
+        try:
+            batch = [self._queue.get(timeout=self._flush_interval)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self._flush_interval
+        while len(batch) < self._batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0 and self._running:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[HistoryRecord]) -> None:
+        """Insert a batch of records in one transaction"""
+        start = time.perf_counter()
+        try:
+            with conn:
+                holes: List[Tuple[Any, ...]] = []
+                for record in batch:
+                    cursor = conn.execute(
+                        "INSERT INTO measurements (timestamp, camera_id, recipe, overall_status, hole_count) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (record.timestamp, record.camera_id, record.recipe, record.overall_status, len(record.circles)),
+                    )
+                    measurement_id = cursor.lastrowid
+                    holes.extend(
+                        (
+                            measurement_id,
+                            c.hole_id,
+                            c.center_x,
+                            c.center_y,
+                            c.diameter_px,
+                            c.diameter_mm,
+                            c.circularity,
+                            c.status,
+                        )
+                        for c in record.circles
+                    )
+                conn.executemany(
+                    "INSERT INTO holes (measurement_id, hole_id, center_x, center_y, diameter_px, diameter_mm, "
+                    "circularity, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    holes,
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to write {len(batch)} measurements: {e}")
+            with self._stats_lock:
+                self._dropped += len(batch)
+        else:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._stats_lock:
+                self._written += len(batch)
+                self._batches += 1
+                self._last_batch_ms = elapsed_ms
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    # ========== Queries ==========
+
+    def query(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        recipe: Optional[str] = None,
+        status: Optional[str] = None,
+        hole_id: Optional[int] = None,
+        camera_id: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[HistoryRecord]:
+        """Query stored measurements, newest first
+
+        Args:
+            start: Only measurements at or after this time
+            end: Only measurements before this time
+            recipe: Recipe name
+            status: Overall status ("OK", "NG", ...)
+            hole_id: Only measurements containing this hole
+            camera_id: Camera ID
+            limit: Maximum records to return
+            offset: Skip first N records
+
+        Returns:
+            Records with seq set to the database row ID
+        """
+        where, params = self._build_filter(start, end, recipe, status, hole_id, camera_id)
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT id, timestamp, camera_id, recipe, overall_status FROM measurements"
+                f"{where} ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+            if not rows:
+                return []
+
+            ids = [row[0] for row in rows]
+            circles: Dict[int, List[CircleRecord]] = {measurement_id: [] for measurement_id in ids}
+            placeholders = ",".join("?" * len(ids))
+            for hole in conn.execute(
+                "SELECT measurement_id, hole_id, center_x, center_y, diameter_px, diameter_mm, circularity, status "
+                f"FROM holes WHERE measurement_id IN ({placeholders}) ORDER BY rowid",
+                ids,
+            ):
+                circles[hole[0]].append(CircleRecord(*hole[1:]))
+
+        return [
+            HistoryRecord(
+                seq=row[0],
+                timestamp=row[1],
+                camera_id=row[2],
+                overall_status=row[4],
+                circles=tuple(circles[row[0]]),
+                recipe=row[3],
+            )
+            for row in rows
+        ]
+
+    def count(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        recipe: Optional[str] = None,
+        status: Optional[str] = None,
+        hole_id: Optional[int] = None,
+        camera_id: Optional[str] = None,
+    ) -> int:
+        """Count stored measurements matching the filters (see query())"""
+        where, params = self._build_filter(start, end, recipe, status, hole_id, camera_id)
+        with closing(self._connect()) as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM measurements{where}", params).fetchone()[0]
+
+    @staticmethod
+    def _build_filter(
+        start: Optional[datetime],
+        end: Optional[datetime],
+        recipe: Optional[str],
+        status: Optional[str],
+        hole_id: Optional[int],
+        camera_id: Optional[str],
+    ) -> Tuple[str, List[Any]]:
+        """Build the WHERE clause shared by query() and count()"""
+        clauses = []
+        params: List[Any] = []
+
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start.timestamp())
+        if end is not None:
+            clauses.append("timestamp < ?")
+            params.append(end.timestamp())
+        if recipe is not None:
+            clauses.append("recipe = ?")
+            params.append(recipe)
+        if status is not None:
+            clauses.append("overall_status = ?")
+            params.append(status.upper())
+        if hole_id is not None:
+            clauses.append("id IN (SELECT measurement_id FROM holes WHERE hole_id = ?)")
+            params.append(hole_id)
+        if camera_id is not None:
+            clauses.append("camera_id = ?")
+            params.append(camera_id)
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection (each thread uses its own)"""
+        conn = sqlite3.connect(self._db_path, timeout=5.0)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get writer statistics"""
+        with self._stats_lock:
+            return {
+                "pending": self._queue.qsize(),
+                "written": self._written,
+                "dropped": self._dropped,
+                "batches": self._batches,
+                "last_batch_ms": self._last_batch_ms,
+            }
@@ -7,7 +7,7 @@ from typing import List, Optional, Dict
 from datetime import datetime
 
 from ..domain.recipe import Recipe
-from ..domain.config import DetectionConfig, ToleranceConfig
+from ..domain.config import CameraConfig, DetectionConfig, ToleranceConfig
 
 logger = logging.getLogger(__name__)
 
@@ -118,6 +118,8 @@ class RecipeService:
         tolerance_config: ToleranceConfig,
         pixel_to_mm: float,
         description: str = "",
+        camera_config: Optional[CameraConfig] = None,
+        plc_index: Optional[int] = None,
     ) -> Recipe:
         """Create a new recipe from current settings"""
         recipe = Recipe(
@@ -126,6 +128,8 @@ class RecipeService:
             detection_config=detection_config,
             tolerance_config=tolerance_config,
             pixel_to_mm=pixel_to_mm,
+            camera_config=camera_config,
+            plc_index=plc_index,
         )
         return recipe
 
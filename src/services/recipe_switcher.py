@@ -0,0 +1,395 @@
+"""Recipe Switcher - PLC-driven recipe changeover with pre-built pipelines"""
+
+import logging
+import threading
+import time
+from dataclasses import replace
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from ..core import get_registry
+from ..domain.io_config import IOStatus
+from ..domain.recipe import Recipe
+from .calibration_service import ScaleField
+from .camera_service import BaslerGigECamera
+from .classifier_service import CircleClassifier
+from .detector_service import CircleDetector
+from .io_service import IOService
+from .recipe_service import RecipeService
+from .thread_manager import RecipePipeline, ThreadManager
+from .virtual_camera import VirtualCamera
+from .visualizer_service import CircleVisualizer
+
+logger = logging.getLogger(__name__)
+
+
+class RecipeSwitcher:
+    """Switch recipes between frames when the PLC recipe bits change
+
+    Recipes are assigned to a PLC recipe index (IOStatus.recipe_index,
+    0-3) by their plc_index; indexes no recipe claims keep the running
+    recipe. Every assigned recipe gets its own detector, classifier and visualizer, built ahead of
+    time with pixel limits, hole tables and drawing data precomputed. A
+    changeover only replaces the pipeline reference of the attached
+    ThreadManagers, so the next frame already runs the new recipe and no
+    frame is processed with a mix of both.
+
+    The recipe bits are read in separate IO polls and may change one at a
+    time, so an index must be seen in settle_polls consecutive polls
+    before the switch. Once attached, PLC switches run on their own thread
+    so camera writes never delay IO polls. A recipe selected by hand stays
+    active until the bits change again.
+
+    Cameras added with add_camera() get the recipe's camera settings
+    before the pipelines are swapped, so no frame is measured with the new
+    recipe under the old settings; only features that differ from the
+    camera's cached state are written.
+    """
+
+    MAX_SLOTS = 4  # Two recipe bits
+
+    def __init__(
+        self,
+        recipe_service: RecipeService,
+        slots: Optional[Dict[int, str]] = None,
+        scale_field: Optional[ScaleField] = None,
+        settle_polls: int = 2,
+    ):
+        """
+        Initialize switcher
+
+        Args:
+            recipe_service: Source of the recipes
+            slots: Recipe name per PLC recipe index (default: from the
+                recipes' plc_index, see reload_slots())
+            scale_field: Field correction applied to every detector
+            settle_polls: Consecutive IO polls an index must be stable for
+        """
+        self._recipe_service = recipe_service
+        self._slots: Dict[int, str] = dict(slots or {})
+        self._scale_field = scale_field
+        self._settle_polls = max(settle_polls, 1)
+
+        self._lock = threading.RLock()
+        # Serializes changeovers (camera writes + swap) without blocking readers
+        self._switch_lock = threading.Lock()
+        self._pipelines: Dict[str, RecipePipeline] = {}
+        self._targets: List[ThreadManager] = []
+        self._cameras: List[Union[BaslerGigECamera, VirtualCamera]] = []
+        self._listeners: List[Callable[[RecipePipeline], None]] = []
+        self._current: Optional[RecipePipeline] = None
+        self._active_index: Optional[int] = None
+
+        # IO debounce state
+        self._pending_index: Optional[int] = None
+        self._pending_polls = 0
+
+        # PLC switch thread (started by attach())
+        self._switch_thread: Optional[threading.Thread] = None
+        self._switch_request = threading.Condition()
+        self._requested_index: Optional[int] = None
+        self._closing = False
+
+        self._switches = 0
+        self._unassigned = 0
+        self._last_prepare_ms = 0.0
+        self._last_camera_ms = 0.0
+
+        registry = get_registry()
+        self._switch_metric = registry.counter("recipe_switches_total", "Recipe changeovers", ("source",))
+        self._prepare_time = registry.histogram("recipe_prepare_seconds", "Time to build one recipe pipeline")
+
+        if slots is None:
+            self.reload_slots()
+
+    @property
+    def slots(self) -> Dict[int, str]:
+        """Recipe name per PLC recipe index"""
+        with self._lock:
+            return dict(self._slots)
+
+    @property
+    def current(self) -> Optional[RecipePipeline]:
+        """Pipeline the targets are running (None before the first switch)"""
+        return self._current
+
+    @property
+    def active_index(self) -> Optional[int]:
+        """PLC recipe index of the current pipeline (None if selected by name)"""
+        return self._active_index
+
+    def assign(self, index: int, recipe_name: Optional[str]) -> None:
+        """Assign a recipe to a PLC recipe index (None to clear)"""
+        if not 0 <= index < self.MAX_SLOTS:
+            raise ValueError(f"Recipe index must be 0-{self.MAX_SLOTS - 1}: {index}")
+        with self._lock:
+            if recipe_name is None:
+                self._slots.pop(index, None)
+            else:
+                self._slots[index] = recipe_name
+
+    def reload_slots(self) -> Dict[int, str]:
+        """
+        Assign recipes to PLC recipe indexes by their plc_index
+
+        Replaces earlier assign() calls. An index claimed by more than one
+        recipe is left unassigned.
+
+        Returns:
+            Recipe name per PLC recipe index
+        """
+        claims: Dict[int, List[str]] = {}
+        for name in self._recipe_service.recipe_names:
+            recipe = self._recipe_service.get_recipe(name)
+            if recipe is not None and recipe.plc_index is not None:
+                claims.setdefault(recipe.plc_index, []).append(name)
+
+        slots: Dict[int, str] = {}
+        for index, names in sorted(claims.items()):
+            if not 0 <= index < self.MAX_SLOTS:
+                logger.warning(f"Recipe {names[0]} has PLC index {index} outside 0-{self.MAX_SLOTS - 1}, ignored")
+            elif len(names) > 1:
+                logger.warning(f"PLC index {index} claimed by {', '.join(sorted(names))}, left unassigned")
+            else:
+                slots[index] = names[0]
+
+        with self._lock:
+            self._slots = slots
+        logger.info(f"Recipe slots: {slots}")
+        return dict(slots)
+
+    # ========== Preparation ==========
+
+    def build(self, recipe: Recipe) -> RecipePipeline:
+        """Build the ready-to-run stages of a recipe"""
+        start = time.perf_counter()
+        # Copies: pipelines never share mutable config with each other or the recipe
+        detection_config = replace(recipe.detection_config, pixel_to_mm=recipe.pixel_to_mm)
+        tolerance_config = replace(recipe.tolerance_config)
+
+        detector = CircleDetector(detection_config, scale_field=self._scale_field)
+        classifier = CircleClassifier(tolerance_config)
+        classifier.prepare()
+        visualizer = CircleVisualizer(detection_config)
+        visualizer.prepare(tolerance_config)
+
+        elapsed = time.perf_counter() - start
+        self._prepare_time.observe(elapsed)
+        self._last_prepare_ms = elapsed * 1000
+        return RecipePipeline(detector, classifier, visualizer, recipe)
+
+    def prepare(self, names: Optional[List[str]] = None) -> int:
+        """
+        Build pipelines ahead of the switch (rebuilds already prepared ones)
+
+        Args:
+            names: Recipes to prepare (default: all assigned recipes)
+
+        Returns:
+            Number of pipelines built
+        """
+        if names is None:
+            names = sorted(set(self.slots.values()))
+
+        built = 0
+        for name in names:
+            recipe = self._recipe_service.get_recipe(name)
+            if recipe is None:
+                logger.warning(f"Cannot prepare unknown recipe: {name}")
+                continue
+            pipeline = self.build(recipe)
+            with self._lock:
+                self._pipelines[name] = pipeline
+            built += 1
+        logger.info(f"Prepared {built} recipe pipelines")
+        return built
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drop prepared pipelines after recipes were edited (None: all)
+
+        The running pipeline is kept until the next switch.
+        """
+        with self._lock:
+            if name is None:
+                self._pipelines.clear()
+            else:
+                self._pipelines.pop(name, None)
+
+    def set_scale_field(self, scale_field: Optional[ScaleField]) -> None:
+        """Apply a new field correction to every prepared detector"""
+        with self._lock:
+            self._scale_field = scale_field
+            pipelines = list(self._pipelines.values())
+            if self._current is not None:
+                # Still running after invalidate()
+                pipelines.append(self._current)
+        for pipeline in pipelines:
+            pipeline.detector.set_scale_field(scale_field)
+
+    # ========== Switching ==========
+
+    def add_target(self, thread_manager: ThreadManager) -> None:
+        """Switch a camera's pipeline along (starts with the current recipe)"""
+        with self._lock:
+            self._targets.append(thread_manager)
+            if self._current is not None:
+                thread_manager.set_pipeline(self._current)
+
+    def add_camera(self, camera: Union[BaslerGigECamera, VirtualCamera]) -> None:
+        """Apply each recipe's camera settings to a camera on switch"""
+        with self._lock:
+            self._cameras.append(camera)
+
+    def add_listener(self, callback: Callable[[RecipePipeline], None]) -> None:
+        """Register callback(pipeline) called after each switch (on the switching thread)"""
+        self._listeners.append(callback)
+
+    def select(self, index: int, source: str = "plc") -> bool:
+        """
+        Switch to the recipe assigned to a PLC recipe index
+
+        Returns:
+            True if switched (or already active), False if the index has no recipe
+        """
+        with self._lock:
+            name = self._slots.get(index)
+            if name is None:
+                self._unassigned += 1
+                logger.warning(f"No recipe assigned to index {index}, keeping current recipe")
+                return False
+        return self._activate(name, source, index)
+
+    def select_recipe(self, name: str, source: str = "manual") -> bool:
+        """
+        Switch to a recipe by name (built now if it wasn't prepared)
+
+        Returns:
+            True if switched (or already active), False if the recipe doesn't exist
+        """
+        return self._activate(name, source, self._index_of(name))
+
+    def load(self, recipe: Recipe, source: str = "manual") -> RecipePipeline:
+        """Build a recipe as given (e.g. edited, not yet saved) and switch to it"""
+        pipeline = self.build(recipe)
+        with self._switch_lock:
+            with self._lock:
+                self._pipelines[recipe.name] = pipeline
+            self._swap(pipeline, source, self._index_of(recipe.name))
+        return pipeline
+
+    def _index_of(self, name: str) -> Optional[int]:
+        """PLC recipe index a recipe is assigned to"""
+        with self._lock:
+            return next((i for i, n in self._slots.items() if n == name), None)
+
+    def _activate(self, name: str, source: str, index: Optional[int]) -> bool:
+        """Switch to a recipe's pipeline"""
+        with self._switch_lock:
+            with self._lock:
+                current = self._current
+                pipeline = self._pipelines.get(name)
+                if current is not None and current.recipe_name == name and current is pipeline:
+                    self._active_index = index
+                    return True
+
+            if pipeline is None:
+                recipe = self._recipe_service.get_recipe(name)
+                if recipe is None:
+                    logger.error(f"Cannot switch to unknown recipe: {name}")
+                    return False
+                logger.warning(f"Recipe {name} was not prepared, building it on switch")
+                pipeline = self.build(recipe)
+                with self._lock:
+                    self._pipelines[name] = pipeline
+
+            self._swap(pipeline, source, index)
+            return True
+
+    def _swap(self, pipeline: RecipePipeline, source: str, index: Optional[int]) -> None:
+        """Write camera settings, then hand a pipeline to every target (called with the switch lock held)"""
+        camera_config = pipeline.recipe.camera_config if pipeline.recipe else None
+        if camera_config is not None:
+            with self._lock:
+                cameras = list(self._cameras)
+            start = time.perf_counter()
+            for camera in cameras:
+                if camera.is_connected:
+                    camera.apply_settings(camera_config)
+            self._last_camera_ms = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            for target in self._targets:
+                target.set_pipeline(pipeline)
+            self._current = pipeline
+            self._active_index = index
+            self._switches += 1
+        self._switch_metric.labels(source=source).inc()
+        logger.info(f"Recipe switched to {pipeline.recipe_name} ({source})")
+
+        for callback in self._listeners:
+            try:
+                callback(pipeline)
+            except Exception as e:
+                logger.error(f"Recipe switch callback error: {e}")
+
+    # ========== PLC ==========
+
+    def attach(self, io_service: IOService) -> None:
+        """Follow the recipe bits read by an IO service (switches on a switch thread)"""
+        with self._switch_request:
+            if self._switch_thread is None:
+                self._closing = False
+                self._switch_thread = threading.Thread(target=self._switch_loop, daemon=True, name="RecipeSwitchThread")
+                self._switch_thread.start()
+        io_service.register_status_callback(self.on_io_status)
+
+    def close(self) -> None:
+        """Stop the switch thread"""
+        with self._switch_request:
+            thread = self._switch_thread
+            self._switch_thread = None
+            self._closing = True
+            self._switch_request.notify()
+        if thread is not None:
+            thread.join(timeout=2.0)
+
+    def on_io_status(self, status: IOStatus) -> None:
+        """Handle one IO poll (switches once the recipe index has settled)"""
+        index = status.recipe_index
+        if index != self._pending_index:
+            self._pending_index = index
+            self._pending_polls = 0
+        self._pending_polls += 1
+
+        if self._pending_polls == self._settle_polls and index != self._active_index:
+            with self._switch_request:
+                if self._switch_thread is not None:
+                    self._requested_index = index
+                    self._switch_request.notify()
+                    return
+            self.select(index)
+
+    def _switch_loop(self) -> None:
+        """Run the PLC switches requested by on_io_status()"""
+        while True:
+            with self._switch_request:
+                while self._requested_index is None and not self._closing:
+                    self._switch_request.wait()
+                if self._closing:
+                    return
+                index = self._requested_index
+                self._requested_index = None
+            if index is not None:
+                self.select(index)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get switching statistics"""
+        with self._lock:
+            return {
+                "current": self._current.recipe_name if self._current else None,
+                "active_index": self._active_index,
+                "prepared": sorted(self._pipelines),
+                "switches": self._switches,
+                "unassigned": self._unassigned,
+                "last_prepare_ms": self._last_prepare_ms,
+                "last_camera_ms": self._last_camera_ms,
+            }
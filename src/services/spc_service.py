@@ -0,0 +1,462 @@
+"""SPC Service - Streaming control charts and process capability"""
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+
+from ..core import AppCore, EventType
+from ..domain.config import SPCConfig, ToleranceConfig
+from ..domain.entities import CircleResult
+
+logger = logging.getLogger(__name__)
+
+
+class ChartType:
+    """Control chart types"""
+
+    INDIVIDUALS = "individuals"  # Individuals and moving range (I-MR)
+    XBAR_R = "xbar_r"  # Subgroup mean and range
+
+
+# Control chart constants by subgroup size n (index n - 2, n = 2..10)
+_D2 = (1.128, 1.693, 2.059, 2.326, 2.534, 2.704, 2.847, 2.970, 3.078)
+_A2 = (1.880, 1.023, 0.729, 0.577, 0.483, 0.419, 0.373, 0.337, 0.308)
+_D3 = (0.0, 0.0, 0.0, 0.0, 0.0, 0.076, 0.136, 0.184, 0.223)
+_D4 = (3.267, 2.574, 2.282, 2.114, 2.004, 1.924, 1.864, 1.816, 1.777)
+
+_RULE_DESCRIPTIONS = {
+    1: "One point beyond 3 sigma",
+    2: "2 of 3 consecutive points beyond 2 sigma on the same side",
+    3: "4 of 5 consecutive points beyond 1 sigma on the same side",
+    4: "8 consecutive points on the same side of the center line",
+}
+
+
+def _spec_limits(tolerance: ToleranceConfig, hole_id: int) -> Tuple[float, float]:
+    """Lower and upper specification limit of a hole (per-hole overrides first)"""
+    nominal, tol = tolerance.nominal_mm, tolerance.tolerance_mm
+    for hole in tolerance.holes:
+        if hole.hole_id == hole_id:
+            if hole.nominal_mm is not None:
+                nominal = hole.nominal_mm
+            if hole.tolerance_mm is not None:
+                tol = hole.tolerance_mm
+            break
+    return nominal - tol, nominal + tol
+
+
+@dataclass(frozen=True)
+class SPCViolation:
+    """Western Electric rule violation on a control chart"""
+
+    recipe: str
+    hole_id: int
+    rule: int
+    description: str
+    value: float
+    center_line: float
+    ucl: float
+    lcl: float
+    timestamp: datetime
+
+
+@dataclass(frozen=True)
+class ChartSnapshot:
+    """Control limits and capability of one chart (recipe, hole)"""
+
+    recipe: str
+    hole_id: int
+    chart_type: str
+    count: int
+    points: int
+    limits_fixed: bool
+    center_line: float
+    ucl: float
+    lcl: float
+    range_center_line: float
+    range_ucl: float
+    range_lcl: float
+    sigma: float
+    mean: float
+    std: float
+    cp: Optional[float]
+    cpk: Optional[float]
+    pp: Optional[float]
+    ppk: Optional[float]
+    last_value: Optional[float]
+    violations: int
+
+
+class _RuleState:
+    """Sliding state for Western Electric rules 2-4 (fixed size, O(1) per point)"""
+
+    def __init__(self):
+        self.zone2: Deque[int] = deque(maxlen=3)  # +1/-1 beyond 2 sigma, else 0
+        self.zone1: Deque[int] = deque(maxlen=5)  # +1/-1 beyond 1 sigma, else 0
+        self.run_side = 0
+        self.run_length = 0
+
+    def evaluate(self, z: float, rules: Tuple[int, ...]) -> List[int]:
+        """Add a point given in sigma units from the center line, return fired rules"""
+        side = 1 if z > 0 else -1 if z < 0 else 0
+        self.zone2.append(side if abs(z) > 2 else 0)
+        self.zone1.append(side if abs(z) > 1 else 0)
+
+        if side != 0 and side == self.run_side:
+            self.run_length += 1
+        else:
+            self.run_side = side
+            self.run_length = 1 if side else 0
+
+        fired = []
+        if 1 in rules and abs(z) > 3:
+            fired.append(1)
+        if 2 in rules and side and self.zone2.count(side) >= 2:
+            fired.append(2)
+            self.zone2.clear()
+        if 3 in rules and side and self.zone1.count(side) >= 4:
+            fired.append(3)
+            self.zone1.clear()
+        if 4 in rules and self.run_length >= 8:
+            fired.append(4)
+            self.run_length = 0
+        return fired
+
+
+class ControlChart:
+    """Streaming I-MR or X-bar/R chart of one characteristic
+
+    The first `baseline_points` plotted points establish the control limits
+    (phase I); afterwards the limits stay fixed and every new point is
+    checked against the Western Electric rules (phase II). Capability uses
+    the within-subgroup sigma (Cp/Cpk) and the overall sigma (Pp/Ppk), both
+    maintained as running sums.
+    """
+
+    def __init__(self, config: SPCConfig):
+        self._config = config
+        self._individuals = config.chart_type != ChartType.XBAR_R
+        self._n = 2 if self._individuals else min(max(config.subgroup_size, 2), 10)
+
+        # All measurements (Welford) for Pp/Ppk
+        self.count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+        # Plotted points: individual values or subgroup means, with their ranges
+        self.points = 0
+        self._point_sum = 0.0
+        self._range_sum = 0.0
+        self._ranges = 0
+        self._previous: Optional[float] = None
+        self._subgroup: List[float] = []
+        self.last_value: Optional[float] = None
+
+        # Fixed control limits (set after the baseline)
+        self._limits: Optional[Tuple[float, float]] = None  # (center line, mean range)
+        self._rules = _RuleState()
+        self.violations = 0
+
+    @property
+    def limits_fixed(self) -> bool:
+        """Check if the baseline is complete"""
+        return self._limits is not None
+
+    def add(self, value: float) -> List[int]:
+        """Add one measurement, return the Western Electric rules it violated"""
+        self.count += 1
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+
+        if self._individuals:
+            point = value
+            if self._previous is not None:
+                self._range_sum += abs(value - self._previous)
+                self._ranges += 1
+            self._previous = value
+        else:
+            self._subgroup.append(value)
+            if len(self._subgroup) < self._n:
+                return []
+            point = sum(self._subgroup) / self._n
+            self._range_sum += max(self._subgroup) - min(self._subgroup)
+            self._ranges += 1
+            self._subgroup = []
+
+        self.points += 1
+        self._point_sum += point
+        self.last_value = point
+
+        if self._limits is None:
+            if self.points >= self._config.baseline_points and self._ranges > 0:
+                self._limits = (self._point_sum / self.points, self._range_sum / self._ranges)
+            return []
+
+        center, sigma = self.center_and_sigma()
+        if sigma <= 0:
+            return []
+        fired = self._rules.evaluate((point - center) / sigma, tuple(self._config.rules))
+        self.violations += len(fired)
+        return fired
+
+    def reset_limits(self) -> None:
+        """Start a new baseline (e.g. after a process change)"""
+        self.points = 0
+        self._point_sum = 0.0
+        self._range_sum = 0.0
+        self._ranges = 0
+        self._previous = None
+        self._subgroup = []
+        self._limits = None
+        self._rules = _RuleState()
+
+    def center_and_sigma(self) -> Tuple[float, float]:
+        """Center line and sigma of the plotted statistic"""
+        if self._limits is not None:
+            center, range_bar = self._limits
+        elif self._ranges:
+            center, range_bar = self._point_sum / self.points, self._range_sum / self._ranges
+        else:
+            return (self._mean, 0.0)
+
+        sigma_within = range_bar / _D2[self._n - 2]
+        if self._individuals:
+            return center, sigma_within
+        return center, sigma_within / math.sqrt(self._n)
+
+    def snapshot(self, recipe: str, hole_id: int, tolerance: Optional[ToleranceConfig]) -> ChartSnapshot:
+        """Get current limits and capability (against the hole's own limits in tolerance.holes)"""
+        center, sigma = self.center_and_sigma()
+        range_bar = self._limits[1] if self._limits else (self._range_sum / self._ranges if self._ranges else 0.0)
+
+        # Within-subgroup sigma of individual measurements
+        sigma_within = sigma if self._individuals else sigma * math.sqrt(self._n)
+        std = math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+        cp = cpk = pp = ppk = None
+        if tolerance is not None and tolerance.enabled:
+            spec = _spec_limits(tolerance, hole_id)
+            cp, cpk = self._capability(spec, sigma_within)
+            pp, ppk = self._capability(spec, std)
+
+        return ChartSnapshot(
+            recipe=recipe,
+            hole_id=hole_id,
+            chart_type=ChartType.INDIVIDUALS if self._individuals else ChartType.XBAR_R,
+            count=self.count,
+            points=self.points,
+            limits_fixed=self.limits_fixed,
+            center_line=center,
+            ucl=center + 3 * sigma,
+            lcl=center - 3 * sigma,
+            range_center_line=range_bar,
+            range_ucl=_D4[self._n - 2] * range_bar,
+            range_lcl=_D3[self._n - 2] * range_bar,
+            sigma=sigma,
+            mean=self._mean,
+            std=std,
+            cp=cp,
+            cpk=cpk,
+            pp=pp,
+            ppk=ppk,
+            last_value=self.last_value,
+            violations=self.violations,
+        )
+
+    def _capability(self, spec: Tuple[float, float], sigma: float) -> Tuple[Optional[float], Optional[float]]:
+        """Capability index pair (Cp, Cpk) for specification limits and a sigma estimate"""
+        if sigma <= 0 or self.count < 2:
+            return None, None
+        lsl, usl = spec
+        spread = (usl - lsl) / (6 * sigma)
+        centering = min(usl - self._mean, self._mean - lsl) / (3 * sigma)
+        return spread, centering
+
+
+class SPCService:
+    """Streaming SPC per recipe and hole ID
+
+    Every measured hole diameter is added to the chart of (recipe, hole_id);
+    rule violations are published as EventType.SPC_VIOLATION and can raise
+    the PLC error output, which stays set until acknowledge() (POST
+    /api/spc/acknowledge).
+    """
+
+    # Recipe name used when no recipe is active
+    NO_RECIPE = "default"
+
+    def __init__(self, config: Optional[SPCConfig] = None, io_service=None):
+        self._config = config or SPCConfig()
+        self._io_service = io_service
+        self._app_core: Optional[AppCore] = None
+        self._feed = False
+        self._charts: Dict[Tuple[str, int], ControlChart] = {}
+        self._tolerances: Dict[str, ToleranceConfig] = {}
+        self._violations: Deque[SPCViolation] = deque(maxlen=100)
+        self._io_error = False
+        self._lock = threading.Lock()
+
+    @property
+    def config(self) -> SPCConfig:
+        """Get SPC configuration"""
+        return self._config
+
+    @property
+    def io_error(self) -> bool:
+        """Check if violations set the PLC error output (until acknowledged)"""
+        return self._io_error
+
+    def attach(self, app_core: AppCore, feed: bool = True) -> None:
+        """Publish violations on AppCore and register as AppCore service "spc"
+
+        Args:
+            app_core: AppCore instance
+            feed: Also chart DETECTION_COMPLETE results published on app_core
+                (recipe from AppCore.current_recipe); set False when results
+                are passed to add_result() directly
+        """
+        self._app_core = app_core
+        self._feed = feed
+        if feed:
+            app_core.subscribe(EventType.DETECTION_COMPLETE, self._on_detection, name="spc")
+        app_core.register_service("spc", self)
+
+    def detach(self) -> None:
+        """Stop receiving results from and publishing to AppCore, unregister the service"""
+        if self._app_core is not None:
+            if self._feed:
+                self._app_core.unsubscribe(EventType.DETECTION_COMPLETE, self._on_detection)
+            if self._app_core.get_service("spc") is self:
+                self._app_core.unregister_service("spc")
+            self._app_core = None
+
+    def _on_detection(self, circles: Optional[List[CircleResult]]) -> None:
+        """AppCore DETECTION_COMPLETE handler"""
+        self.add_result(circles, recipe=self._app_core.current_recipe if self._app_core else None)
+
+    def set_tolerance(self, recipe: Optional[str], tolerance: ToleranceConfig) -> None:
+        """Set the specification limits used for Cp/Cpk of a recipe"""
+        with self._lock:
+            self._tolerances[recipe or self.NO_RECIPE] = tolerance
+
+    def add_result(
+        self,
+        circles: Optional[List[CircleResult]],
+        recipe: Optional[str] = None,
+        tolerance: Optional[ToleranceConfig] = None,
+        timestamp: Optional[float] = None,
+    ) -> List[SPCViolation]:
+        """Add the holes of one inspection to their charts
+
+        Args:
+            circles: Detected circles
+            recipe: Active recipe name
+            tolerance: Specification limits of the recipe (remembered for Cp/Cpk)
+            timestamp: Inspection time (default: now)
+
+        Returns:
+            Violations found in this inspection
+        """
+        if not circles:
+            return []
+        recipe = recipe or self.NO_RECIPE
+        when = datetime.fromtimestamp(time.time() if timestamp is None else timestamp)
+
+        violations = []
+        with self._lock:
+            if tolerance is not None:
+                self._tolerances[recipe] = tolerance
+
+            for circle in circles:
+                key = (recipe, circle.hole_id)
+                chart = self._charts.get(key)
+                if chart is None:
+                    chart = self._charts[key] = ControlChart(self._config)
+
+                fired = chart.add(circle.diameter_mm)
+                point = chart.last_value
+                if fired and point is not None:
+                    center, sigma = chart.center_and_sigma()
+                    for rule in fired:
+                        violations.append(
+                            SPCViolation(
+                                recipe=recipe,
+                                hole_id=circle.hole_id,
+                                rule=rule,
+                                description=_RULE_DESCRIPTIONS[rule],
+                                value=point,
+                                center_line=center,
+                                ucl=center + 3 * sigma,
+                                lcl=center - 3 * sigma,
+                                timestamp=when,
+                            )
+                        )
+            self._violations.extend(violations)
+
+        for violation in violations:
+            logger.warning(
+                f"SPC violation: recipe={violation.recipe} hole={violation.hole_id} "
+                f"rule {violation.rule} ({violation.description}), value={violation.value:.4f}"
+            )
+            if self._app_core is not None:
+                self._app_core.publish(EventType.SPC_VIOLATION, violation)
+
+        if violations and self._config.raise_io_error and self._io_service is not None:
+            self._io_service.set_error(True)
+            self._io_error = True
+
+        return violations
+
+    def acknowledge(self) -> bool:
+        """Clear the PLC error output raised by violations
+
+        Returns:
+            True if the error output was set
+        """
+        was_set = self._io_error
+        if self._config.raise_io_error and self._io_service is not None:
+            self._io_service.set_error(False)
+        self._io_error = False
+        if was_set:
+            logger.info("SPC violation acknowledged, PLC error output cleared")
+        return was_set
+
+    def reset_limits(self, recipe: Optional[str] = None, hole_id: Optional[int] = None) -> None:
+        """Re-establish control limits of matching charts from new data"""
+        with self._lock:
+            for (chart_recipe, chart_hole), chart in self._charts.items():
+                if (recipe is None or chart_recipe == recipe) and (hole_id is None or chart_hole == hole_id):
+                    chart.reset_limits()
+
+    def clear(self) -> None:
+        """Remove all charts and violations"""
+        with self._lock:
+            self._charts.clear()
+            self._violations.clear()
+
+    def get_charts(self, recipe: Optional[str] = None) -> List[ChartSnapshot]:
+        """Get snapshots of all charts (optionally of one recipe), ordered by recipe and hole"""
+        with self._lock:
+            return [
+                chart.snapshot(key[0], key[1], self._tolerances.get(key[0]))
+                for key, chart in sorted(self._charts.items())
+                if recipe is None or key[0] == recipe
+            ]
+
+    def get_chart(self, recipe: Optional[str], hole_id: int) -> Optional[ChartSnapshot]:
+        """Get snapshot of one chart"""
+        recipe = recipe or self.NO_RECIPE
+        with self._lock:
+            chart = self._charts.get((recipe, hole_id))
+            return chart.snapshot(recipe, hole_id, self._tolerances.get(recipe)) if chart else None
+
+    def get_violations(self, limit: int = 100) -> List[SPCViolation]:
+        """Get the most recent violations, newest first"""
+        with self._lock:
+            return list(self._violations)[::-1][:limit]
@@ -0,0 +1,422 @@
+"""Statistics Service - Incremental production statistics"""
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..core import AppCore, EventType
+from ..domain.entities import CircleResult
+from ..domain.enums import MeasureStatus
+
+logger = logging.getLogger(__name__)
+
+
+class P2Quantile:
+    """Streaming quantile estimate with the P² algorithm (Jain & Chlamtac)
+
+    Keeps five markers, so memory and update cost are O(1) regardless of
+    how many values were added.
+    """
+
+    def __init__(self, p: float):
+        if not 0 < p < 1:
+            raise ValueError("Quantile must be between 0 and 1")
+        self.p = p
+        self._heights: List[float] = []
+        self._positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self._desired = [1.0, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5.0]
+        self._increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x: float) -> None:
+        """Add a value"""
+        q = self._heights
+        if len(q) < 5:
+            q.append(x)
+            if len(q) == 5:
+                q.sort()
+            return
+
+        # Find the cell containing x, extending the extremes if needed
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        n = self._positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Move the middle markers towards their desired positions
+        for i in (1, 2, 3):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                height = self._parabolic(i, step)
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                q[i] = height
+                n[i] += step
+
+    def _parabolic(self, i: int, d: int) -> float:
+        """Piecewise-parabolic prediction of marker height"""
+        q, n = self._heights, self._positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    @property
+    def value(self) -> float:
+        """Current estimate (exact for fewer than 5 values, NaN if empty)"""
+        if not self._heights:
+            return math.nan
+        if len(self._heights) < 5:
+            ordered = sorted(self._heights)
+            return ordered[min(int(self.p * len(ordered)), len(ordered) - 1)]
+        return self._heights[2]
+
+
+class HoleStatistics:
+    """Running diameter statistics of one hole position (Welford + P²)"""
+
+    QUANTILES = (0.05, 0.5, 0.95)
+
+    def __init__(self):
+        self.count = 0
+        self.ok_count = 0
+        self.ng_count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._quantiles = [P2Quantile(p) for p in self.QUANTILES]
+
+    def add(self, diameter_mm: float, status: MeasureStatus) -> None:
+        """Add one measurement of this hole"""
+        self.count += 1
+        delta = diameter_mm - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (diameter_mm - self.mean)
+        self.min = min(self.min, diameter_mm)
+        self.max = max(self.max, diameter_mm)
+
+        if status == MeasureStatus.OK:
+            self.ok_count += 1
+        elif status == MeasureStatus.NG:
+            self.ng_count += 1
+
+        for quantile in self._quantiles:
+            quantile.add(diameter_mm)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance of the diameter"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def snapshot(self, hole_id: int) -> "HoleSnapshot":
+        """Get an immutable copy of the current values"""
+        p05, p50, p95 = (q.value for q in self._quantiles)
+        return HoleSnapshot(
+            hole_id=hole_id,
+            count=self.count,
+            ok_count=self.ok_count,
+            ng_count=self.ng_count,
+            mean_mm=self.mean,
+            std_mm=math.sqrt(self.variance),
+            min_mm=self.min,
+            max_mm=self.max,
+            p05_mm=p05,
+            p50_mm=p50,
+            p95_mm=p95,
+        )
+
+
+class SlidingWindow:
+    """Inspection counters over the last `span_s` seconds
+
+    Counts are kept in time buckets of `bucket_s` seconds; adding touches one
+    bucket and reading sums a fixed number of buckets.
+    """
+
+    def __init__(self, span_s: float, bucket_s: float):
+        self.span_s = span_s
+        self.bucket_s = bucket_s
+        self._size = max(int(math.ceil(span_s / bucket_s)), 1)
+        self._ids = [-1] * self._size
+        self._counts = [[0, 0, 0, 0] for _ in range(self._size)]
+
+    def add(self, timestamp: float, circles: int, ok: int, ng: int) -> None:
+        """Count one inspection"""
+        bucket_id = int(timestamp // self.bucket_s)
+        index = bucket_id % self._size
+        counts = self._counts[index]
+        if self._ids[index] != bucket_id:
+            self._ids[index] = bucket_id
+            counts[:] = [0, 0, 0, 0]
+        counts[0] += 1
+        counts[1] += circles
+        counts[2] += ok
+        counts[3] += ng
+
+    def totals(self, now: float) -> Tuple[int, int, int, int]:
+        """Sum inspections, circles, OK and NG within the window ending now"""
+        oldest = int(now // self.bucket_s) - self._size + 1
+        totals = [0, 0, 0, 0]
+        for bucket_id, counts in zip(self._ids, self._counts):
+            if bucket_id >= oldest:
+                for i in range(4):
+                    totals[i] += counts[i]
+        return totals[0], totals[1], totals[2], totals[3]
+
+
+@dataclass(frozen=True)
+class HoleSnapshot:
+    """Diameter statistics of one hole position"""
+
+    hole_id: int
+    count: int
+    ok_count: int
+    ng_count: int
+    mean_mm: float
+    std_mm: float
+    min_mm: float
+    max_mm: float
+    p05_mm: float
+    p50_mm: float
+    p95_mm: float
+
+
+@dataclass(frozen=True)
+class WindowSnapshot:
+    """Inspection counts within a time window"""
+
+    name: str
+    start: datetime
+    inspections: int
+    circles: int
+    ok_count: int
+    ng_count: int
+    ok_rate: float
+    throughput_per_minute: float
+
+
+@dataclass(frozen=True)
+class StatisticsSnapshot:
+    """Point-in-time copy of production statistics
+
+    OK/NG counts are per hole (circle); ok_parts/ng_parts per inspection.
+    """
+
+    total_inspections: int
+    total_circles: int
+    ok_count: int
+    ng_count: int
+    ok_parts: int
+    ng_parts: int
+    ok_rate: float
+    throughput_per_minute: float
+    runtime_seconds: float
+    session_start: datetime
+    last_result: Optional[MeasureStatus]
+    windows: Dict[str, WindowSnapshot] = field(default_factory=dict)
+    holes: Dict[int, HoleSnapshot] = field(default_factory=dict)
+
+
+class StatisticsService:
+    """Production statistics updated incrementally from detection results
+
+    add_result() costs O(holes) and never rescans past results. Readers get
+    a StatisticsSnapshot that is cached until the next result (or the next
+    second, since window counts age), so UI and API polling is cheap.
+    """
+
+    # Shift start hours of day (06:00, 14:00, 22:00)
+    DEFAULT_SHIFT_START_HOURS = (6, 14, 22)
+
+    def __init__(self, shift_start_hours: Sequence[int] = DEFAULT_SHIFT_START_HOURS):
+        if not shift_start_hours:
+            raise ValueError("At least one shift start hour is required")
+        self._shift_start_hours = sorted(shift_start_hours)
+        self._lock = threading.Lock()
+        self._app_core: Optional[AppCore] = None
+        self._reset_locked(time.time())
+
+    def _reset_locked(self, now: float) -> None:
+        """Clear all counters. Caller holds _lock (or is __init__)."""
+        self._session_start = now
+        self._inspections = 0
+        self._circles = 0
+        self._ok = 0
+        self._ng = 0
+        self._ok_parts = 0
+        self._ng_parts = 0
+        self._last_result: Optional[MeasureStatus] = None
+        self._holes: Dict[int, HoleStatistics] = {}
+        self._minute = SlidingWindow(60, 1)
+        self._hour = SlidingWindow(3600, 60)
+        self._shift_start = self.shift_start(now)
+        self._shift_counts = [0, 0, 0, 0]
+        self._version = 0
+        self._cached: Optional[Tuple[int, int, StatisticsSnapshot]] = None
+
+    # ========== Feeding ==========
+
+    def attach(self, app_core: AppCore) -> None:
+        """Feed from AppCore detection results and register as AppCore.statistics
+
+        Args:
+            app_core: AppCore instance publishing DETECTION_COMPLETE
+        """
+        self._app_core = app_core
+        app_core.subscribe(EventType.DETECTION_COMPLETE, self.add_result, name="statistics")
+        app_core.statistics = self
+
+    def detach(self) -> None:
+        """Stop receiving results from AppCore"""
+        if self._app_core is not None:
+            self._app_core.unsubscribe(EventType.DETECTION_COMPLETE, self.add_result)
+            if self._app_core.statistics is self:
+                self._app_core.statistics = None
+            self._app_core = None
+
+    def add_result(self, circles: Optional[List[CircleResult]], timestamp: Optional[float] = None) -> None:
+        """Count one inspection
+
+        Results without circles are ignored (nothing was inspected).
+
+        Args:
+            circles: Detected circles of one inspection
+            timestamp: Inspection time (default: now)
+        """
+        if not circles:
+            return
+        now = time.time() if timestamp is None else timestamp
+
+        ok = sum(1 for c in circles if c.status == MeasureStatus.OK)
+        ng = sum(1 for c in circles if c.status == MeasureStatus.NG)
+        overall = MeasureStatus.NG if ng else MeasureStatus.OK if ok == len(circles) else MeasureStatus.NONE
+
+        with self._lock:
+            self._inspections += 1
+            self._circles += len(circles)
+            self._ok += ok
+            self._ng += ng
+            if overall == MeasureStatus.NG:
+                self._ng_parts += 1
+            elif overall == MeasureStatus.OK:
+                self._ok_parts += 1
+            self._last_result = overall
+
+            for circle in circles:
+                hole = self._holes.get(circle.hole_id)
+                if hole is None:
+                    hole = self._holes[circle.hole_id] = HoleStatistics()
+                hole.add(circle.diameter_mm, circle.status)
+
+            self._minute.add(now, len(circles), ok, ng)
+            self._hour.add(now, len(circles), ok, ng)
+
+            shift_start = self.shift_start(now)
+            if shift_start != self._shift_start:
+                self._shift_start = shift_start
+                self._shift_counts = [0, 0, 0, 0]
+            counts = self._shift_counts
+            counts[0] += 1
+            counts[1] += len(circles)
+            counts[2] += ok
+            counts[3] += ng
+
+            self._version += 1
+
+    def reset(self) -> None:
+        """Reset all statistics and start a new session"""
+        with self._lock:
+            self._reset_locked(time.time())
+        logger.info("Statistics reset")
+
+    # ========== Reading ==========
+
+    def shift_start(self, timestamp: float) -> float:
+        """Get the start time of the shift containing timestamp"""
+        moment = datetime.fromtimestamp(timestamp)
+        midnight = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        # Latest shift start at or before the timestamp (previous day's last shift before the first)
+        start = midnight + timedelta(hours=self._shift_start_hours[-1]) - timedelta(days=1)
+        for hour in self._shift_start_hours:
+            candidate = midnight + timedelta(hours=hour)
+            if candidate <= moment:
+                start = candidate
+        return start.timestamp()
+
+    def snapshot(self) -> StatisticsSnapshot:
+        """Get current statistics (cached until the next result or second)"""
+        now = time.time()
+        second = int(now)
+
+        with self._lock:
+            cached = self._cached
+            if cached is not None and cached[0] == self._version and cached[1] == second:
+                return cached[2]
+
+            runtime = now - self._session_start
+            minutes = runtime / 60
+
+            shift_start = self.shift_start(now)
+            shift_counts = tuple(self._shift_counts) if shift_start == self._shift_start else (0, 0, 0, 0)
+
+            windows = {
+                "minute": self._window("minute", now - 60, self._minute.totals(now), 60),
+                "hour": self._window("hour", now - 3600, self._hour.totals(now), 3600),
+                "shift": self._window("shift", shift_start, shift_counts, now - shift_start),
+            }
+
+            snapshot = StatisticsSnapshot(
+                total_inspections=self._inspections,
+                total_circles=self._circles,
+                ok_count=self._ok,
+                ng_count=self._ng,
+                ok_parts=self._ok_parts,
+                ng_parts=self._ng_parts,
+                ok_rate=self._rate(self._ok, self._ng),
+                throughput_per_minute=self._inspections / minutes if minutes > 0 else 0.0,
+                runtime_seconds=runtime,
+                session_start=datetime.fromtimestamp(self._session_start),
+                last_result=self._last_result,
+                windows=windows,
+                holes={hole_id: hole.snapshot(hole_id) for hole_id, hole in sorted(self._holes.items())},
+            )
+            self._cached = (self._version, second, snapshot)
+            return snapshot
+
+    @staticmethod
+    def _rate(ok: int, ng: int) -> float:
+        """OK percentage of judged holes"""
+        total = ok + ng
+        return ok / total * 100 if total > 0 else 0.0
+
+    def _window(self, name: str, start: float, counts: Sequence[int], span_s: float) -> WindowSnapshot:
+        """Build a window snapshot from inspections/circles/OK/NG counts"""
+        inspections, circles, ok, ng = counts
+        return WindowSnapshot(
+            name=name,
+            start=datetime.fromtimestamp(start),
+            inspections=inspections,
+            circles=circles,
+            ok_count=ok,
+            ng_count=ng,
+            ok_rate=self._rate(ok, ng),
+            throughput_per_minute=inspections / (span_s / 60) if span_s > 0 else 0.0,
+        )
@@ -1,19 +1,29 @@
 """Thread Manager - Multi-threaded camera and processing management"""
 
+import itertools
 import logging
 import threading
+import time
+from concurrent.futures import Executor
 from queue import Queue, Empty, Full
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, Union
 from dataclasses import dataclass
 from datetime import datetime
 
 import numpy as np
 
 from .camera_service import BaslerGigECamera
+from .virtual_camera import VirtualCamera
 from .detector_service import CircleDetector
+from .classifier_service import CircleClassifier
+from .flight_recorder import FlightRecorder
 from .visualizer_service import CircleVisualizer
+from ..core.metrics import get_registry
+from ..core.profiler import profile_checkpoint
+from ..core.tracing import get_tracer
 from ..domain.entities import CircleResult
 from ..domain.config import ToleranceConfig
+from ..domain.recipe import Recipe
 
 logger = logging.getLogger(__name__)
 
@@ -27,15 +37,64 @@ class ProcessResult:
     circles: list
     timestamp: datetime
     processing_time_ms: float
+    frame_seq: int = 0
+    recipe: Optional[str] = None
 
 
-class ThreadManager:
-    """Manages camera and processing threads"""
+@dataclass(frozen=True)
+class RecipePipeline:
+    """Ready-to-run processing stages of one recipe
+
+    Swapped as a whole (see ThreadManager.set_pipeline); stages are never
+    shared between pipelines.
+    """
+
+    detector: CircleDetector
+    classifier: CircleClassifier
+    visualizer: CircleVisualizer
+    recipe: Optional[Recipe] = None
+
+    @property
+    def recipe_name(self) -> Optional[str]:
+        """Name of the recipe (None: manual settings)"""
+        return self.recipe.name if self.recipe else None
 
-    def __init__(self, camera: BaslerGigECamera, detector: CircleDetector, visualizer: CircleVisualizer):
+
+class ThreadManager:
+    """Manages camera and processing threads
+
+    By default each manager owns a dedicated processing thread. When an
+    executor is given (shared by several cameras, see CameraManager), frames
+    are submitted to it instead, with at most max_in_flight frames of this
+    camera being processed at once; further frames are dropped.
+
+    Stage times, queue depths, dropped frames and grab failures are recorded
+    in the metrics registry, labelled with the manager's name (camera ID).
+    Every grabbed frame gets a sequence number; its stages are recorded as
+    trace spans tagged with it.
+
+    Detector, classifier and visualizer form one RecipePipeline, read once
+    per frame: set_pipeline() swaps recipes between frames without stopping
+    the threads.
+    """
+
+    def __init__(
+        self,
+        camera: Union[BaslerGigECamera, VirtualCamera],
+        detector: CircleDetector,
+        visualizer: CircleVisualizer,
+        executor: Optional[Executor] = None,
+        max_in_flight: int = 1,
+        name: str = "default",
+    ):
+        self._name = name
         self._camera = camera
-        self._detector = detector
-        self._visualizer = visualizer
+        self._pipeline = RecipePipeline(detector, CircleClassifier(), visualizer)
+
+        # Shared worker pool (optional)
+        self._executor = executor
+        self._max_in_flight = max(max_in_flight, 1)
+        self._in_flight = threading.BoundedSemaphore(self._max_in_flight)
 
         # Queues for inter-thread communication
         self._frame_queue: Queue = Queue(maxsize=2)
@@ -52,10 +111,52 @@ class ThreadManager:
         # State
         self._is_running = False
         self._detection_enabled = True
-        self._tolerance_config = ToleranceConfig()
+        self._render_overlay = True
 
         # Callbacks
         self._on_result: Optional[Callable[[ProcessResult], None]] = None
+        self._flight_recorder: Optional[FlightRecorder] = None
+
+        self._frame_seq = itertools.count(1)
+        self._tracer = get_tracer()
+        self._init_metrics()
+
+    def _init_metrics(self) -> None:
+        """Look up this camera's metric children once (hot paths only update them)"""
+        registry = get_registry()
+        stage_time = registry.histogram(
+            "pipeline_stage_seconds", "Time spent in each pipeline stage", ("camera", "stage")
+        )
+        self._grab_time = stage_time.labels(camera=self._name, stage="grab")
+        self._detect_time = stage_time.labels(camera=self._name, stage="detect")
+        self._classify_time = stage_time.labels(camera=self._name, stage="classify")
+        self._visualize_time = stage_time.labels(camera=self._name, stage="visualize")
+        self._process_time = stage_time.labels(camera=self._name, stage="process")
+
+        queue_depth = registry.gauge("pipeline_queue_depth", "Items waiting in pipeline queues", ("camera", "queue"))
+        self._frame_queue_depth = queue_depth.labels(camera=self._name, queue="frame")
+        self._result_queue_depth = queue_depth.labels(camera=self._name, queue="result")
+
+        dropped = registry.counter(
+            "pipeline_dropped_frames_total", "Frames or results dropped by the pipeline", ("camera", "reason")
+        )
+        self._dropped_frame_queue = dropped.labels(camera=self._name, reason="frame_queue_full")
+        self._dropped_pool = dropped.labels(camera=self._name, reason="pool_saturated")
+        self._dropped_result = dropped.labels(camera=self._name, reason="result_queue_full")
+
+        grab_failures = registry.counter(
+            "camera_grab_failures_total", "Grabs that returned no frame or raised", ("camera", "reason")
+        )
+        self._grab_empty = grab_failures.labels(camera=self._name, reason="no_frame")
+        self._grab_error = grab_failures.labels(camera=self._name, reason="error")
+        self._frames_grabbed = registry.counter("camera_frames_total", "Frames grabbed", ("camera",)).labels(
+            camera=self._name
+        )
+
+    @property
+    def name(self) -> str:
+        """Name used to label metrics (camera ID)"""
+        return self._name
 
     @property
     def is_running(self) -> bool:
@@ -66,9 +167,33 @@ class ThreadManager:
         """Enable/disable detection processing"""
         self._detection_enabled = enabled
 
+    def set_render_overlay(self, enabled: bool) -> None:
+        """Enable/disable drawing overlays into display_frame
+
+        When disabled, display_frame is the clean frame and clients draw the
+        overlay themselves from the circle geometry (see OverlayFrame).
+        """
+        self._render_overlay = enabled
+
+    def set_flight_recorder(self, recorder: Optional[FlightRecorder]) -> None:
+        """Hand every grabbed frame to a flight recorder (None to stop)"""
+        self._flight_recorder = recorder
+
+    @property
+    def pipeline(self) -> RecipePipeline:
+        """Processing stages applied to the next frame"""
+        return self._pipeline
+
+    def set_pipeline(self, pipeline: RecipePipeline) -> None:
+        """Process following frames with another recipe's stages
+
+        Frames already being processed finish with the previous stages.
+        """
+        self._pipeline = pipeline
+
     def set_tolerance_config(self, config: ToleranceConfig) -> None:
-        """Update tolerance config"""
-        self._tolerance_config = config
+        """Update tolerance config of the current pipeline"""
+        self._pipeline.classifier.update_config(config)
 
     def set_result_callback(self, callback: Callable[[ProcessResult], None]) -> None:
         """Set callback for processing results"""
@@ -88,12 +213,15 @@ class ThreadManager:
         self._clear_queues()
 
         # Start camera thread
-        self._camera_thread = threading.Thread(target=self._camera_loop, daemon=True, name="CameraThread")
+        self._camera_thread = threading.Thread(target=self._camera_loop, daemon=True, name=f"CameraThread-{self._name}")
         self._camera_thread.start()
 
-        # Start processing thread
-        self._processing_thread = threading.Thread(target=self._processing_loop, daemon=True, name="ProcessingThread")
-        self._processing_thread.start()
+        # Start processing thread (not needed with a shared worker pool)
+        if self._executor is None:
+            self._processing_thread = threading.Thread(
+                target=self._processing_loop, daemon=True, name=f"ProcessingThread-{self._name}"
+            )
+            self._processing_thread.start()
 
         logger.info("Worker threads started")
 
@@ -112,9 +240,32 @@ class ThreadManager:
         if self._processing_thread and self._processing_thread.is_alive():
             self._processing_thread.join(timeout=2.0)
 
+        if self._executor is not None:
+            # Frames already on the shared pool finish (queued ones are skipped)
+            self._drain_in_flight(timeout=2.0)
+
         self._clear_queues()
         logger.info("Worker threads stopped")
 
+    def _drain_in_flight(self, timeout: float) -> bool:
+        """Wait until no frame of this camera is on the shared pool
+
+        Returns:
+            True if drained within timeout
+        """
+        deadline = time.monotonic() + timeout
+        acquired = 0
+        try:
+            for _ in range(self._max_in_flight):
+                if not self._in_flight.acquire(timeout=max(deadline - time.monotonic(), 0)):
+                    logger.warning(f"Frames of {self._name} still processing after stop")
+                    return False
+                acquired += 1
+            return True
+        finally:
+            for _ in range(acquired):
+                self._in_flight.release()
+
     def pause(self) -> None:
         """Pause processing"""
         self._pause_event.set()
@@ -126,9 +277,11 @@ class ThreadManager:
     def get_result(self, timeout: float = 0.1) -> Optional[ProcessResult]:
         """Get latest processing result from queue"""
         try:
-            return self._result_queue.get(timeout=timeout)
+            result = self._result_queue.get(timeout=timeout)
         except Empty:
             return None
+        self._result_queue_depth.set(self._result_queue.qsize())
+        return result
 
     def _clear_queues(self) -> None:
         """Clear all queues"""
@@ -149,6 +302,7 @@ class ThreadManager:
         logger.info("Camera thread started")
 
         while not self._stop_event.is_set():
+            profile_checkpoint()
             if self._pause_event.is_set():
                 self._stop_event.wait(0.1)
                 continue
@@ -158,15 +312,42 @@ class ThreadManager:
                 continue
 
             try:
+                grab_start = time.perf_counter_ns()
                 frame = self._camera.grab_frame(timeout_ms=500)
-                if frame is not None:
+                if frame is None:
+                    self._grab_empty.inc()
+                    continue
+
+                grabbed = time.perf_counter_ns()
+                seq = next(self._frame_seq)
+                self._grab_time.observe((grabbed - grab_start) / 1e9)
+                self._frames_grabbed.inc()
+                self._tracer.record("grab", grab_start, grabbed, frame_seq=seq, camera_id=self._name)
+
+                recorder = self._flight_recorder
+                if recorder is not None:
+                    recorder.record(frame, seq)
+
+                if self._executor is not None:
+                    # Submit to shared pool, drop if this camera is saturated
+                    if self._in_flight.acquire(blocking=False):
+                        try:
+                            self._executor.submit(self._process_pooled, frame, seq, grabbed)
+                        except RuntimeError:
+                            self._in_flight.release()
+                            raise
+                    else:
+                        self._dropped_pool.inc()
+                else:
                     # Try to put frame in queue, drop if full
                     try:
-                        self._frame_queue.put(frame, timeout=0.05)
+                        self._frame_queue.put((frame, seq, grabbed), timeout=0.05)
                     except Full:
-                        pass  # Drop frame if queue is full
+                        self._dropped_frame_queue.inc()
+                    self._frame_queue_depth.set(self._frame_queue.qsize())
 
             except Exception as e:
+                self._grab_error.inc()
                 logger.error(f"Camera thread error: {e}")
                 self._stop_event.wait(0.1)
 
@@ -177,56 +358,110 @@ class ThreadManager:
         logger.info("Processing thread started")
 
         while not self._stop_event.is_set():
+            profile_checkpoint()
             try:
                 # Get frame from queue
-                frame = self._frame_queue.get(timeout=0.1)
+                frame, seq, queued_ns = self._frame_queue.get(timeout=0.1)
             except Empty:
                 continue
 
+            self._frame_queue_depth.set(self._frame_queue.qsize())
             if self._pause_event.is_set():
                 continue
 
-            try:
-                start_time = datetime.now()
+            self._process_frame(frame, seq, queued_ns)
 
-                if self._detection_enabled:
-                    # Detect circles
-                    circles, binary = self._detector.detect(frame)
+        logger.info("Processing thread stopped")
 
-                    # Draw visualization
-                    display_frame = self._visualizer.draw(frame, circles, self._tolerance_config)
+    def _process_pooled(self, frame: np.ndarray, seq: int, queued_ns: int) -> None:
+        """Process a frame on the shared worker pool"""
+        profile_checkpoint()
+        try:
+            if not self._stop_event.is_set() and not self._pause_event.is_set():
+                self._process_frame(frame, seq, queued_ns)
+        finally:
+            self._in_flight.release()
+
+    def _process_frame(self, frame: np.ndarray, seq: int = 0, queued_ns: Optional[int] = None) -> None:
+        """Detect, visualize and publish one frame
+
+        Args:
+            frame: Grabbed frame
+            seq: Frame sequence number (tags trace spans and the result)
+            queued_ns: perf_counter_ns() when the frame was queued
+        """
+        tracer = self._tracer
+        tracer.set_frame(seq, self._name)
+        # One read per frame: a recipe switch never mixes stages within a frame
+        pipeline = self._pipeline
+        try:
+            start_time = datetime.now()
+            start = time.perf_counter_ns()
+            if queued_ns is not None:
+                tracer.record("queue_wait", queued_ns, start)
+
+            if self._detection_enabled:
+                # Detect circles (records preprocess/contours spans)
+                circles, binary = pipeline.detector.detect(frame)
+                detected = time.perf_counter_ns()
+                self._detect_time.observe((detected - start) / 1e9)
+
+                # Classify all circles once (sets circle.status)
+                pipeline.classifier.apply(circles)
+                classified = time.perf_counter_ns()
+                self._classify_time.observe((classified - detected) / 1e9)
+                tracer.record("classify", detected, classified)
+
+                if self._render_overlay:
+                    # Draw visualization (colors from circle.status)
+                    display_frame = pipeline.visualizer.draw(frame, circles)
+                    rendered = time.perf_counter_ns()
+                    self._visualize_time.observe((rendered - classified) / 1e9)
+                    tracer.record("render", classified, rendered)
                 else:
-                    circles = []
-                    display_frame = frame.copy()
-
-                # Calculate processing time
-                processing_time = (datetime.now() - start_time).total_seconds() * 1000
-
-                # Create result
-                result = ProcessResult(
-                    frame=frame,
-                    display_frame=display_frame,
-                    circles=circles,
-                    timestamp=start_time,
-                    processing_time_ms=processing_time,
-                )
-
-                # Put result in queue
+                    display_frame = frame
+            else:
+                circles = []
+                display_frame = frame
+
+            # Calculate processing time
+            elapsed = (time.perf_counter_ns() - start) / 1e9
+            self._process_time.observe(elapsed)
+            processing_time = elapsed * 1000
+
+            # Create result
+            result = ProcessResult(
+                frame=frame,
+                display_frame=display_frame,
+                circles=circles,
+                timestamp=start_time,
+                processing_time_ms=processing_time,
+                frame_seq=seq,
+                recipe=pipeline.recipe_name,
+            )
+
+            # Put result in queue (never blocks: the oldest result is replaced)
+            publish_start = time.perf_counter_ns()
+            try:
+                self._result_queue.put_nowait(result)
+            except Full:
+                # With a result callback the queue only keeps the latest results
+                # for get_result(); replacing one of them drops nothing
+                if self._on_result is None:
+                    self._dropped_result.inc()
                 try:
-                    self._result_queue.put(result, timeout=0.05)
-                except Full:
-                    # Replace oldest result
-                    try:
-                        self._result_queue.get_nowait()
-                        self._result_queue.put(result, timeout=0.05)
-                    except (Empty, Full):
-                        pass
-
-                # Call callback if set
-                if self._on_result:
-                    self._on_result(result)
-
-            except Exception as e:
-                logger.error(f"Processing thread error: {e}")
-
-        logger.info("Processing thread stopped")
+                    self._result_queue.get_nowait()
+                    self._result_queue.put_nowait(result)
+                except (Empty, Full):
+                    pass
+            self._result_queue_depth.set(self._result_queue.qsize())
+
+            # Call callback if set
+            if self._on_result:
+                self._on_result(result)
+            tracer.record("publish", publish_start, time.perf_counter_ns())
+
+        except Exception as e:
+            logger.error(f"Processing thread error: {e}")
+        finally:
+            tracer.set_frame(None)
@@ -0,0 +1,303 @@
+"""Thumbnail Service - Downscaled copies of saved images for the gallery"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from ..core import get_registry
+from .image_archive import ImageArchive
+
+logger = logging.getLogger(__name__)
+
+
+class ThumbnailSize:
+    """Downscaled variants of a saved image"""
+
+    THUMB = "thumb"  # Gallery grid tile
+    PREVIEW = "preview"  # Full-screen view in the browser
+
+
+# Long edge in pixels of each variant
+_MAX_EDGE = {ThumbnailSize.THUMB: 256, ThumbnailSize.PREVIEW: 1280}
+
+
+class ThumbnailService:
+    """Thumbnails and previews of archived images, with an LRU cache
+
+    submit() hands over an image that was just saved; a background thread
+    downscales it (preview from the full image, thumbnail from the preview)
+    and writes both as small JPEGs named by archive ID. get() serves from
+    a byte-bounded in-memory LRU cache, then from disk, and generates
+    missing variants from the saved file (e.g. images saved before
+    thumbnails were enabled or dropped from the queue). Variants are
+    deleted when the archive removes their image.
+    """
+
+    def __init__(
+        self,
+        archive: ImageArchive,
+        thumb_dir: str,
+        cache_bytes: int = 32 * 1024 * 1024,
+        max_pending: int = 4,
+        jpeg_quality: int = 85,
+    ):
+        """
+        Initialize service
+
+        Args:
+            archive: Index of the saved images
+            thumb_dir: Directory of the generated files
+            cache_bytes: Memory budget of the LRU cache
+            max_pending: Images queued for generation (oldest dropped when full)
+            jpeg_quality: JPEG quality of generated files (0-100)
+        """
+        self._archive = archive
+        self._thumb_dir = Path(thumb_dir)
+        self._cache_budget = cache_bytes
+        self._jpeg_params = [cv2.IMWRITE_JPEG_QUALITY, int(jpeg_quality)]
+
+        self._cache: "OrderedDict[Tuple[int, str], bytes]" = OrderedDict()
+        self._cache_bytes = 0
+        self._cache_lock = threading.Lock()
+
+        self._queue: Deque[Tuple[int, np.ndarray]] = deque(maxlen=max(max_pending, 1))
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._active = False
+
+        self._generated = 0
+        self._dropped = 0
+        self._hits = 0
+        self._misses = 0
+
+        registry = get_registry()
+        self._requests_metric = registry.counter(
+            "thumbnail_requests_total", "Thumbnail and preview lookups", ("source",)
+        )
+        self._generate_time = registry.histogram("thumbnail_generate_seconds", "Time to downscale and encode one image")
+        self._cache_metric = registry.gauge("thumbnail_cache_bytes", "Bytes held by the thumbnail cache")
+
+        archive.add_remove_listener(self._on_removed)
+
+    @property
+    def archive(self) -> ImageArchive:
+        """Index of the saved images"""
+        return self._archive
+
+    @property
+    def thumb_dir(self) -> Path:
+        """Directory of the generated files"""
+        return self._thumb_dir
+
+    def path_for(self, image_id: int, size: str) -> Path:
+        """File of one variant"""
+        return self._thumb_dir / size / f"{image_id}.jpg"
+
+    # ========== Generation ==========
+
+    def submit(self, image_id: int, image: np.ndarray) -> None:
+        """Queue a just-saved image for generation (never blocks)
+
+        The image is kept by reference and must not be modified afterwards.
+        """
+        with self._cond:
+            if self._thread is None:
+                self._running = True
+                self._thread = threading.Thread(target=self._generate_loop, name="ThumbnailWriter", daemon=True)
+                self._thread.start()
+            if len(self._queue) == self._queue.maxlen:
+                # deque drops the oldest; it is generated again when requested
+                self._dropped += 1
+            self._queue.append((image_id, image))
+            self._cond.notify_all()
+
+    def _generate_loop(self) -> None:
+        """Generate queued images until closed and drained"""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or not self._running)
+                if not self._queue:
+                    return
+                image_id, image = self._queue.popleft()
+                self._active = True
+
+            try:
+                self._generate(image_id, image)
+            except Exception as e:
+                logger.error(f"Failed to generate thumbnails of image {image_id}: {e}")
+            finally:
+                with self._cond:
+                    self._active = False
+                    self._cond.notify_all()
+
+    def _generate(self, image_id: int, image: np.ndarray) -> Dict[str, bytes]:
+        """Downscale, encode, write and cache all variants of an image"""
+        start = time.perf_counter()
+        if image.dtype != np.uint8:
+            normalized = np.empty(image.shape, dtype=np.uint8)
+            image = cv2.normalize(image, normalized, 0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U)
+
+        encoded = {}
+        # Largest first: each variant is downscaled from the previous one
+        for size in sorted(_MAX_EDGE, key=lambda size: _MAX_EDGE[size], reverse=True):
+            image = self._downscale(image, _MAX_EDGE[size])
+            ok, data = cv2.imencode(".jpg", image, self._jpeg_params)
+            if not ok:
+                raise ValueError("JPEG encoding failed")
+            encoded[size] = data.tobytes()
+
+            path = self.path_for(image_id, size)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(encoded[size])
+            self._cache_put((image_id, size), encoded[size])
+
+        self._generate_time.observe(time.perf_counter() - start)
+        with self._cond:
+            self._generated += 1
+        return encoded
+
+    @staticmethod
+    def _downscale(image: np.ndarray, max_edge: int) -> np.ndarray:
+        """Shrink so the long edge is at most max_edge (never enlarges)"""
+        height, width = image.shape[:2]
+        scale = max_edge / max(height, width)
+        if scale >= 1:
+            return image
+        size = (max(round(width * scale), 1), max(round(height * scale), 1))
+        return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until all queued images are generated
+
+        Returns:
+            True if the queue was drained within timeout
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._active, timeout=timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Generate pending images and stop the background thread"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=timeout)
+            self._thread = None
+
+    # ========== Lookup ==========
+
+    def get(self, image_id: int, size: str = ThumbnailSize.THUMB) -> Optional[bytes]:
+        """JPEG bytes of one variant (blocks while generating a missing one)
+
+        Returns:
+            JPEG data, or None if the image is not archived or can't be read
+        """
+        if size not in _MAX_EDGE:
+            raise ValueError(f"Unknown thumbnail size: {size}")
+
+        key = (image_id, size)
+        with self._cache_lock:
+            data = self._cache.get(key)
+            if data is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+        if data is not None:
+            self._requests_metric.labels(source="cache").inc()
+            return data
+
+        with self._cache_lock:
+            self._misses += 1
+        path = self.path_for(image_id, size)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            data = None
+        except OSError as e:
+            logger.warning(f"Failed to read {path}: {e}")
+            data = None
+        if data is not None:
+            self._requests_metric.labels(source="disk").inc()
+            self._cache_put(key, data)
+            return data
+
+        image = self._load_original(image_id)
+        if image is None:
+            return None
+        self._requests_metric.labels(source="generated").inc()
+        try:
+            return self._generate(image_id, image)[size]
+        except (OSError, ValueError, cv2.error) as e:
+            logger.error(f"Failed to generate thumbnails of image {image_id}: {e}")
+            return None
+
+    def _load_original(self, image_id: int) -> Optional[np.ndarray]:
+        """Read a saved image from disk"""
+        record = self._archive.get_by_id(image_id)
+        if record is None:
+            return None
+        try:
+            if record.path.endswith(".npy"):
+                return np.load(record.path, allow_pickle=False)
+            return cv2.imread(record.path, cv2.IMREAD_UNCHANGED)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read image {record.path}: {e}")
+            return None
+
+    # ========== Cache ==========
+
+    def _cache_put(self, key: Tuple[int, str], data: bytes) -> None:
+        """Insert as most recently used and evict least recently used over budget"""
+        with self._cache_lock:
+            previous = self._cache.pop(key, None)
+            if previous is not None:
+                self._cache_bytes -= len(previous)
+            if len(data) <= self._cache_budget:
+                self._cache[key] = data
+                self._cache_bytes += len(data)
+            while self._cache_bytes > self._cache_budget:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= len(evicted)
+            self._cache_metric.set(self._cache_bytes)
+
+    def _on_removed(self, image_ids: List[int]) -> None:
+        """Delete the variants of images removed from the archive"""
+        with self._cache_lock:
+            for image_id in image_ids:
+                for size in _MAX_EDGE:
+                    data = self._cache.pop((image_id, size), None)
+                    if data is not None:
+                        self._cache_bytes -= len(data)
+            self._cache_metric.set(self._cache_bytes)
+
+        for image_id in image_ids:
+            for size in _MAX_EDGE:
+                try:
+                    self.path_for(image_id, size).unlink(missing_ok=True)
+                except OSError as e:
+                    logger.warning(f"Failed to delete thumbnail of image {image_id}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get generation and cache statistics"""
+        with self._cond:
+            pending = len(self._queue)
+            generated = self._generated
+            dropped = self._dropped
+        with self._cache_lock:
+            return {
+                "pending": pending,
+                "generated": generated,
+                "dropped": dropped,
+                "cache_entries": len(self._cache),
+                "cache_bytes": self._cache_bytes,
+                "cache_hits": self._hits,
+                "cache_misses": self._misses,
+            }
@@ -0,0 +1,463 @@
+"""Virtual Camera Service - Simulated camera backend for hardware-free testing"""
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+import cv2
+import numpy as np
+
+from .camera_service import FeatureWriteReport, TriggerMode
+from ..domain.config import CameraConfig, VirtualCameraConfig
+
+logger = logging.getLogger(__name__)
+
+
+class VirtualCamera:
+    """
+    Drop-in replacement for BaslerGigECamera that produces frames without hardware
+
+    Frames come either from a pool of pre-rendered synthetic images (white holes
+    on a dark background) or from a replay source: a folder of images, a ``.npy``
+    sequence of shape (N, H, W[, C]) or a video file.
+
+    Trigger semantics follow the Basler camera:
+    - SOFTWARE: free-run at the configured frame rate (TriggerMode Off)
+    - HARDWARE: one frame per trigger, see fire_hardware_trigger()
+
+    Returned frames are read-only views into the frame pool; callers that need
+    to draw on a frame must copy it first (the visualizer already does).
+    """
+
+    IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+    DEVICE_INFO = {
+        "model": "Virtual Camera",
+        "serial": "VIRTUAL-0",
+        "name": "Virtual Camera (simulated)",
+    }
+
+    def __init__(self, config: Optional[VirtualCameraConfig] = None):
+        self._config = config or VirtualCameraConfig()
+        self._is_connected: bool = False
+        self._is_grabbing: bool = False
+        self._device_info: Optional[Dict] = None
+        self._trigger_mode: str = TriggerMode.SOFTWARE
+        self._exposure_us: float = 0.0
+
+        # Frame sources
+        self._frames: List[np.ndarray] = []
+        self._files: List[Path] = []
+        self._video: Optional[Any] = None
+        self._frame_index = 0
+
+        # Timing
+        self._next_frame_time: Optional[float] = None
+        self._stop_event = threading.Event()
+
+        # Hardware trigger state
+        self._trigger_cond = threading.Condition()
+        self._pending_triggers = 0
+
+        # Counters
+        self._frames_delivered = 0
+        self._frames_dropped = 0
+
+    @property
+    def config(self) -> VirtualCameraConfig:
+        """Get virtual camera config"""
+        return self._config
+
+    @property
+    def is_connected(self) -> bool:
+        """Check if camera is connected"""
+        return self._is_connected
+
+    @property
+    def is_grabbing(self) -> bool:
+        """Check if camera is grabbing"""
+        return self._is_grabbing
+
+    @property
+    def device_info(self) -> Optional[Dict]:
+        """Get connected device info"""
+        return self._device_info
+
+    @property
+    def trigger_mode(self) -> str:
+        """Get current trigger mode"""
+        return self._trigger_mode
+
+    @property
+    def frames_delivered(self) -> int:
+        """Number of frames returned by grab_frame"""
+        return self._frames_delivered
+
+    @property
+    def frames_dropped(self) -> int:
+        """Number of free-run frames skipped because the consumer was late"""
+        return self._frames_dropped
+
+    @staticmethod
+    def list_devices() -> List[Dict[str, Any]]:
+        """List the single virtual device"""
+        return [
+            {
+                "index": 0,
+                **VirtualCamera.DEVICE_INFO,
+                "ip": "N/A",
+                "vendor": "Simulation",
+            }
+        ]
+
+    def connect(self, device_index: int = 0, exposure_us: float = 50.0) -> bool:
+        """
+        Connect to the virtual camera and prepare its frame source
+
+        Args:
+            device_index: Ignored, there is only one virtual device
+            exposure_us: Initial exposure time in microseconds
+
+        Returns:
+            True if the frame source could be opened
+        """
+        if self._is_connected:
+            logger.warning("Already connected to a camera")
+            return True
+
+        try:
+            if self._config.source:
+                self._open_source(Path(self._config.source))
+            else:
+                self._frames = self._render_synthetic_frames()
+        except Exception as e:
+            logger.error(f"Failed to open virtual camera source: {e}")
+            self._release_source()
+            return False
+
+        self._exposure_us = exposure_us
+        self._trigger_mode = TriggerMode.SOFTWARE
+        self._frame_index = 0
+        self._frames_delivered = 0
+        self._frames_dropped = 0
+        self._device_info = dict(self.DEVICE_INFO)
+        self._is_connected = True
+        logger.info(f"Connected to virtual camera: {self._describe_source()}")
+        return True
+
+    def _open_source(self, source: Path) -> None:
+        """Open a replay source (image folder, .npy sequence or video file)"""
+        if source.is_dir():
+            self._files = sorted(p for p in source.iterdir() if p.suffix.lower() in self.IMAGE_EXTENSIONS)
+            if not self._files:
+                raise ValueError(f"No images found in {source}")
+            if self._config.preload:
+                self._frames = [self._read_image(p) for p in self._files]
+            return
+
+        if not source.exists():
+            raise FileNotFoundError(source)
+
+        if source.suffix.lower() == ".npy":
+            data = np.load(source, mmap_mode="r")
+            if data.ndim == 2 or (data.ndim == 3 and data.shape[2] in (1, 3)):
+                data = data[np.newaxis]
+            self._frames = [data[i] for i in range(data.shape[0])]
+            return
+
+        video = cv2.VideoCapture(str(source))
+        if not video.isOpened():
+            raise ValueError(f"Unsupported replay source: {source}")
+        self._video = video
+
+    def _read_image(self, path: Path) -> np.ndarray:
+        """Decode an image file as read-only BGR"""
+        frame = cv2.imread(str(path), cv2.IMREAD_COLOR)
+        if frame is None:
+            raise ValueError(f"Failed to read image: {path}")
+        frame.setflags(write=False)
+        return frame
+
+    def _render_synthetic_frames(self) -> List[np.ndarray]:
+        """Render the pool of synthetic frames (white holes on dark background)"""
+        cfg = self._config
+        rng = np.random.default_rng(cfg.seed)
+
+        cell_w = cfg.width / max(cfg.hole_cols, 1)
+        cell_h = cfg.height / max(cfg.hole_rows, 1)
+        base_radius = 0.3 * min(cell_w, cell_h)
+
+        frames = []
+        for _ in range(max(cfg.frame_pool_size, 1)):
+            frame = np.full((cfg.height, cfg.width, 3), 20, dtype=np.uint8)
+            for row in range(cfg.hole_rows):
+                for col in range(cfg.hole_cols):
+                    center = (int((col + 0.5) * cell_w), int((row + 0.5) * cell_h))
+                    radius = base_radius + rng.uniform(-cfg.radius_jitter_px, cfg.radius_jitter_px)
+                    cv2.circle(frame, center, max(int(round(radius)), 1), (255, 255, 255), -1, cv2.LINE_AA)
+            frame.setflags(write=False)
+            frames.append(frame)
+
+        return frames
+
+    def _describe_source(self) -> str:
+        """Human readable description of the frame source"""
+        if self._config.source:
+            return f"replay {self._config.source}"
+        cfg = self._config
+        return f"synthetic {cfg.width}x{cfg.height} @ {cfg.fps} fps"
+
+    def _release_source(self) -> None:
+        """Release replay resources"""
+        if self._video is not None:
+            self._video.release()
+            self._video = None
+        self._frames = []
+        self._files = []
+
+    def set_trigger_mode(self, mode: str) -> bool:
+        """
+        Set camera trigger mode
+
+        Args:
+            mode: TriggerMode.SOFTWARE or TriggerMode.HARDWARE
+
+        Returns:
+            True if successful
+        """
+        if not self._is_connected:
+            logger.warning("Cannot set trigger mode - camera not connected")
+            return False
+
+        with self._trigger_cond:
+            self._trigger_mode = TriggerMode.HARDWARE if mode == TriggerMode.HARDWARE else TriggerMode.SOFTWARE
+            self._pending_triggers = 0
+        self._next_frame_time = None
+        logger.info(f"Virtual camera trigger mode: {self._trigger_mode}")
+        return True
+
+    def execute_software_trigger(self) -> bool:
+        """
+        Execute a software trigger (for testing in hardware trigger mode)
+
+        Returns:
+            True if successful
+        """
+        if not self._is_connected:
+            return False
+
+        if self._trigger_mode == TriggerMode.HARDWARE:
+            self.fire_hardware_trigger()
+        logger.debug("Software trigger executed")
+        return True
+
+    def fire_hardware_trigger(self) -> None:
+        """Simulate a rising edge on the trigger line (e.g. from IOService)"""
+        with self._trigger_cond:
+            if self._trigger_mode != TriggerMode.HARDWARE:
+                return
+            self._pending_triggers += 1
+            self._trigger_cond.notify()
+
+    def disconnect(self) -> None:
+        """Disconnect from camera"""
+        if self._is_grabbing:
+            self.stop_grabbing()
+        self._release_source()
+        self._is_connected = False
+        self._device_info = None
+        logger.info("Virtual camera disconnected")
+
+    def start_grabbing(self) -> None:
+        """Start continuous frame grabbing"""
+        if not self._is_connected:
+            logger.warning("Cannot start grabbing - camera not connected")
+            return
+
+        if self._is_grabbing:
+            return
+
+        self._stop_event.clear()
+        self._next_frame_time = None
+        self._is_grabbing = True
+        logger.info("Started grabbing")
+
+    def stop_grabbing(self) -> None:
+        """Stop frame grabbing"""
+        if not self._is_grabbing:
+            return
+
+        self._is_grabbing = False
+        self._stop_event.set()
+        with self._trigger_cond:
+            self._trigger_cond.notify_all()
+        logger.info("Stopped grabbing")
+
+    def grab_frame(self, timeout_ms: int = 1000) -> Optional[np.ndarray]:
+        """
+        Grab a single frame, honouring frame rate, trigger mode and transport delay
+
+        Args:
+            timeout_ms: Timeout in milliseconds
+
+        Returns:
+            BGR image as read-only numpy array, or None on timeout
+        """
+        if not self._is_connected:
+            return None
+
+        if not self._is_grabbing:
+            self.start_grabbing()
+
+        timeout_s = timeout_ms / 1000.0
+
+        if self._trigger_mode == TriggerMode.HARDWARE:
+            if not self._wait_for_trigger(timeout_s):
+                return None
+            delay = self._config.transport_delay_ms / 1000.0
+            if delay > 0 and self._stop_event.wait(delay):
+                return None
+        elif not self._wait_for_frame_slot(timeout_s):
+            return None
+
+        try:
+            frame = self._next_frame()
+        except Exception as e:
+            logger.error(f"Error grabbing frame: {e}")
+            return None
+
+        if frame is not None:
+            self._frames_delivered += 1
+        return frame
+
+    def _wait_for_trigger(self, timeout_s: float) -> bool:
+        """Block until a trigger is pending, consuming it"""
+        with self._trigger_cond:
+            if not self._trigger_cond.wait_for(
+                lambda: self._pending_triggers > 0 or not self._is_grabbing, timeout=timeout_s
+            ):
+                return False
+            if not self._is_grabbing:
+                return False
+            self._pending_triggers -= 1
+            return True
+
+    def _wait_for_frame_slot(self, timeout_s: float) -> bool:
+        """Pace free-run grabs to the configured frame rate
+
+        Frames are "exposed" on a fixed schedule and delivered after the
+        transport delay. When the consumer falls behind, stale frames are
+        skipped like GrabStrategy_LatestImageOnly would.
+        """
+        fps = self._config.fps
+        delay = self._config.transport_delay_ms / 1000.0
+        now = time.perf_counter()
+
+        if fps <= 0:
+            return not (delay > 0 and self._stop_event.wait(delay))
+
+        period = 1.0 / fps
+        if self._next_frame_time is None:
+            self._next_frame_time = now
+        elif now - self._next_frame_time > period:
+            missed = int((now - self._next_frame_time) / period)
+            self._next_frame_time += missed * period
+            self._frames_dropped += missed
+
+        wait = self._next_frame_time + delay - now
+        if wait > timeout_s:
+            self._stop_event.wait(timeout_s)
+            return False
+        if wait > 0 and self._stop_event.wait(wait):
+            return False
+
+        self._next_frame_time += period
+        return True
+
+    def _next_frame(self) -> Optional[np.ndarray]:
+        """Return the next frame from the pool or replay source"""
+        if self._video is not None:
+            ok, frame = self._video.read()
+            if not ok and self._config.loop:
+                self._video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                ok, frame = self._video.read()
+            return frame if ok else None
+
+        count = len(self._frames) or len(self._files)
+        if count == 0:
+            return None
+
+        if self._frame_index >= count:
+            if not self._config.loop:
+                return None
+            self._frame_index = 0
+
+        index = self._frame_index
+        self._frame_index += 1
+
+        if not self._frames:
+            return self._read_image(self._files[index])
+
+        frame = self._frames[index]
+        if frame.ndim == 2 or frame.shape[2] == 1:
+            frame = cv2.cvtColor(np.ascontiguousarray(frame), cv2.COLOR_GRAY2BGR)
+            frame.setflags(write=False)
+        return frame
+
+    def set_exposure(self, exposure_us: float) -> None:
+        """
+        Set exposure time
+
+        Args:
+            exposure_us: Exposure time in microseconds
+        """
+        if not self._is_connected:
+            return
+
+        self._exposure_us = exposure_us
+        logger.info(f"Exposure set to {exposure_us}us")
+
+    def apply_settings(self, config: CameraConfig) -> Optional[FeatureWriteReport]:
+        """
+        Apply a recipe's camera settings, changing only what differs
+
+        The virtual camera has exposure and trigger mode (no gain).
+
+        Returns:
+            Features written and unchanged, or None if not connected
+        """
+        if not self._is_connected:
+            return None
+
+        start = time.perf_counter()
+        report = FeatureWriteReport()
+        if self._exposure_us == config.default_exposure_us:
+            report.unchanged.append("ExposureTime")
+        else:
+            self.set_exposure(config.default_exposure_us)
+            report.written.append("ExposureTime")
+
+        mode = TriggerMode.HARDWARE if config.trigger_mode == TriggerMode.HARDWARE else TriggerMode.SOFTWARE
+        if self._trigger_mode == mode:
+            report.unchanged.append("TriggerMode")
+        else:
+            self.set_trigger_mode(mode)
+            report.written.append("TriggerMode")
+
+        report.elapsed_ms = (time.perf_counter() - start) * 1000
+        return report
+
+    def get_info(self) -> Dict[str, Any]:
+        """Get camera information"""
+        if not self._is_connected:
+            return {"connected": False}
+
+        return {
+            "connected": True,
+            **(self._device_info or {}),
+            "exposure_us": self._exposure_us,
+            "source": self._describe_source(),
+            "frames_delivered": self._frames_delivered,
+            "frames_dropped": self._frames_dropped,
+        }
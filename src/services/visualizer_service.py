@@ -1,11 +1,14 @@
 """Circle Visualizer Service - Draw detection results on images"""
 
 import logging
-from typing import List, Optional, Tuple
+import math
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 import cv2
 import numpy as np
 
+from .classifier_service import CircleClassifier
 from ..domain.entities import CircleResult
 from ..domain.enums import MeasureStatus
 from ..domain.config import DetectionConfig, ToleranceConfig
@@ -13,6 +16,152 @@ from ..domain.config import DetectionConfig, ToleranceConfig
 logger = logging.getLogger(__name__)
 
 
+class LabelSprite(NamedTuple):
+    """Pre-rendered text, drawn with a masked copy"""
+
+    pixels: np.ndarray  # BGR, HxWx3
+    mask: np.ndarray  # uint8, HxW, nonzero on text and background pixels
+    origin: Tuple[int, int]  # (x, y) of the text baseline start inside the sprite
+
+
+class _Glyph(NamedTuple):
+    mask: np.ndarray
+    origin: Tuple[int, int]
+    advance: float
+
+
+class LabelSpriteCache:
+    """Cache of rendered label sprites
+
+    Glyph masks are rendered once per (character, font, scale, thickness).
+    A label is composed from its glyphs on first use and kept as a colored
+    sprite keyed by (text, font, scale, thickness, color, background) in an
+    LRU, so drawing it again is a NumPy masked copy instead of getTextSize
+    and putText. Composed glyphs are placed on whole pixels, so a label may
+    differ from cv2.putText by up to half a pixel per character.
+    """
+
+    def __init__(self, max_labels: int = 1024):
+        self._max_labels = max_labels
+        self._labels: "OrderedDict[tuple, LabelSprite]" = OrderedDict()
+        self._glyphs: Dict[tuple, _Glyph] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def clear(self) -> None:
+        """Remove all cached sprites"""
+        self._labels.clear()
+        self._glyphs.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        text: str,
+        font: int,
+        scale: float,
+        thickness: int,
+        color: Tuple[int, int, int],
+        background: Optional[Tuple[int, int, int]] = None,
+        padding: int = 0,
+    ) -> LabelSprite:
+        """Get the sprite of a label, rendering it on first use"""
+        key = (text, font, scale, thickness, color, background, padding)
+        sprite = self._labels.get(key)
+        if sprite is not None:
+            self._labels.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        sprite = self._render(text, font, scale, thickness, color, background, padding)
+        self._labels[key] = sprite
+        if len(self._labels) > self._max_labels:
+            self._labels.popitem(last=False)
+        return sprite
+
+    def prepare(self, chars: str, font: int, scale: float, thickness: int) -> None:
+        """Render the glyph masks of characters ahead of their first label"""
+        for char in chars:
+            self._glyph(char, font, scale, thickness)
+
+    def _glyph(self, char: str, font: int, scale: float, thickness: int) -> _Glyph:
+        key = (char, font, scale, thickness)
+        glyph = self._glyphs.get(key)
+        if glyph is None:
+            (width, height), baseline = cv2.getTextSize(char, font, scale, thickness)
+            # Fractional advance: width of a run of the character without the stroke padding
+            run_width = cv2.getTextSize(char * 10, font, scale, thickness)[0][0]
+            margin = thickness + 2
+            canvas = np.zeros((height + baseline + 2 * margin, width + 2 * margin), dtype=np.uint8)
+            origin = (margin, margin + height)
+            cv2.putText(canvas, char, origin, font, scale, 255, thickness)
+            glyph = _Glyph(canvas > 0, origin, (run_width - thickness) / 10)
+            self._glyphs[key] = glyph
+        return glyph
+
+    def _render(
+        self,
+        text: str,
+        font: int,
+        scale: float,
+        thickness: int,
+        color: Tuple[int, int, int],
+        background: Optional[Tuple[int, int, int]],
+        padding: int,
+    ) -> LabelSprite:
+        glyphs = [self._glyph(char, font, scale, thickness) for char in text]
+        (_, text_h), baseline = cv2.getTextSize(" ", font, scale, thickness)
+        text_w = int(round(sum(glyph.advance for glyph in glyphs))) + thickness
+
+        margin = max(padding, thickness + 2)
+        origin = (margin, margin + text_h)
+        mask = np.zeros((text_h + max(baseline, padding) + 2 * margin + 1, text_w + 2 * margin + 1), dtype=bool)
+        pixels = np.zeros((*mask.shape, 3), dtype=np.uint8)
+
+        if background is not None:
+            # Same box as cv2.rectangle((x - p, y - h - p), (x + w + p, y + p)) around the text
+            rows = slice(origin[1] - text_h - padding, origin[1] + padding + 1)
+            cols = slice(origin[0] - padding, origin[0] + text_w + padding + 1)
+            mask[rows, cols] = True
+            pixels[rows, cols] = background
+
+        cursor = float(origin[0])
+        for glyph in glyphs:
+            x = int(round(cursor)) - glyph.origin[0]
+            y = origin[1] - glyph.origin[1]
+            h, w = glyph.mask.shape
+            w = min(w, mask.shape[1] - x)
+            target = mask[y : y + h, x : x + w]
+            np.logical_or(target, glyph.mask[:, :w], out=target)
+            pixels[y : y + h, x : x + w][glyph.mask[:, :w]] = color
+            cursor += glyph.advance
+
+        return LabelSprite(pixels, mask.view(np.uint8), origin)
+
+    @staticmethod
+    def blit(frame: np.ndarray, sprite: LabelSprite, x: int, y: int) -> None:
+        """Draw a sprite with its text baseline starting at (x, y), clipped to the frame
+
+        cv2.copyTo writes through the frame view in place and is much faster
+        than a NumPy masked assignment for label-sized regions.
+        """
+        top = y - sprite.origin[1]
+        left = x - sprite.origin[0]
+        h, w = sprite.mask.shape
+        y0, x0 = max(top, 0), max(left, 0)
+        y1, x1 = min(top + h, frame.shape[0]), min(left + w, frame.shape[1])
+        if y0 >= y1 or x0 >= x1:
+            return
+
+        src_rows = slice(y0 - top, y1 - top)
+        src_cols = slice(x0 - left, x1 - left)
+        cv2.copyTo(sprite.pixels[src_rows, src_cols], sprite.mask[src_rows, src_cols], frame[y0:y1, x0:x1])
+
+
 class CircleVisualizer:
     """Service for visualizing circle detection results"""
 
@@ -25,23 +174,65 @@ class CircleVisualizer:
     COLOR_LABEL_BG = (0, 0, 0)  # Black
     COLOR_LABEL_TEXT = (255, 255, 255)  # White
 
+    # Label fonts
+    LABEL_FONT = cv2.FONT_HERSHEY_SIMPLEX
+    LABEL_SCALE = 0.5
+    ID_SCALE = 0.4
+    LABEL_PADDING = 3
+
+    # Center dot of the diameter lines (radius 3)
+    _DOT = np.array([[-1, -3], [1, -3], [3, -1], [3, 1], [1, 3], [-1, 3], [-3, 1], [-3, -1]], dtype=np.int32)
+
     def __init__(self, config: Optional[DetectionConfig] = None):
         self._config = config or DetectionConfig()
+        self._sprites = LabelSpriteCache()
+        self._classifier = CircleClassifier()
+        self._unit_circles: Dict[int, np.ndarray] = {}
+
+    @property
+    def sprite_cache(self) -> LabelSpriteCache:
+        """Label sprite cache (hit/miss counters)"""
+        return self._sprites
 
     def update_config(self, config: DetectionConfig) -> None:
         """Update visualization configuration"""
         self._config = config
 
+    def prepare(self, tolerance: Optional[ToleranceConfig] = None) -> None:
+        """Precompute drawing data of the configured size range
+
+        Renders label glyphs, edge polygons for every radius between the
+        min and max diameter, and hole-ID labels of the tolerance's holes,
+        so the first frames after a recipe switch draw at full speed.
+        """
+        self._sprites.prepare("D=0123456789.-m", self.LABEL_FONT, self.LABEL_SCALE, 1)
+        self._sprites.prepare("#0123456789", self.LABEL_FONT, self.ID_SCALE, 1)
+
+        px_per_mm = 1.0 / self._config.pixel_to_mm
+        # Vertex count stops growing at radius 230 (360 vertices)
+        min_radius = min(max(int(self._config.min_diameter_mm / 2 * px_per_mm), 1), 230)
+        max_radius = min(int(self._config.max_diameter_mm / 2 * px_per_mm) + 2, 230)
+        for radius in range(min_radius, max_radius + 1):
+            self._unit_circle(radius)
+
+        if tolerance is not None:
+            for hole in tolerance.holes:
+                self._sprites.get(f"#{hole.hole_id}", self.LABEL_FONT, self.ID_SCALE, 1, self.COLOR_LABEL_TEXT)
+
     def draw(
         self, frame: np.ndarray, circles: List[CircleResult], tolerance: Optional[ToleranceConfig] = None
     ) -> np.ndarray:
         """
         Draw detection results on frame
 
+        Edges and diameter lines are drawn in one batched call per color;
+        labels are blitted from the sprite cache. Colors follow circle.status
+        (set by CircleClassifier); circles are not modified.
+
         Args:
             frame: BGR image
             circles: List of detected circles
-            tolerance: Optional tolerance config for OK/NG coloring
+            tolerance: Optional tolerance config to color by instead of circle.status
 
         Returns:
             Frame with overlay drawn
@@ -50,86 +241,86 @@ class CircleVisualizer:
             return frame
 
         output = frame.copy()
+        if not circles:
+            return output
 
-        for circle in circles:
-            # Determine status color
-            color = self._get_status_color(circle, tolerance)
+        # Determine status colors
+        classification = self._classifier.classify(circles, tolerance) if tolerance else None
+        statuses = classification.statuses if classification else [circle.status for circle in circles]
+        colors = [self._get_status_color(status) for status in statuses]
 
-            # Update circle status based on tolerance
-            if tolerance and tolerance.enabled:
-                circle.status = self._check_tolerance(circle, tolerance)
+        if self._config.show_contours or self._config.show_diameter_line:
+            centers = np.array([(int(c.center_x), int(c.center_y)) for c in circles], dtype=np.int32)
+            radii = np.array([int(c.radius) for c in circles], dtype=np.int32)
 
-            # Draw circle edge
+            # Draw circle edges
             if self._config.show_contours:
-                self._draw_circle_edge(output, circle, color)
+                self._draw_circle_edges(output, centers, radii, colors)
 
-            # Draw diameter line
+            # Draw diameter lines
             if self._config.show_diameter_line:
-                self._draw_diameter_line(output, circle)
+                self._draw_diameter_lines(output, centers, radii)
 
-            # Draw label
-            if self._config.show_label:
+        # Draw labels
+        if self._config.show_label:
+            for circle, color in zip(circles, colors):
                 self._draw_label(output, circle, color)
 
         return output
 
-    def _get_status_color(self, circle: CircleResult, tolerance: Optional[ToleranceConfig]) -> Tuple[int, int, int]:
-        """Get color based on circle status and tolerance"""
-        if tolerance and tolerance.enabled:
-            status = self._check_tolerance(circle, tolerance)
-            if status == MeasureStatus.OK:
-                return self.COLOR_OK
-            elif status == MeasureStatus.NG:
-                return self.COLOR_NG
-            elif status == MeasureStatus.PARTIAL:
-                return self.COLOR_PARTIAL
-
-        # Default based on existing status
-        if circle.status == MeasureStatus.OK:
+    def _get_status_color(self, status: MeasureStatus) -> Tuple[int, int, int]:
+        """Get color of a circle status"""
+        if status == MeasureStatus.OK:
             return self.COLOR_OK
-        elif circle.status == MeasureStatus.NG:
+        elif status == MeasureStatus.NG:
             return self.COLOR_NG
-        elif circle.status == MeasureStatus.PARTIAL:
+        elif status == MeasureStatus.PARTIAL:
             return self.COLOR_PARTIAL
 
         return self.COLOR_EDGE
 
-    def _check_tolerance(self, circle: CircleResult, tolerance: ToleranceConfig) -> MeasureStatus:
-        """Check if circle is within tolerance"""
-        if not tolerance.enabled:
-            return MeasureStatus.OK
-
-        lower = tolerance.nominal_mm - tolerance.tolerance_mm
-        upper = tolerance.nominal_mm + tolerance.tolerance_mm
-
-        if lower <= circle.diameter_mm <= upper:
-            return MeasureStatus.OK
-        else:
-            return MeasureStatus.NG
-
-    def _draw_circle_edge(self, frame: np.ndarray, circle: CircleResult, color: Tuple[int, int, int]) -> None:
-        """Draw circle edge"""
-        center = (int(circle.center_x), int(circle.center_y))
-        radius = int(circle.radius)
-        cv2.circle(frame, center, radius, color, 2)
-
-    def _draw_diameter_line(self, frame: np.ndarray, circle: CircleResult) -> None:
-        """Draw diameter line through center"""
-        cx, cy = int(circle.center_x), int(circle.center_y)
-        r = int(circle.radius)
-
-        # Horizontal diameter line
-        pt1 = (cx - r, cy)
-        pt2 = (cx + r, cy)
-        cv2.line(frame, pt1, pt2, self.COLOR_DIAMETER, 1)
-
-        # Vertical diameter line
-        pt1 = (cx, cy - r)
-        pt2 = (cx, cy + r)
-        cv2.line(frame, pt1, pt2, self.COLOR_DIAMETER, 1)
-
-        # Center point
-        cv2.circle(frame, (cx, cy), 3, self.COLOR_DIAMETER, -1)
+    def _unit_circle(self, radius: int) -> np.ndarray:
+        """Unit circle polygon with enough vertices for the radius"""
+        vertices = int(min(max(math.pi * radius / 2, 16), 360))
+        # Round to a multiple of 8 so nearby radii share a polygon
+        vertices = (vertices + 7) // 8 * 8
+        unit = self._unit_circles.get(vertices)
+        if unit is None:
+            angles = np.linspace(0.0, 2 * math.pi, vertices, endpoint=False)
+            unit = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+            self._unit_circles[vertices] = unit
+        return unit
+
+    def _draw_circle_edges(
+        self, frame: np.ndarray, centers: np.ndarray, radii: np.ndarray, colors: List[Tuple[int, int, int]]
+    ) -> None:
+        """Draw circle edges, one polylines call per color
+
+        A thickness-2 edge is drawn as three concentric 1 px rings (r - 1, r,
+        r + 1): OpenCV strokes thick polylines segment by segment, which costs
+        as much as drawing each circle separately.
+        """
+        unit = self._unit_circle(int(radii.max()) + 1)
+        rings = np.array([-1, 0, 1])
+        for color in set(colors):
+            index = [i for i, c in enumerate(colors) if c == color]
+            ring_radii = (radii[index, None] + rings[None, :]).reshape(-1)
+            ring_centers = np.repeat(centers[index], len(rings), axis=0)
+            points = ring_centers[:, None, :] + ring_radii[:, None, None] * unit[None, :, :]
+            cv2.polylines(frame, list(np.rint(points).astype(np.int32)), True, color, 1, cv2.LINE_4)
+
+    def _draw_diameter_lines(self, frame: np.ndarray, centers: np.ndarray, radii: np.ndarray) -> None:
+        """Draw horizontal and vertical diameter lines and center points"""
+        offsets = np.zeros((len(radii), 2, 2, 2), dtype=np.int32)
+        offsets[:, 0, 0, 0] = -radii  # Horizontal: (cx - r, cy) .. (cx + r, cy)
+        offsets[:, 0, 1, 0] = radii
+        offsets[:, 1, 0, 1] = -radii  # Vertical: (cx, cy - r) .. (cx, cy + r)
+        offsets[:, 1, 1, 1] = radii
+        lines = (centers[:, None, None, :] + offsets).reshape(-1, 2, 2)
+        cv2.polylines(frame, list(lines), False, self.COLOR_DIAMETER, 1)
+
+        dots = centers[:, None, :] + self._DOT[None, :, :]
+        cv2.fillPoly(frame, list(dots), self.COLOR_DIAMETER)
 
     def _draw_label(self, frame: np.ndarray, circle: CircleResult, color: Tuple[int, int, int]) -> None:
         """Draw measurement label"""
@@ -144,26 +335,15 @@ class CircleVisualizer:
         if label_y < 20:
             label_y = int(circle.center_y + circle.radius + 25)
 
-        # Get text size
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        font_scale = 0.5
-        thickness = 1
-        (text_w, text_h), baseline = cv2.getTextSize(label, font, font_scale, thickness)
-
-        # Draw background rectangle
-        padding = 3
-        bg_pt1 = (label_x - padding, label_y - text_h - padding)
-        bg_pt2 = (label_x + text_w + padding, label_y + padding)
-        cv2.rectangle(frame, bg_pt1, bg_pt2, self.COLOR_LABEL_BG, -1)
-
-        # Draw text
-        cv2.putText(frame, label, (label_x, label_y), font, font_scale, color, thickness)
+        # Draw text on background rectangle
+        sprite = self._sprites.get(
+            label, self.LABEL_FONT, self.LABEL_SCALE, 1, color, self.COLOR_LABEL_BG, self.LABEL_PADDING
+        )
+        LabelSpriteCache.blit(frame, sprite, label_x, label_y)
 
         # Draw hole ID
-        id_label = f"#{circle.hole_id}"
-        id_x = int(circle.center_x - 10)
-        id_y = int(circle.center_y + 5)
-        cv2.putText(frame, id_label, (id_x, id_y), font, 0.4, self.COLOR_LABEL_TEXT, 1)
+        id_sprite = self._sprites.get(f"#{circle.hole_id}", self.LABEL_FONT, self.ID_SCALE, 1, self.COLOR_LABEL_TEXT)
+        LabelSpriteCache.blit(frame, id_sprite, int(circle.center_x - 10), int(circle.center_y + 5))
 
     def draw_binary_overlay(self, frame: np.ndarray, binary: np.ndarray, alpha: float = 0.3) -> np.ndarray:
         """
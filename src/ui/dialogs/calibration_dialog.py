@@ -7,11 +7,14 @@ import logging
 
 import numpy as np
 
-from ...services.calibration_service import CalibrationService
+from ...services.calibration_service import CalibrationJob, CalibrationService
 from ...domain.entities import CalibrationData
 
 logger = logging.getLogger(__name__)
 
+# How often the dialog checks a running auto-calibration (ms)
+JOB_POLL_INTERVAL = 100
+
 
 class CalibrationDialog(tk.Toplevel):
     """Dialog for performing camera calibration"""
@@ -26,7 +29,7 @@ class CalibrationDialog(tk.Toplevel):
         super().__init__(parent)
 
         self.title("Camera Calibration")
-        self.geometry("450x400")
+        self.geometry("450x560")
         self.resizable(False, False)
         self.transient(parent)
         self.grab_set()
@@ -36,9 +39,12 @@ class CalibrationDialog(tk.Toplevel):
         self._on_complete = on_calibration_complete
         self._current_frame: Optional[np.ndarray] = None
         self._measured_diameter_px: Optional[float] = None
+        self._job: Optional[CalibrationJob] = None
+        self._poll_job_id: Optional[str] = None
 
         self._setup_ui()
         self._update_info()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
     def _setup_ui(self) -> None:
         """Setup dialog UI"""
@@ -80,7 +86,7 @@ class CalibrationDialog(tk.Toplevel):
 
         ttk.Separator(method_frame, orient=tk.HORIZONTAL).pack(fill=tk.X, pady=10)
 
-        # Option 2: Auto-detect from frame
+        # Option 2: Auto-detect from live frames (runs in the background)
         auto_frame = ttk.Frame(method_frame)
         auto_frame.pack(fill=tk.X, pady=5)
 
@@ -94,20 +100,47 @@ class CalibrationDialog(tk.Toplevel):
         self.known_mm_entry = ttk.Entry(auto_entry_frame, textvariable=self.known_mm_var, width=10)
         self.known_mm_entry.pack(side=tk.LEFT, padx=5)
 
+        ttk.Label(auto_entry_frame, text="Frames:").pack(side=tk.LEFT)
+        self.frames_var = tk.IntVar(value=10)
+        self.frames_spin = ttk.Spinbox(auto_entry_frame, from_=1, to=100, textvariable=self.frames_var, width=5)
+        self.frames_spin.pack(side=tk.LEFT, padx=5)
+
         btn_frame = ttk.Frame(auto_frame)
         btn_frame.pack(fill=tk.X, pady=5)
 
         self.capture_btn = ttk.Button(btn_frame, text="Capture Frame", command=self._on_capture_frame)
         self.capture_btn.pack(side=tk.LEFT, padx=(0, 5))
 
-        self.auto_btn = ttk.Button(
-            btn_frame, text="Detect & Calibrate", command=self._on_auto_calibrate, state=tk.DISABLED
-        )
+        self.auto_btn = ttk.Button(btn_frame, text="Detect & Calibrate", command=self._on_auto_calibrate)
         self.auto_btn.pack(side=tk.LEFT)
 
+        self.auto_progress = ttk.Progressbar(auto_frame, mode="determinate", maximum=1)
+        self.auto_progress.pack(fill=tk.X, pady=(5, 0))
+
         self.capture_status = ttk.Label(auto_frame, text="No frame captured")
         self.capture_status.pack(anchor=tk.W)
 
+        ttk.Separator(method_frame, orient=tk.HORIZONTAL).pack(fill=tk.X, pady=10)
+
+        # Option 3: Dot grid plate (field correction, uses the captured frame)
+        grid_frame = ttk.Frame(method_frame)
+        grid_frame.pack(fill=tk.X, pady=5)
+
+        ttk.Label(grid_frame, text="Grid Plate (field correction):").pack(anchor=tk.W)
+
+        grid_entry_frame = ttk.Frame(grid_frame)
+        grid_entry_frame.pack(fill=tk.X, pady=5)
+
+        ttk.Label(grid_entry_frame, text="Dot pitch (mm):").pack(side=tk.LEFT)
+        self.pitch_mm_var = tk.DoubleVar(value=5.0)
+        self.pitch_mm_entry = ttk.Entry(grid_entry_frame, textvariable=self.pitch_mm_var, width=10)
+        self.pitch_mm_entry.pack(side=tk.LEFT, padx=5)
+
+        self.grid_btn = ttk.Button(
+            grid_entry_frame, text="Calibrate (Grid)", command=self._on_grid_calibrate, state=tk.DISABLED
+        )
+        self.grid_btn.pack(side=tk.LEFT)
+
         # Bottom buttons
         btn_bottom = ttk.Frame(main_frame)
         btn_bottom.pack(fill=tk.X, pady=(15, 0))
@@ -115,7 +148,7 @@ class CalibrationDialog(tk.Toplevel):
         self.reset_btn = ttk.Button(btn_bottom, text="Reset to Default", command=self._on_reset)
         self.reset_btn.pack(side=tk.LEFT)
 
-        self.close_btn = ttk.Button(btn_bottom, text="Close", command=self.destroy)
+        self.close_btn = ttk.Button(btn_bottom, text="Close", command=self._on_close)
         self.close_btn.pack(side=tk.RIGHT)
 
     def _update_info(self) -> None:
@@ -130,6 +163,10 @@ class CalibrationDialog(tk.Toplevel):
             text += f"Pixel to mm: {info['pixel_to_mm']:.6f} mm/px\n"
             text += f"Calibrated at: {info['calibrated_at']}\n"
             text += f"Reference: {info['reference_mm']:.3f} mm = {info['reference_px']:.1f} px"
+            field = info.get("scale_field")
+            if field:
+                text += f"\nField: {field['rows']}x{field['cols']}, "
+                text += f"{field['min_factor']:.4f}-{field['max_factor']:.4f}"
         else:
             text = f"Status: Using defaults\n"
             text += f"Pixel to mm: {info['pixel_to_mm']:.6f} mm/px\n"
@@ -170,42 +207,120 @@ class CalibrationDialog(tk.Toplevel):
 
         self._current_frame = frame.copy()
         self.capture_status.config(text=f"Frame captured: {frame.shape[1]}x{frame.shape[0]}")
-        self.auto_btn.config(state=tk.NORMAL)
+        self.grid_btn.config(state=tk.NORMAL)
         logger.info("Calibration frame captured")
 
     def _on_auto_calibrate(self) -> None:
-        """Auto-detect circle and calibrate"""
+        """Start auto-calibration over live frames in the background"""
+        try:
+            known_mm = self.known_mm_var.get()
+            frames = self.frames_var.get()
+
+            if known_mm <= 0:
+                messagebox.showerror("Error", "Known diameter must be positive")
+                return
+            if frames < 1:
+                messagebox.showerror("Error", "Frames must be at least 1")
+                return
+
+            self._job = self._calibration_service.start_auto_calibration(self._get_frame, known_mm, frames)
+
+        except Exception as e:
+            logger.error(f"Auto-calibration error: {e}")
+            messagebox.showerror("Error", f"Auto-calibration failed: {e}")
+            return
+
+        self._set_auto_running(True)
+        self._poll_job()
+
+    def _poll_job(self) -> None:
+        """Show progress of the running auto-calibration and its result when done"""
+        job = self._job
+        if job is None:
+            return
+
+        measured, frames = job.progress
+        self.auto_progress.config(maximum=frames, value=measured)
+        self.capture_status.config(text=f"Measuring frame {min(measured + 1, frames)}/{frames}...")
+
+        if not job.is_done:
+            self._poll_job_id = self.after(JOB_POLL_INTERVAL, self._poll_job)
+            return
+
+        self._job = None
+        self._poll_job_id = None
+        self._set_auto_running(False)
+
+        calibration = job.result
+        if calibration is None:
+            self.capture_status.config(text=f"Auto-calibration failed: {job.error}")
+            messagebox.showwarning(
+                "Warning",
+                f"Auto-calibration failed: {job.error}.\nPlease ensure a circular reference object is clearly visible.",
+            )
+            return
+
+        found = len(job.diameters_px)
+        self.capture_status.config(text=f"Calibrated from {found - job.rejected}/{frames} frames")
+        self._update_info()
+
+        messagebox.showinfo(
+            "Success",
+            f"Auto-calibration complete!\nPixel to mm: {calibration.pixel_to_mm:.6f}\n"
+            f"Frames used: {found - job.rejected} ({job.rejected} outliers rejected)",
+        )
+
+        if self._on_complete:
+            self._on_complete(calibration)
+
+    def _set_auto_running(self, running: bool) -> None:
+        """Disable calibration buttons while auto-calibration runs"""
+        state = tk.DISABLED if running else tk.NORMAL
+        for button in (self.auto_btn, self.manual_btn, self.reset_btn, self.capture_btn):
+            button.config(state=state)
+        self.grid_btn.config(state=tk.DISABLED if running or self._current_frame is None else tk.NORMAL)
+
+    def _on_close(self) -> None:
+        """Cancel a running auto-calibration and close"""
+        if self._job is not None:
+            self._job.cancel()
+        if self._poll_job_id is not None:
+            self.after_cancel(self._poll_job_id)
+        self.destroy()
+
+    def _on_grid_calibrate(self) -> None:
+        """Calibrate with field correction from a dot grid plate"""
         if self._current_frame is None:
             messagebox.showwarning("Warning", "Please capture a frame first")
             return
 
         try:
-            known_mm = self.known_mm_var.get()
+            pitch_mm = self.pitch_mm_var.get()
 
-            if known_mm <= 0:
-                messagebox.showerror("Error", "Known diameter must be positive")
+            if pitch_mm <= 0:
+                messagebox.showerror("Error", "Dot pitch must be positive")
                 return
 
-            calibration = self._calibration_service.calibrate_from_circle(self._current_frame, known_mm)
+            calibration = self._calibration_service.calibrate_from_grid(self._current_frame, pitch_mm)
 
             if calibration is None:
                 messagebox.showwarning(
                     "Warning",
-                    "Could not detect a circle in the captured frame.\n"
-                    "Please ensure a circular reference object is clearly visible.",
+                    "Could not find a regular dot grid in the captured frame.\n"
+                    "Please ensure the grid plate fills the field of view.",
                 )
                 return
 
             self._update_info()
 
-            messagebox.showinfo("Success", f"Auto-calibration complete!\nPixel to mm: {calibration.pixel_to_mm:.6f}")
+            messagebox.showinfo("Success", f"Grid calibration complete!\nPixel to mm: {calibration.pixel_to_mm:.6f}")
 
             if self._on_complete:
                 self._on_complete(calibration)
 
         except Exception as e:
-            logger.error(f"Auto-calibration error: {e}")
-            messagebox.showerror("Error", f"Auto-calibration failed: {e}")
+            logger.error(f"Grid calibration error: {e}")
+            messagebox.showerror("Error", f"Grid calibration failed: {e}")
 
     def _on_reset(self) -> None:
         """Reset calibration to defaults"""
@@ -3,17 +3,27 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import logging
-from typing import Optional, List
+import time
+from functools import partial
+from typing import Optional, List, Union
 
+from ..core import AppCore, get_tracer, profile_checkpoint
 from ..services.camera_service import BaslerGigECamera
+from ..services.virtual_camera import VirtualCamera
 from ..services.detector_service import CircleDetector
 from ..services.visualizer_service import CircleVisualizer
 from ..services.calibration_service import CalibrationService
-from ..services.thread_manager import ThreadManager, ProcessResult
+from ..services.thread_manager import ThreadManager, ProcessResult, RecipePipeline
 from ..services.recipe_service import RecipeService
+from ..services.recipe_switcher import RecipeSwitcher
 from ..services.image_saver import ImageSaver
+from ..services.measurement_log import MeasurementLog
+from ..services.flight_recorder import FlightRecorder
+from ..services.measurement_store import MeasurementStore
+from ..services.spc_service import SPCService
+from ..services.statistics_service import StatisticsService
 from ..services.io_service import IOService
-from ..domain.config import DetectionConfig, ToleranceConfig
+from ..domain.config import CameraConfig, DetectionConfig, ToleranceConfig
 from ..domain.io_config import IOConfig, IOMode
 from ..domain.entities import CircleResult, CalibrationData
 from ..domain.enums import MeasureStatus
@@ -44,23 +54,55 @@ logger = logging.getLogger(__name__)
 class MainWindow:
     """Main application window with multi-threaded processing"""
 
-    def __init__(self):
+    def __init__(self, camera: Optional[Union[BaslerGigECamera, VirtualCamera]] = None):
         self._root = tk.Tk()
         self._root.title(f"{APP_NAME} v{APP_VERSION}")
         self._root.geometry(f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}")
         self._root.minsize(1000, 700)
 
         # Services
-        self._camera = BaslerGigECamera()
+        self._camera = camera or BaslerGigECamera()
         self._calibration = CalibrationService()
         self._detector = CircleDetector()
         self._visualizer = CircleVisualizer()
         self._recipe_service = RecipeService()
-        self._image_saver = ImageSaver()
+        # NG images are linked from the measurement log instead of sidecar JSON files
+        self._image_saver = ImageSaver(sidecar_json=False, thumbnails=True)
+        # Web gallery
+        AppCore().register_service("image_saver", self._image_saver)
+        self._measurement_log = MeasurementLog()
+        self._measurement_log.start()
         self._io_service = IOService()
+        self._measurement_store = MeasurementStore()
+        self._measurement_store.start()
+        # History queries beyond the in-memory ring (web API)
+        AppCore().measurement_store = self._measurement_store
+
+        # Statistics shared with the web API
+        self._statistics = StatisticsService()
+        AppCore().statistics = self._statistics
+
+        # SPC control charts (violations are published on AppCore)
+        self._spc = SPCService(io_service=self._io_service)
+        self._spc.attach(AppCore(), feed=False)
+
+        # Flight recorder: last seconds of raw frames, dumped around NG parts
+        self._flight_recorder = FlightRecorder()
+        self._flight_recorder.attach(AppCore(), feed=False)
+        self._flight_recorder.start()
 
         # Thread manager
         self._thread_manager = ThreadManager(self._camera, self._detector, self._visualizer)
+        self._thread_manager.set_flight_recorder(self._flight_recorder)
+
+        # PLC recipe bits swap between pre-built recipe pipelines (applied to the UI in _update_ui)
+        self._pending_pipeline: Optional[RecipePipeline] = None
+        self._recipe_switcher = RecipeSwitcher(self._recipe_service, scale_field=self._calibration.scale_field)
+        self._recipe_switcher.add_target(self._thread_manager)
+        self._recipe_switcher.add_camera(self._camera)
+        self._recipe_switcher.add_listener(self._on_recipe_switched)
+        self._recipe_switcher.prepare()
+        self._recipe_switcher.attach(self._io_service)
 
         # Apply calibration to detector
         self._apply_calibration()
@@ -227,7 +269,7 @@ class MainWindow:
         self.history_panel.pack(fill=tk.X, pady=(0, 10))
 
         # Statistics panel
-        self.statistics_panel = StatisticsPanel(right_frame)
+        self.statistics_panel = StatisticsPanel(right_frame, self._statistics)
         self.statistics_panel.pack(fill=tk.X, pady=(0, 10))
 
         # IO Panel
@@ -255,6 +297,8 @@ class MainWindow:
         config = self._detector.config
         config.pixel_to_mm = self._calibration.pixel_to_mm
         self._detector.update_config(config)
+        self._detector.set_scale_field(self._calibration.scale_field)
+        self._recipe_switcher.set_scale_field(self._calibration.scale_field)
         logger.info(f"Applied calibration: {config.pixel_to_mm:.6f} mm/px")
 
     def _update_calibration_label(self) -> None:
@@ -283,7 +327,7 @@ class MainWindow:
     def _on_camera_refresh(self):
         """Refresh camera device list"""
         self._update_status("Scanning for cameras...")
-        devices = BaslerGigECamera.list_devices()
+        devices = self._camera.list_devices()
         self._update_status(f"Found {len(devices)} camera(s)")
         return devices
 
@@ -352,6 +396,7 @@ class MainWindow:
 
     def _start_processing(self) -> None:
         """Start multi-threaded processing"""
+        self._sync_recipe_pipeline()
         self._thread_manager.set_tolerance_config(self._tolerance_config)
         self._thread_manager.set_detection_enabled(self._detection_enabled)
         self._thread_manager.start()
@@ -375,6 +420,8 @@ class MainWindow:
         if not self._is_running:
             return
 
+        profile_checkpoint()
+        self._sync_recipe_pipeline()
         try:
             # Get result from queue (non-blocking)
             result = self._thread_manager.get_result(timeout=0.01)
@@ -393,16 +440,45 @@ class MainWindow:
                 # Add to history and statistics (only if circles detected)
                 if result.circles:
                     self.history_panel.add_measurement(result.circles)
+                    # Recipe that processed this frame (may precede a PLC switch)
+                    recipe_name = result.recipe or (self._current_recipe.name if self._current_recipe else None)
+                    self._measurement_store.add_result(result.circles, recipe=recipe_name)
+                    self._spc.add_result(result.circles, recipe=recipe_name, tolerance=self._tolerance_config)
 
                     # Update statistics
                     ok_count = sum(1 for c in result.circles if c.status == MeasureStatus.OK)
                     ng_count = sum(1 for c in result.circles if c.status == MeasureStatus.NG)
-                    self.statistics_panel.add_inspection(ok_count, ng_count)
-
-                    # Save NG images if enabled
+                    self._statistics.add_result(result.circles)
+                    self.statistics_panel.refresh()
+
+                    # Log every inspection (OK included); NG images are linked once written
+                    log_inspection = partial(
+                        self._measurement_log.log,
+                        result.circles,
+                        recipe=recipe_name,
+                        frame_seq=result.frame_seq,
+                        timestamp=time.time(),
+                    )
                     if self._save_ng_images and ng_count > 0:
+                        # Only queues the image; an ImageSaver writer logs the inspection
+                        # with its archive ID after the write (or without if it is lost)
                         ng_circles = [c for c in result.circles if c.status == MeasureStatus.NG]
-                        self._image_saver.save_ng_image(result.frame, ng_circles, result.display_frame)
+                        tracer = get_tracer()
+                        tracer.set_frame(result.frame_seq)
+                        with tracer.span("save_image"):
+                            self._image_saver.save_ng_image(
+                                result.frame,
+                                ng_circles,
+                                result.display_frame,
+                                frame_seq=result.frame_seq,
+                                on_done=lambda image_id: log_inspection(image_id=image_id),
+                            )
+                        tracer.set_frame(None)
+                    else:
+                        log_inspection()
+
+                    if ng_count > 0:
+                        self._flight_recorder.trigger("ng")
 
                     # Send IO result to PLC
                     overall_ok = ng_count == 0
@@ -410,8 +486,6 @@ class MainWindow:
 
                 # Update FPS counter
                 self._frame_count += 1
-                import time
-
                 current_time = time.time()
                 if self._last_fps_time == 0:
                     self._last_fps_time = current_time
@@ -476,9 +550,15 @@ class MainWindow:
 
     def _open_recipe_dialog(self) -> None:
         """Open recipe management dialog"""
-        RecipeDialog(self._root, self._recipe_service, self._on_recipe_load)
+        dialog = RecipeDialog(self._root, self._recipe_service, self._on_recipe_load)
+        self._root.wait_window(dialog)
         self._update_recipe_submenu()
 
+        # Recipes may have been edited: reassign PLC indexes and rebuild their pipelines
+        self._recipe_switcher.reload_slots()
+        self._recipe_switcher.invalidate()
+        self._recipe_switcher.prepare()
+
     def _on_recipe_load(self, recipe: Recipe) -> None:
         """Handle recipe load from dialog"""
         self._apply_recipe(recipe)
@@ -493,27 +573,40 @@ class MainWindow:
 
     def _apply_recipe(self, recipe: Recipe) -> None:
         """Apply a recipe to current settings"""
-        self._current_recipe = recipe
+        # Swaps the processing pipeline between frames, then updates the UI
+        self._recipe_switcher.load(recipe)
+        self._sync_recipe_pipeline()
+        self._update_status(f"Recipe loaded: {recipe.name}")
 
-        # Apply detection config
-        self._detector.update_config(recipe.detection_config)
-        self._visualizer.update_config(recipe.detection_config)
+    def _on_recipe_switched(self, pipeline: RecipePipeline) -> None:
+        """Handle recipe switch (switch thread for PLC switches)"""
+        self._pending_pipeline = pipeline
 
-        # Apply tolerance config
-        self._tolerance_config = recipe.tolerance_config
-        self._thread_manager.set_tolerance_config(recipe.tolerance_config)
+    def _sync_recipe_pipeline(self) -> None:
+        """Point settings and UI controls at the pipeline of the last recipe switch"""
+        pipeline = self._pending_pipeline
+        if pipeline is None or pipeline.recipe is None:
+            return
+        self._pending_pipeline = None
+        recipe = pipeline.recipe
+        self._current_recipe = recipe
+
+        # Later edits in the control panel apply to the running pipeline
+        self._detector = pipeline.detector
+        self._visualizer = pipeline.visualizer
+        self._tolerance_config = pipeline.classifier.config
 
-        # Apply calibration
         self._calibration.set_pixel_to_mm(recipe.pixel_to_mm)
-        self._apply_calibration()
         self._update_calibration_label()
 
-        # Update UI controls
-        self.control_panel.set_config(recipe.detection_config)
-        self.control_panel.set_tolerance(recipe.tolerance_config)
+        self.control_panel.set_config(pipeline.detector.config)
+        self.control_panel.set_tolerance(self._tolerance_config)
+        if recipe.camera_config is not None:
+            # Camera already has it (written by the switcher)
+            self.exposure_var.set(recipe.camera_config.default_exposure_us)
+            self.exposure_label.config(text=f"{recipe.camera_config.default_exposure_us:.1f} us")
 
         self._root.title(f"{APP_NAME} v{APP_VERSION} - {recipe.name}")
-        self._update_status(f"Recipe loaded: {recipe.name}")
         logger.info(f"Recipe applied: {recipe.name}")
 
     def _save_current_as_recipe(self) -> None:
@@ -534,6 +627,13 @@ class MainWindow:
             detection_config=self._detector.config,
             tolerance_config=self._tolerance_config,
             pixel_to_mm=self._calibration.pixel_to_mm,
+            camera_config=CameraConfig(
+                default_exposure_us=self.exposure_var.get(), trigger_mode=self._camera.trigger_mode
+            ),
+            # Overwriting a recipe keeps its PLC index; new recipes are selected by hand
+            plc_index=self._current_recipe.plc_index
+            if self._current_recipe is not None and self._current_recipe.name == name
+            else None,
         )
 
         if self._recipe_service.save_recipe(recipe):
@@ -597,6 +697,9 @@ class MainWindow:
     def _on_io_trigger(self) -> None:
         """Handle IO trigger signal"""
         logger.info("IO trigger received")
+        # The virtual camera has no trigger line, forward the PLC edge to it
+        if isinstance(self._camera, VirtualCamera):
+            self._camera.fire_hardware_trigger()
         # If camera is connected and running, the next frame will be processed
         # This is useful for hardware trigger mode
         if self._camera.is_connected and self._is_running:
@@ -616,6 +719,14 @@ class MainWindow:
         # Cleanup IO service
         if self._io_service.is_running:
             self._io_service.cleanup()
+        self._recipe_switcher.close()
+
+        # Write pending measurements and NG images
+        AppCore().measurement_store = None
+        self._measurement_store.close()
+        self._image_saver.close()
+        self._measurement_log.close()
+        self._flight_recorder.stop()
 
         self._root.destroy()
         logger.info("Application closed")
@@ -2,7 +2,8 @@
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from typing import List
+from typing import Deque, List
+from collections import deque
 from datetime import datetime
 from dataclasses import dataclass
 import csv
@@ -29,11 +30,18 @@ class HistoryPanel(ttk.LabelFrame):
     """Panel for displaying measurement history"""
 
     MAX_HISTORY_SIZE = 100
+    MAX_DISPLAY_ROWS = 50
 
     def __init__(self, parent):
         super().__init__(parent, text="Measurement History", padding=10)
 
-        self._history: List[HistoryEntry] = []
+        self._history: Deque[HistoryEntry] = deque(maxlen=self.MAX_HISTORY_SIZE)
+
+        # Running totals over the entries in _history
+        self._total_ok = 0
+        self._total_ng = 0
+        self._total_all = 0
+
         self._setup_ui()
 
     def _setup_ui(self) -> None:
@@ -110,25 +118,26 @@ class HistoryPanel(ttk.LabelFrame):
             ng_count=ng_count,
         )
 
-        # Add to history (limit size)
+        # Add to history (oldest entry falls out), keeping totals in step
+        if len(self._history) == self._history.maxlen:
+            oldest = self._history[0]
+            self._total_ok -= oldest.ok_count
+            self._total_ng -= oldest.ng_count
+            self._total_all -= oldest.total_count
         self._history.append(entry)
-        if len(self._history) > self.MAX_HISTORY_SIZE:
-            self._history.pop(0)
+        self._total_ok += entry.ok_count
+        self._total_ng += entry.ng_count
+        self._total_all += entry.total_count
 
         # Update display
-        self._update_display()
+        self._update_display(entry)
 
-    def _update_display(self) -> None:
-        """Update the UI display"""
-        # Update statistics
-        total_measurements = len(self._history)
-        total_ok = sum(e.ok_count for e in self._history)
-        total_all = sum(e.total_count for e in self._history)
+    def _update_display(self, entry: HistoryEntry) -> None:
+        """Update the summary and add the new entry's row"""
+        self.total_label.config(text=str(len(self._history)))
 
-        self.total_label.config(text=str(total_measurements))
-
-        if total_all > 0:
-            ok_rate = (total_ok / total_all) * 100
+        if self._total_all > 0:
+            ok_rate = (self._total_ok / self._total_all) * 100
             self.rate_label.config(text=f"{ok_rate:.1f}%")
 
             if ok_rate >= 95:
@@ -140,23 +149,22 @@ class HistoryPanel(ttk.LabelFrame):
         else:
             self.rate_label.config(text="0%", foreground="gray")
 
-        # Update treeview (show latest 50)
-        self.tree.delete(*self.tree.get_children())
+        # Newest row on top, keep the latest MAX_DISPLAY_ROWS
+        time_str = entry.timestamp.strftime("%H:%M:%S")
 
-        for entry in reversed(self._history[-50:]):
-            time_str = entry.timestamp.strftime("%H:%M:%S")
+        # Determine tag based on results
+        if entry.ng_count == 0:
+            tag = "ok"
+        elif entry.ok_count == 0:
+            tag = "ng"
+        else:
+            tag = "mixed"
 
-            # Determine tag based on results
-            if entry.ng_count == 0:
-                tag = "ok"
-            elif entry.ok_count == 0:
-                tag = "ng"
-            else:
-                tag = "mixed"
+        self.tree.insert("", 0, values=(time_str, entry.total_count, entry.ok_count, entry.ng_count), tags=(tag,))
 
-            self.tree.insert(
-                "", tk.END, values=(time_str, entry.total_count, entry.ok_count, entry.ng_count), tags=(tag,)
-            )
+        rows = self.tree.get_children()
+        if len(rows) > self.MAX_DISPLAY_ROWS:
+            self.tree.delete(*rows[self.MAX_DISPLAY_ROWS :])
 
     def _export_csv(self) -> None:
         """Export history to CSV file"""
@@ -206,26 +214,24 @@ class HistoryPanel(ttk.LabelFrame):
 
     def clear(self) -> None:
         """Clear all history"""
-        self._history = []
+        self._history.clear()
+        self._total_ok = 0
+        self._total_ng = 0
+        self._total_all = 0
         self.tree.delete(*self.tree.get_children())
         self.total_label.config(text="0")
         self.rate_label.config(text="0%", foreground="gray")
 
     def get_history(self) -> List[HistoryEntry]:
         """Get full history"""
-        return self._history.copy()
+        return list(self._history)
 
     def get_statistics(self) -> dict:
         """Get overall statistics"""
-        total_measurements = len(self._history)
-        total_ok = sum(e.ok_count for e in self._history)
-        total_ng = sum(e.ng_count for e in self._history)
-        total_all = sum(e.total_count for e in self._history)
-
         return {
-            "measurements": total_measurements,
-            "total_circles": total_all,
-            "ok_count": total_ok,
-            "ng_count": total_ng,
-            "ok_rate": (total_ok / total_all * 100) if total_all > 0 else 0.0,
+            "measurements": len(self._history),
+            "total_circles": self._total_all,
+            "ok_count": self._total_ok,
+            "ng_count": self._total_ng,
+            "ok_rate": (self._total_ok / self._total_all * 100) if self._total_all > 0 else 0.0,
         }
@@ -2,26 +2,25 @@
 
 import tkinter as tk
 from tkinter import ttk
-from typing import Dict
-from datetime import datetime, timedelta
+from typing import Dict, Optional
 import logging
 
+from ...services.statistics_service import StatisticsService
+
 logger = logging.getLogger(__name__)
 
 
 class StatisticsPanel(ttk.LabelFrame):
-    """Panel for displaying production statistics"""
+    """Panel for displaying production statistics
+
+    Shows snapshots of a StatisticsService; the panel keeps no counters of
+    its own, so it always matches what the web API reports.
+    """
 
-    def __init__(self, parent):
+    def __init__(self, parent, statistics: Optional[StatisticsService] = None):
         super().__init__(parent, text="Production Statistics", padding=10)
 
-        self._stats = {
-            "total_inspections": 0,
-            "total_circles": 0,
-            "ok_count": 0,
-            "ng_count": 0,
-            "start_time": datetime.now(),
-        }
+        self._statistics = statistics or StatisticsService()
 
         self._setup_ui()
 
@@ -51,6 +50,11 @@ class StatisticsPanel(ttk.LabelFrame):
         self.ng_label = ttk.Label(stats_frame, text="0", foreground="red", font=("Arial", 11, "bold"))
         self.ng_label.grid(row=3, column=1, sticky=tk.W, padx=10)
 
+        # Row 4: Current shift
+        ttk.Label(stats_frame, text="This Shift:").grid(row=4, column=0, sticky=tk.W)
+        self.shift_label = ttk.Label(stats_frame, text="0 pcs")
+        self.shift_label.grid(row=4, column=1, sticky=tk.W, padx=10)
+
         ttk.Separator(self, orient=tk.HORIZONTAL).pack(fill=tk.X, pady=10)
 
         # Rate display
@@ -85,33 +89,31 @@ class StatisticsPanel(ttk.LabelFrame):
         # Start runtime update
         self._update_runtime()
 
-    def add_inspection(self, ok_count: int, ng_count: int) -> None:
-        """
-        Add inspection result to statistics
-
-        Args:
-            ok_count: Number of OK circles
-            ng_count: Number of NG circles
-        """
-        self._stats["total_inspections"] += 1
-        self._stats["total_circles"] += ok_count + ng_count
-        self._stats["ok_count"] += ok_count
-        self._stats["ng_count"] += ng_count
+    @property
+    def statistics(self) -> StatisticsService:
+        """Get the statistics service shown by this panel"""
+        return self._statistics
 
+    def refresh(self) -> None:
+        """Update the display from the latest statistics snapshot"""
         self._update_display()
 
     def _update_display(self) -> None:
         """Update the display"""
+        snapshot = self._statistics.snapshot()
+
         # Update counts
-        self.inspections_label.config(text=str(self._stats["total_inspections"]))
-        self.circles_label.config(text=str(self._stats["total_circles"]))
-        self.ok_label.config(text=str(self._stats["ok_count"]))
-        self.ng_label.config(text=str(self._stats["ng_count"]))
-
-        # Calculate and update rate
-        total = self._stats["ok_count"] + self._stats["ng_count"]
-        if total > 0:
-            rate = (self._stats["ok_count"] / total) * 100
+        self.inspections_label.config(text=str(snapshot.total_inspections))
+        self.circles_label.config(text=str(snapshot.total_circles))
+        self.ok_label.config(text=str(snapshot.ok_count))
+        self.ng_label.config(text=str(snapshot.ng_count))
+
+        shift = snapshot.windows["shift"]
+        self.shift_label.config(text=f"{shift.inspections} pcs, {shift.ok_rate:.1f}% OK")
+
+        # Update rate
+        if snapshot.ok_count + snapshot.ng_count > 0:
+            rate = snapshot.ok_rate
             self.rate_label.config(text=f"{rate:.1f}%")
             self.rate_bar["value"] = rate
 
@@ -127,43 +129,37 @@ class StatisticsPanel(ttk.LabelFrame):
             self.rate_bar["value"] = 0
 
         # Update throughput
-        runtime = datetime.now() - self._stats["start_time"]
-        minutes = runtime.total_seconds() / 60
-        if minutes > 0:
-            throughput = self._stats["total_inspections"] / minutes
-            self.throughput_label.config(text=f"{throughput:.1f} pcs/min")
+        if snapshot.runtime_seconds > 0:
+            self.throughput_label.config(text=f"{snapshot.throughput_per_minute:.1f} pcs/min")
         else:
             self.throughput_label.config(text="-- pcs/min")
 
-    def _update_runtime(self) -> None:
-        """Update runtime display"""
-        runtime = datetime.now() - self._stats["start_time"]
-        hours, remainder = divmod(int(runtime.total_seconds()), 3600)
+        # Update runtime
+        hours, remainder = divmod(int(snapshot.runtime_seconds), 3600)
         minutes, seconds = divmod(remainder, 60)
         self.runtime_label.config(text=f"{hours:02d}:{minutes:02d}:{seconds:02d}")
 
+    def _update_runtime(self) -> None:
+        """Periodic refresh (runtime, throughput and windows age even without results)"""
+        self._update_display()
+
         # Schedule next update
         self.after(1000, self._update_runtime)
 
     def reset(self) -> None:
         """Reset all statistics"""
-        self._stats = {
-            "total_inspections": 0,
-            "total_circles": 0,
-            "ok_count": 0,
-            "ng_count": 0,
-            "start_time": datetime.now(),
-        }
+        self._statistics.reset()
         self._update_display()
-        logger.info("Statistics reset")
 
     def get_statistics(self) -> Dict:
         """Get current statistics"""
-        runtime = datetime.now() - self._stats["start_time"]
-        total = self._stats["ok_count"] + self._stats["ng_count"]
-
+        snapshot = self._statistics.snapshot()
         return {
-            **self._stats,
-            "runtime_seconds": runtime.total_seconds(),
-            "ok_rate": (self._stats["ok_count"] / total * 100) if total > 0 else 0.0,
+            "total_inspections": snapshot.total_inspections,
+            "total_circles": snapshot.total_circles,
+            "ok_count": snapshot.ok_count,
+            "ng_count": snapshot.ng_count,
+            "start_time": snapshot.session_start,
+            "runtime_seconds": snapshot.runtime_seconds,
+            "ok_rate": snapshot.ok_rate,
         }
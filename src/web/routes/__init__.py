@@ -1,7 +1,8 @@
 """Web routes package."""
 
 from .api import router as api_router
+from .metrics import router as metrics_router
 from .stream import router as stream_router
 from .websocket import router as websocket_router
 
-__all__ = ["api_router", "stream_router", "websocket_router"]
+__all__ = ["api_router", "metrics_router", "stream_router", "websocket_router"]
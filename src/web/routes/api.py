@@ -3,48 +3,72 @@
 This module provides all REST API endpoints for the Web Dashboard.
 """
 
+import asyncio
 import csv
 import io
+from dataclasses import asdict
 from datetime import datetime
-from typing import Any, Optional
+from pathlib import Path
+from typing import Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 
-from src.core import AppCore
+from src.core import AppCore, ProfileResult, get_profiler, get_tracer, profile_checkpoint
 from src.web.dependencies import get_app_core
 from src.web.schemas import (
     SystemStatusSchema,
+    CameraStatusSchema,
+    CameraListSchema,
+    EventSubscriberSchema,
+    EventSubscriberListSchema,
     StatisticsSchema,
+    StatisticsWindowSchema,
+    HoleStatisticsSchema,
+    SPCChartSchema,
+    SPCViolationSchema,
+    SPCAcknowledgeSchema,
+    SPCResponseSchema,
     RecipeListSchema,
     RecipeDetailSchema,
     DetectionConfigSchema,
     ToleranceConfigSchema,
+    HoleToleranceSchema,
     IOStatusSchema,
     CalibrationSchema,
+    ScaleFieldSchema,
     HistoryResponseSchema,
     HistoryItemSchema,
     CircleResultSchema,
     MeasureStatusEnum,
+    ProfileModeEnum,
+    ProfileFormatEnum,
+    ProfileFunctionSchema,
+    MemoryDiffSchema,
+    ProfileResultSchema,
+    FlightRecorderSchema,
+    FlightRecorderDumpSchema,
+    ThumbnailSizeEnum,
+    ImageItemSchema,
+    ImageListSchema,
 )
 
 router = APIRouter(prefix="/api", tags=["api"])
 
 
-def _get_status_string(status: Any) -> str:
-    """Convert status to string for MeasureStatusEnum.
+def _status_enum(status: str) -> MeasureStatusEnum:
+    """Convert a history status name to MeasureStatusEnum.
 
     Args:
-        status: Status value (enum, string, or None)
+        status: Uppercase status name
 
     Returns:
-        Uppercase status string
+        Matching enum value, NONE for statuses the API does not expose
     """
-    if status is None:
-        return "NONE"
-    if hasattr(status, "value"):
-        return str(status.value).upper()
-    return str(status).upper()
+    try:
+        return MeasureStatusEnum(status)
+    except ValueError:
+        return MeasureStatusEnum.NONE
 
 
 @router.get("/status", response_model=SystemStatusSchema)
@@ -57,10 +81,38 @@ async def get_status(app_core: AppCore = Depends(get_app_core)):
         current_recipe=status["current_recipe"],
         fps=status["fps"],
         web_clients=status["web_clients"],
+        cameras=[CameraStatusSchema(**camera) for camera in status["cameras"]],
         timestamp=datetime.fromisoformat(status["timestamp"]),
     )
 
 
+@router.get("/cameras", response_model=CameraListSchema)
+async def get_cameras(app_core: AppCore = Depends(get_app_core)):
+    """Get status of all camera stations."""
+    cameras = [CameraStatusSchema(**camera) for camera in app_core.get_status()["cameras"]]
+    return CameraListSchema(cameras=cameras, count=len(cameras))
+
+
+@router.get("/cameras/{camera_id}", response_model=CameraStatusSchema)
+async def get_camera(camera_id: str, app_core: AppCore = Depends(get_app_core)):
+    """Get status of a single camera station."""
+    status = app_core.get_camera_status(camera_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Camera not found: {camera_id}")
+    return CameraStatusSchema(**status)
+
+
+@router.get("/events/subscribers", response_model=EventSubscriberListSchema)
+async def get_event_subscribers(app_core: AppCore = Depends(get_app_core)):
+    """Get event bus delivery statistics (drops, suppressed events, lag)."""
+    subscribers = [EventSubscriberSchema(**stats) for stats in app_core.get_subscriber_stats()]
+    return EventSubscriberListSchema(
+        subscribers=subscribers,
+        total_dropped=sum(sub.dropped for sub in subscribers),
+        total_suppressed=sum(sub.suppressed + sub.coalesced for sub in subscribers),
+    )
+
+
 @router.get("/statistics", response_model=StatisticsSchema)
 async def get_statistics(app_core: AppCore = Depends(get_app_core)):
     """Get production statistics."""
@@ -78,35 +130,21 @@ async def get_statistics(app_core: AppCore = Depends(get_app_core)):
             session_start=None,
         )
 
-    # Get statistics data
-    try:
-        total = stats.total_count
-        ok = stats.ok_count
-        ng = stats.ng_count
-        ok_rate = stats.ok_rate
-        throughput = getattr(stats, "throughput_per_minute", 0.0)
-        runtime = getattr(stats, "runtime_seconds", 0)
-        session_start = getattr(stats, "session_start", None)
-        last = getattr(stats, "last_result", None)
-    except AttributeError:
-        total = 0
-        ok = 0
-        ng = 0
-        ok_rate = 0.0
-        throughput = 0.0
-        runtime = 0
-        session_start = None
-        last = None
-
+    snapshot = stats.snapshot()
     return StatisticsSchema(
-        total_inspections=total,
-        ok_count=ok,
-        ng_count=ng,
-        ok_rate=ok_rate,
-        throughput_per_minute=throughput,
-        runtime_seconds=runtime,
-        last_result=MeasureStatusEnum(last.value.upper()) if last else None,
-        session_start=session_start,
+        total_inspections=snapshot.total_inspections,
+        total_circles=snapshot.total_circles,
+        ok_count=snapshot.ok_count,
+        ng_count=snapshot.ng_count,
+        ok_parts=snapshot.ok_parts,
+        ng_parts=snapshot.ng_parts,
+        ok_rate=snapshot.ok_rate,
+        throughput_per_minute=snapshot.throughput_per_minute,
+        runtime_seconds=int(snapshot.runtime_seconds),
+        last_result=_status_enum(snapshot.last_result.name) if snapshot.last_result else None,
+        session_start=snapshot.session_start,
+        windows=[StatisticsWindowSchema(**asdict(window)) for window in snapshot.windows.values()],
+        holes=[HoleStatisticsSchema(**asdict(hole)) for hole in snapshot.holes.values() if hole.count > 0],
     )
 
 
@@ -124,18 +162,34 @@ async def export_statistics(app_core: AppCore = Depends(get_app_core)):
 
     # Data
     if stats is not None:
-        try:
+        snapshot = stats.snapshot()
+        writer.writerow(
+            [
+                datetime.now().isoformat(),
+                snapshot.total_inspections,
+                snapshot.ok_count,
+                snapshot.ng_count,
+                snapshot.ok_rate,
+            ]
+        )
+
+        # Per-hole diameter statistics
+        writer.writerow([])
+        writer.writerow(["hole_id", "count", "mean_mm", "std_mm", "min_mm", "max_mm", "p05_mm", "p50_mm", "p95_mm"])
+        for hole in snapshot.holes.values():
             writer.writerow(
                 [
-                    datetime.now().isoformat(),
-                    stats.total_count,
-                    stats.ok_count,
-                    stats.ng_count,
-                    stats.ok_rate,
+                    hole.hole_id,
+                    hole.count,
+                    f"{hole.mean_mm:.4f}",
+                    f"{hole.std_mm:.4f}",
+                    f"{hole.min_mm:.4f}",
+                    f"{hole.max_mm:.4f}",
+                    f"{hole.p05_mm:.4f}",
+                    f"{hole.p50_mm:.4f}",
+                    f"{hole.p95_mm:.4f}",
                 ]
             )
-        except AttributeError:
-            writer.writerow([datetime.now().isoformat(), 0, 0, 0, 0.0])
 
     output.seek(0)
 
@@ -149,6 +203,44 @@ async def export_statistics(app_core: AppCore = Depends(get_app_core)):
     )
 
 
+@router.get("/spc", response_model=SPCResponseSchema)
+async def get_spc(
+    recipe: Optional[str] = Query(None, description="Only charts of this recipe"),
+    hole_id: Optional[int] = Query(None, ge=1, description="Only the chart of this hole"),
+    limit: int = Query(20, ge=0, le=100, description="Maximum recent violations"),
+    app_core: AppCore = Depends(get_app_core),
+):
+    """Get SPC control limits, Cp/Cpk and recent rule violations."""
+    spc = app_core.get_service("spc")
+    if spc is None:
+        return SPCResponseSchema(enabled=False)
+
+    charts = [chart for chart in spc.get_charts(recipe) if hole_id is None or chart.hole_id == hole_id]
+    violations = [
+        violation
+        for violation in spc.get_violations(100)
+        if (recipe is None or violation.recipe == recipe) and (hole_id is None or violation.hole_id == hole_id)
+    ]
+    return SPCResponseSchema(
+        enabled=True,
+        io_error=spc.io_error,
+        charts=[SPCChartSchema(**asdict(chart)) for chart in charts],
+        violations=[SPCViolationSchema(**asdict(violation)) for violation in violations[:limit]],
+    )
+
+
+@router.post("/spc/acknowledge", response_model=SPCAcknowledgeSchema)
+async def acknowledge_spc(app_core: AppCore = Depends(get_app_core)):
+    """Acknowledge SPC violations and clear the PLC error output they raised.
+
+    acknowledged is false if no error output was set.
+    """
+    spc = app_core.get_service("spc")
+    if spc is None:
+        raise HTTPException(status_code=503, detail="SPC is not running")
+    return SPCAcknowledgeSchema(acknowledged=spc.acknowledge())
+
+
 @router.get("/recipes", response_model=RecipeListSchema)
 async def get_recipes(app_core: AppCore = Depends(get_app_core)):
     """Get list of available recipes."""
@@ -197,6 +289,9 @@ async def get_recipe(name: str, app_core: AppCore = Depends(get_app_core)):
         enabled=recipe.tolerance_config.enabled,
         nominal_mm=recipe.tolerance_config.nominal_mm,
         tolerance_mm=recipe.tolerance_config.tolerance_mm,
+        min_circularity=recipe.tolerance_config.min_circularity,
+        position_tolerance_px=recipe.tolerance_config.position_tolerance_px,
+        holes=[HoleToleranceSchema(**asdict(hole)) for hole in recipe.tolerance_config.holes],
     )
 
     return RecipeDetailSchema(
@@ -267,6 +362,7 @@ async def get_calibration(app_core: AppCore = Depends(get_app_core)):
         is_calibrated = calib_service.is_calibrated
         pixel_to_mm = calib_service.pixel_to_mm
         calib_data = getattr(calib_service, "calibration_data", None)
+        field = getattr(calib_service, "scale_field", None)
 
         if calib_data:
             reference_size_mm = calib_data.reference_size_mm
@@ -282,6 +378,7 @@ async def get_calibration(app_core: AppCore = Depends(get_app_core)):
         reference_size_mm = None
         reference_size_px = None
         calibrated_at = None
+        field = None
 
     return CalibrationSchema(
         is_calibrated=is_calibrated,
@@ -289,6 +386,17 @@ async def get_calibration(app_core: AppCore = Depends(get_app_core)):
         reference_size_mm=reference_size_mm,
         reference_size_px=reference_size_px,
         calibrated_at=calibrated_at,
+        scale_field=(
+            ScaleFieldSchema(
+                rows=field.shape[0],
+                cols=field.shape[1],
+                min_factor=float(field.factor.min()),
+                max_factor=float(field.factor.max()),
+                samples=field.samples,
+            )
+            if field is not None
+            else None
+        ),
     )
 
 
@@ -296,53 +404,306 @@ async def get_calibration(app_core: AppCore = Depends(get_app_core)):
 async def get_history(
     limit: int = Query(default=100, ge=1, le=1000),
     offset: int = Query(default=0, ge=0),
+    start: Optional[datetime] = Query(default=None, description="Measurements at or after this time"),
+    end: Optional[datetime] = Query(default=None, description="Measurements before this time"),
+    recipe: Optional[str] = None,
+    status: Optional[MeasureStatusEnum] = None,
+    hole_id: Optional[int] = Query(default=None, ge=1),
+    camera_id: Optional[str] = None,
     app_core: AppCore = Depends(get_app_core),
 ):
-    """Get measurement history."""
-    history = app_core.get_history(limit=limit, offset=offset)
-    total = app_core.get_history_count()
+    """Get measurement history (persistent store if available), newest first."""
+    history, total = await asyncio.to_thread(
+        app_core.query_history,
+        start=start,
+        end=end,
+        recipe=recipe,
+        status=status.value if status else None,
+        hole_id=hole_id,
+        camera_id=camera_id,
+        limit=limit,
+        offset=offset,
+    )
 
-    items = []
-    for item in history:
-        try:
-            result = item.get("result", [])
-            circles = []
-
-            if isinstance(result, list):
-                for circle in result:
-                    try:
-                        circles.append(
-                            CircleResultSchema(
-                                center_x=getattr(circle, "center_x", 0),
-                                center_y=getattr(circle, "center_y", 0),
-                                diameter_mm=getattr(circle, "diameter_mm", 0),
-                                diameter_px=getattr(circle, "diameter_px", 0),
-                                circularity=getattr(circle, "circularity", 0),
-                                status=MeasureStatusEnum(_get_status_string(getattr(circle, "status", None))),
-                            )
-                        )
-                    except Exception:
-                        pass
-
-            # Determine overall status
-            if circles:
-                if any(c.status == MeasureStatusEnum.NG for c in circles):
-                    overall = MeasureStatusEnum.NG
-                elif all(c.status == MeasureStatusEnum.OK for c in circles):
-                    overall = MeasureStatusEnum.OK
-                else:
-                    overall = MeasureStatusEnum.NONE
-            else:
-                overall = MeasureStatusEnum.NONE
-
-            items.append(
-                HistoryItemSchema(
-                    timestamp=datetime.fromisoformat(item["timestamp"]),
-                    circles=circles,
-                    overall_status=overall,
+    items = [
+        HistoryItemSchema(
+            seq=record.seq,
+            timestamp=datetime.fromtimestamp(record.timestamp),
+            camera_id=record.camera_id,
+            recipe=record.recipe,
+            circles=[
+                CircleResultSchema(
+                    center_x=circle.center_x,
+                    center_y=circle.center_y,
+                    diameter_mm=circle.diameter_mm,
+                    diameter_px=circle.diameter_px,
+                    circularity=circle.circularity,
+                    status=_status_enum(circle.status),
                 )
-            )
-        except Exception:
-            pass
+                for circle in record.circles
+            ],
+            overall_status=_status_enum(record.overall_status),
+        )
+        for record in history
+    ]
 
     return HistoryResponseSchema(items=items, total=total, limit=limit, offset=offset)
+
+
+def _profile_schema(result: ProfileResult, top: int) -> ProfileResultSchema:
+    """Convert a profiling result to its response schema."""
+    formats = [ProfileFormatEnum.PSTATS, ProfileFormatEnum.TEXT]
+    if result.collapsed is not None:
+        formats.append(ProfileFormatEnum.COLLAPSED)
+
+    return ProfileResultSchema(
+        mode=ProfileModeEnum(result.mode),
+        started=result.started,
+        duration_s=result.duration_s,
+        threads=result.threads,
+        samples=result.samples,
+        functions=[ProfileFunctionSchema(**row) for row in result.top_functions(top)],
+        memory=[MemoryDiffSchema(**asdict(diff)) for diff in result.memory] if result.memory is not None else None,
+        formats=formats,
+        missing_threads=result.missing_threads,
+    )
+
+
+@router.post("/profile", response_model=ProfileResultSchema)
+async def run_profile(
+    duration_s: float = Query(default=5.0, gt=0, le=120, description="Session length in seconds"),
+    mode: ProfileModeEnum = ProfileModeEnum.SAMPLING,
+    interval_ms: float = Query(default=10.0, ge=1, le=1000, description="Sampling interval"),
+    memory: bool = Query(default=False, description="Include a tracemalloc snapshot diff"),
+    top: int = Query(default=20, ge=1, le=200, description="Functions in the summary"),
+):
+    """Profile the running application for duration_s and return a summary.
+
+    Download the artifact of the session from /api/profile/artifact.
+    """
+    profiler = get_profiler()
+    if profiler.is_active:
+        raise HTTPException(status_code=409, detail=f"Profiling already running ({profiler.active_mode})")
+
+    session = asyncio.create_task(
+        asyncio.to_thread(profiler.run, duration_s, mode.value, interval_ms=interval_ms, memory=memory)
+    )
+
+    # The event loop thread has no loop of its own to checkpoint from
+    while not session.done():
+        profile_checkpoint()
+        await asyncio.wait({session}, timeout=0.1)
+    profile_checkpoint()
+
+    try:
+        result = session.result()
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return _profile_schema(result, top)
+
+
+@router.get("/profile", response_model=ProfileResultSchema)
+async def get_profile(top: int = Query(default=20, ge=1, le=200)):
+    """Get the summary of the most recent profiling session."""
+    result = get_profiler().last_result
+    if result is None:
+        raise HTTPException(status_code=404, detail="No profiling session has run")
+    return _profile_schema(result, top)
+
+
+@router.get("/profile/artifact")
+async def get_profile_artifact(format: ProfileFormatEnum = ProfileFormatEnum.PSTATS):
+    """Download the most recent profile as pstats, text report or collapsed stacks."""
+    result = get_profiler().last_result
+    if result is None:
+        raise HTTPException(status_code=404, detail="No profiling session has run")
+
+    stamp = result.started.strftime("%Y%m%d_%H%M%S")
+    content: Union[bytes, str]
+    if format == ProfileFormatEnum.PSTATS:
+        content, media_type, filename = result.pstats_bytes(), "application/octet-stream", f"profile_{stamp}.prof"
+    elif format == ProfileFormatEnum.TEXT:
+        content, media_type, filename = result.text_report(), "text/plain", f"profile_{stamp}.txt"
+    else:
+        if result.collapsed is None:
+            raise HTTPException(status_code=400, detail="Collapsed stacks are only recorded in sampling mode")
+        content, media_type, filename = result.collapsed, "text/plain", f"profile_{stamp}.collapsed"
+
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+@router.get("/trace")
+async def get_trace(
+    seconds: Optional[float] = Query(
+        default=10.0, gt=0, description="Spans ending in the last N seconds (all if omitted)"
+    ),
+):
+    """Download recent per-frame trace spans as Chrome trace JSON.
+
+    Open the file in chrome://tracing or https://ui.perfetto.dev.
+    """
+    trace = await asyncio.to_thread(get_tracer().export_chrome, seconds)
+    filename = f"trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    return JSONResponse(content=trace, headers={"Content-Disposition": f"attachment; filename={filename}"})
+
+
+@router.get("/flight-recorder", response_model=FlightRecorderSchema)
+async def get_flight_recorder(app_core: AppCore = Depends(get_app_core)):
+    """Get flight recorder ring and dump statistics."""
+    recorder = app_core.get_service("flight_recorder")
+    if recorder is None:
+        return FlightRecorderSchema(enabled=False)
+    stats = recorder.get_stats()
+    return FlightRecorderSchema(enabled=recorder.is_running, **stats)
+
+
+@router.post("/flight-recorder/dump", response_model=FlightRecorderDumpSchema)
+async def dump_flight_recorder(
+    reason: str = Query(default="api", pattern=r"^[A-Za-z0-9_-]{1,32}$", description="Dump name suffix"),
+    pre_s: Optional[float] = Query(default=None, ge=0, description="Seconds before now (default: recorder setting)"),
+    post_s: Optional[float] = Query(default=None, ge=0, le=60, description="Seconds after now"),
+    app_core: AppCore = Depends(get_app_core),
+):
+    """Dump the recorded frames around now to disk.
+
+    The dump is written in the background once the post-event window has
+    passed; it is not scheduled (scheduled=false) if too many dumps are pending.
+    """
+    recorder = app_core.get_service("flight_recorder")
+    if recorder is None or not recorder.is_running:
+        raise HTTPException(status_code=503, detail="Flight recorder is not running")
+    scheduled = recorder.trigger(reason, pre_s, post_s)
+    return FlightRecorderDumpSchema(scheduled=scheduled, reason=reason, dump_dir=str(recorder.dump_dir))
+
+
+# Image URLs carry the save time (?v=), so a response for a versioned URL
+# never changes and browsers may keep it without revalidating.
+_IMMUTABLE = "public, max-age=31536000, immutable"
+_REVALIDATE = "no-cache"
+
+_IMAGE_MEDIA_TYPES = {
+    ".jpg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+    ".npy": "application/octet-stream",
+}
+
+
+def _get_image_saver(app_core: AppCore):
+    """Get the registered ImageSaver or fail with 503."""
+    saver = app_core.get_service("image_saver")
+    if saver is None:
+        raise HTTPException(status_code=503, detail="Image saving is not running")
+    return saver
+
+
+def _image_version(timestamp: float) -> int:
+    """Version of an image URL (save time in milliseconds)."""
+    return int(timestamp * 1000)
+
+
+def _image_headers(image_id: int, timestamp: float, variant: str, v: Optional[int]) -> dict:
+    """ETag and Cache-Control of an image response."""
+    version = _image_version(timestamp)
+    return {
+        "ETag": f'"{image_id}-{version}-{variant}"',
+        "Cache-Control": _IMMUTABLE if v == version else _REVALIDATE,
+    }
+
+
+@router.get("/images", response_model=ImageListSchema)
+async def get_images(
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+    kind: Optional[str] = Query(default=None, description="File name prefix (NG, IMG, ...)"),
+    status: Optional[MeasureStatusEnum] = None,
+    date: Optional[datetime] = Query(default=None, description="Images saved on this day"),
+    app_core: AppCore = Depends(get_app_core),
+):
+    """Get a page of saved images, newest first."""
+    saver = app_core.get_service("image_saver")
+    if saver is None:
+        return ImageListSchema(items=[], total=0, limit=limit, offset=offset)
+
+    records, total = await asyncio.to_thread(
+        saver.archive.page, limit, offset, kind, status.value if status else None, date
+    )
+
+    items = []
+    for record in records:
+        version = _image_version(record.timestamp)
+        items.append(
+            ImageItemSchema(
+                id=record.id,
+                timestamp=datetime.fromtimestamp(record.timestamp),
+                kind=record.kind,
+                status=_status_enum(record.status),
+                codec=record.codec,
+                size_bytes=record.size_bytes,
+                frame_seq=record.frame_seq,
+                thumbnail_url=f"/api/images/{record.id}/thumb?v={version}",
+                preview_url=f"/api/images/{record.id}/preview?v={version}",
+                image_url=f"/api/images/{record.id}?v={version}",
+            )
+        )
+    return ImageListSchema(items=items, total=total, limit=limit, offset=offset)
+
+
+@router.get("/images/{image_id}/{size}")
+async def get_image_thumbnail(
+    image_id: int,
+    size: ThumbnailSizeEnum,
+    v: Optional[int] = Query(default=None, description="Image version from the gallery list"),
+    if_none_match: Optional[str] = Header(default=None),
+    app_core: AppCore = Depends(get_app_core),
+):
+    """Get the thumbnail or preview JPEG of a saved image (generated if missing)."""
+    saver = _get_image_saver(app_core)
+    if saver.thumbnails is None:
+        raise HTTPException(status_code=503, detail="Thumbnails are disabled")
+
+    record = await asyncio.to_thread(saver.archive.get_by_id, image_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Image {image_id} not found")
+
+    headers = _image_headers(image_id, record.timestamp, size.value, v)
+    if if_none_match == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
+    data = await asyncio.to_thread(saver.thumbnails.get, image_id, size.value)
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"Image {image_id} can't be read")
+    return Response(content=data, media_type="image/jpeg", headers=headers)
+
+
+@router.get("/images/{image_id}")
+async def get_image(
+    image_id: int,
+    v: Optional[int] = Query(default=None, description="Image version from the gallery list"),
+    if_none_match: Optional[str] = Header(default=None),
+    app_core: AppCore = Depends(get_app_core),
+):
+    """Download a saved image file in its original resolution and codec."""
+    saver = _get_image_saver(app_core)
+    record = await asyncio.to_thread(saver.archive.get_by_id, image_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Image {image_id} not found")
+
+    headers = _image_headers(image_id, record.timestamp, "original", v)
+    if if_none_match == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
+    path = Path(record.path)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail=f"Image {image_id} file is missing")
+    return FileResponse(
+        path,
+        media_type=_IMAGE_MEDIA_TYPES.get(path.suffix),
+        filename=path.name,
+        content_disposition_type="inline",
+        headers=headers,
+    )
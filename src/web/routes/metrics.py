@@ -0,0 +1,45 @@
+"""Prometheus metrics endpoint.
+
+This module serves the process-wide metrics registry in the Prometheus
+text exposition format.
+"""
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from src.core import AppCore, get_registry
+from src.web.dependencies import get_app_core
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _collect_event_bus(app_core: AppCore) -> None:
+    """Copy event bus subscriber queue depths and drops into the registry."""
+    registry = get_registry()
+    queue_depth = registry.gauge(
+        "event_subscriber_queue_depth", "Events queued for an async event bus subscriber", ("event", "subscriber")
+    )
+    dropped = registry.gauge(
+        "event_subscriber_dropped", "Events dropped or merged for an event bus subscriber", ("event", "subscriber")
+    )
+
+    for stats in app_core.get_subscriber_stats():
+        if stats["mode"] == "sync":
+            continue
+        labels = {"event": stats["event_type"], "subscriber": stats["name"]}
+        queue_depth.labels(**labels).set(stats["queue_depth"])
+        dropped.labels(**labels).set(stats["dropped"] + stats["coalesced"] + stats.get("suppressed", 0))
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(app_core: AppCore = Depends(get_app_core)):
+    """Get runtime metrics in Prometheus text format.
+
+    Covers pipeline stage times, queue depths, dropped frames, camera grab
+    failures, IO loop jitter, WebSocket clients and send lag, MJPEG encode
+    time and event bus subscriber queues.
+    """
+    _collect_event_bus(app_core)
+    return PlainTextResponse(get_registry().render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -2,29 +2,40 @@
 
 This module provides the MJPEG streaming endpoint for live video
 display in web browsers.
+
+Each part carries Content-Length and X-Frame-Seq headers. With
+overlay=false the stream carries the clean frame; the dashboard reads the
+parts itself and draws the overlay for the same X-Frame-Seq from the
+WebSocket "overlay" event on a canvas.
 """
 
 import asyncio
 import logging
 import time
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 
 import cv2
 import numpy as np
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 
-from src.core import AppCore
+from src.core import AppCore, get_registry
 from src.web.dependencies import get_app_core
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/stream", tags=["stream"])
 
+_encode_time = get_registry().histogram("mjpeg_encode_seconds", "JPEG encode time per MJPEG stream frame")
+
 # Stream configuration
 STREAM_FPS = 10  # Target FPS for web streaming
 JPEG_QUALITY = 85  # JPEG quality (0-100)
 FRAME_INTERVAL = 1.0 / STREAM_FPS  # Time between frames
+KEEPALIVE_INTERVAL = 1.0  # Resend last frame after this many seconds without a new one
+PREVIEW_MAX_WIDTH = 1280  # Frames wider than this are downscaled before encoding (0 = full size)
+
+_placeholder_frame: Optional[np.ndarray] = None
 
 
 def create_placeholder_frame() -> np.ndarray:
@@ -52,6 +63,14 @@ def create_placeholder_frame() -> np.ndarray:
     return frame
 
 
+def _get_placeholder_frame() -> np.ndarray:
+    """Get the shared placeholder frame (created once)."""
+    global _placeholder_frame
+    if _placeholder_frame is None:
+        _placeholder_frame = create_placeholder_frame()
+    return _placeholder_frame
+
+
 def encode_frame_to_jpeg(frame: np.ndarray) -> bytes:
     """Encode a frame to JPEG bytes.
 
@@ -61,13 +80,42 @@ def encode_frame_to_jpeg(frame: np.ndarray) -> bytes:
     Returns:
         JPEG encoded bytes
     """
+    start = time.perf_counter()
     encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), JPEG_QUALITY]
     _, buffer = cv2.imencode(".jpg", frame, encode_param)
+    _encode_time.observe(time.perf_counter() - start)
     return buffer.tobytes()
 
 
+def scale_to_preview(frame: np.ndarray, max_width: int = PREVIEW_MAX_WIDTH) -> np.ndarray:
+    """Downscale a frame to at most max_width pixels wide (0 = keep size).
+
+    Args:
+        frame: OpenCV frame
+
+    Returns:
+        The frame itself, or a resized copy
+    """
+    height, width = frame.shape[:2]
+    if max_width <= 0 or width <= max_width:
+        return frame
+    size = (max_width, max(1, round(height * max_width / width)))
+    return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+
+def _part(jpeg_bytes: bytes, frame_seq: Optional[int]) -> bytes:
+    """Build one multipart part (boundary, headers, JPEG)."""
+    headers = f"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: {len(jpeg_bytes)}\r\n"
+    if frame_seq is not None:
+        headers += f"X-Frame-Seq: {frame_seq}\r\n"
+    return headers.encode("ascii") + b"\r\n" + jpeg_bytes + b"\r\n"
+
+
 async def generate_mjpeg_stream(
     app_core: AppCore,
+    camera_id: str = AppCore.DEFAULT_CAMERA_ID,
+    overlay: bool = True,
+    max_width: int = PREVIEW_MAX_WIDTH,
 ) -> AsyncGenerator[bytes, None]:
     """Generate MJPEG stream frames.
 
@@ -76,15 +124,17 @@ async def generate_mjpeg_stream(
 
     Args:
         app_core: AppCore instance for accessing frames
+        camera_id: Camera whose frames are streamed
+        overlay: Stream the display frame (with server-side overlays, if drawn)
+                 instead of the clean raw frame
+        max_width: Preview width limit (0 = full size)
 
     Yields:
         MJPEG frame bytes with boundary markers
     """
-    boundary = b"--frame\r\n"
-    content_type = b"Content-Type: image/jpeg\r\n\r\n"
-
     last_frame_time = 0.0
-    placeholder = None
+    last_version = -1
+    last_part = b""
 
     while True:
         # Throttle to target FPS
@@ -97,24 +147,34 @@ async def generate_mjpeg_stream(
         last_frame_time = time.time()
 
         try:
-            # Get the display frame (with overlays)
-            frame = app_core.get_display_frame()
-
-            if frame is None:
-                # Try raw frame
-                frame = app_core.get_raw_frame()
+            frames = app_core.get_frames(camera_id)
+
+            if frames.version == last_version:
+                # No new frame: wait for one off the event loop instead of
+                # re-encoding the same image; resend the last JPEG on timeout
+                # so the connection stays alive
+                snapshot = await asyncio.to_thread(app_core.wait_for_frame, last_version, KEEPALIVE_INTERVAL, camera_id)
+                if snapshot is None:
+                    yield last_part
+                    continue
+                frames = snapshot
+
+            # Prefer the display frame (with overlays) if asked for, fall back to raw frame
+            frame = frames.display_frame if overlay and frames.display_frame is not None else frames.raw_frame
+            frame_seq = frames.frame_seq
 
             if frame is None:
                 # Use placeholder
-                if placeholder is None:
-                    placeholder = create_placeholder_frame()
-                frame = placeholder
+                frame = _get_placeholder_frame()
+                frame_seq = None
 
             # Encode to JPEG
-            jpeg_bytes = encode_frame_to_jpeg(frame)
+            jpeg_bytes = encode_frame_to_jpeg(scale_to_preview(frame, max_width))
+            last_version = frames.version
 
             # Yield MJPEG frame
-            yield boundary + content_type + jpeg_bytes + b"\r\n"
+            last_part = _part(jpeg_bytes, frame_seq)
+            yield last_part
 
         except Exception as e:
             logger.error(f"Error generating stream frame: {e}")
@@ -122,7 +182,11 @@ async def generate_mjpeg_stream(
 
 
 @router.get("/video")
-async def video_stream(app_core: AppCore = Depends(get_app_core)):
+async def video_stream(
+    overlay: bool = Query(True, description="Include server-side overlays (false: clean frame)"),
+    max_width: int = Query(PREVIEW_MAX_WIDTH, ge=0, description="Preview width limit in pixels (0: full size)"),
+    app_core: AppCore = Depends(get_app_core),
+):
     """Get MJPEG video stream.
 
     This endpoint returns a multipart MJPEG stream that can be
@@ -133,9 +197,31 @@ async def video_stream(app_core: AppCore = Depends(get_app_core)):
     ```
 
     The stream runs at approximately 10 FPS to minimize bandwidth
-    while providing smooth video playback.
+    while providing smooth video playback. Frames are downscaled to
+    max_width for preview; with overlay=false the clean frame is streamed
+    and clients draw the overlay from the WebSocket "overlay" event.
+    """
+    return StreamingResponse(
+        generate_mjpeg_stream(app_core, overlay=overlay, max_width=max_width),
+        media_type="multipart/x-mixed-replace; boundary=frame",
+    )
+
+
+@router.get("/video/{camera_id}")
+async def camera_video_stream(
+    camera_id: str,
+    overlay: bool = Query(True, description="Include server-side overlays (false: clean frame)"),
+    max_width: int = Query(PREVIEW_MAX_WIDTH, ge=0, description="Preview width limit in pixels (0: full size)"),
+    app_core: AppCore = Depends(get_app_core),
+):
+    """Get MJPEG video stream of a single camera station.
+
+    Same as /stream/video, for multi-camera setups managed by CameraManager.
     """
+    if camera_id not in app_core.camera_ids:
+        raise HTTPException(status_code=404, detail=f"Camera not found: {camera_id}")
+
     return StreamingResponse(
-        generate_mjpeg_stream(app_core),
+        generate_mjpeg_stream(app_core, camera_id, overlay, max_width),
         media_type="multipart/x-mixed-replace; boundary=frame",
     )
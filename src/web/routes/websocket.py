@@ -7,17 +7,27 @@ events to connected web clients.
 import asyncio
 import json
 import logging
+import time
 from datetime import datetime
+from enum import Enum
 from typing import List, Set, Dict, Any
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from src.core import AppCore, EventType
+from src.core import AppCore, EventType, OverflowPolicy, get_registry, profile_checkpoint
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["websocket"])
 
+_metrics = get_registry()
+_clients_gauge = _metrics.gauge("websocket_clients", "Connected WebSocket clients")
+_queue_depth_gauge = _metrics.gauge("websocket_event_queue_depth", "Events waiting for the broadcast loop")
+_send_lag = _metrics.histogram(
+    "websocket_send_lag_seconds", "Time from event delivery to the bridge until sent to all clients"
+)
+_messages_sent = _metrics.counter("websocket_messages_sent_total", "Messages sent to WebSocket clients", ("event",))
+
 
 class ConnectionManager:
     """Manages WebSocket connections and broadcasts.
@@ -28,12 +38,26 @@ class ConnectionManager:
     - Event subscription from AppCore
     """
 
+    # Events waiting for the broadcast loop
+    EVENT_QUEUE_SIZE = 100
+
+    # Events buffered per AppCore subscription before overflow policy applies
+    SUBSCRIBER_QUEUE_SIZE = 20
+
+    # Detection results are forwarded at most this often per camera (latest result wins)
+    DETECTION_INTERVAL_MS = 100
+
+    # Overlay geometry is forwarded at twice the MJPEG stream rate, so most
+    # streamed frames have the overlay of their own sequence number
+    OVERLAY_INTERVAL_MS = 50
+
     def __init__(self):
         """Initialize the connection manager."""
         self.active_connections: Set[WebSocket] = set()
         self._app_core: AppCore = None
         self._broadcast_task: asyncio.Task = None
         self._event_queue: asyncio.Queue = None
+        self._loop: asyncio.AbstractEventLoop = None
         self._running = False
 
     async def connect(self, websocket: WebSocket) -> None:
@@ -44,6 +68,7 @@ class ConnectionManager:
         """
         await websocket.accept()
         self.active_connections.add(websocket)
+        _clients_gauge.set(len(self.active_connections))
 
         # Update client count in AppCore
         if self._app_core:
@@ -61,6 +86,7 @@ class ConnectionManager:
             websocket: WebSocket connection that disconnected
         """
         self.active_connections.discard(websocket)
+        _clients_gauge.set(len(self.active_connections))
 
         # Update client count in AppCore
         if self._app_core:
@@ -114,6 +140,7 @@ class ConnectionManager:
                 await connection.send_json(message)
             except Exception:
                 disconnected.add(connection)
+        _messages_sent.labels(event=event_type).inc(len(self.active_connections) - len(disconnected))
 
         # Remove disconnected clients
         for conn in disconnected:
@@ -140,6 +167,11 @@ class ConnectionManager:
         if isinstance(data, datetime):
             return data.isoformat()
 
+        if isinstance(data, Enum):
+            # Enum members have a __dict__ of private fields only; send the
+            # name ("OK", "NG") for auto() values, as the REST API does
+            return data.value if isinstance(data.value, str) else data.name
+
         if hasattr(data, "__dict__"):
             # Convert objects to dict
             result = {}
@@ -157,39 +189,72 @@ class ConnectionManager:
     def setup_event_handlers(self, app_core: AppCore) -> None:
         """Set up event handlers to receive events from AppCore.
 
+        Must be called from the event loop. Each event type is subscribed in
+        async mode, so publishers never wait for the loop; when the loop falls
+        behind, the subscriber's overflow policy drops old events (or keeps
+        only the latest for status-like events). Detection results are rate
+        limited to DETECTION_INTERVAL_MS and overlays to OVERLAY_INTERVAL_MS
+        per camera (events are published keyed by camera ID), so a fast
+        camera never coalesces away the results of a slower one.
+
         Args:
             app_core: AppCore instance to subscribe to
         """
         self._app_core = app_core
-        self._event_queue = asyncio.Queue()
+        self._loop = asyncio.get_running_loop()
+        self._event_queue = asyncio.Queue(maxsize=self.EVENT_QUEUE_SIZE)
 
         # Subscribe to events
         def queue_event(event_type: str):
             def handler(data):
+                # Runs on the subscriber's delivery thread; waiting here backs
+                # up that subscriber's queue, not the publisher
                 try:
-                    # Put event in queue for async processing
-                    asyncio.get_event_loop().call_soon_threadsafe(self._event_queue.put_nowait, (event_type, data))
-                except Exception:
-                    pass
+                    future = asyncio.run_coroutine_threadsafe(
+                        self._event_queue.put((event_type, data, time.perf_counter())), self._loop
+                    )
+                    future.result(timeout=1.0)
+                except Exception as e:
+                    logger.debug(f"Dropped {event_type} event: {e}")
 
             return handler
 
-        app_core.subscribe(EventType.DETECTION_COMPLETE, queue_event("detection_result"))
-        app_core.subscribe(EventType.STATISTICS_UPDATE, queue_event("statistics_update"))
-        app_core.subscribe(EventType.IO_STATUS_CHANGED, queue_event("io_status"))
-        app_core.subscribe(EventType.SYSTEM_STATUS_CHANGED, queue_event("system_status"))
-        app_core.subscribe(EventType.RECIPE_CHANGED, queue_event("recipe_changed"))
+        for event, name, overflow, min_interval_ms in (
+            (EventType.DETECTION_COMPLETE, "detection_result", OverflowPolicy.DROP_OLDEST, self.DETECTION_INTERVAL_MS),
+            (EventType.OVERLAY_UPDATE, "overlay", OverflowPolicy.COALESCE_LATEST, self.OVERLAY_INTERVAL_MS),
+            (EventType.PART_COMPLETE, "part_result", OverflowPolicy.DROP_OLDEST, 0),
+            (EventType.STATISTICS_UPDATE, "statistics_update", OverflowPolicy.COALESCE_LATEST, 0),
+            (EventType.IO_STATUS_CHANGED, "io_status", OverflowPolicy.COALESCE_LATEST, 0),
+            (EventType.SYSTEM_STATUS_CHANGED, "system_status", OverflowPolicy.COALESCE_LATEST, 0),
+            (EventType.RECIPE_CHANGED, "recipe_changed", OverflowPolicy.DROP_OLDEST, 0),
+            (EventType.SPC_VIOLATION, "spc_violation", OverflowPolicy.DROP_OLDEST, 0),
+        ):
+            app_core.subscribe(
+                event,
+                queue_event(name),
+                async_dispatch=True,
+                max_queue=self.SUBSCRIBER_QUEUE_SIZE,
+                overflow=overflow,
+                name=f"websocket.{name}",
+                min_interval_ms=min_interval_ms,
+            )
+
+        if self._broadcast_task is None or self._broadcast_task.done():
+            self._broadcast_task = self._loop.create_task(self.start_broadcast_loop())
 
     async def start_broadcast_loop(self) -> None:
         """Start the broadcast loop that processes queued events."""
         self._running = True
 
         while self._running:
+            profile_checkpoint()
             try:
                 # Wait for events with timeout
                 try:
-                    event_type, data = await asyncio.wait_for(self._event_queue.get(), timeout=1.0)
+                    event_type, data, queued_at = await asyncio.wait_for(self._event_queue.get(), timeout=1.0)
+                    _queue_depth_gauge.set(self._event_queue.qsize())
                     await self.broadcast(event_type, data)
+                    _send_lag.observe(time.perf_counter() - queued_at)
                 except asyncio.TimeoutError:
                     pass
 
@@ -212,6 +277,8 @@ async def websocket_endpoint(websocket: WebSocket):
 
     This endpoint provides real-time events to connected clients:
     - detection_result: Circle detection results
+    - overlay: Circle geometry of a frame, tagged with its frame_seq
+    - part_result: Merged multi-camera part results
     - statistics_update: Production statistics (every 5s)
     - io_status: IO status changes (every 500ms)
     - system_status: System status changes (every 10s)
@@ -19,6 +19,28 @@ class MeasureStatusEnum(str, Enum):
     PARTIAL = "PARTIAL"
 
 
+class ProfileModeEnum(str, Enum):
+    """Profiling mode enumeration."""
+
+    SAMPLING = "sampling"
+    CPROFILE = "cprofile"
+
+
+class ProfileFormatEnum(str, Enum):
+    """Profile artifact format enumeration."""
+
+    PSTATS = "pstats"
+    TEXT = "text"
+    COLLAPSED = "collapsed"
+
+
+class ThumbnailSizeEnum(str, Enum):
+    """Gallery image variant enumeration."""
+
+    THUMB = "thumb"
+    PREVIEW = "preview"
+
+
 class CircleResultSchema(BaseModel):
     """Schema for a single circle detection result."""
 
@@ -42,6 +64,24 @@ class DetectionResultSchema(BaseModel):
     detection_time_ms: float
 
 
+class CameraStatusSchema(BaseModel):
+    """Schema for the status of a single camera station."""
+
+    camera_id: str
+    connected: bool
+    is_running: bool
+    current_recipe: Optional[str] = None
+    fps: float
+    part_group: Optional[str] = None
+
+
+class CameraListSchema(BaseModel):
+    """Schema for camera list."""
+
+    cameras: List[CameraStatusSchema]
+    count: int
+
+
 class SystemStatusSchema(BaseModel):
     """Schema for system status."""
 
@@ -50,20 +90,194 @@ class SystemStatusSchema(BaseModel):
     current_recipe: Optional[str] = None
     fps: float
     web_clients: int
+    cameras: List[CameraStatusSchema] = []
     timestamp: datetime
 
 
+class EventSubscriberSchema(BaseModel):
+    """Schema for delivery statistics of one event bus subscriber."""
+
+    event_type: str
+    name: str
+    mode: str
+    delivered: int
+    errors: int
+    handler_avg_ms: float
+    handler_max_ms: float
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+    suppressed: int = 0
+    lag_last_ms: float = 0.0
+    lag_max_ms: float = 0.0
+    min_interval_ms: Optional[float] = None
+
+
+class EventSubscriberListSchema(BaseModel):
+    """Schema for event bus subscriber statistics."""
+
+    subscribers: List[EventSubscriberSchema]
+    total_dropped: int
+    total_suppressed: int
+
+
+class StatisticsWindowSchema(BaseModel):
+    """Schema for inspection counts within a time window."""
+
+    name: str
+    start: datetime
+    inspections: int
+    circles: int
+    ok_count: int
+    ng_count: int
+    ok_rate: float
+    throughput_per_minute: float
+
+
+class HoleStatisticsSchema(BaseModel):
+    """Schema for streaming diameter statistics of one hole position."""
+
+    hole_id: int
+    count: int
+    ok_count: int
+    ng_count: int
+    mean_mm: float
+    std_mm: float
+    min_mm: float
+    max_mm: float
+    p05_mm: float
+    p50_mm: float
+    p95_mm: float
+
+
 class StatisticsSchema(BaseModel):
     """Schema for production statistics."""
 
     total_inspections: int
+    total_circles: int = 0
     ok_count: int
     ng_count: int
+    ok_parts: int = 0
+    ng_parts: int = 0
     ok_rate: float
     throughput_per_minute: float
     runtime_seconds: int
     last_result: Optional[MeasureStatusEnum] = None
     session_start: Optional[datetime] = None
+    windows: List[StatisticsWindowSchema] = []
+    holes: List[HoleStatisticsSchema] = []
+
+
+class SPCChartSchema(BaseModel):
+    """Schema for control limits and capability of one (recipe, hole) chart."""
+
+    recipe: str
+    hole_id: int
+    chart_type: str
+    count: int
+    points: int
+    limits_fixed: bool
+    center_line: float
+    ucl: float
+    lcl: float
+    range_center_line: float
+    range_ucl: float
+    range_lcl: float
+    sigma: float
+    mean: float
+    std: float
+    cp: Optional[float] = None
+    cpk: Optional[float] = None
+    pp: Optional[float] = None
+    ppk: Optional[float] = None
+    last_value: Optional[float] = None
+    violations: int
+
+
+class SPCViolationSchema(BaseModel):
+    """Schema for a Western Electric rule violation."""
+
+    recipe: str
+    hole_id: int
+    rule: int
+    description: str
+    value: float
+    center_line: float
+    ucl: float
+    lcl: float
+    timestamp: datetime
+
+
+class SPCResponseSchema(BaseModel):
+    """Schema for SPC charts and recent violations."""
+
+    enabled: bool
+    io_error: bool = False
+    charts: List[SPCChartSchema] = []
+    violations: List[SPCViolationSchema] = []
+
+
+class SPCAcknowledgeSchema(BaseModel):
+    """Schema for an acknowledged SPC alarm."""
+
+    acknowledged: bool
+
+
+class ProfileFunctionSchema(BaseModel):
+    """Schema for one function of a profile."""
+
+    function: str
+    calls: int
+    self_s: float
+    cumulative_s: float
+
+
+class MemoryDiffSchema(BaseModel):
+    """Schema for the allocation change of one source line."""
+
+    filename: str
+    lineno: int
+    size_diff_kb: float
+    size_kb: float
+    count_diff: int
+
+
+class ProfileResultSchema(BaseModel):
+    """Schema for a finished profiling session."""
+
+    mode: ProfileModeEnum
+    started: datetime
+    duration_s: float
+    threads: List[str]
+    samples: int
+    functions: List[ProfileFunctionSchema]
+    memory: Optional[List[MemoryDiffSchema]] = None
+    formats: List[ProfileFormatEnum]
+    missing_threads: List[str] = []
+
+
+class FlightRecorderSchema(BaseModel):
+    """Schema for flight recorder status."""
+
+    enabled: bool
+    frames: int = 0
+    span_s: float = 0.0
+    bytes: int = 0
+    max_bytes: int = 0
+    recorded: int = 0
+    dropped: int = 0
+    pending_dumps: int = 0
+    dumps_written: int = 0
+    dumps_dropped: int = 0
+
+
+class FlightRecorderDumpSchema(BaseModel):
+    """Schema for a requested flight recorder dump."""
+
+    scheduled: bool
+    reason: str
+    dump_dir: str
 
 
 class IOStatusSchema(BaseModel):
@@ -81,6 +295,16 @@ class IOStatusSchema(BaseModel):
     recipe_index: int
 
 
+class ScaleFieldSchema(BaseModel):
+    """Schema for the field correction of a grid-plate calibration."""
+
+    rows: int
+    cols: int
+    min_factor: float
+    max_factor: float
+    samples: int
+
+
 class CalibrationSchema(BaseModel):
     """Schema for calibration info."""
 
@@ -89,6 +313,7 @@ class CalibrationSchema(BaseModel):
     reference_size_mm: Optional[float] = None
     reference_size_px: Optional[float] = None
     calibrated_at: Optional[datetime] = None
+    scale_field: Optional[ScaleFieldSchema] = None
 
 
 class RecipeListSchema(BaseModel):
@@ -110,12 +335,25 @@ class DetectionConfigSchema(BaseModel):
     binary_threshold: int
 
 
+class HoleToleranceSchema(BaseModel):
+    """Schema for per-hole tolerance overrides."""
+
+    hole_id: int
+    nominal_mm: Optional[float] = None
+    tolerance_mm: Optional[float] = None
+    x_px: Optional[float] = None
+    y_px: Optional[float] = None
+
+
 class ToleranceConfigSchema(BaseModel):
     """Schema for tolerance configuration."""
 
     enabled: bool
     nominal_mm: float
     tolerance_mm: float
+    min_circularity: float = 0.0
+    position_tolerance_px: float = 0.0
+    holes: List[HoleToleranceSchema] = []
 
 
 class RecipeDetailSchema(BaseModel):
@@ -132,7 +370,10 @@ class RecipeDetailSchema(BaseModel):
 class HistoryItemSchema(BaseModel):
     """Schema for a history item."""
 
+    seq: int
     timestamp: datetime
+    camera_id: Optional[str] = None
+    recipe: Optional[str] = None
     circles: List[CircleResultSchema]
     overall_status: MeasureStatusEnum
 
@@ -146,6 +387,30 @@ class HistoryResponseSchema(BaseModel):
     offset: int
 
 
+class ImageItemSchema(BaseModel):
+    """Schema for a saved image in the gallery."""
+
+    id: int
+    timestamp: datetime
+    kind: str
+    status: MeasureStatusEnum
+    codec: Optional[str] = None
+    size_bytes: int
+    frame_seq: Optional[int] = None
+    thumbnail_url: str
+    preview_url: str
+    image_url: str
+
+
+class ImageListSchema(BaseModel):
+    """Schema for a page of saved images."""
+
+    items: List[ImageItemSchema]
+    total: int
+    limit: int
+    offset: int
+
+
 class WebSocketEventSchema(BaseModel):
     """Schema for WebSocket events."""
 
@@ -19,7 +19,7 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 
 from src.core import AppCore
-from src.web.routes import api_router, stream_router, websocket_router
+from src.web.routes import api_router, metrics_router, stream_router, websocket_router
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +54,7 @@ def create_app(app_core: Optional[AppCore] = None) -> FastAPI:
     app.include_router(api_router)
     app.include_router(stream_router)
     app.include_router(websocket_router)
+    app.include_router(metrics_router)
 
     # Health check endpoint
     @app.get("/health")
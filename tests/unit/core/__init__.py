@@ -0,0 +1 @@
+"""Core layer unit tests"""
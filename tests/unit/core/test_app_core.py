@@ -0,0 +1,324 @@
+"""Tests for AppCore - Shared state, frame buffer and event bus"""
+
+import threading
+import time
+
+import pytest
+import numpy as np
+from src.core import AppCore, EventBatch, EventType, OverflowPolicy
+
+
+class TestFrameBuffer:
+    """Test versioned, copy-free frame buffer"""
+
+    @pytest.fixture
+    def app_core(self):
+        AppCore.reset_instance()
+        yield AppCore()
+        AppCore.reset_instance()
+
+    def test_frames_shared_without_copy(self, app_core):
+        """TC-CORE-001: Getter returns the stored array, read-only"""
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        app_core.set_raw_frame(frame)
+
+        stored = app_core.get_raw_frame()
+        assert stored is frame
+        assert not stored.flags.writeable
+        with pytest.raises(ValueError):
+            stored[0, 0, 0] = 1
+
+    def test_version_increments(self, app_core):
+        """TC-CORE-002: Every update bumps the version"""
+        assert app_core.get_frame_version() == 0
+        v1 = app_core.set_raw_frame(np.zeros((4, 4), dtype=np.uint8))
+        v2 = app_core.set_display_frame(np.zeros((4, 4), dtype=np.uint8))
+        assert v2 == v1 + 1 == app_core.get_frame_version()
+
+    def test_set_frames_single_version(self, app_core):
+        """TC-CORE-003: set_frames stores a cycle as one consistent snapshot"""
+        raw = np.zeros((4, 4), dtype=np.uint8)
+        display = np.ones((4, 4), dtype=np.uint8)
+        version = app_core.set_frames(raw, display)
+
+        snapshot = app_core.get_frames()
+        assert snapshot.version == version == 1
+        assert snapshot.raw_frame is raw
+        assert snapshot.display_frame is display
+
+    def test_wait_for_frame_timeout(self, app_core):
+        """TC-CORE-004: Waiting without a new frame times out"""
+        assert app_core.wait_for_frame(0, timeout=0.05) is None
+
+    def test_wait_for_frame_wakes_on_update(self, app_core):
+        """TC-CORE-005: Reader wakes up when a newer version is published"""
+        result = {}
+
+        def reader():
+            result["snapshot"] = app_core.wait_for_frame(0, timeout=2.0)
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        app_core.set_raw_frame(np.zeros((4, 4), dtype=np.uint8))
+        thread.join()
+
+        assert result["snapshot"] is not None
+        assert result["snapshot"].version == 1
+
+    def test_frames_keyed_by_camera(self, app_core):
+        """TC-CORE-006: Cameras have independent buffers"""
+        app_core.set_raw_frame(np.zeros((4, 4), dtype=np.uint8), camera_id="cam1")
+        assert app_core.get_raw_frame("cam1") is not None
+        assert app_core.get_raw_frame() is None
+        assert app_core.get_frame_version("cam2") == 0
+
+    def test_clear_keeps_version_monotonic(self, app_core):
+        """TC-CORE-007: Clearing frames never moves the version backwards"""
+        app_core.set_raw_frame(np.zeros((4, 4), dtype=np.uint8))
+        app_core.clear_frames()
+        assert app_core.get_raw_frame() is None
+        assert app_core.get_frame_version() == 2
+
+    def test_frame_seq_tags_raw_frame(self, app_core):
+        """TC-CORE-043: set_frames keeps the pipeline sequence number with the raw frame"""
+        app_core.set_frames(np.zeros((4, 4), dtype=np.uint8), frame_seq=7)
+        assert app_core.get_frames().frame_seq == 7
+
+        app_core.set_display_frame(np.zeros((4, 4), dtype=np.uint8))
+        assert app_core.get_frames().frame_seq == 7
+
+        app_core.set_raw_frame(np.zeros((4, 4), dtype=np.uint8))
+        assert app_core.get_frames().frame_seq is None
+
+
+class TestEventBus:
+    """Test synchronous and queued event delivery"""
+
+    @pytest.fixture
+    def app_core(self):
+        AppCore.reset_instance()
+        yield AppCore()
+        AppCore.reset_instance()
+
+    @staticmethod
+    def _wait(condition, timeout=2.0):
+        deadline = time.time() + timeout
+        while not condition() and time.time() < deadline:
+            time.sleep(0.01)
+        return condition()
+
+    def test_sync_delivery(self, app_core):
+        """TC-CORE-008: Sync subscribers run before publish returns"""
+        received = []
+        app_core.subscribe(EventType.DETECTION_COMPLETE, received.append)
+        app_core.publish(EventType.DETECTION_COMPLETE, 1)
+        assert received == [1]
+
+    def test_async_publisher_never_blocks(self, app_core):
+        """TC-CORE-009: A slow async subscriber does not delay the publisher"""
+        release = threading.Event()
+        received = []
+
+        def slow(data):
+            release.wait(2.0)
+            received.append(data)
+
+        app_core.subscribe(EventType.DETECTION_COMPLETE, slow, async_dispatch=True)
+
+        start = time.perf_counter()
+        for i in range(10):
+            app_core.publish(EventType.DETECTION_COMPLETE, i)
+        assert time.perf_counter() - start < 0.5
+
+        release.set()
+        assert self._wait(lambda: len(received) == 10)
+        assert received == list(range(10))
+
+    def test_drop_oldest(self, app_core):
+        """TC-CORE-010: Full queue drops the oldest events"""
+        release = threading.Event()
+        received = []
+
+        def handler(data):
+            release.wait(2.0)
+            received.append(data)
+
+        app_core.subscribe(EventType.DETECTION_COMPLETE, handler, async_dispatch=True, max_queue=3, name="slow")
+        app_core.publish(EventType.DETECTION_COMPLETE, 0)
+        assert self._wait(lambda: app_core.get_subscriber_stats()[0]["queue_depth"] == 0)
+
+        for i in range(1, 7):
+            app_core.publish(EventType.DETECTION_COMPLETE, i)
+        release.set()
+
+        assert self._wait(lambda: len(received) == 4)
+        assert received == [0, 4, 5, 6]
+        stats = app_core.get_subscriber_stats()[0]
+        assert stats["name"] == "slow"
+        assert stats["dropped"] == 3
+        assert stats["max_queue_depth"] == 3
+
+    def test_drop_newest(self, app_core):
+        """TC-CORE-011: DROP_NEWEST keeps queued events and rejects new ones"""
+        release = threading.Event()
+        received = []
+
+        def handler(data):
+            release.wait(2.0)
+            received.append(data)
+
+        app_core.subscribe(
+            EventType.DETECTION_COMPLETE,
+            handler,
+            async_dispatch=True,
+            max_queue=2,
+            overflow=OverflowPolicy.DROP_NEWEST,
+        )
+        app_core.publish(EventType.DETECTION_COMPLETE, 0)
+        assert self._wait(lambda: app_core.get_subscriber_stats()[0]["queue_depth"] == 0)
+
+        for i in range(1, 5):
+            app_core.publish(EventType.DETECTION_COMPLETE, i)
+        release.set()
+
+        assert self._wait(lambda: len(received) == 3)
+        assert received == [0, 1, 2]
+
+    def test_coalesce_latest(self, app_core):
+        """TC-CORE-012: Coalescing subscriber only sees the latest pending event"""
+        release = threading.Event()
+        received = []
+
+        def handler(data):
+            release.wait(2.0)
+            received.append(data)
+
+        app_core.subscribe(
+            EventType.IO_STATUS_CHANGED, handler, async_dispatch=True, overflow=OverflowPolicy.COALESCE_LATEST
+        )
+        app_core.publish(EventType.IO_STATUS_CHANGED, 0)
+        assert self._wait(lambda: app_core.get_subscriber_stats()[0]["queue_depth"] == 0)
+
+        for i in range(1, 5):
+            app_core.publish(EventType.IO_STATUS_CHANGED, i)
+        release.set()
+
+        assert self._wait(lambda: len(received) == 2)
+        assert received == [0, 4]
+        assert app_core.get_subscriber_stats()[0]["coalesced"] == 3
+
+    def test_handler_errors_counted(self, app_core):
+        """TC-CORE-013: Handler exceptions are isolated and counted"""
+
+        def failing(data):
+            raise RuntimeError("boom")
+
+        received = []
+        app_core.subscribe(EventType.DETECTION_COMPLETE, failing)
+        app_core.subscribe(EventType.DETECTION_COMPLETE, received.append)
+        app_core.publish(EventType.DETECTION_COMPLETE, 1)
+
+        assert received == [1]
+        stats = {s["name"]: s for s in app_core.get_subscriber_stats()}
+        assert stats[failing.__qualname__]["errors"] == 1
+        assert stats[failing.__qualname__]["delivered"] == 1
+
+    def test_lag_and_handler_time(self, app_core):
+        """TC-CORE-014: Async subscribers report lag and handler time"""
+        done = threading.Event()
+
+        def handler(data):
+            time.sleep(0.02)
+            if data == 1:
+                done.set()
+
+        app_core.subscribe(EventType.DETECTION_COMPLETE, handler, async_dispatch=True)
+        app_core.publish(EventType.DETECTION_COMPLETE, 0)
+        app_core.publish(EventType.DETECTION_COMPLETE, 1)
+        assert done.wait(2.0)
+
+        assert self._wait(lambda: app_core.get_subscriber_stats()[0]["delivered"] == 2)
+        stats = app_core.get_subscriber_stats()[0]
+        assert stats["mode"] == "async"
+        assert stats["handler_max_ms"] >= 15
+        assert stats["lag_max_ms"] >= 15
+
+    def test_unsubscribe_stops_worker(self, app_core):
+        """TC-CORE-015: Unsubscribing an async subscriber stops its thread"""
+        received = []
+        app_core.subscribe(EventType.DETECTION_COMPLETE, received.append, async_dispatch=True)
+        app_core.unsubscribe(EventType.DETECTION_COMPLETE, received.append)
+
+        assert app_core.get_subscriber_stats() == []
+        assert not any(t.name == "EventWorker-detection_complete" for t in threading.enumerate())
+        app_core.publish(EventType.DETECTION_COMPLETE, 1)
+        time.sleep(0.05)
+        assert received == []
+
+    def test_throttled_latest_within_interval(self, app_core):
+        """TC-CORE-016: Rate-limited subscriber gets the latest event per interval"""
+        received = []
+        app_core.subscribe(EventType.DETECTION_COMPLETE, received.append, min_interval_ms=100)
+
+        for i in range(50):
+            app_core.publish(EventType.DETECTION_COMPLETE, i)
+
+        assert self._wait(lambda: received and received[-1] == 49)
+        time.sleep(0.15)
+        assert len(received) <= 2
+
+        stats = app_core.get_subscriber_stats()[0]
+        assert stats["mode"] == "throttled"
+        assert stats["suppressed"] == 50 - len(received)
+
+    def test_throttled_bounded_rate(self, app_core):
+        """TC-CORE-017: Delivery rate stays bounded under a full-rate publisher"""
+        received = []
+        app_core.subscribe(EventType.DETECTION_COMPLETE, received.append, min_interval_ms=50)
+
+        end = time.time() + 0.3
+        published = 0
+        while time.time() < end:
+            app_core.publish(EventType.DETECTION_COMPLETE, published)
+            published += 1
+            time.sleep(0.001)
+
+        assert self._wait(lambda: received[-1] == published - 1)
+        assert published > 50
+        assert len(received) <= 9
+
+    def test_aggregate_counts(self, app_core):
+        """TC-CORE-018: Aggregating subscriber receives merged event counts"""
+        batches = []
+        app_core.subscribe(EventType.DETECTION_COMPLETE, batches.append, min_interval_ms=100, aggregate=True)
+
+        for i in range(20):
+            app_core.publish(EventType.DETECTION_COMPLETE, i)
+
+        assert self._wait(lambda: sum(batch.count for batch in batches) == 20)
+        assert all(isinstance(batch, EventBatch) for batch in batches)
+        assert batches[-1].latest == 19
+
+    def test_throttled_per_key(self, app_core):
+        """TC-CORE-045: Rate limiting keeps the latest event of every camera"""
+        received = []
+        app_core.subscribe(EventType.OVERLAY_UPDATE, received.append, min_interval_ms=50)
+
+        end = time.time() + 0.3
+        fast = 0
+        while time.time() < end:
+            app_core.publish(EventType.OVERLAY_UPDATE, ("top", fast), key="top")
+            fast += 1
+            if fast % 50 == 0:
+                app_core.publish(EventType.OVERLAY_UPDATE, ("side", fast), key="side")
+            time.sleep(0.001)
+
+        # The slow camera is never coalesced away by the fast one
+        side_events = fast // 50
+        assert side_events > 0
+        assert self._wait(lambda: sum(1 for camera, _ in received if camera == "side") == side_events)
+        assert self._wait(lambda: ("top", fast - 1) in received)
+        assert sum(1 for camera, _ in received if camera == "top") <= 9
+
+        # Keys are forgotten once idle for an interval
+        assert self._wait(lambda: app_core.get_subscriber_stats()[0]["keys"] == 0)
@@ -0,0 +1,148 @@
+"""Tests for HistoryBuffer - Ring-buffer measurement history"""
+
+import pytest
+from src.core import AppCore, HistoryBuffer
+from src.domain.entities import CircleResult
+from src.domain.enums import MeasureStatus
+
+
+def _result(*statuses: MeasureStatus):
+    return [
+        CircleResult(
+            hole_id=i + 1,
+            center_x=10.0 * i,
+            center_y=5.0,
+            radius=20.0,
+            diameter_mm=10.0,
+            circularity=0.95,
+            area_mm2=78.5,
+            status=status,
+        )
+        for i, status in enumerate(statuses)
+    ]
+
+
+class TestHistoryBuffer:
+    """Test ring buffer append, paging and wrap-around"""
+
+    def test_compact_record(self):
+        """TC-CORE-019: Results are stored as compact records"""
+        history = HistoryBuffer(capacity=10)
+        record = history.add_result(_result(MeasureStatus.OK, MeasureStatus.NG), "cam1")
+
+        assert record.seq == 1
+        assert record.camera_id == "cam1"
+        assert record.overall_status == "NG"
+        assert record.circles[1].hole_id == 2
+        assert record.circles[0].diameter_px == 40.0
+        assert record.circles[0].status == "OK"
+
+    def test_overall_status(self):
+        """TC-CORE-020: Overall status is OK only when all holes are OK"""
+        history = HistoryBuffer(capacity=10)
+        assert history.add_result(_result(MeasureStatus.OK), "cam").overall_status == "OK"
+        assert history.add_result(_result(MeasureStatus.NONE), "cam").overall_status == "NONE"
+        assert history.add_result([], "cam").overall_status == "NONE"
+
+    def test_paging_newest_first(self):
+        """TC-CORE-021: get() pages newest first"""
+        history = HistoryBuffer(capacity=10)
+        for _ in range(5):
+            history.add_result([], "cam")
+
+        assert [r.seq for r in history.get(limit=2)] == [5, 4]
+        assert [r.seq for r in history.get(limit=2, offset=3)] == [2, 1]
+        assert history.get(limit=2, offset=5) == []
+
+    def test_wrap_around(self):
+        """TC-CORE-022: Oldest records are overwritten, sequence keeps counting"""
+        history = HistoryBuffer(capacity=3)
+        for _ in range(7):
+            history.add_result([], "cam")
+
+        assert len(history) == 3
+        assert history.last_seq == 7
+        assert [r.seq for r in history.get(limit=10)] == [7, 6, 5]
+
+    def test_clear_keeps_sequence(self):
+        """TC-CORE-023: Clearing does not reuse sequence numbers"""
+        history = HistoryBuffer(capacity=3)
+        history.add_result([], "cam")
+        history.clear()
+
+        assert len(history) == 0
+        assert history.get() == []
+        assert history.add_result([], "cam").seq == 2
+
+    def test_resize_keeps_newest(self):
+        """TC-CORE-024: Resizing keeps the newest records"""
+        history = HistoryBuffer(capacity=5)
+        for _ in range(5):
+            history.add_result([], "cam")
+
+        history.resize(2)
+        assert [r.seq for r in history.get()] == [5, 4]
+
+        history.resize(4)
+        history.add_result([], "cam")
+        assert [r.seq for r in history.get()] == [6, 5, 4]
+
+    def test_invalid_capacity(self):
+        """TC-CORE-025: Capacity must be positive"""
+        with pytest.raises(ValueError):
+            HistoryBuffer(capacity=0)
+
+    def test_find_across_chunks(self):
+        """TC-CORE-044: find() scans every record newest first, chunk by chunk"""
+        history = HistoryBuffer(capacity=HistoryBuffer.FIND_CHUNK * 2 + 10)
+        for i in range(history.capacity + 50):
+            history.add_result(_result(MeasureStatus.NG if i % 3 == 0 else MeasureStatus.OK), "cam")
+
+        page, total = history.find(lambda record: record.overall_status == "NG", limit=5, offset=2)
+        expected = [r.seq for r in history.get(history.capacity) if r.overall_status == "NG"]
+        assert total == len(expected)
+        assert [r.seq for r in page] == expected[2:7]
+
+
+class TestAppCoreHistory:
+    """Test AppCore history integration"""
+
+    @pytest.fixture
+    def app_core(self):
+        AppCore.reset_instance()
+        yield AppCore()
+        AppCore.reset_instance()
+
+    def test_results_recorded(self, app_core):
+        """TC-CORE-026: Published results land in history with camera ID"""
+        app_core.set_latest_result(_result(MeasureStatus.OK), camera_id="top")
+        app_core.set_latest_result(_result(MeasureStatus.NG), camera_id="side")
+
+        records = app_core.get_history()
+        assert [r.camera_id for r in records] == ["side", "top"]
+        assert app_core.get_history_count() == 2
+        assert app_core.get_history_seq() == 2
+
+    def test_configurable_capacity(self, app_core):
+        """TC-CORE-027: History capacity can be changed at runtime"""
+        app_core.set_history_capacity(2)
+        for _ in range(4):
+            app_core.set_latest_result(_result(MeasureStatus.OK))
+
+        assert app_core.get_history_count() == 2
+        assert [r.seq for r in app_core.get_history()] == [4, 3]
+
+    def test_query_in_memory(self, app_core):
+        """TC-CORE-028: Without a store, filters apply to in-memory history"""
+        app_core.current_recipe = "A"
+        app_core.set_latest_result(_result(MeasureStatus.OK), camera_id="top")
+        app_core.set_latest_result(_result(MeasureStatus.NG, MeasureStatus.OK), camera_id="top")
+        app_core.current_recipe = "B"
+        app_core.set_latest_result(_result(MeasureStatus.OK), camera_id="side")
+
+        records, total = app_core.query_history(recipe="A")
+        assert total == 2
+        assert [r.seq for r in records] == [2, 1]
+        assert app_core.query_history(status="ng")[1] == 1
+        assert app_core.query_history(hole_id=2)[1] == 1
+        assert app_core.query_history(camera_id="side", limit=1)[0][0].recipe == "B"
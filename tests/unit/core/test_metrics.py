@@ -0,0 +1,77 @@
+"""Tests for MetricsRegistry - Counters, gauges, histograms and Prometheus export"""
+
+import threading
+
+import pytest
+from src.core import MetricsRegistry
+
+
+class TestMetricsRegistry:
+    """Test metric types and text exposition"""
+
+    def test_counter_and_gauge(self):
+        """TC-CORE-029: Counters and gauges render with HELP, TYPE and labels"""
+        registry = MetricsRegistry()
+        frames = registry.counter("frames_total", "Frames grabbed", ("camera",))
+        frames.labels(camera="cam1").inc()
+        frames.labels(camera="cam1").inc(2)
+        clients = registry.gauge("clients", "Connected clients")
+        clients.set(3)
+        clients.dec()
+
+        text = registry.render()
+
+        assert "# HELP cms_frames_total Frames grabbed\n# TYPE cms_frames_total counter" in text
+        assert 'cms_frames_total{camera="cam1"} 3\n' in text
+        assert "# TYPE cms_clients gauge\ncms_clients 2\n" in text
+
+    def test_histogram_buckets(self):
+        """TC-CORE-030: Histogram buckets are cumulative with sum and count"""
+        registry = MetricsRegistry()
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.01, 0.1))
+        for value in (0.005, 0.05, 0.05, 2.0):
+            latency.observe(value)
+
+        lines = registry.render().splitlines()
+
+        assert 'cms_latency_seconds_bucket{le="0.01"} 1' in lines
+        assert 'cms_latency_seconds_bucket{le="0.1"} 3' in lines
+        assert 'cms_latency_seconds_bucket{le="+Inf"} 4' in lines
+        assert "cms_latency_seconds_sum 2.105" in lines
+        assert "cms_latency_seconds_count 4" in lines
+
+    def test_registration_is_idempotent(self):
+        """TC-CORE-031: Same name returns the same metric; conflicting types are rejected"""
+        registry = MetricsRegistry()
+        first = registry.counter("errors_total", "Errors", ("stage",))
+
+        assert registry.counter("errors_total", "Errors", ("stage",)) is first
+        assert registry.get("errors_total") is first
+        with pytest.raises(ValueError):
+            registry.gauge("errors_total", "Errors", ("stage",))
+        with pytest.raises(ValueError):
+            first.labels(camera="x")
+
+    def test_label_escaping(self):
+        """TC-CORE-032: Label values are escaped"""
+        registry = MetricsRegistry(namespace="")
+        registry.gauge("depth", "Depth", ("name",)).labels(name='a"b\\c').set(1)
+
+        assert 'depth{name="a\\"b\\\\c"} 1' in registry.render()
+
+    def test_concurrent_increments(self):
+        """TC-CORE-033: Counter increments from several threads are not lost"""
+        registry = MetricsRegistry()
+        counter = registry.counter("events_total", "Events", ("kind",)).labels(kind="a")
+
+        def work():
+            for _ in range(10000):
+                counter.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.value == 40000
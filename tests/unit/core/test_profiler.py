@@ -0,0 +1,147 @@
+"""Tests for Profiler - On-demand sampling and cProfile sessions"""
+
+import io
+import marshal
+import pstats
+import threading
+import time
+
+import pytest
+from src.core import ProfileMode, get_profiler, profile_checkpoint
+from src.core import profiler as profiler_module
+from src.core.profiler import Profiler
+
+
+def _busy_work():
+    total = 0
+    for i in range(300000):
+        total += i * i
+    return total
+
+
+class _Worker:
+    """Thread that calls _busy_work in a loop with a profile checkpoint"""
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ProfiledWorker", daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            profile_checkpoint()
+            _busy_work()
+            time.sleep(0.001)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join(timeout=2.0)
+
+
+class TestProfiler:
+    """Test profiling sessions and artifacts"""
+
+    def test_sampling_sees_worker(self):
+        """TC-CORE-034: Sampling records stacks of other threads"""
+        with _Worker():
+            result = Profiler().run(0.3, ProfileMode.SAMPLING, interval_ms=2)
+
+        assert result.samples > 10
+        assert "ProfiledWorker" in result.threads
+        assert any(key[2] == "_busy_work" for key in result.stats)
+        assert any(
+            line.startswith("ProfiledWorker;") and "_busy_work" in line for line in result.collapsed.splitlines()
+        )
+
+    def test_cprofile_via_checkpoints(self):
+        """TC-CORE-035: cProfile mode profiles threads that reach a checkpoint"""
+        with _Worker():
+            result = Profiler().run(0.3, ProfileMode.CPROFILE)
+
+        assert result.threads == ["ProfiledWorker"]
+        assert result.collapsed is None
+        calls = [value[1] for key, value in result.stats.items() if key[2] == "_busy_work"]
+        assert calls and calls[0] >= 3
+
+    def test_blocked_thread_released(self, monkeypatch):
+        """TC-CORE-047: A thread blocked after joining is reported missing and idle checkpoints are cheap again"""
+        monkeypatch.setattr(Profiler, "CHECKPOINT_TIMEOUT_S", 0.2)
+        release = threading.Event()
+
+        def blocked():
+            profile_checkpoint()  # Joins the running session
+            release.wait(timeout=5.0)
+            profile_checkpoint()
+
+        thread = threading.Thread(target=blocked, name="BlockedWorker", daemon=True)
+        profiler = Profiler()
+        with _Worker():
+            session = threading.Thread(target=lambda: profiler.run(0.3, ProfileMode.CPROFILE))
+            session.start()
+            while profiler_module._session is None:
+                time.sleep(0.001)
+            thread.start()
+            session.join(timeout=5.0)
+
+        release.set()
+        thread.join(timeout=2.0)
+        result = profiler.last_result
+        assert result.threads == ["ProfiledWorker"]
+        assert result.missing_threads == ["BlockedWorker"]
+        assert profiler_module._holding == 0
+
+    def test_pstats_artifact_loads(self):
+        """TC-CORE-036: Binary artifact loads with pstats; text report lists functions"""
+        with _Worker():
+            result = Profiler().run(0.2, ProfileMode.SAMPLING, interval_ms=2)
+
+        assert marshal.loads(result.pstats_bytes()) == result.stats
+        assert "_busy_work" in result.text_report(limit=100)
+        stats = pstats.Stats(_holder(result.stats), stream=io.StringIO())
+        assert stats.total_tt > 0
+
+    def test_memory_diff(self):
+        """TC-CORE-037: tracemalloc diff shows allocations made during the session"""
+        retained = []
+
+        def allocate():
+            for _ in range(20):
+                retained.append(bytearray(100_000))
+                time.sleep(0.005)
+
+        thread = threading.Thread(target=allocate)
+        thread.start()
+        result = Profiler().run(0.3, ProfileMode.SAMPLING, memory=True)
+        thread.join()
+
+        assert result.memory
+        assert result.memory[0].size_diff_kb > 1000
+
+    def test_one_session_at_a_time(self):
+        """TC-CORE-038: A second session is rejected while one is running"""
+        profiler = get_profiler()
+        runner = threading.Thread(target=profiler.run, args=(0.3,))
+        runner.start()
+        time.sleep(0.05)
+        try:
+            assert profiler.is_active
+            with pytest.raises(RuntimeError):
+                profiler.run(0.1)
+        finally:
+            runner.join()
+
+        assert not profiler.is_active
+        assert profiler.last_result is not None
+        with pytest.raises(ValueError):
+            profiler.run(0.1, mode="unknown")
+
+
+def _holder(stats):
+    class Holder:
+        def create_stats(self):
+            self.stats = stats
+
+    return Holder()
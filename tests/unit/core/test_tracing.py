@@ -0,0 +1,90 @@
+"""Tests for Tracer - Per-frame trace spans and Chrome trace export"""
+
+import gc
+import json
+import threading
+import time
+
+import pytest
+from src.core import Tracer
+
+
+class TestTracer:
+    """Test span recording, ring wrap-around and export"""
+
+    def test_span_tagged_with_frame(self):
+        """TC-CORE-039: Spans carry the thread's frame and camera"""
+        tracer = Tracer(trace_gc=False)
+        tracer.set_frame(7, "cam1")
+        with tracer.span("preprocess"):
+            time.sleep(0.002)
+        tracer.set_frame(None)
+        with tracer.span("idle"):
+            pass
+
+        (name, start_ns, duration_ns, thread_id, frame, camera, _), idle = tracer.get_spans()
+        assert (name, frame, camera, thread_id) == ("preprocess", 7, "cam1", threading.get_ident())
+        assert duration_ns >= 2_000_000
+        assert idle[4] is None
+
+    def test_ring_keeps_newest(self):
+        """TC-CORE-040: Full ring overwrites the oldest spans"""
+        tracer = Tracer(capacity=3, trace_gc=False)
+        for i in range(5):
+            tracer.record(f"s{i}", i, i + 1)
+
+        assert [span[0] for span in tracer.get_spans()] == ["s2", "s3", "s4"]
+        with pytest.raises(ValueError):
+            Tracer(capacity=0)
+
+    def test_chrome_export(self):
+        """TC-CORE-041: Export is Chrome trace JSON with thread names, filtered by time"""
+        tracer = Tracer(trace_gc=False)
+        now = time.perf_counter_ns()
+        tracer.record("old", now - 20_000_000_000, now - 19_000_000_000)
+        tracer.record("grab", now - 3_000_000, now - 1_000_000, frame_seq=5, camera_id="cam1", args={"size": 1})
+
+        trace = json.loads(json.dumps(tracer.export_chrome(last_s=5)))
+        events = trace["traceEvents"]
+
+        assert events[0]["ph"] == "M" and events[0]["args"]["name"] == threading.current_thread().name
+        (span,) = [event for event in events if event["ph"] == "X"]
+        assert span["name"] == "grab"
+        assert span["dur"] == pytest.approx(2000)
+        assert span["args"] == {"size": 1, "frame": 5, "camera": "cam1"}
+
+    def test_disabled_and_gc(self):
+        """TC-CORE-042: Disabled tracer records nothing; enabled tracer records gc runs"""
+        tracer = Tracer(enabled=False)
+        with tracer.span("x"):
+            pass
+        assert tracer.get_spans() == []
+
+        tracer.enable()
+        try:
+            gc.collect()
+        finally:
+            tracer.disable()
+
+        assert "gc" in [span[0] for span in tracer.get_spans()]
+
+    def test_gc_during_export(self):
+        """TC-CORE-046: A collection triggered while the ring is read or cleared records its span"""
+        tracer = Tracer(capacity=100)
+        threshold = gc.get_threshold()
+
+        def read_and_clear():
+            for _ in range(200):
+                tracer.get_spans()
+                tracer.clear()
+
+        worker = threading.Thread(target=read_and_clear, daemon=True)
+        gc.set_threshold(1)
+        try:
+            worker.start()
+            worker.join(timeout=5.0)
+        finally:
+            gc.set_threshold(*threshold)
+            tracer.disable()
+
+        assert not worker.is_alive()
@@ -1,8 +1,9 @@
 """Tests for domain config classes"""
 
 import pytest
-from src.domain.config import DetectionConfig, ToleranceConfig
+from src.domain.config import DetectionConfig, HoleTolerance, ToleranceConfig
 from src.domain.enums import MeasureStatus
+from src.domain.recipe import Recipe
 
 
 class TestDetectionConfig:
@@ -69,3 +70,16 @@ class TestToleranceConfig:
         """TC-DOM-008: Check returns NONE when disabled"""
         config = ToleranceConfig(enabled=False)
         assert config.check(10.0) == MeasureStatus.NONE
+
+    def test_recipe_round_trip_classification_limits(self):
+        """TC-DOM-009: Recipe JSON keeps circularity, position and per-hole limits"""
+        tolerance = ToleranceConfig(
+            enabled=True,
+            min_circularity=0.9,
+            position_tolerance_px=4.0,
+            holes=[HoleTolerance(1, nominal_mm=5.0), HoleTolerance(2, x_px=10.0, y_px=20.0)],
+        )
+        restored = Recipe.from_json(Recipe(name="A", tolerance_config=tolerance).to_json()).tolerance_config
+
+        assert restored == tolerance
+        assert Recipe.from_dict({"tolerance": {"enabled": True}}).tolerance_config.holes == []
@@ -4,7 +4,7 @@ import pytest
 import json
 import numpy as np
 import cv2
-from src.services.calibration_service import CalibrationService
+from src.services.calibration_service import CalibrationService, ScaleField
 from src.domain.config import DetectionConfig
 
 
@@ -166,3 +166,151 @@ class TestCalibrationService:
         assert info["reference_mm"] == 10.0
         assert info["reference_px"] == 100.0
         assert "calibrated_at" in info
+
+
+def grid_plate_image(pitch_px=40.0, distortion=0.0, size=(960, 1280)):
+    """Dark dots on a white plate; distortion > 0 spreads dots toward the edges"""
+    height, width = size
+    img = np.full((height, width), 255, dtype=np.uint8)
+    cx, cy = width / 2, height / 2
+    half = max(width, height) / 2
+    for gy in np.arange(-cy + pitch_px / 2, cy, pitch_px):
+        for gx in np.arange(-cx + pitch_px / 2, cx, pitch_px):
+            r2 = (gx * gx + gy * gy) / (half * half)
+            x = cx + gx * (1 + distortion * r2)
+            y = cy + gy * (1 + distortion * r2)
+            if 10 < x < width - 10 and 10 < y < height - 10:
+                cv2.circle(img, (round(x), round(y)), 8, 0, -1)
+    return img
+
+
+class TestGridCalibration:
+    """Test grid-plate calibration with a spatially varying scale field"""
+
+    @pytest.fixture
+    def calib_service(self, temp_config_dir):
+        """Create calibration service with temp directory"""
+        return CalibrationService(config_path=str(temp_config_dir / "calib.json"))
+
+    def test_scale_field_bilinear_lookup(self):
+        """TC-CAL-017: Field is exact at nodes, bilinear between and clamped outside"""
+        field = ScaleField(width=101, height=51, factor=np.array([[1.0, 2.0], [3.0, 4.0]]))
+
+        assert field.sample(0, 0) == pytest.approx(1.0)
+        assert field.sample(100, 50) == pytest.approx(4.0)
+        assert field.sample(50, 25) == pytest.approx(2.5)
+        np.testing.assert_allclose(field.sample(np.array([-10.0, 500.0]), np.array([0.0, 0.0])), [1.0, 2.0])
+
+    def test_uniform_grid(self, calib_service):
+        """TC-CAL-018: An undistorted plate gives its pitch and a flat field"""
+        result = calib_service.calibrate_from_grid(grid_plate_image(pitch_px=40), pitch_mm=2.0)
+
+        assert result.pixel_to_mm == pytest.approx(2.0 / 40, rel=0.01)
+        field = calib_service.scale_field
+        assert field.shape == (12, 16)
+        np.testing.assert_allclose(field.factor, 1.0, atol=0.01)
+
+    def test_distorted_grid(self, calib_service):
+        """TC-CAL-019: Dots spread toward the edges give a smaller scale there"""
+        calib_service.calibrate_from_grid(grid_plate_image(pitch_px=40, distortion=0.08), pitch_mm=2.0)
+
+        field = calib_service.scale_field
+        center = field.sample(640, 480)
+        corner = field.sample(40, 40)
+        assert center > 1.0
+        assert corner < center * 0.95
+        assert calib_service.get_info()["scale_field"]["samples"] > 500
+
+    def test_field_saved_and_reset(self, calib_service, temp_config_dir):
+        """TC-CAL-020: The field is saved next to the calibration file, kept by set_pixel_to_mm"""
+        calib_service.calibrate_from_grid(grid_plate_image(distortion=0.08), pitch_mm=2.0)
+        field_path = temp_config_dir / "calib_field.npz"
+        assert field_path.exists()
+        with open(temp_config_dir / "calib.json") as f:
+            assert json.load(f)["scale_field"] == "calib_field.npz"
+
+        reloaded = CalibrationService(config_path=str(temp_config_dir / "calib.json"))
+        np.testing.assert_allclose(reloaded.scale_field.factor, calib_service.scale_field.factor)
+
+        reloaded.set_pixel_to_mm(0.05)
+        assert reloaded.scale_field is not None
+
+        reloaded.reset_calibration()
+        assert reloaded.scale_field is None
+        assert not field_path.exists()
+
+    def test_grid_needs_dots(self, calib_service):
+        """TC-CAL-021: Reject images without a dot grid and invalid parameters"""
+        assert calib_service.calibrate_from_grid(np.full((480, 640), 255, np.uint8), pitch_mm=2.0) is None
+        assert calib_service.is_calibrated == False
+
+        with pytest.raises(ValueError):
+            calib_service.calibrate_from_grid(grid_plate_image(), pitch_mm=0)
+
+
+def circle_frame(radius, size=(480, 640)):
+    """Frame with one white circle at the center"""
+    img = np.zeros((*size, 3), dtype=np.uint8)
+    cv2.circle(img, (size[1] // 2, size[0] // 2), radius, (255, 255, 255), -1)
+    return img
+
+
+class TestAutoCalibration:
+    """Test background multi-frame calibration from a reference circle"""
+
+    @pytest.fixture
+    def calib_service(self, temp_config_dir):
+        """Create calibration service with temp directory"""
+        return CalibrationService(config_path=str(temp_config_dir / "calib.json"))
+
+    def test_coarse_to_fine_matches_full_resolution(self, calib_service):
+        """TC-CAL-022: Circle located on a subsampled frame is measured at full resolution"""
+        img = np.zeros((2400, 3200, 3), dtype=np.uint8)
+        cv2.circle(img, (1203, 1101), 401, (255, 255, 255), -1)
+        cv2.circle(img, (3000, 200), 30, (255, 255, 255), -1)
+
+        cx, cy, radius = calib_service._detect_calibration_circle(img)
+        full = calib_service._detect_circles(img)
+        assert (cx, cy, radius) == pytest.approx(tuple(full[np.argmax(full[:, 2])]), abs=0.01)
+
+    def test_job_averages_frames_and_rejects_outliers(self, calib_service):
+        """TC-CAL-023: Diameters of K frames are averaged without outliers"""
+        frames = iter([circle_frame(r) for r in (100, 101, 99, 130, 100, 100)])
+        job = calib_service.start_auto_calibration(lambda: next(frames), known_diameter_mm=10.0, frames=6)
+
+        assert job.wait(5)
+        assert job.error is None
+        assert job.progress == (6, 6)
+        assert job.rejected == 1
+        assert job.result.pixel_to_mm == pytest.approx(10.0 / 200, rel=0.01)
+        assert calib_service.pixel_to_mm == job.result.pixel_to_mm
+
+    def test_job_uses_frames_seen_before_timeout(self, calib_service):
+        """TC-CAL-024: A stalled camera ends collection with the frames measured so far"""
+        frame = circle_frame(100)
+        job = calib_service.start_auto_calibration(lambda: frame, known_diameter_mm=10.0, frames=5, frame_timeout=0.1)
+
+        assert job.wait(5)
+        assert job.progress == (1, 5)
+        assert job.result is not None
+
+    def test_job_failure_keeps_calibration(self, calib_service):
+        """TC-CAL-025: No circle or cancel reports an error and leaves calibration unchanged"""
+        blank = iter([np.zeros((480, 640, 3), np.uint8) for _ in range(3)])
+        job = calib_service.start_auto_calibration(lambda: next(blank), known_diameter_mm=10.0, frames=3)
+        assert job.wait(5)
+        assert job.result is None
+        assert job.error == "No reference circle detected"
+        assert calib_service.is_calibrated == False
+
+        job = calib_service.start_auto_calibration(lambda: None, known_diameter_mm=10.0, frame_timeout=5)
+        job.cancel()
+        assert job.wait(5)
+        assert job.error == "Cancelled"
+        assert calib_service.is_calibrated == False
+
+    def test_reject_outliers(self):
+        """TC-CAL-026: Outliers are far from the median; identical values are all kept"""
+        mask = CalibrationService.reject_outliers([200.0, 200.5, 199.5, 200.2, 260.0])
+        assert mask.tolist() == [True, True, True, True, False]
+        assert CalibrationService.reject_outliers([200.0] * 4).all()
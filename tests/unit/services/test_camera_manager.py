@@ -0,0 +1,251 @@
+"""Tests for CameraManager - Multi-camera orchestration"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from unittest.mock import MagicMock
+
+from src.core import AppCore, EventType, get_registry
+from src.services.camera_manager import CameraManager, PartResultMerger
+from src.services.virtual_camera import VirtualCamera
+from src.domain.config import DetectionConfig, ToleranceConfig, VirtualCameraConfig
+from src.domain.entities import CircleResult, OverlayFrame
+from src.domain.enums import MeasureStatus
+from src.domain.recipe import Recipe
+
+
+def _circle(status: MeasureStatus) -> CircleResult:
+    return CircleResult(
+        hole_id=1, center_x=0, center_y=0, radius=10, diameter_mm=10.0, circularity=1.0, area_mm2=78.5, status=status
+    )
+
+
+class TestPartResultMerger:
+    """Test merging of per-camera results into parts"""
+
+    @pytest.fixture
+    def merger(self):
+        merger = PartResultMerger(merge_window_ms=100)
+        merger.set_group("station1", ["top", "side"])
+        return merger
+
+    def test_complete_part(self, merger):
+        """TC-CAM-001: Part completes when all cameras reported"""
+        t0 = datetime.now()
+        assert merger.add_result("station1", "top", [_circle(MeasureStatus.OK)], t0) == []
+
+        parts = merger.add_result("station1", "side", [_circle(MeasureStatus.OK)], t0 + timedelta(milliseconds=20))
+        assert len(parts) == 1
+        assert parts[0].complete
+        assert parts[0].overall_status == MeasureStatus.OK
+        assert len(parts[0].circles) == 2
+
+    def test_ng_on_any_camera(self, merger):
+        """TC-CAM-002: Part is NG if any camera saw an NG hole"""
+        t0 = datetime.now()
+        merger.add_result("station1", "top", [_circle(MeasureStatus.OK)], t0)
+        parts = merger.add_result("station1", "side", [_circle(MeasureStatus.NG)], t0)
+        assert parts[0].overall_status == MeasureStatus.NG
+
+    def test_same_camera_starts_new_part(self, merger):
+        """TC-CAM-003: A second result from one camera opens a new part"""
+        t0 = datetime.now()
+        merger.add_result("station1", "top", [], t0)
+        merger.add_result("station1", "top", [], t0 + timedelta(milliseconds=10))
+
+        parts = merger.add_result("station1", "side", [], t0 + timedelta(milliseconds=20))
+        assert len(parts) == 1
+        assert parts[0].part_id == 1
+
+    def test_expired_part_is_partial(self, merger):
+        """TC-CAM-004: Part missing a camera expires as PARTIAL"""
+        t0 = datetime.now()
+        merger.add_result("station1", "top", [], t0)
+
+        parts = merger.add_result("station1", "top", [], t0 + timedelta(milliseconds=500))
+        assert len(parts) == 1
+        assert not parts[0].complete
+        assert parts[0].overall_status == MeasureStatus.PARTIAL
+
+    def test_flush_all(self, merger):
+        """TC-CAM-005: Flush emits all pending parts"""
+        merger.add_result("station1", "top", [], datetime.now())
+        assert len(merger.flush()) == 1
+        assert merger.flush() == []
+
+
+class TestCameraManager:
+    """Test CameraManager with virtual cameras"""
+
+    @pytest.fixture
+    def app_core(self):
+        AppCore.reset_instance()
+        yield AppCore()
+        AppCore.reset_instance()
+
+    @staticmethod
+    def _camera():
+        return VirtualCamera(VirtualCameraConfig(width=320, height=240, fps=50, hole_rows=1, hole_cols=1))
+
+    @staticmethod
+    def _recipe(name: str) -> Recipe:
+        return Recipe(
+            name=name,
+            detection_config=DetectionConfig(pixel_to_mm=0.1),
+            tolerance_config=ToleranceConfig(enabled=True, nominal_mm=7.2, tolerance_mm=1.0),
+            pixel_to_mm=0.1,
+        )
+
+    def test_add_camera_registers_in_app_core(self, app_core):
+        """TC-CAM-006: Added cameras are keyed in AppCore state"""
+        manager = CameraManager(app_core)
+        manager.add_camera("cam1", self._camera(), recipe=self._recipe("A"))
+        manager.add_camera("cam2", self._camera())
+
+        assert manager.camera_ids == ["cam1", "cam2"]
+        assert app_core.camera_ids == ["cam1", "cam2"]
+        assert app_core.get_camera_status("cam1")["current_recipe"] == "A"
+
+    def test_duplicate_camera_rejected(self, app_core):
+        """TC-CAM-007: Camera IDs must be unique"""
+        manager = CameraManager(app_core)
+        manager.add_camera("cam1", self._camera())
+        with pytest.raises(ValueError):
+            manager.add_camera("cam1", self._camera())
+
+    def test_recipe_per_camera(self, app_core):
+        """TC-CAM-008: Each camera gets its own detection config"""
+        manager = CameraManager(app_core)
+        manager.add_camera("cam1", self._camera(), recipe=self._recipe("A"))
+        manager.add_camera("cam2", self._camera(), recipe=self._recipe("B"))
+
+        station1 = manager.get_station("cam1")
+        station2 = manager.get_station("cam2")
+        assert station1.detector.config is not station2.detector.config
+
+    def test_remove_camera(self, app_core):
+        """TC-CAM-009: Removing a camera clears its AppCore state"""
+        manager = CameraManager(app_core)
+        manager.add_camera("cam1", self._camera())
+        manager.remove_camera("cam1")
+
+        assert manager.camera_ids == []
+        assert app_core.get_camera_status("cam1") is None
+
+    @pytest.mark.parametrize("worker_count", [None, 1])
+    def test_pipelines_publish_per_camera(self, app_core, worker_count):
+        """TC-CAM-010: Results and frames are published per camera (own threads or shared pool)"""
+        parts = []
+        app_core.subscribe(EventType.PART_COMPLETE, parts.append)
+
+        manager = CameraManager(app_core, worker_count=worker_count, merge_window_ms=1000)
+        manager.add_camera("top", self._camera(), recipe=self._recipe("A"), part_group="station1")
+        manager.add_camera("side", self._camera(), recipe=self._recipe("A"), part_group="station1")
+
+        assert manager.connect() == {"top": True, "side": True}
+        manager.start()
+
+        deadline = time.time() + 3.0
+        while time.time() < deadline and not (
+            app_core.get_latest_result("top") and app_core.get_latest_result("side") and parts
+        ):
+            time.sleep(0.02)
+        manager.shutdown()
+
+        assert app_core.get_latest_result("top")
+        assert app_core.get_latest_result("side")
+        assert app_core.get_display_frame("top") is not None
+        assert parts
+        assert parts[0].part_group == "station1"
+
+    def test_overlay_published_with_clean_frame(self, app_core):
+        """TC-CAM-011: Frames are published clean with the geometry of the same frame_seq"""
+        overlays = []
+        app_core.subscribe(EventType.OVERLAY_UPDATE, overlays.append)
+
+        manager = CameraManager(app_core)
+        station = manager.add_camera("top", self._camera(), recipe=self._recipe("A"))
+        station.visualizer.draw = MagicMock(side_effect=AssertionError("overlay drawn on the server"))
+
+        manager.connect()
+        manager.start()
+        deadline = time.time() + 3.0
+        while time.time() < deadline and not overlays:
+            time.sleep(0.02)
+        manager.stop()
+        frames = app_core.get_frames("top")
+        manager.shutdown()
+
+        assert overlays
+        overlay = overlays[-1]
+        assert isinstance(overlay, OverlayFrame)
+        assert (overlay.camera_id, overlay.width, overlay.height) == ("top", 320, 240)
+        assert overlay.frame_seq == frames.frame_seq
+        assert frames.display_frame is frames.raw_frame
+        # Tolerance status is applied without drawing (virtual hole is outside 7.2 +/- 1.0 mm)
+        assert overlay.circles and overlay.circles[0].status == MeasureStatus.NG
+
+    def test_results_not_blocked_with_callback(self, app_core):
+        """TC-CAM-012: Results delivered by callback never wait for the result queue or count as drops"""
+        dropped = get_registry().counter(
+            "pipeline_dropped_frames_total", "Frames or results dropped by the pipeline", ("camera", "reason")
+        )
+        before = dropped.labels(camera="fast", reason="result_queue_full").value
+        parts = []
+        manager = CameraManager(app_core)
+        manager.set_part_callback(parts.append)
+        camera = VirtualCamera(VirtualCameraConfig(width=160, height=120, fps=0, hole_rows=1, hole_cols=1))
+        manager.add_camera("fast", camera, recipe=self._recipe("A"), part_group="solo")
+        manager.connect()
+        start = time.perf_counter()
+        manager.start()
+        deadline = time.time() + 5.0
+        while time.time() < deadline and len(parts) < 30:
+            time.sleep(0.02)
+        elapsed = time.perf_counter() - start
+        manager.shutdown()
+
+        # Nobody reads the result queue: a blocking put would hold every frame 50 ms
+        assert len(parts) >= 30
+        assert elapsed < 30 * 0.05
+        assert dropped.labels(camera="fast", reason="result_queue_full").value == before
+
+    def test_stop_waits_for_pooled_frames(self, app_core):
+        """TC-CAM-013: stop() returns only after frames on the shared pool are done; threads name their camera"""
+        manager = CameraManager(app_core, worker_count=1)
+        camera = VirtualCamera(VirtualCameraConfig(width=160, height=120, fps=0, hole_rows=1, hole_cols=1))
+        station = manager.add_camera("slow", camera, recipe=self._recipe("A"))
+
+        entered = threading.Event()
+        release = threading.Event()
+        finished = []
+        detect = station.detector.detect
+
+        def slow_detect(frame):
+            entered.set()
+            release.wait(timeout=5)
+            result = detect(frame)
+            finished.append(time.perf_counter())
+            return result
+
+        station.detector.detect = slow_detect
+        manager.connect()
+        manager.start()
+        assert entered.wait(timeout=5)
+        assert "CameraThread-slow" in {thread.name for thread in threading.enumerate()}
+
+        stopper = threading.Thread(target=manager.stop)
+        stopper.start()
+        stopper.join(timeout=0.2)
+        assert stopper.is_alive()
+
+        release.set()
+        stopper.join(timeout=5)
+        assert not stopper.is_alive()
+        stopped = time.perf_counter()
+        assert len(finished) == 1
+        time.sleep(0.1)
+        assert len(finished) == 1 and finished[0] < stopped
+        manager.shutdown()
@@ -0,0 +1,138 @@
+"""Tests for CameraNodeMap and BaslerGigECamera feature writes"""
+
+import pytest
+
+from src.domain.config import CameraConfig
+from src.services.camera_service import BaslerGigECamera, CameraNodeMap, TriggerMode
+
+
+class _Node:
+    """GenICam node recording writes into its camera's log"""
+
+    def __init__(self, camera, name, value):
+        self._camera = camera
+        self._name = name
+        self.value = value
+        self.reads = 0
+
+    def GetValue(self):
+        self.reads += 1
+        return self.value
+
+    def SetValue(self, value):
+        if self._name in self._camera.rejects:
+            raise ValueError(f"{self._name} out of range")
+        self._camera.writes.append((self._name, value))
+        self.value = value
+
+
+class _Camera:
+    """Camera exposing nodes as attributes, like pylon.InstantCamera"""
+
+    def __init__(self, *names):
+        self.writes = []
+        self.rejects = set()
+        for name in names:
+            setattr(self, name, _Node(self, name, None))
+
+
+class TestCameraNodeMap:
+    """Test CameraNodeMap"""
+
+    @pytest.fixture
+    def camera(self):
+        """Camera with SFNC 1.x exposure and trigger features"""
+        return _Camera("ExposureTimeAbs", "GainAbs", "TriggerSource", "TriggerActivation", "TriggerMode")
+
+    def test_writes_only_changed_features(self, camera):
+        """TC-NMAP-001: Features already at the target value are not written again"""
+        node_map = CameraNodeMap(camera)
+        features = {"ExposureTime": 100.0, "TriggerMode": "Off"}
+
+        report = node_map.apply(features)
+        assert report.ok
+        assert report.written == ["TriggerMode", "ExposureTime"]
+
+        report = node_map.apply(features)
+        assert report.written == []
+        assert report.unchanged == ["TriggerMode", "ExposureTime"]
+
+        report = node_map.apply({"ExposureTime": 200.0, "TriggerMode": "Off"})
+        assert report.written == ["ExposureTime"]
+        assert camera.writes == [("TriggerMode", "Off"), ("ExposureTimeAbs", 100.0), ("ExposureTimeAbs", 200.0)]
+        assert report.elapsed_ms >= 0
+
+    def test_dependency_order(self, camera):
+        """TC-NMAP-002: Trigger source is set before enabling the trigger, disabling comes first"""
+        node_map = CameraNodeMap(camera)
+        node_map.apply({"TriggerMode": "On", "TriggerSource": "Line1", "ExposureTime": 50.0})
+        assert [name for name, _ in camera.writes] == ["ExposureTimeAbs", "TriggerSource", "TriggerMode"]
+
+        camera.writes.clear()
+        node_map.apply({"ExposureTime": 80.0, "TriggerSource": "Software", "TriggerMode": "Off"})
+        assert [name for name, _ in camera.writes] == ["TriggerMode", "ExposureTimeAbs", "TriggerSource"]
+
+    def test_alias_and_missing_features(self, camera):
+        """TC-NMAP-003: SFNC 1.x names are resolved once, missing features are reported"""
+        node_map = CameraNodeMap(camera)
+        assert node_map.node("ExposureTime") is camera.ExposureTimeAbs
+        assert node_map.node("Gain") is camera.GainAbs
+        assert not node_map.has("ExposureAuto")
+
+        report = node_map.apply({"ExposureAuto": "Off", "Gain": 2.0})
+        assert report.written == ["Gain"]
+        assert "ExposureAuto" in report.failed
+        assert not report.ok
+
+    def test_failed_write_is_retried(self, camera):
+        """TC-NMAP-004: A rejected value is not cached, so the next apply writes it again"""
+        node_map = CameraNodeMap(camera)
+        node_map.apply({"ExposureTime": 100.0})
+        camera.rejects.add("ExposureTimeAbs")
+        assert "ExposureTime" in node_map.apply({"ExposureTime": 1e9}).failed
+
+        camera.rejects.clear()
+        assert node_map.apply({"ExposureTime": 100.0}).written == ["ExposureTime"]
+        with pytest.raises(RuntimeError):
+            node_map.set("ExposureAuto", "Off")
+
+    def test_get_reads_once(self, camera):
+        """TC-NMAP-005: Values are read from the camera once, then served from the cache"""
+        camera.ExposureTimeAbs.value = 35.0
+        node_map = CameraNodeMap(camera)
+        assert node_map.get("ExposureTime") == 35.0
+        assert node_map.get("ExposureTime") == 35.0
+        assert camera.ExposureTimeAbs.reads == 1
+        assert node_map.get("ExposureAuto") is None
+
+        # Read value counts as known: writing it again is skipped
+        assert not node_map.set("ExposureTime", 35.0)
+        node_map.invalidate()
+        assert node_map.set("ExposureTime", 35.0)
+
+    def test_camera_apply_settings(self, camera):
+        """TC-NMAP-006: Recipe camera settings are diffed against the cached state"""
+        basler = BaslerGigECamera()
+        assert basler.apply_settings(CameraConfig()) is None
+
+        basler._camera = camera
+        basler._node_map = CameraNodeMap(camera)
+        basler._device_info = {"model": "acA4600-7gc"}
+        basler._is_connected = True
+
+        report = basler.apply_settings(CameraConfig(default_exposure_us=100.0, trigger_mode=TriggerMode.HARDWARE))
+        assert report.ok
+        assert report.written == ["ExposureTime", "TriggerSource", "TriggerActivation", "TriggerMode"]
+        assert basler.trigger_mode == TriggerMode.HARDWARE
+
+        report = basler.apply_settings(
+            CameraConfig(default_exposure_us=100.0, gain_db=1.5, trigger_mode=TriggerMode.HARDWARE)
+        )
+        assert report.written == ["Gain"]
+
+        camera.writes.clear()
+        basler.set_exposure(100.0)
+        assert camera.writes == []
+        assert basler.set_trigger_mode(TriggerMode.SOFTWARE)
+        assert camera.writes == [("TriggerMode", "Off")]
+        assert basler.get_info()["exposure_us"] == 100.0
@@ -0,0 +1,105 @@
+"""Tests for CircleClassifier - Vectorized multi-criteria classification"""
+
+import numpy as np
+import pytest
+from src.domain.config import HoleTolerance, ToleranceConfig
+from src.domain.entities import CircleResult
+from src.domain.enums import MeasureStatus
+from src.services.classifier_service import CircleClassifier
+
+
+def _circle(hole_id: int, diameter_mm: float, circularity: float = 0.95, x: float = 100, y: float = 100):
+    return CircleResult(
+        hole_id=hole_id,
+        center_x=x,
+        center_y=y,
+        radius=20,
+        diameter_mm=diameter_mm,
+        circularity=circularity,
+        area_mm2=0,
+        status=MeasureStatus.NONE,
+    )
+
+
+class TestCircleClassifier:
+    """Test CircleClassifier"""
+
+    def test_disabled_keeps_status(self):
+        """TC-CLS-001: Disabled tolerance leaves circles unchanged"""
+        circles = [_circle(1, 10.0)]
+        assert CircleClassifier().apply(circles) is None
+        assert circles[0].status == MeasureStatus.NONE
+
+    def test_diameter_matches_tolerance_check(self):
+        """TC-CLS-002: Diameter check uses the same bounds as ToleranceConfig.check"""
+        tolerance = ToleranceConfig(enabled=True, nominal_mm=10.0, tolerance_mm=0.1)
+        diameters = [9.8, 9.9, 9.95, 10.0, 10.1, 10.2]
+        circles = [_circle(i, d) for i, d in enumerate(diameters)]
+
+        result = CircleClassifier(tolerance).apply(circles)
+
+        assert [c.status for c in circles] == [tolerance.check(d) for d in diameters]
+        assert result.diameter_ok.tolist() == [False, True, True, True, True, False]
+
+    def test_circularity_and_position(self):
+        """TC-CLS-003: Circularity and position are checked when configured"""
+        tolerance = ToleranceConfig(
+            enabled=True,
+            nominal_mm=10.0,
+            tolerance_mm=0.5,
+            min_circularity=0.9,
+            position_tolerance_px=5.0,
+            holes=[HoleTolerance(1, x_px=100, y_px=100), HoleTolerance(2, x_px=200, y_px=100)],
+        )
+        circles = [
+            _circle(1, 10.0, x=103, y=104),  # 5 px off: OK
+            _circle(2, 10.0, x=210, y=100),  # 10 px off: NG
+            _circle(3, 10.0, circularity=0.8),  # Not round: NG
+            _circle(4, 10.0, x=999, y=999),  # No expected position: OK
+        ]
+
+        result = CircleClassifier(tolerance).apply(circles)
+
+        assert result.position_ok.tolist() == [True, False, True, True]
+        assert result.circularity_ok.tolist() == [True, True, False, True]
+        assert [c.status for c in circles] == [MeasureStatus.OK, MeasureStatus.NG, MeasureStatus.NG, MeasureStatus.OK]
+
+    def test_per_hole_overrides(self):
+        """TC-CLS-004: Per-hole nominal and tolerance override the recipe-wide values"""
+        tolerance = ToleranceConfig(
+            enabled=True,
+            nominal_mm=10.0,
+            tolerance_mm=0.1,
+            holes=[HoleTolerance(2, nominal_mm=5.0), HoleTolerance(7, tolerance_mm=1.0)],
+        )
+        circles = [_circle(1, 10.05), _circle(2, 5.05), _circle(2, 10.0), _circle(7, 10.8), _circle(9, 10.8)]
+
+        result = CircleClassifier(tolerance).classify(circles)
+
+        assert result.ok.tolist() == [True, True, False, True, False]
+        assert all(c.status == MeasureStatus.NONE for c in circles)
+
+    def test_hole_table_rebuilt_on_new_config(self):
+        """TC-CLS-005: A new tolerance config replaces the cached per-hole table"""
+        classifier = CircleClassifier(ToleranceConfig(enabled=True, holes=[HoleTolerance(1, nominal_mm=5.0)]))
+        circles = [_circle(1, 5.0)]
+        assert classifier.classify(circles).ok.tolist() == [True]
+
+        classifier.update_config(ToleranceConfig(enabled=True, holes=[HoleTolerance(1, nominal_mm=6.0)]))
+        assert classifier.classify(circles).ok.tolist() == [False]
+
+        # Edited in place: same object and hole count, new limits
+        classifier.config.holes[0].nominal_mm = 5.0
+        assert classifier.classify(circles).ok.tolist() == [True]
+
+    @pytest.mark.parametrize("count", [0, 500])
+    def test_many_circles(self, count):
+        """TC-CLS-006: Arrays cover every circle of the frame"""
+        rng = np.random.default_rng(1)
+        diameters = rng.normal(10.0, 0.1, count)
+        tolerance = ToleranceConfig(enabled=True, nominal_mm=10.0, tolerance_mm=0.1)
+
+        result = CircleClassifier(tolerance).classify([_circle(i, d) for i, d in enumerate(diameters)])
+
+        assert result.ok.shape == (count,)
+        assert result.ok.tolist() == [tolerance.check(d) == MeasureStatus.OK for d in diameters]
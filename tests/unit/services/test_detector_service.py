@@ -3,6 +3,7 @@
 import pytest
 import numpy as np
 import cv2
+from src.services.calibration_service import ScaleField
 from src.services.detector_service import CircleDetector
 from src.domain.config import DetectionConfig, ToleranceConfig
 from src.domain.enums import MeasureStatus
@@ -88,3 +89,23 @@ class TestCircleDetector:
         # Test NG case
         assert tolerance.check(11.0) == MeasureStatus.NG
         assert tolerance.check(9.0) == MeasureStatus.NG
+
+    def test_scale_field_correction(self, detector):
+        """TC-DET-011: Field correction uses the local scale at each circle center"""
+        img = np.zeros((480, 640, 3), dtype=np.uint8)
+        cv2.circle(img, (120, 240), 50, (255, 255, 255), -1)
+        cv2.circle(img, (520, 240), 50, (255, 255, 255), -1)
+        uniform, _ = detector.detect(img)
+
+        # Scale grows 20% from left to right edge
+        detector.set_scale_field(ScaleField(width=640, height=480, factor=np.array([[1.0, 1.2], [1.0, 1.2]])))
+        corrected, _ = detector.detect(img)
+
+        by_x = {round(c.center_x): c for c in uniform}
+        for circle in corrected:
+            expected = 1.0 + 0.2 * circle.center_x / 639
+            assert circle.diameter_mm == pytest.approx(by_x[round(circle.center_x)].diameter_mm * expected)
+            assert circle.area_mm2 == pytest.approx(by_x[round(circle.center_x)].area_mm2 * expected**2)
+
+        detector.set_scale_field(None)
+        assert detector.detect(img)[0][0].diameter_mm == uniform[0].diameter_mm
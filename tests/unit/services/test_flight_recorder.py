@@ -0,0 +1,138 @@
+"""Tests for FlightRecorder - Recent frame ring with event dumps"""
+
+import json
+import time
+
+import numpy as np
+import pytest
+
+from src.services.flight_recorder import FlightRecorder
+
+
+def make_frame(value: int, shape=(40, 60, 3)) -> np.ndarray:
+    """Create a frame filled with one value"""
+    return np.full(shape, value % 256, dtype=np.uint8)
+
+
+def wait_for(condition, timeout: float = 2.0) -> bool:
+    """Poll until condition() is true"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def record_all(recorder: FlightRecorder, count: int, start: int = 0, interval: float = 0.0) -> None:
+    """Record frames one by one, waiting until each is stored"""
+    for i in range(start, start + count):
+        before = recorder.get_stats()["recorded"] + recorder.get_stats()["dropped"]
+        recorder.record(make_frame(i), frame_seq=i)
+        wait_for(lambda: recorder.get_stats()["recorded"] + recorder.get_stats()["dropped"] > before)
+        if interval:
+            time.sleep(interval)
+
+
+class TestFlightRecorder:
+    """Test FlightRecorder ring, memory cap and dumps"""
+
+    @pytest.fixture
+    def recorder(self, tmp_path):
+        """Start recorder writing dumps to a temp directory"""
+        recorder = FlightRecorder(seconds=5.0, post_seconds=0.05, dump_dir=str(tmp_path / "flight"))
+        recorder.start()
+        yield recorder
+        recorder.stop()
+
+    def test_keeps_last_seconds(self, tmp_path):
+        """TC-FR-001: Frames older than the time span are evicted"""
+        recorder = FlightRecorder(seconds=0.1, dump_dir=str(tmp_path))
+        recorder.start()
+        record_all(recorder, 10, interval=0.03)
+        stats = recorder.get_stats()
+        recorder.stop()
+
+        assert stats["recorded"] == 10
+        assert stats["frames"] < 10
+        assert stats["span_s"] <= 0.1
+
+    def test_memory_cap(self, tmp_path):
+        """TC-FR-002: Ring memory never exceeds max_bytes"""
+        frame_bytes = make_frame(0).nbytes
+        recorder = FlightRecorder(max_bytes=frame_bytes * 4, dump_dir=str(tmp_path))
+        recorder.start()
+        record_all(recorder, 10)
+        stats = recorder.get_stats()
+        recorder.stop()
+
+        assert stats["frames"] == 4
+        assert stats["bytes"] <= frame_bytes * 4
+
+    def test_dump_pre_and_post_frames(self, recorder):
+        """TC-FR-003: A dump holds frames before and after the event"""
+        record_all(recorder, 3)
+        assert recorder.trigger("ng", post_seconds=0.2)
+        record_all(recorder, 2, start=3)
+        assert recorder.flush()
+
+        dumps = list(recorder.dump_dir.iterdir())
+        assert len(dumps) == 1
+        assert dumps[0].name.endswith("_ng")
+
+        manifest = json.loads((dumps[0] / "manifest.json").read_text())
+        assert [f["frame_seq"] for f in manifest["frames"]] == [0, 1, 2, 3, 4]
+        assert manifest["frames"][0]["offset_s"] < 0 < manifest["frames"][-1]["offset_s"]
+        np.testing.assert_array_equal(np.load(dumps[0] / "frame_0004.npy"), make_frame(4))
+        assert recorder.get_stats()["dumps_written"] == 1
+
+    def test_downsampled_jpeg_frames(self, tmp_path):
+        """TC-FR-004: Downsampled JPEG mode stores and dumps smaller frames"""
+        import cv2
+
+        recorder = FlightRecorder(downsample=2, jpeg_quality=80, post_seconds=0.0, dump_dir=str(tmp_path))
+        recorder.start()
+        record_all(recorder, 2)
+        assert recorder.get_stats()["bytes"] < make_frame(0).nbytes
+        recorder.trigger("alarm")
+        assert recorder.flush()
+        recorder.stop()
+
+        dump = next(tmp_path.iterdir())
+        image = cv2.imread(str(dump / "frame_0000.jpg"))
+        assert image.shape == (20, 30, 3)
+
+    def test_pending_dump_limit(self, tmp_path):
+        """TC-FR-005: Triggers beyond max_pending_dumps are dropped"""
+        recorder = FlightRecorder(post_seconds=1.0, max_pending_dumps=1, dump_dir=str(tmp_path))
+        recorder.start()
+        assert recorder.trigger("first")
+        assert not recorder.trigger("second")
+        assert recorder.get_stats()["dumps_dropped"] == 1
+        recorder.stop()
+
+    def test_pinned_frames_count_against_cap(self, tmp_path):
+        """TC-FR-006: Frames held by a pending dump stay within the memory cap"""
+        frame_bytes = make_frame(0).nbytes
+        recorder = FlightRecorder(max_bytes=frame_bytes * 4, post_seconds=5.0, dump_dir=str(tmp_path))
+        recorder.start()
+        record_all(recorder, 4)
+        recorder.trigger("ng")
+        record_all(recorder, 4, start=4)
+        stats = recorder.get_stats()
+
+        assert stats["bytes"] <= frame_bytes * 4
+        assert stats["dropped"] == 4
+        recorder.stop()
+
+        # Stopping writes the pending dump with the frames it held
+        manifest = json.loads((next(tmp_path.iterdir()) / "manifest.json").read_text())
+        assert [f["frame_seq"] for f in manifest["frames"]] == [0, 1, 2, 3]
+
+    def test_record_ignored_when_stopped(self, tmp_path):
+        """TC-FR-007: record() and trigger() do nothing before start()"""
+        recorder = FlightRecorder(dump_dir=str(tmp_path))
+        recorder.record(make_frame(0))
+
+        assert not recorder.trigger("ng")
+        assert recorder.get_stats()["recorded"] == 0
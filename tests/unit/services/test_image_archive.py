@@ -0,0 +1,197 @@
+"""Tests for ImageArchive - Index of saved images with quota retention"""
+
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.domain.entities import CircleResult
+from src.domain.enums import MeasureStatus
+from src.services.image_archive import ImageArchive
+from src.services.image_saver import ImageSaver
+
+
+def write_file(directory, name, size):
+    """Create a file of the given size"""
+    path = directory / name
+    path.write_bytes(b"\0" * size)
+    return path
+
+
+class TestImageArchive:
+    """Test ImageArchive indexing, counts and eviction"""
+
+    @pytest.fixture
+    def archive(self, tmp_path):
+        """Open archive without quota"""
+        archive = ImageArchive(str(tmp_path / "images.db"))
+        assert archive.open()
+        yield archive
+        archive.close()
+
+    def test_add_and_count(self, archive, tmp_path):
+        """TC-ARC-001: Counts per kind and day come from the index"""
+        now = datetime.now()
+        archive.add(write_file(tmp_path, "NG_1.jpg", 100), now, "NG", "NG")
+        archive.add(write_file(tmp_path, "NG_2.jpg", 100), now, "NG", "NG")
+        archive.add(write_file(tmp_path, "IMG_1.jpg", 50), now - timedelta(days=1), "IMG", "OK")
+
+        assert archive.count() == 3
+        assert archive.count("NG") == 2
+        assert archive.count("NG", now) == 2
+        assert archive.count("IMG", now) == 0
+        assert archive.count("IMG", now - timedelta(days=1)) == 1
+        assert archive.count("MISSING") == 0
+        assert archive.total_bytes == 250
+
+    def test_counts_survive_reopen(self, tmp_path):
+        """TC-ARC-002: Counts and sizes are reloaded from the index"""
+        archive = ImageArchive(str(tmp_path / "images.db"))
+        archive.open()
+        archive.add(write_file(tmp_path, "NG_1.jpg", 10), datetime.now(), "NG", "NG")
+        archive.close()
+
+        reopened = ImageArchive(str(tmp_path / "images.db"))
+        reopened.open()
+        assert reopened.count("NG") == 1
+        assert reopened.total_bytes == 10
+        reopened.close()
+
+    def test_lookup(self, archive, tmp_path):
+        """TC-ARC-003: Look up files by path and frame sequence number"""
+        image = write_file(tmp_path, "NG_1.jpg", 10)
+        data = write_file(tmp_path, "NG_1.json", 5)
+        archive.add(image, datetime.now(), "NG", "NG", codec="jpeg", data_path=data, frame_seq=42)
+
+        entry = archive.get(str(image))
+        assert entry is not None
+        assert entry.data_path == str(data)
+        assert entry.size_bytes == 15
+        assert entry.codec == "jpeg"
+        assert [e.path for e in archive.find_frame(42)] == [str(image)]
+        assert archive.get(str(tmp_path / "missing.jpg")) is None
+
+    def test_remove_before(self, archive, tmp_path):
+        """TC-ARC-004: Files older than the cutoff are deleted and unindexed"""
+        now = datetime.now()
+        old = write_file(tmp_path, "NG_old.jpg", 10)
+        new = write_file(tmp_path, "NG_new.jpg", 10)
+        archive.add(old, now - timedelta(days=40), "NG", "NG")
+        archive.add(new, now, "NG", "NG")
+
+        assert archive.remove_before(now - timedelta(days=30)) == 1
+        assert not old.exists()
+        assert new.exists()
+        assert archive.count("NG") == 1
+        assert archive.total_bytes == 10
+
+    def test_quota_evicts_oldest_first(self, tmp_path):
+        """TC-ARC-005: Exceeding the quota evicts oldest files in the background"""
+        archive = ImageArchive(str(tmp_path / "images.db"), quota_bytes=1000, low_watermark=0.5, evict_batch=2)
+        archive.open()
+        paths = []
+        for i in range(12):
+            paths.append(write_file(tmp_path, f"NG_{i:02d}.jpg", 100))
+            archive.add(paths[-1], datetime.now(), "NG", "NG")
+
+        deadline = time.monotonic() + 2
+        while archive.total_bytes > 1000 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        # Evicted down to the low watermark at least once
+        assert archive.total_bytes <= 1000
+        assert archive.get_stats()["evicted"] >= 6
+        assert paths[-1].exists()
+        assert not paths[0].exists()
+        remaining = [p for p in paths if p.exists()]
+        assert remaining == paths[-len(remaining) :]
+        assert archive.count("NG") == len(remaining)
+        assert archive.get_stats()["evicted"] == 12 - len(remaining)
+        archive.close()
+
+    def test_rows_removed_once(self, archive, tmp_path):
+        """TC-ARC-008: Rows already removed by another pass don't change the counters again"""
+        now = datetime.now()
+        for i in range(3):
+            archive.add(write_file(tmp_path, f"NG_{i}.jpg", 10), now - timedelta(days=40), "NG", "NG")
+        rows = archive._conn.execute("SELECT id, path, data_path, day, kind, size_bytes FROM images").fetchall()
+
+        with archive._remove_lock:
+            assert archive._remove(rows[:2]) == 2
+            # Stale selection overlapping the first pass
+            assert archive._remove(rows) == 1
+
+        assert archive.count("NG") == 0
+        assert archive.total_bytes == 0
+        assert archive.remove_before(now) == 0
+
+    def test_page(self, archive, tmp_path):
+        """TC-ARC-009: Pages are newest first with the total of matching files"""
+        now = datetime.now()
+        for i in range(5):
+            archive.add(write_file(tmp_path, f"NG_{i}.jpg", 10), now, "NG", "NG")
+        archive.add(write_file(tmp_path, "IMG_1.jpg", 10), now - timedelta(days=1), "IMG", "OK")
+
+        items, total = archive.page(limit=2, offset=1, kind="NG")
+        assert total == 5
+        assert [item.path for item in items] == [str(tmp_path / "NG_3.jpg"), str(tmp_path / "NG_2.jpg")]
+
+        items, total = archive.page(status="OK", date=now - timedelta(days=1))
+        assert total == 1
+        assert items[0].kind == "IMG"
+        assert archive.page(date=now - timedelta(days=2)) == ([], 0)
+
+    def test_remove_listener(self, archive, tmp_path):
+        """TC-ARC-010: Remove listeners get the IDs of removed files"""
+        removed = []
+        archive.add_remove_listener(removed.extend)
+        old_id = archive.add(write_file(tmp_path, "NG_old.jpg", 10), datetime.now() - timedelta(days=40), "NG", "NG")
+        archive.add(write_file(tmp_path, "NG_new.jpg", 10), datetime.now(), "NG", "NG")
+
+        archive.remove_before(datetime.now() - timedelta(days=30))
+        assert removed == [old_id]
+
+
+class TestImageSaverArchive:
+    """Test ImageSaver recording into its archive"""
+
+    @pytest.fixture
+    def ng_circle(self):
+        """Create NG circle result"""
+        return CircleResult(
+            hole_id=1,
+            center_x=32,
+            center_y=24,
+            radius=5,
+            diameter_mm=12.0,
+            circularity=0.95,
+            area_mm2=78.54,
+            status=MeasureStatus.NG,
+        )
+
+    def test_saved_images_are_indexed(self, temp_output_dir, ng_circle):
+        """TC-ARC-006: Written images are indexed with size, status and frame link"""
+        saver = ImageSaver(save_dir=str(temp_output_dir))
+        path = saver.save_ng_image(np.zeros((48, 64, 3), np.uint8), [ng_circle], frame_seq=7)
+        assert saver.flush()
+
+        entry = saver.archive.get(path)
+        saver.close()
+        assert entry.kind == "NG"
+        assert entry.status == "NG"
+        assert entry.frame_seq == 7
+        assert entry.data_path.endswith(".json")
+
+    def test_total_ng_count_survives_restart(self, temp_output_dir, ng_circle):
+        """TC-ARC-007: NG totals are kept across ImageSaver restarts"""
+        frame = np.zeros((48, 64, 3), np.uint8)
+        saver = ImageSaver(save_dir=str(temp_output_dir))
+        saver.save_ng_image(frame, [ng_circle])
+        saver.save_ng_image(frame, [ng_circle])
+        saver.close()
+
+        restarted = ImageSaver(save_dir=str(temp_output_dir))
+        assert restarted.get_total_ng_count() == 2
+        assert restarted.get_ng_image_count() == 2
+        restarted.close()
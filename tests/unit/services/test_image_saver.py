@@ -2,11 +2,12 @@
 
 import pytest
 import json
+import time
 import numpy as np
 import cv2
 from datetime import datetime, timedelta
 from pathlib import Path
-from src.services.image_saver import ImageSaver
+from src.services.image_saver import ImageCodec, ImageSaver, SavePolicy
 from src.domain.entities import CircleResult
 from src.domain.enums import MeasureStatus
 
@@ -17,7 +18,9 @@ class TestImageSaver:
     @pytest.fixture
     def image_saver(self, temp_output_dir):
         """Create image saver with temp directory"""
-        return ImageSaver(save_dir=str(temp_output_dir))
+        saver = ImageSaver(save_dir=str(temp_output_dir))
+        yield saver
+        saver.close()
 
     @pytest.fixture
     def test_frame(self):
@@ -70,6 +73,7 @@ class TestImageSaver:
         """TC-IMG-003: Save NG image successfully"""
         circles = [ng_circle]
         path = image_saver.save_ng_image(test_frame, circles)
+        assert image_saver.flush()
 
         assert path is not None
         assert Path(path).exists()
@@ -82,6 +86,7 @@ class TestImageSaver:
 
         circles = [ng_circle]
         path = image_saver.save_ng_image(test_frame, circles, display_frame)
+        assert image_saver.flush()
 
         assert path is not None
         assert Path(path).exists()
@@ -98,6 +103,7 @@ class TestImageSaver:
         """TC-IMG-006: Save creates JSON measurement data"""
         circles = [ng_circle]
         path = image_saver.save_ng_image(test_frame, circles)
+        assert image_saver.flush()
 
         # Check JSON file exists
         json_path = Path(path).with_suffix(".json")
@@ -124,6 +130,7 @@ class TestImageSaver:
         """TC-IMG-008: Save when at least one NG circle"""
         circles = [ok_circle, ng_circle]
         path = image_saver.save_ng_image(test_frame, circles)
+        assert image_saver.flush()
 
         assert path is not None
 
@@ -145,6 +152,7 @@ class TestImageSaver:
     def test_save_all_image(self, image_saver, test_frame, ok_circle):
         """TC-IMG-010: Save any image (not just NG)"""
         path = image_saver.save_all_image(test_frame, [ok_circle])
+        assert image_saver.flush()
 
         assert path is not None
         assert Path(path).exists()
@@ -165,6 +173,7 @@ class TestImageSaver:
         image_saver.save_ng_image(test_frame, circles)
         image_saver.save_ng_image(test_frame, circles)
         image_saver.save_ng_image(test_frame, circles)
+        assert image_saver.flush()
 
         count = image_saver.get_ng_image_count()
         assert count == 3
@@ -180,6 +189,7 @@ class TestImageSaver:
 
         image_saver.save_ng_image(test_frame, circles)
         image_saver.save_ng_image(test_frame, circles)
+        assert image_saver.flush()
 
         assert image_saver.get_total_ng_count() == 2
 
@@ -204,6 +214,7 @@ class TestImageSaver:
         """TC-IMG-016: Cleanup keeps recent images"""
         circles = [ng_circle]
         image_saver.save_ng_image(test_frame, circles)
+        assert image_saver.flush()
 
         # Cleanup shouldn't remove today's images
         removed = image_saver.cleanup_old_images(days=30)
@@ -237,6 +248,7 @@ class TestImageSaver:
         )
 
         path = image_saver.save_ng_image(test_frame, [ng1, ng2])
+        assert image_saver.flush()
         assert path is not None
 
         json_path = Path(path).with_suffix(".json")
@@ -253,3 +265,188 @@ class TestImageSaver:
         path = image_saver.save_ng_image(None, [ng_circle])
         # Should return None without crashing
         assert path is None
+
+    # ========== Background writers ==========
+    @pytest.fixture
+    def gated_encode(self, monkeypatch):
+        """Make cv2.imencode wait until the returned event is set"""
+        import threading
+
+        import src.services.image_saver as image_saver_module
+
+        gate = threading.Event()
+        real_imencode = cv2.imencode
+
+        def imencode(ext, image, params=None):
+            gate.wait(timeout=5)
+            return real_imencode(ext, image, params if params is not None else [])
+
+        monkeypatch.setattr(image_saver_module.cv2, "imencode", imencode)
+        yield gate
+        gate.set()
+
+    def test_save_returns_before_write(self, temp_output_dir, test_frame, ng_circle, gated_encode):
+        """TC-IMG-019: save_ng_image only queues; the writer thread writes the file"""
+        saver = ImageSaver(save_dir=str(temp_output_dir), workers=1)
+        path = saver.save_ng_image(test_frame, [ng_circle])
+
+        assert path is not None
+        assert not Path(path).exists()
+        assert saver.pending == 1
+
+        gated_encode.set()
+        assert saver.flush()
+        assert Path(path).exists()
+        assert saver.get_stats()["written"] == 1
+        saver.close()
+
+    def test_drop_newest_when_full(self, temp_output_dir, test_frame, ng_circle, gated_encode):
+        """TC-IMG-020: DROP_NEWEST discards new images while the queue is full"""
+        saver = ImageSaver(save_dir=str(temp_output_dir), workers=1, max_pending=1, policy=SavePolicy.DROP_NEWEST)
+        first = saver.save_ng_image(test_frame, [ng_circle])  # Taken by the writer
+        for _ in range(100):
+            if saver.get_stats()["writing"] == 1:
+                break
+            time.sleep(0.01)
+        queued = saver.save_ng_image(test_frame, [ng_circle])
+        dropped = saver.save_ng_image(test_frame, [ng_circle])
+
+        assert dropped is None
+        gated_encode.set()
+        assert saver.flush()
+        assert Path(first).exists() and Path(queued).exists()
+        assert saver.get_stats()["dropped"] == 1
+        saver.close()
+
+    def test_drop_oldest_when_full(self, temp_output_dir, test_frame, ng_circle, gated_encode):
+        """TC-IMG-021: DROP_OLDEST replaces the oldest queued image"""
+        saver = ImageSaver(save_dir=str(temp_output_dir), workers=1, max_pending=1, policy=SavePolicy.DROP_OLDEST)
+        saver.save_ng_image(test_frame, [ng_circle])
+        for _ in range(100):
+            if saver.get_stats()["writing"] == 1:
+                break
+            time.sleep(0.01)
+        replaced = saver.save_ng_image(test_frame, [ng_circle])
+        latest = saver.save_ng_image(test_frame, [ng_circle])
+
+        gated_encode.set()
+        assert saver.flush()
+        assert not Path(replaced).exists()
+        assert Path(latest).exists()
+        assert saver.get_stats()["dropped"] == 1
+        saver.close()
+
+    def test_block_policy_times_out(self, temp_output_dir, test_frame, ng_circle, gated_encode):
+        """TC-IMG-022: BLOCK waits up to block_timeout for a free slot"""
+        saver = ImageSaver(
+            save_dir=str(temp_output_dir), workers=1, max_pending=1, policy=SavePolicy.BLOCK, block_timeout=0.05
+        )
+        saver.save_ng_image(test_frame, [ng_circle])
+        for _ in range(100):
+            if saver.get_stats()["writing"] == 1:
+                break
+            time.sleep(0.01)
+        saver.save_ng_image(test_frame, [ng_circle])
+
+        start = time.perf_counter()
+        assert saver.save_ng_image(test_frame, [ng_circle]) is None
+        assert time.perf_counter() - start >= 0.04
+        gated_encode.set()
+        saver.close()
+
+    def test_invalid_policy(self, temp_output_dir):
+        """TC-IMG-023: Unknown save policy is rejected"""
+        with pytest.raises(ValueError):
+            ImageSaver(save_dir=str(temp_output_dir), policy="spill")
+
+    def test_unique_paths_within_millisecond(self, image_saver, test_frame, ng_circle):
+        """TC-IMG-024: Images queued back to back get distinct paths"""
+        paths = [image_saver.save_ng_image(test_frame, [ng_circle]) for _ in range(3)]
+        assert image_saver.flush()
+
+        assert len(set(paths)) == 3
+        assert all(Path(path).exists() for path in paths)
+
+    def test_close_writes_pending(self, temp_output_dir, test_frame, ng_circle):
+        """TC-IMG-025: close() writes queued images before stopping"""
+        saver = ImageSaver(save_dir=str(temp_output_dir))
+        path = saver.save_ng_image(test_frame, [ng_circle])
+        saver.close()
+
+        assert Path(path).exists()
+        assert saver.pending == 0
+
+    # ========== Codecs ==========
+    @pytest.mark.parametrize(
+        "codec, extension", [("jpeg", ".jpg"), ("png", ".png"), ("webp", ".webp"), ("npy", ".npy")]
+    )
+    def test_codec_extension(self, temp_output_dir, test_frame, ng_circle, codec, extension):
+        """TC-IMG-026: Each codec writes its own file format"""
+        saver = ImageSaver(save_dir=str(temp_output_dir), codec=codec)
+        path = saver.save_ng_image(test_frame, [ng_circle])
+        saver.close()
+
+        assert path.endswith(extension)
+        assert Path(path).exists()
+        assert Path(path).with_suffix(".json").exists()
+        assert saver.get_ng_image_count() == 1
+
+    @pytest.mark.parametrize("codec", ["png", "webp", "npy"])
+    def test_lossless_codecs(self, temp_output_dir, codec):
+        """TC-IMG-027: PNG, WebP and NPY round-trip the frame exactly"""
+        frame = np.random.default_rng(0).integers(0, 256, (120, 160, 3), dtype=np.uint8)
+        saver = ImageSaver(save_dir=str(temp_output_dir), codec=codec)
+        path = saver.save_all_image(frame, [])
+        saver.close()
+
+        loaded = np.load(path) if codec == "npy" else cv2.imread(path)
+        np.testing.assert_array_equal(loaded, frame)
+
+    def test_codec_stats(self, temp_output_dir, test_frame, ng_circle):
+        """TC-IMG-028: Bytes written and encode time are recorded per codec"""
+        from src.core import get_registry
+
+        bytes_metric = get_registry().counter("image_written_bytes_total", "", ("codec",)).labels(codec="png")
+        before = bytes_metric.value
+
+        saver = ImageSaver(save_dir=str(temp_output_dir), codec=ImageCodec.PNG)
+        path = saver.save_ng_image(test_frame, [ng_circle])
+        saver.close()
+
+        stats = saver.get_stats()
+        assert stats["codec"] == "png"
+        assert stats["bytes_written"] == Path(path).stat().st_size
+        assert stats["avg_encode_ms"] > 0
+        assert bytes_metric.value - before == stats["bytes_written"]
+
+    def test_invalid_codec(self, temp_output_dir):
+        """TC-IMG-029: Unknown codec is rejected"""
+        with pytest.raises(ValueError):
+            ImageSaver(save_dir=str(temp_output_dir), codec="bmp")
+
+    # ========== Outcome callback ==========
+    def test_on_done_reports_outcome(self, temp_output_dir, test_frame, ng_circle, gated_encode):
+        """TC-IMG-030: on_done gets the archive ID once written, None if dropped or failed"""
+        saver = ImageSaver(save_dir=str(temp_output_dir), workers=1, max_pending=1, policy=SavePolicy.DROP_OLDEST)
+        outcomes = {}
+        saver.save_ng_image(test_frame, [ng_circle], on_done=lambda image_id: outcomes.update(first=image_id))
+        for _ in range(100):
+            if saver.get_stats()["writing"] == 1:
+                break
+            time.sleep(0.01)
+        saver.save_ng_image(test_frame, [ng_circle], on_done=lambda image_id: outcomes.update(replaced=image_id))
+        saver.save_ng_image(test_frame, [ng_circle], on_done=lambda image_id: outcomes.update(latest=image_id))
+        # Dropped from the queue: reported right away
+        assert outcomes == {"replaced": None}
+
+        gated_encode.set()
+        assert saver.flush()
+        assert saver.archive.get_by_id(outcomes["first"]) is not None
+        assert saver.archive.get_by_id(outcomes["latest"]) is not None
+
+        # Unwritable image
+        saver.save_ng_image(np.zeros((0, 0, 3), np.uint8), [ng_circle], on_done=lambda i: outcomes.update(failed=i))
+        assert saver.flush()
+        assert outcomes["failed"] is None
+        assert saver.get_stats()["failed"] == 1
+        saver.close()
@@ -0,0 +1,124 @@
+"""Tests for MeasurementLog - Append-only daily measurement log"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from src.services.image_saver import ImageSaver
+from src.services.measurement_log import MeasurementLog
+from src.domain.entities import CircleResult
+from src.domain.enums import MeasureStatus
+
+
+def _result(*statuses: MeasureStatus):
+    return [
+        CircleResult(
+            hole_id=i + 1,
+            center_x=100.0 * i,
+            center_y=50.0,
+            radius=20.0,
+            diameter_mm=10.0 + i,
+            circularity=0.95,
+            area_mm2=78.5,
+            status=status,
+        )
+        for i, status in enumerate(statuses)
+    ]
+
+
+class TestMeasurementLog:
+    """Test group-committed JSONL logging"""
+
+    @pytest.fixture
+    def log(self, tmp_path):
+        log = MeasurementLog(str(tmp_path / "logs"), flush_interval_ms=20)
+        assert log.start()
+        yield log
+        log.close()
+
+    def test_logs_ok_and_ng(self, log):
+        """TC-MLOG-001: Every inspection is logged, OK included"""
+        assert log.log(_result(MeasureStatus.OK, MeasureStatus.OK), recipe="A", frame_seq=1)
+        assert log.log(_result(MeasureStatus.OK, MeasureStatus.NG), recipe="A", frame_seq=2, image_id=7)
+        assert log.flush()
+
+        records = list(log.read())
+        assert [r["status"] for r in records] == ["OK", "NG"]
+        assert records[0]["image_id"] is None
+        assert records[1]["image_id"] == 7
+        assert records[1]["frame_seq"] == 2
+        assert records[1]["circles"][1] == {
+            "hole_id": 2,
+            "center_x": 100.0,
+            "center_y": 50.0,
+            "diameter_px": 40.0,
+            "diameter_mm": 11.0,
+            "circularity": 0.95,
+            "status": "NG",
+        }
+
+    def test_group_commit(self, log):
+        """TC-MLOG-002: Queued inspections are appended in few commits"""
+        for i in range(200):
+            log.log(_result(MeasureStatus.OK), frame_seq=i)
+        assert log.flush()
+
+        stats = log.get_stats()
+        assert stats["written"] == 200
+        assert stats["commits"] < 20
+        assert [r["frame_seq"] for r in log.read()] == list(range(200))
+
+    def test_daily_rotation(self, log):
+        """TC-MLOG-003: Inspections go to the file of their day"""
+        yesterday = datetime.now() - timedelta(days=1)
+        log.log(_result(MeasureStatus.OK), timestamp=yesterday.timestamp())
+        log.log(_result(MeasureStatus.NG))
+        assert log.flush()
+
+        assert log.path_for(yesterday).exists()
+        assert log.path_for(datetime.now()).exists()
+        assert len(list(log.read(yesterday))) == 1
+        assert len(list(log.read())) == 1
+
+    def test_appends_across_restarts(self, tmp_path):
+        """TC-MLOG-004: Reopening the log appends to the day's file"""
+        for frame_seq in (1, 2):
+            log = MeasurementLog(str(tmp_path), flush_interval_ms=20)
+            log.start()
+            log.log(_result(MeasureStatus.OK), frame_seq=frame_seq)
+            log.close()
+
+        assert [r["frame_seq"] for r in MeasurementLog(str(tmp_path)).read()] == [1, 2]
+
+    def test_skips_torn_line(self, log):
+        """TC-MLOG-005: A line cut off mid-write is skipped when reading"""
+        log.log(_result(MeasureStatus.OK), frame_seq=1)
+        assert log.flush()
+        with open(log.path_for(datetime.now()), "a", encoding="utf-8") as f:
+            f.write('{"timestamp": "2024')
+
+        assert [r["frame_seq"] for r in log.read()] == [1]
+
+    def test_drops_when_full(self, tmp_path):
+        """TC-MLOG-006: A full queue drops instead of blocking"""
+        log = MeasurementLog(str(tmp_path), max_pending=2)
+        assert log.log(_result(MeasureStatus.OK))
+        assert log.log(_result(MeasureStatus.OK))
+        assert not log.log(_result(MeasureStatus.OK))
+        assert log.get_stats()["dropped"] == 1
+
+    def test_links_image_id(self, log, temp_output_dir):
+        """TC-MLOG-007: Inspections logged once their NG image is written find it in the archive"""
+        saver = ImageSaver(save_dir=str(temp_output_dir), sidecar_json=False)
+        circles = _result(MeasureStatus.NG)
+        path = saver.save_ng_image(
+            np.zeros((48, 64, 3), np.uint8), circles, on_done=lambda image_id: log.log(circles, image_id=image_id)
+        )
+        assert saver.flush() and log.flush()
+
+        record = next(log.read())
+        entry = saver.archive.get_by_id(record["image_id"])
+        saver.close()
+        assert entry.path == path
+        assert entry.data_path is None
+        assert not list(temp_output_dir.rglob("*.json"))
@@ -0,0 +1,120 @@
+"""Tests for MeasurementStore - Persistent measurement history"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from src.core import AppCore
+from src.services.measurement_store import MeasurementStore
+from src.domain.entities import CircleResult
+from src.domain.enums import MeasureStatus
+
+
+def _result(*statuses: MeasureStatus):
+    return [
+        CircleResult(
+            hole_id=i + 1,
+            center_x=100.0 * i,
+            center_y=50.0,
+            radius=20.0,
+            diameter_mm=10.0 + i,
+            circularity=0.95,
+            area_mm2=78.5,
+            status=status,
+        )
+        for i, status in enumerate(statuses)
+    ]
+
+
+class TestMeasurementStore:
+    """Test batched writes and indexed queries"""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        store = MeasurementStore(str(tmp_path / "measurements.db"), flush_interval_ms=20)
+        assert store.start()
+        yield store
+        store.close()
+
+    def test_write_and_read_back(self, store):
+        """TC-STORE-001: Stored measurement reads back with holes"""
+        assert store.add_result(_result(MeasureStatus.OK, MeasureStatus.NG), camera_id="top", recipe="A")
+        assert store.flush()
+
+        records = store.query()
+        assert len(records) == 1
+        record = records[0]
+        assert record.camera_id == "top"
+        assert record.recipe == "A"
+        assert record.overall_status == "NG"
+        assert [c.hole_id for c in record.circles] == [1, 2]
+        assert record.circles[1].diameter_mm == 11.0
+        assert store.get_stats()["written"] == 1
+
+    def test_newest_first_paging(self, store):
+        """TC-STORE-002: Query pages newest first"""
+        now = time.time()
+        for i in range(5):
+            store.add_result(_result(MeasureStatus.OK), timestamp=now + i)
+        store.flush()
+
+        first = store.query(limit=2)
+        second = store.query(limit=2, offset=2)
+        assert [r.timestamp for r in first] == [now + 4, now + 3]
+        assert [r.timestamp for r in second] == [now + 2, now + 1]
+        assert store.count() == 5
+
+    def test_filters(self, store):
+        """TC-STORE-003: Filter by time range, recipe, status and hole"""
+        t0 = datetime(2026, 1, 1, 8, 0)
+        store.add_result(_result(MeasureStatus.OK), recipe="A", timestamp=t0.timestamp())
+        store.add_result(
+            _result(MeasureStatus.NG, MeasureStatus.OK), recipe="A", timestamp=(t0 + timedelta(hours=1)).timestamp()
+        )
+        store.add_result(_result(MeasureStatus.OK), recipe="B", timestamp=(t0 + timedelta(hours=2)).timestamp())
+        store.flush()
+
+        assert store.count(start=t0 + timedelta(minutes=30)) == 2
+        assert store.count(start=t0, end=t0 + timedelta(hours=1)) == 1
+        assert store.count(recipe="A") == 2
+        assert store.count(status="ng") == 1
+        assert store.count(hole_id=2) == 1
+        assert store.query(recipe="B")[0].recipe == "B"
+
+    def test_persists_across_restart(self, tmp_path):
+        """TC-STORE-004: Measurements survive closing and reopening"""
+        path = str(tmp_path / "measurements.db")
+        store = MeasurementStore(path, flush_interval_ms=20)
+        store.start()
+        store.add_result(_result(MeasureStatus.OK))
+        store.close()
+
+        reopened = MeasurementStore(path)
+        reopened.start()
+        assert reopened.count() == 1
+        reopened.close()
+
+    def test_full_queue_drops(self, tmp_path):
+        """TC-STORE-005: Adding never blocks; overflow is counted as dropped"""
+        store = MeasurementStore(str(tmp_path / "measurements.db"), max_pending=2)
+
+        results = [store.add_result(_result(MeasureStatus.OK)) for _ in range(4)]
+        assert results == [True, True, False, False]
+        assert store.get_stats()["dropped"] == 2
+
+    def test_app_core_forwards_records(self, store):
+        """TC-STORE-006: AppCore history feeds the store and queries it"""
+        AppCore.reset_instance()
+        app_core = AppCore()
+        app_core.measurement_store = store
+        app_core.current_recipe = "A"
+        try:
+            app_core.set_latest_result(_result(MeasureStatus.OK))
+            app_core.set_latest_result(_result(MeasureStatus.NG))
+            store.flush()
+
+            records, total = app_core.query_history(status="NG")
+            assert total == 1
+            assert records[0].recipe == "A"
+        finally:
+            AppCore.reset_instance()
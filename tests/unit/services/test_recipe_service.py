@@ -3,7 +3,7 @@
 import pytest
 from src.services.recipe_service import RecipeService
 from src.domain.recipe import Recipe
-from src.domain.config import DetectionConfig, ToleranceConfig
+from src.domain.config import CameraConfig, DetectionConfig, ToleranceConfig
 
 
 class TestRecipeService:
@@ -163,3 +163,24 @@ class TestRecipeService:
         recipe = recipe_service.create_default_recipe()
         assert recipe.name == "Default"
         assert recipe.description is not None
+
+    def test_plc_index_round_trip(self, recipe_service, temp_recipe_dir):
+        """TC-RCP-012: The PLC recipe index is saved with the recipe; older recipes have none"""
+        assert recipe_service.save_recipe(Recipe(name="Indexed", plc_index=2))
+
+        loaded = RecipeService(recipe_dir=str(temp_recipe_dir)).get_recipe("Indexed")
+        assert loaded.plc_index == 2
+
+        assert Recipe.from_dict(Recipe(name="Plain").to_dict()).plc_index is None
+
+    def test_camera_config_round_trip(self, recipe_service, temp_recipe_dir):
+        """TC-RCP-013: Camera settings are saved with the recipe; older recipes have none"""
+        recipe = Recipe(name="Camera", camera_config=CameraConfig(default_exposure_us=120.0, gain_db=3.0))
+        assert recipe_service.save_recipe(recipe)
+
+        loaded = RecipeService(recipe_dir=str(temp_recipe_dir)).get_recipe("Camera")
+        assert loaded.camera_config.default_exposure_us == 120.0
+        assert loaded.camera_config.gain_db == 3.0
+        assert loaded.camera_config.trigger_mode == "software"
+
+        assert Recipe.from_dict(Recipe(name="Plain").to_dict()).camera_config is None
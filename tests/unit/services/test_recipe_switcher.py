@@ -0,0 +1,265 @@
+"""Tests for RecipeSwitcher"""
+
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from src.domain.config import CameraConfig, DetectionConfig, HoleTolerance, ToleranceConfig, VirtualCameraConfig
+from src.domain.io_config import IOConfig, IOMode, IOStatus
+from src.domain.recipe import Recipe
+from src.services.classifier_service import CircleClassifier
+from src.services.detector_service import CircleDetector
+from src.services.io_service import IOService
+from src.services.recipe_service import RecipeService
+from src.services.recipe_switcher import RecipeSwitcher
+from src.services.thread_manager import ThreadManager
+from src.services.virtual_camera import VirtualCamera
+from src.services.visualizer_service import CircleVisualizer
+
+
+def _status(index: int) -> IOStatus:
+    return IOStatus(recipe_bit0=bool(index & 1), recipe_bit1=bool(index & 2))
+
+
+class TestRecipeSwitcher:
+    """Test RecipeSwitcher"""
+
+    @pytest.fixture
+    def recipe_service(self, temp_recipe_dir):
+        """Recipe service with three recipes of different scales on PLC indexes 0-2"""
+        service = RecipeService(recipe_dir=str(temp_recipe_dir))
+        for index, (name, pixel_to_mm) in enumerate((("Alpha", 0.1), ("Beta", 0.2), ("Gamma", 0.05))):
+            service.save_recipe(
+                Recipe(
+                    name=name,
+                    detection_config=DetectionConfig(min_diameter_mm=0.5, max_diameter_mm=30.0),
+                    tolerance_config=ToleranceConfig(holes=[HoleTolerance(hole_id=1, nominal_mm=5.0)]),
+                    pixel_to_mm=pixel_to_mm,
+                    plc_index=index,
+                )
+            )
+        return service
+
+    @pytest.fixture
+    def manager(self):
+        """Thread manager (not started) with manual settings"""
+        return ThreadManager(VirtualCamera(), CircleDetector(), CircleVisualizer())
+
+    @pytest.fixture
+    def frame(self):
+        """Frame with one 60 px circle"""
+        frame = np.zeros((200, 200, 3), dtype=np.uint8)
+        cv2.circle(frame, (100, 100), 30, (255, 255, 255), -1)
+        return frame
+
+    def test_default_slots_and_prepare(self, recipe_service):
+        """TC-RSW-001: Recipes fill the indexes they claim and are built ahead"""
+        switcher = RecipeSwitcher(recipe_service)
+        assert switcher.slots == {0: "Alpha", 1: "Beta", 2: "Gamma"}
+
+        assert switcher.prepare() == 3
+        stats = switcher.get_stats()
+        assert stats["prepared"] == ["Alpha", "Beta", "Gamma"]
+        assert stats["current"] is None
+
+        with pytest.raises(ValueError):
+            switcher.assign(4, "Alpha")
+
+    def test_select_swaps_pipeline(self, recipe_service, manager):
+        """TC-RSW-002: Selecting an index swaps the manager to that recipe's own stages"""
+        switcher = RecipeSwitcher(recipe_service)
+        switcher.prepare()
+        switcher.add_target(manager)
+
+        assert switcher.select(1)
+        beta = manager.pipeline
+        assert beta.recipe_name == "Beta"
+        assert beta.detector.config.pixel_to_mm == 0.2
+        assert switcher.active_index == 1
+
+        assert switcher.select(0)
+        alpha = manager.pipeline
+        assert alpha.recipe_name == "Alpha"
+        assert alpha.detector is not beta.detector
+        assert alpha.detector.config is not beta.detector.config
+        # Recipe configs are copied, never shared with the pipeline
+        assert alpha.detector.config is not recipe_service.get_recipe("Alpha").detection_config
+
+        # Prepared pipelines are reused on the next switch
+        assert switcher.select(1)
+        assert manager.pipeline is beta
+
+    def test_unassigned_index_keeps_recipe(self, recipe_service, manager):
+        """TC-RSW-003: An index without recipe keeps the running pipeline"""
+        switcher = RecipeSwitcher(recipe_service)
+        switcher.add_target(manager)
+        switcher.select(0)
+        alpha = manager.pipeline
+
+        assert not switcher.select(3)
+        assert manager.pipeline is alpha
+        assert switcher.get_stats()["unassigned"] == 1
+
+    def test_io_status_settles_before_switch(self, recipe_service, manager):
+        """TC-RSW-004: The recipe index must be stable for settle_polls polls"""
+        switcher = RecipeSwitcher(recipe_service, settle_polls=2)
+        switcher.prepare()
+        switcher.add_target(manager)
+        switched = []
+        switcher.add_listener(lambda pipeline: switched.append(pipeline.recipe_name))
+
+        switcher.on_io_status(_status(0))
+        switcher.on_io_status(_status(0))
+        assert switched == ["Alpha"]
+
+        # 0 -> 3 -> 2: bit 0 changes one poll before bit 1
+        switcher.on_io_status(_status(3))
+        switcher.on_io_status(_status(2))
+        assert switched == ["Alpha"]
+        switcher.on_io_status(_status(2))
+        assert switched == ["Alpha", "Gamma"]
+
+        # Stable index does not switch again
+        for _ in range(5):
+            switcher.on_io_status(_status(2))
+        assert switched == ["Alpha", "Gamma"]
+
+    def test_frames_use_recipe_at_start(self, recipe_service, manager, frame):
+        """TC-RSW-005: Each frame is measured with the recipe active when it started"""
+        switcher = RecipeSwitcher(recipe_service)
+        switcher.prepare()
+        switcher.add_target(manager)
+
+        switcher.select(0)
+        manager._process_frame(frame, seq=1)
+        switcher.select(1)
+        manager._process_frame(frame, seq=2)
+
+        first = manager.get_result(timeout=0.1)
+        second = manager.get_result(timeout=0.1)
+        assert (first.recipe, second.recipe) == ("Alpha", "Beta")
+        assert second.circles[0].diameter_mm == pytest.approx(2 * first.circles[0].diameter_mm)
+
+    def test_load_and_invalidate(self, recipe_service, manager):
+        """TC-RSW-006: Edited recipes are rebuilt, unknown recipes are rejected"""
+        switcher = RecipeSwitcher(recipe_service)
+        switcher.prepare()
+        switcher.add_target(manager)
+
+        edited = recipe_service.get_recipe("Alpha")
+        edited.pixel_to_mm = 0.3
+        pipeline = switcher.load(edited)
+        assert manager.pipeline is pipeline
+        assert pipeline.detector.config.pixel_to_mm == 0.3
+        assert switcher.active_index == 0
+
+        switcher.invalidate("Beta")
+        assert "Beta" not in switcher.get_stats()["prepared"]
+        assert switcher.select_recipe("Beta")
+        assert manager.pipeline.recipe_name == "Beta"
+
+        assert not switcher.select_recipe("Missing")
+        assert manager.pipeline.recipe_name == "Beta"
+
+    def test_follows_io_service(self, recipe_service, manager):
+        """TC-RSW-007: Switches when the simulated PLC changes the recipe bits"""
+        io_service = IOService(IOConfig(mode=IOMode.SIMULATION, polling_interval_ms=1))
+        switcher = RecipeSwitcher(recipe_service)
+        switcher.prepare()
+        switcher.add_target(manager)
+        switcher.attach(io_service)
+
+        io_service.start()
+        try:
+            io_service.sim_set_recipe(2)
+            deadline = time.time() + 2.0
+            while switcher.active_index != 2 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            io_service.cleanup()
+            switcher.close()
+
+        assert switcher.active_index == 2
+        assert manager.pipeline.recipe_name == "Gamma"
+
+    def test_prepare_precomputes_stages(self):
+        """TC-RSW-008: Classifier hole table and visualizer drawing data are built ahead"""
+        tolerance = ToleranceConfig(holes=[HoleTolerance(hole_id=1), HoleTolerance(hole_id=2)])
+        classifier = CircleClassifier(tolerance)
+        classifier.prepare()
+        assert classifier._table is not None
+
+        visualizer = CircleVisualizer(DetectionConfig(pixel_to_mm=0.1, min_diameter_mm=1.0, max_diameter_mm=20.0))
+        visualizer.prepare(tolerance)
+        assert len(visualizer.sprite_cache) == 2
+        assert visualizer._unit_circles
+
+    def test_unclaimed_indexes_are_noops(self, recipe_service, manager):
+        """TC-RSW-009: Only recipes with a unique plc_index get a slot; the rest keep the running recipe"""
+        for name, index in (("Delta", None), ("Epsilon", 1), ("Zeta", 7)):
+            recipe_service.save_recipe(Recipe(name=name, plc_index=index))
+        switcher = RecipeSwitcher(recipe_service)
+        # Beta and Epsilon both claim 1, Zeta is out of range
+        assert switcher.slots == {0: "Alpha", 2: "Gamma"}
+
+        switcher.add_target(manager)
+        switcher.select(0)
+        alpha = manager.pipeline
+        assert not switcher.select(1)
+        assert not switcher.select(3)
+        assert manager.pipeline is alpha
+
+        # Editing the recipes takes effect on reload_slots()
+        epsilon = recipe_service.get_recipe("Epsilon")
+        epsilon.plc_index = 3
+        recipe_service.save_recipe(epsilon)
+        assert switcher.reload_slots() == {0: "Alpha", 1: "Beta", 2: "Gamma", 3: "Epsilon"}
+        assert switcher.select(3)
+        assert manager.pipeline.recipe_name == "Epsilon"
+
+    def test_camera_settings_on_switch(self, recipe_service, manager):
+        """TC-RSW-010: Switching writes only the camera settings that differ"""
+        for name, exposure in (("Alpha", 100.0), ("Beta", 100.0), ("Gamma", 250.0)):
+            recipe = recipe_service.get_recipe(name)
+            recipe.camera_config = CameraConfig(default_exposure_us=exposure)
+        camera = VirtualCamera(VirtualCameraConfig(width=64, height=48, fps=0))
+        camera.connect(exposure_us=50.0)
+
+        switcher = RecipeSwitcher(recipe_service)
+        switcher.prepare()
+        switcher.add_target(manager)
+        switcher.add_camera(camera)
+
+        switcher.select(0)
+        assert camera.get_info()["exposure_us"] == 100.0
+        assert camera.apply_settings(CameraConfig(default_exposure_us=100.0)).written == []
+
+        switcher.select(2)
+        assert camera.get_info()["exposure_us"] == 250.0
+        assert switcher.get_stats()["last_camera_ms"] >= 0
+        camera.disconnect()
+
+    def test_camera_settings_before_swap(self, recipe_service, manager):
+        """TC-RSW-011: The camera has the new settings before any frame runs the new recipe"""
+        recipe_service.get_recipe("Beta").camera_config = CameraConfig(default_exposure_us=250.0)
+        camera = VirtualCamera(VirtualCameraConfig(width=64, height=48, fps=0))
+        camera.connect(exposure_us=50.0)
+        seen = []
+        apply_settings = camera.apply_settings
+
+        def record_apply(config):
+            seen.append(manager.pipeline.recipe_name)
+            return apply_settings(config)
+
+        camera.apply_settings = record_apply
+        switcher = RecipeSwitcher(recipe_service)
+        switcher.add_target(manager)
+        switcher.add_camera(camera)
+
+        switcher.select(0)
+        switcher.select(1)
+        assert seen == ["Alpha"]
+        assert manager.pipeline.recipe_name == "Beta"
+        camera.disconnect()
@@ -0,0 +1,197 @@
+"""Tests for SPCService - Streaming control charts and capability"""
+
+import random
+import statistics
+from unittest.mock import MagicMock
+
+import pytest
+from src.core import AppCore, EventType
+from src.domain.config import HoleTolerance, SPCConfig, ToleranceConfig
+from src.domain.entities import CircleResult
+from src.domain.enums import MeasureStatus
+from src.services.spc_service import ChartType, ControlChart, SPCService
+
+
+def _circle(hole_id: int, diameter_mm: float) -> CircleResult:
+    return CircleResult(
+        hole_id=hole_id,
+        center_x=0,
+        center_y=0,
+        radius=10,
+        diameter_mm=diameter_mm,
+        circularity=1.0,
+        area_mm2=0,
+        status=MeasureStatus.OK,
+    )
+
+
+def _baseline(n: int = 25, seed: int = 1):
+    rng = random.Random(seed)
+    return [rng.gauss(10.0, 0.01) for _ in range(n)]
+
+
+class TestControlChart:
+    """Test control limits and Western Electric rules"""
+
+    def test_individuals_limits(self):
+        """TC-SPC-001: I-MR limits use the mean moving range / d2"""
+        values = _baseline()
+        chart = ControlChart(SPCConfig(baseline_points=len(values)))
+        for value in values:
+            chart.add(value)
+
+        mr_bar = statistics.mean(abs(b - a) for a, b in zip(values, values[1:]))
+        snapshot = chart.snapshot("r", 1, None)
+
+        assert snapshot.limits_fixed
+        assert snapshot.center_line == pytest.approx(statistics.mean(values))
+        assert snapshot.sigma == pytest.approx(mr_bar / 1.128)
+        assert snapshot.range_ucl == pytest.approx(3.267 * mr_bar)
+        assert snapshot.cp is None
+
+    def test_xbar_r_limits(self):
+        """TC-SPC-002: X-bar/R plots one point per subgroup with A2/D4 limits"""
+        values = _baseline(50)
+        chart = ControlChart(SPCConfig(chart_type=ChartType.XBAR_R, subgroup_size=5, baseline_points=10))
+        for value in values:
+            chart.add(value)
+
+        subgroups = [values[i : i + 5] for i in range(0, 50, 5)]
+        r_bar = statistics.mean(max(g) - min(g) for g in subgroups)
+        snapshot = chart.snapshot("r", 1, None)
+
+        assert snapshot.points == 10
+        assert snapshot.ucl == pytest.approx(statistics.mean(values) + 0.577 * r_bar)
+        assert snapshot.range_ucl == pytest.approx(2.114 * r_bar)
+        assert snapshot.range_lcl == 0.0
+
+    def test_rule1_beyond_3_sigma(self):
+        """TC-SPC-003: A point beyond 3 sigma fires rule 1"""
+        chart = ControlChart(SPCConfig())
+        for value in _baseline():
+            assert chart.add(value) == []
+
+        assert 1 in chart.add(10.5)
+
+    def test_rule4_run_on_one_side(self):
+        """TC-SPC-004: Eight points on one side of the center fire rule 4 once"""
+        chart = ControlChart(SPCConfig(rules=(4,)))
+        for value in _baseline():
+            chart.add(value)
+        center = chart.snapshot("r", 1, None).center_line
+
+        fired = [chart.add(center + 0.001) for _ in range(8)]
+        assert fired[:7] == [[]] * 7
+        assert fired[7] == [4]
+        assert chart.add(center + 0.001) == []
+
+    def test_rules_2_and_3(self):
+        """TC-SPC-005: Points beyond 2 and 1 sigma fire rules 2 and 3"""
+        chart = ControlChart(SPCConfig(rules=(2, 3)))
+        for value in _baseline():
+            chart.add(value)
+        snapshot = chart.snapshot("r", 1, None)
+
+        assert chart.add(snapshot.center_line + 2.5 * snapshot.sigma) == []
+        assert chart.add(snapshot.center_line + 2.5 * snapshot.sigma) == [2]
+
+        chart = ControlChart(SPCConfig(rules=(3,)))
+        for value in _baseline():
+            chart.add(value)
+        fired = [chart.add(snapshot.center_line + 1.5 * snapshot.sigma) for _ in range(4)]
+        assert fired[3] == [3]
+
+    def test_capability(self):
+        """TC-SPC-006: Cp/Cpk and Pp/Ppk follow the specification limits"""
+        chart = ControlChart(SPCConfig())
+        for value in _baseline(200):
+            chart.add(value)
+        tolerance = ToleranceConfig(enabled=True, nominal_mm=10.0, tolerance_mm=0.05)
+        snapshot = chart.snapshot("r", 1, tolerance)
+
+        assert snapshot.cp == pytest.approx(0.1 / (6 * snapshot.sigma))
+        assert snapshot.pp == pytest.approx(0.1 / (6 * snapshot.std))
+        assert snapshot.cpk <= snapshot.cp
+        assert snapshot.pp > 1.0
+
+    def test_capability_per_hole(self):
+        """TC-SPC-010: Per-hole nominal/tolerance overrides set the hole's specification limits"""
+        chart = ControlChart(SPCConfig())
+        for value in _baseline(200):
+            chart.add(value)
+        tolerance = ToleranceConfig(
+            enabled=True,
+            nominal_mm=5.0,
+            tolerance_mm=0.05,
+            holes=[HoleTolerance(hole_id=2, nominal_mm=10.0), HoleTolerance(hole_id=3, tolerance_mm=0.1)],
+        )
+
+        # Hole 2 uses its own nominal, hole 1 the recipe-wide 5.0 mm
+        hole2 = chart.snapshot("r", 2, tolerance)
+        assert hole2.cp == pytest.approx(0.1 / (6 * hole2.sigma))
+        assert hole2.cpk > 0
+        assert chart.snapshot("r", 1, tolerance).cpk < 0
+        # Hole 3 widens the tolerance only
+        assert chart.snapshot("r", 3, tolerance).cp == pytest.approx(2 * hole2.cp)
+
+
+class TestSPCService:
+    """Test SPCService"""
+
+    def setup_method(self):
+        AppCore.reset_instance()
+
+    def teardown_method(self):
+        AppCore.reset_instance()
+
+    def test_charts_per_recipe_and_hole(self):
+        """TC-SPC-007: Each (recipe, hole) has its own chart"""
+        spc = SPCService()
+        spc.add_result([_circle(1, 10.0), _circle(2, 12.0)], recipe="A")
+        spc.add_result([_circle(1, 10.0)], recipe="B")
+
+        assert [(c.recipe, c.hole_id) for c in spc.get_charts()] == [("A", 1), ("A", 2), ("B", 1)]
+        assert spc.get_chart("A", 2).mean == 12.0
+        assert spc.get_chart("C", 1) is None
+
+    def test_violation_published_and_sets_error(self):
+        """TC-SPC-008: Violations are published on AppCore and raise the PLC error output"""
+        app_core = AppCore()
+        received = []
+        app_core.subscribe(EventType.SPC_VIOLATION, received.append)
+
+        io_service = MagicMock()
+        spc = SPCService(SPCConfig(raise_io_error=True), io_service=io_service)
+        spc.attach(app_core, feed=False)
+        assert app_core.get_service("spc") is spc
+
+        for value in _baseline():
+            spc.add_result([_circle(1, value)], recipe="A")
+        io_service.set_error.assert_not_called()
+
+        violations = spc.add_result([_circle(1, 11.0)], recipe="A")
+
+        assert violations and violations[0].rule == 1
+        assert received == violations
+        assert spc.get_violations()[0] == violations[0]
+        io_service.set_error.assert_called_once_with(True)
+
+        assert spc.io_error
+        assert spc.acknowledge()
+        io_service.set_error.assert_called_with(False)
+        assert not spc.io_error
+        assert not spc.acknowledge()
+
+    def test_attach_feeds_from_detection_events(self):
+        """TC-SPC-009: Attached service charts DETECTION_COMPLETE with the current recipe"""
+        app_core = AppCore()
+        app_core.current_recipe = "A"
+        spc = SPCService()
+        spc.attach(app_core)
+
+        app_core.publish(EventType.DETECTION_COMPLETE, [_circle(1, 10.0)])
+        spc.detach()
+        app_core.publish(EventType.DETECTION_COMPLETE, [_circle(1, 10.0)])
+
+        assert spc.get_chart("A", 1).count == 1
+        assert app_core.get_service("spc") is None
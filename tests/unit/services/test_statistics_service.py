@@ -0,0 +1,149 @@
+"""Tests for StatisticsService - Incremental production statistics"""
+
+import random
+from datetime import datetime
+
+import numpy as np
+import pytest
+from src.core import AppCore, EventType
+from src.services.statistics_service import P2Quantile, SlidingWindow, StatisticsService
+from src.domain.entities import CircleResult
+from src.domain.enums import MeasureStatus
+
+
+def _circle(hole_id: int, diameter_mm: float, status: MeasureStatus = MeasureStatus.OK) -> CircleResult:
+    return CircleResult(
+        hole_id=hole_id,
+        center_x=0,
+        center_y=0,
+        radius=10,
+        diameter_mm=diameter_mm,
+        circularity=1.0,
+        area_mm2=0,
+        status=status,
+    )
+
+
+class TestStreamingEstimators:
+    """Test P² quantiles and sliding windows"""
+
+    @pytest.mark.parametrize("p", [0.05, 0.5, 0.95])
+    def test_p2_close_to_exact(self, p):
+        """TC-STAT-001: P² estimate is close to the exact quantile"""
+        rng = random.Random(1)
+        values = [rng.gauss(10.0, 0.05) for _ in range(5000)]
+        estimator = P2Quantile(p)
+        for value in values:
+            estimator.add(value)
+
+        assert estimator.value == pytest.approx(float(np.quantile(values, p)), abs=0.01)
+
+    def test_p2_small_sample(self):
+        """TC-STAT-002: Fewer than five values use the exact sample"""
+        estimator = P2Quantile(0.5)
+        assert np.isnan(estimator.value)
+        for value in (3.0, 1.0, 2.0):
+            estimator.add(value)
+        assert estimator.value == 2.0
+
+    def test_sliding_window_expires(self):
+        """TC-STAT-003: Window only counts recent buckets"""
+        window = SlidingWindow(span_s=60, bucket_s=1)
+        window.add(1000.0, circles=2, ok=2, ng=0)
+        window.add(1030.0, circles=2, ok=1, ng=1)
+
+        assert window.totals(1030.0) == (2, 4, 3, 1)
+        assert window.totals(1070.0) == (1, 2, 1, 1)
+        assert window.totals(1100.0) == (0, 0, 0, 0)
+
+
+class TestStatisticsService:
+    """Test counters, windows and per-hole statistics"""
+
+    def test_running_counters(self):
+        """TC-STAT-004: Counters update per inspection"""
+        stats = StatisticsService()
+        stats.add_result([_circle(1, 10.0), _circle(2, 10.1)])
+        stats.add_result([_circle(1, 10.0), _circle(2, 10.5, MeasureStatus.NG)])
+        stats.add_result([])
+
+        snapshot = stats.snapshot()
+        assert snapshot.total_inspections == 2
+        assert snapshot.total_circles == 4
+        assert snapshot.ok_count == 3
+        assert snapshot.ng_count == 1
+        assert snapshot.ok_parts == 1
+        assert snapshot.ng_parts == 1
+        assert snapshot.ok_rate == pytest.approx(75.0)
+        assert snapshot.last_result == MeasureStatus.NG
+
+    def test_per_hole_mean_variance(self):
+        """TC-STAT-005: Per-hole mean/std match the exact values"""
+        stats = StatisticsService()
+        diameters = [10.0, 10.02, 9.98, 10.04, 9.96, 10.01]
+        for diameter in diameters:
+            stats.add_result([_circle(1, diameter), _circle(2, 5.0)])
+
+        hole = stats.snapshot().holes[1]
+        assert hole.count == len(diameters)
+        assert hole.mean_mm == pytest.approx(np.mean(diameters))
+        assert hole.std_mm == pytest.approx(np.std(diameters, ddof=1))
+        assert hole.min_mm == 9.96
+        assert hole.max_mm == 10.04
+        assert stats.snapshot().holes[2].std_mm == 0.0
+
+    def test_windows(self):
+        """TC-STAT-006: Minute and hour windows count recent inspections"""
+        stats = StatisticsService()
+        now = datetime.now().timestamp()
+        stats.add_result([_circle(1, 10.0)], timestamp=now - 600)
+        stats.add_result([_circle(1, 10.0, MeasureStatus.NG)], timestamp=now - 5)
+
+        windows = stats.snapshot().windows
+        assert windows["minute"].inspections == 1
+        assert windows["minute"].ng_count == 1
+        assert windows["hour"].inspections == 2
+        assert windows["hour"].ok_rate == pytest.approx(50.0)
+
+    def test_shift_boundaries(self):
+        """TC-STAT-007: Shift start is the latest configured hour"""
+        stats = StatisticsService(shift_start_hours=(6, 14, 22))
+        assert stats.shift_start(datetime(2026, 3, 2, 15, 30).timestamp()) == datetime(2026, 3, 2, 14).timestamp()
+        assert stats.shift_start(datetime(2026, 3, 2, 3, 0).timestamp()) == datetime(2026, 3, 1, 22).timestamp()
+
+    def test_snapshot_cached(self):
+        """TC-STAT-008: Repeated reads return the cached snapshot"""
+        stats = StatisticsService()
+        stats.add_result([_circle(1, 10.0)])
+
+        first = stats.snapshot()
+        assert stats.snapshot() is first
+        stats.add_result([_circle(1, 10.0)])
+        assert stats.snapshot() is not first
+
+    def test_reset(self):
+        """TC-STAT-009: Reset clears counters and hole statistics"""
+        stats = StatisticsService()
+        stats.add_result([_circle(1, 10.0)])
+        stats.reset()
+
+        snapshot = stats.snapshot()
+        assert snapshot.total_inspections == 0
+        assert snapshot.holes == {}
+
+    def test_attach_to_app_core(self):
+        """TC-STAT-010: Attached service counts AppCore detection results"""
+        AppCore.reset_instance()
+        app_core = AppCore()
+        try:
+            stats = StatisticsService()
+            stats.attach(app_core)
+            assert app_core.statistics is stats
+
+            app_core.publish(EventType.DETECTION_COMPLETE, [_circle(1, 10.0)])
+            assert stats.snapshot().total_inspections == 1
+
+            stats.detach()
+            assert app_core.statistics is None
+        finally:
+            AppCore.reset_instance()
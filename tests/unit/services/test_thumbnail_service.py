@@ -0,0 +1,119 @@
+"""Tests for ThumbnailService - Gallery thumbnails with an LRU cache"""
+
+from datetime import datetime, timedelta
+
+import cv2
+import numpy as np
+import pytest
+
+from src.services.image_archive import ImageArchive
+from src.services.image_saver import ImageSaver
+from src.services.thumbnail_service import ThumbnailService, ThumbnailSize
+
+
+def decode(data):
+    """Decode JPEG bytes"""
+    return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+
+
+class TestThumbnailService:
+    """Test thumbnail generation, lookup and cache"""
+
+    @pytest.fixture
+    def archive(self, tmp_path):
+        """Open archive without quota"""
+        archive = ImageArchive(str(tmp_path / "images.db"))
+        archive.open()
+        yield archive
+        archive.close()
+
+    @pytest.fixture
+    def service(self, archive, tmp_path):
+        """Create service writing into tmp_path/thumbnails"""
+        service = ThumbnailService(archive, str(tmp_path / "thumbnails"))
+        yield service
+        service.close()
+
+    def add_image(self, archive, tmp_path, name, shape=(600, 2000, 3), timestamp=None):
+        """Write a JPEG image and index it"""
+        path = tmp_path / name
+        cv2.imwrite(str(path), np.full(shape, 128, np.uint8))
+        return archive.add(path, timestamp or datetime.now(), "NG", "NG", "jpeg")
+
+    def test_submit_generates_variants(self, service):
+        """TC-THM-001: Submitted images get a thumbnail and a preview on disk"""
+        service.submit(5, np.zeros((600, 2000, 3), np.uint8))
+        assert service.flush()
+
+        thumb = decode(service.path_for(5, ThumbnailSize.THUMB).read_bytes())
+        preview = decode(service.path_for(5, ThumbnailSize.PREVIEW).read_bytes())
+        assert thumb.shape[:2] == (77, 256)
+        assert preview.shape[:2] == (384, 1280)
+        assert service.get_stats()["generated"] == 1
+
+    def test_small_images_are_not_enlarged(self, service):
+        """TC-THM-002: Images smaller than a variant keep their size"""
+        service.submit(1, np.zeros((100, 200), np.uint8))
+        assert service.flush()
+
+        assert decode(service.get(1, ThumbnailSize.PREVIEW)).shape[:2] == (100, 200)
+        assert decode(service.get(1, ThumbnailSize.THUMB)).shape[:2] == (100, 200)
+
+    def test_get_generates_missing_from_saved_file(self, service, archive, tmp_path):
+        """TC-THM-003: Variants of images saved without thumbnails are generated on request"""
+        image_id = self.add_image(archive, tmp_path, "NG_1.jpg")
+
+        data = service.get(image_id)
+        assert decode(data).shape[:2] == (77, 256)
+        assert service.path_for(image_id, ThumbnailSize.PREVIEW).exists()
+        assert service.get(999) is None
+        with pytest.raises(ValueError):
+            service.get(image_id, "huge")
+
+    def test_cache_hits_and_lru_eviction(self, archive, tmp_path):
+        """TC-THM-004: Hot variants are served from memory within the byte budget"""
+        ids = [self.add_image(archive, tmp_path, f"NG_{i}.jpg") for i in range(3)]
+        probe = ThumbnailService(archive, str(tmp_path / "probe"))
+        probe.get(ids[0])
+        # Room for the variants of about one image
+        budget = probe.get_stats()["cache_bytes"] * 3 // 2
+
+        service = ThumbnailService(archive, str(tmp_path / "thumbnails"), cache_bytes=budget)
+        for image_id in ids:
+            service.get(image_id)
+
+        stats = service.get_stats()
+        assert stats["cache_bytes"] <= budget
+        assert stats["cache_misses"] == 3
+
+        service.get(ids[-1])
+        assert service.get_stats()["cache_hits"] == 1
+        # Least recently used entries were evicted but are still on disk
+        service.get(ids[0])
+        assert service.get_stats()["cache_hits"] == 1
+        assert service.get_stats()["cache_misses"] == 4
+        service.close()
+
+    def test_removed_images_drop_variants(self, service, archive, tmp_path):
+        """TC-THM-005: Variants are deleted when the archive removes their image"""
+        image_id = self.add_image(archive, tmp_path, "NG_old.jpg", timestamp=datetime.now() - timedelta(days=40))
+        service.get(image_id)
+        assert service.path_for(image_id, ThumbnailSize.THUMB).exists()
+
+        archive.remove_before(datetime.now() - timedelta(days=30))
+        assert not service.path_for(image_id, ThumbnailSize.THUMB).exists()
+        assert not service.path_for(image_id, ThumbnailSize.PREVIEW).exists()
+        assert service.get_stats()["cache_entries"] == 0
+        assert service.get(image_id) is None
+
+    def test_image_saver_submits_written_images(self, temp_output_dir):
+        """TC-THM-006: ImageSaver queues written images for thumbnails"""
+        saver = ImageSaver(save_dir=str(temp_output_dir), thumbnails=True)
+        saver.save_all_image(np.zeros((480, 640, 3), np.uint8), [])
+        assert saver.flush()
+        assert saver.thumbnails.flush()
+
+        image = saver.archive.latest(1)[0]
+        assert saver.thumbnails.path_for(image.id, ThumbnailSize.THUMB).exists()
+        assert saver.thumbnails.get_stats()["cache_entries"] == 2
+        saver.close()
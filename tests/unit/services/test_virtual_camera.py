@@ -0,0 +1,155 @@
+"""Tests for VirtualCamera - Simulated camera backend"""
+
+import time
+
+import pytest
+import numpy as np
+import cv2
+from src.services.virtual_camera import VirtualCamera
+from src.services.camera_service import TriggerMode
+from src.services.detector_service import CircleDetector
+from src.services.visualizer_service import CircleVisualizer
+from src.services.thread_manager import ThreadManager
+from src.domain.config import DetectionConfig, VirtualCameraConfig
+
+
+class TestVirtualCamera:
+    """Test VirtualCamera synthetic and replay frame sources"""
+
+    @pytest.fixture
+    def camera(self):
+        """Create small synthetic camera"""
+        camera = VirtualCamera(VirtualCameraConfig(width=640, height=480, fps=0, hole_rows=1, hole_cols=2))
+        yield camera
+        camera.disconnect()
+
+    def test_list_devices(self):
+        """TC-VCAM-001: Virtual device is listed without pypylon"""
+        devices = VirtualCamera.list_devices()
+        assert len(devices) == 1
+        assert devices[0]["index"] == 0
+
+    def test_connect_and_grab_synthetic(self, camera):
+        """TC-VCAM-002: Synthetic frame has configured resolution"""
+        assert camera.connect()
+        assert camera.is_connected
+
+        frame = camera.grab_frame()
+        assert frame is not None
+        assert frame.shape == (480, 640, 3)
+        assert frame.dtype == np.uint8
+        assert camera.frames_delivered == 1
+
+    def test_frames_are_read_only(self, camera):
+        """TC-VCAM-003: Pool frames are handed out read-only"""
+        camera.connect()
+        frame = camera.grab_frame()
+        assert not frame.flags.writeable
+
+    def test_synthetic_holes_detected(self, camera):
+        """TC-VCAM-004: Detector finds the synthetic holes"""
+        camera.connect()
+        detector = CircleDetector(DetectionConfig(pixel_to_mm=0.1))
+
+        circles, _ = detector.detect(camera.grab_frame())
+        assert len(circles) == 2
+
+    def test_grab_not_connected(self, camera):
+        """TC-VCAM-005: Grab returns None when disconnected"""
+        assert camera.grab_frame() is None
+
+    def test_frame_rate_pacing(self):
+        """TC-VCAM-006: Free-run grabs are paced to fps"""
+        camera = VirtualCamera(VirtualCameraConfig(width=64, height=48, fps=50))
+        camera.connect()
+
+        start = time.perf_counter()
+        for _ in range(6):
+            assert camera.grab_frame() is not None
+        elapsed = time.perf_counter() - start
+        camera.disconnect()
+
+        # 6 frames at 50 fps span 5 periods
+        assert elapsed >= 0.09
+
+    def test_transport_delay(self):
+        """TC-VCAM-007: Transport delay is added to each grab"""
+        camera = VirtualCamera(VirtualCameraConfig(width=64, height=48, fps=0, transport_delay_ms=30))
+        camera.connect()
+
+        start = time.perf_counter()
+        camera.grab_frame()
+        elapsed = time.perf_counter() - start
+        camera.disconnect()
+
+        assert elapsed >= 0.025
+
+    def test_hardware_trigger_waits(self, camera):
+        """TC-VCAM-008: Hardware mode only delivers triggered frames"""
+        camera.connect()
+        assert camera.set_trigger_mode(TriggerMode.HARDWARE)
+
+        assert camera.grab_frame(timeout_ms=50) is None
+
+        camera.fire_hardware_trigger()
+        assert camera.grab_frame(timeout_ms=50) is not None
+        assert camera.grab_frame(timeout_ms=50) is None
+
+    def test_software_trigger_in_hardware_mode(self, camera):
+        """TC-VCAM-009: execute_software_trigger fires one frame"""
+        camera.connect()
+        camera.set_trigger_mode(TriggerMode.HARDWARE)
+
+        assert camera.execute_software_trigger()
+        assert camera.grab_frame(timeout_ms=50) is not None
+
+    def test_replay_folder(self, tmp_path):
+        """TC-VCAM-010: Replay image folder in order"""
+        for i in range(3):
+            img = np.full((48, 64, 3), i * 50, dtype=np.uint8)
+            cv2.imwrite(str(tmp_path / f"frame_{i}.png"), img)
+
+        camera = VirtualCamera(VirtualCameraConfig(source=str(tmp_path), fps=0))
+        assert camera.connect()
+
+        values = [int(camera.grab_frame()[0, 0, 0]) for _ in range(4)]
+        camera.disconnect()
+
+        assert values == [0, 50, 100, 0]
+
+    def test_replay_npy_no_loop(self, tmp_path):
+        """TC-VCAM-011: Replay .npy grayscale sequence without looping"""
+        path = tmp_path / "sequence.npy"
+        np.save(path, np.zeros((2, 48, 64), dtype=np.uint8))
+
+        camera = VirtualCamera(VirtualCameraConfig(source=str(path), fps=0, loop=False))
+        assert camera.connect()
+
+        first = camera.grab_frame()
+        assert first.shape == (48, 64, 3)
+        assert camera.grab_frame() is not None
+        assert camera.grab_frame() is None
+        camera.disconnect()
+
+    def test_missing_source_fails(self, tmp_path):
+        """TC-VCAM-012: Connect fails for missing replay source"""
+        camera = VirtualCamera(VirtualCameraConfig(source=str(tmp_path / "missing.npy")))
+        assert not camera.connect()
+        assert not camera.is_connected
+
+    def test_thread_manager_pipeline(self):
+        """TC-VCAM-013: ThreadManager runs end-to-end on virtual frames"""
+        camera = VirtualCamera(VirtualCameraConfig(width=640, height=480, fps=100))
+        camera.connect()
+        manager = ThreadManager(camera, CircleDetector(DetectionConfig(pixel_to_mm=0.1)), CircleVisualizer())
+
+        manager.start()
+        result = None
+        deadline = time.time() + 3.0
+        while result is None and time.time() < deadline:
+            result = manager.get_result(timeout=0.1)
+        manager.stop()
+        camera.disconnect()
+
+        assert result is not None
+        assert len(result.circles) == 6
@@ -3,7 +3,7 @@
 import pytest
 import numpy as np
 import cv2
-from src.services.visualizer_service import CircleVisualizer
+from src.services.visualizer_service import CircleVisualizer, LabelSpriteCache
 from src.domain.entities import CircleResult
 from src.domain.config import DetectionConfig, ToleranceConfig
 from src.domain.enums import MeasureStatus
@@ -260,3 +260,108 @@ class TestCircleVisualizer:
         assert visualizer._config.show_contours == False
         assert visualizer._config.show_diameter_line == False
         assert visualizer._config.show_label == True
+
+    # ========== Label sprites and batched drawing ==========
+    def test_label_sprites_cached(self, visualizer, test_frame, sample_circle_ok):
+        """TC-VIS-019: Repeated labels are blitted from the sprite cache"""
+        first = visualizer.draw(test_frame, [sample_circle_ok])
+        misses = visualizer.sprite_cache.misses
+
+        second = visualizer.draw(test_frame, [sample_circle_ok])
+
+        assert misses == 2  # Diameter label and hole ID
+        assert visualizer.sprite_cache.misses == misses
+        assert visualizer.sprite_cache.hits == 2
+        assert np.array_equal(first, second)
+
+    def test_label_sprite_matches_put_text(self):
+        """TC-VIS-020: Composed label covers the same box as getTextSize/putText"""
+        cache = LabelSpriteCache()
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        text = "D=10.000mm"
+        (text_w, text_h), _ = cv2.getTextSize(text, font, 0.5, 1)
+
+        expected = np.zeros((60, 200, 3), dtype=np.uint8)
+        cv2.putText(expected, text, (20, 40), font, 0.5, (0, 255, 0), 1)
+        actual = np.zeros_like(expected)
+        LabelSpriteCache.blit(actual, cache.get(text, font, 0.5, 1, (0, 255, 0)), 20, 40)
+
+        ys, xs = np.nonzero(actual[:, :, 1])
+        ys_ref, xs_ref = np.nonzero(expected[:, :, 1])
+        assert abs(xs.min() - xs_ref.min()) <= 1 and abs(xs.max() - xs_ref.max()) <= 2
+        assert abs(ys.min() - ys_ref.min()) <= 1 and abs(ys.max() - ys_ref.max()) <= 1
+        assert xs.max() - 20 <= text_w and 40 - ys.min() <= text_h
+
+        with_bg = np.full_like(expected, 100)
+        LabelSpriteCache.blit(with_bg, cache.get(text, font, 0.5, 1, (0, 255, 0), (0, 0, 0), 3), 20, 40)
+        background = np.all(with_bg == 0, axis=2)
+        ys, xs = np.nonzero(background)
+        assert (xs.min(), ys.min()) == (17, 40 - text_h - 3)
+        assert (xs.max(), ys.max()) == (20 + text_w + 3, 43)
+
+    def test_label_sprite_clipped_at_frame_edge(self):
+        """TC-VIS-021: Sprites partly outside the frame are clipped"""
+        cache = LabelSpriteCache()
+        sprite = cache.get("D=5.000mm", cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1, (0, 255, 0), (0, 0, 0), 3)
+        frame = np.full((30, 40, 3), 100, dtype=np.uint8)
+
+        LabelSpriteCache.blit(frame, sprite, -20, 5)
+        LabelSpriteCache.blit(frame, sprite, 500, 500)
+
+        assert np.any(frame[:8, :] == 0)
+        assert np.all(frame[20:, :] == 100)
+
+    def test_label_cache_bounded(self):
+        """TC-VIS-022: Label cache evicts least recently used sprites"""
+        cache = LabelSpriteCache(max_labels=2)
+        for text in ("a", "b", "a", "c"):
+            cache.get(text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1, (255, 255, 255))
+
+        assert len(cache) == 2
+        cache.get("a", cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1, (255, 255, 255))
+        assert cache.hits == 2
+
+    def test_batched_edges_per_color(self, visualizer, test_frame):
+        """TC-VIS-023: Every circle gets its edge and center dot in the batched pass"""
+        visualizer.update_config(DetectionConfig(show_label=False))
+        circles = [
+            CircleResult(
+                hole_id=i,
+                center_x=60 + (i % 5) * 120,
+                center_y=80 + (i // 5) * 160,
+                radius=30 + i,
+                diameter_mm=6.0,
+                circularity=0.95,
+                area_mm2=28.0,
+                status=MeasureStatus.OK if i % 2 else MeasureStatus.NG,
+            )
+            for i in range(10)
+        ]
+
+        result = visualizer.draw(test_frame, circles)
+
+        for circle in circles:
+            color = visualizer.COLOR_OK if circle.status == MeasureStatus.OK else visualizer.COLOR_NG
+            cx, cy, r = int(circle.center_x), int(circle.center_y), int(circle.radius)
+            ring = result[cy - 2 : cy + 3, cx + r - 2 : cx + r + 3].reshape(-1, 3)
+            assert any(tuple(pixel) == color for pixel in ring)
+            assert tuple(result[cy, cx]) == visualizer.COLOR_DIAMETER
+
+    def test_draw_does_not_change_status(self, visualizer, test_frame):
+        """TC-VIS-024: Coloring by tolerance leaves circle.status to the classifier"""
+        circle = CircleResult(
+            hole_id=1,
+            center_x=320,
+            center_y=240,
+            radius=50,
+            diameter_mm=12.0,
+            circularity=0.95,
+            area_mm2=78.54,
+            status=MeasureStatus.NONE,
+        )
+        tolerance = ToleranceConfig(enabled=True, nominal_mm=10.0, tolerance_mm=0.5)
+
+        result = visualizer.draw(test_frame, [circle], tolerance)
+
+        assert circle.status == MeasureStatus.NONE
+        assert np.any(np.all(result == visualizer.COLOR_NG, axis=2))
@@ -100,6 +100,17 @@ const API = {
         return this.request(`/api/history?limit=${limit}&offset=${offset}`);
     },
 
+    /**
+     * Get a page of saved images, newest first
+     * @param {number} limit - Images per page
+     * @param {number} offset - Skip first N images
+     * @param {string} kind - File name prefix (e.g. 'NG')
+     * @returns {Promise} Image list data
+     */
+    async getImages(limit = 24, offset = 0, kind = 'NG') {
+        return this.request(`/api/images?limit=${limit}&offset=${offset}&kind=${encodeURIComponent(kind)}`);
+    },
+
     /**
      * Export statistics as CSV
      */
@@ -110,10 +121,11 @@ const API = {
 
     /**
      * Get video stream URL
+     * @param {boolean} overlay - Include server-side overlays (false: clean frames)
      * @returns {string} MJPEG stream URL
      */
-    getVideoStreamUrl() {
-        return `${this.baseUrl}/stream/video`;
+    getVideoStreamUrl(overlay = true) {
+        return `${this.baseUrl}/stream/video${overlay ? '' : '?overlay=false'}`;
     }
 };
 
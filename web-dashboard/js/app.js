@@ -3,6 +3,9 @@
  */
 
 const App = {
+    galleryPageSize: 24,
+    galleryOffset: 0,
+
     /**
      * Initialize the application
      */
@@ -25,27 +28,29 @@ const App = {
     },
 
     /**
-     * Set up video stream
+     * Set up video stream (clean frames, overlay drawn by LiveView)
      */
     setupVideoStream() {
         const videoElement = document.getElementById('videoStream');
+        const canvas = document.getElementById('overlayCanvas');
         const overlay = document.getElementById('videoOverlay');
 
-        if (videoElement) {
-            videoElement.src = API.getVideoStreamUrl();
-
-            videoElement.onload = () => {
-                if (overlay) {
-                    overlay.classList.add('hidden');
+        if (videoElement && canvas) {
+            LiveView.start(
+                videoElement,
+                canvas,
+                () => {
+                    if (overlay) {
+                        overlay.classList.add('hidden');
+                    }
+                },
+                () => {
+                    if (overlay) {
+                        overlay.classList.remove('hidden');
+                        overlay.querySelector('span').textContent = 'Video unavailable';
+                    }
                 }
-            };
-
-            videoElement.onerror = () => {
-                if (overlay) {
-                    overlay.classList.remove('hidden');
-                    overlay.querySelector('span').textContent = 'Video unavailable';
-                }
-            };
+            );
         }
     },
 
@@ -58,6 +63,10 @@ const App = {
             this.updateDetectionResults(data);
         });
 
+        WebSocketClient.on('overlay', (data) => {
+            LiveView.addOverlay(data);
+        });
+
         WebSocketClient.on('statistics_update', (data) => {
             this.updateStatistics(data);
         });
@@ -106,6 +115,9 @@ const App = {
             const io = await API.getIOStatus();
             this.updateIOStatus(io);
 
+            // Load NG image gallery
+            await this.loadGallery(0);
+
         } catch (error) {
             console.error('Error loading initial data:', error);
         }
@@ -134,6 +146,11 @@ const App = {
                 console.error('Error updating IO status:', error);
             }
         }, 500);
+
+        // Refresh the first gallery page every 10 seconds
+        setInterval(() => {
+            if (this.galleryOffset === 0) this.loadGallery(0);
+        }, 10000);
     },
 
     /**
@@ -328,6 +345,41 @@ const App = {
         }
     },
 
+    /**
+     * Load and show one page of the NG image gallery
+     * @param {number} offset - Skip first N images
+     */
+    async loadGallery(offset) {
+        const grid = document.getElementById('galleryGrid');
+        if (!grid) return;
+
+        try {
+            const page = await API.getImages(this.galleryPageSize, Math.max(offset, 0));
+            this.galleryOffset = page.offset;
+
+            if (page.items.length === 0) {
+                grid.innerHTML = '<div class="no-results">No saved images</div>';
+            } else {
+                // Thumbnail URLs are versioned, so the browser reuses cached tiles
+                grid.innerHTML = page.items.map(item => `
+                    <a class="gallery-item" href="${item.preview_url}" target="_blank"
+                       title="${new Date(item.timestamp).toLocaleString()}">
+                        <img src="${item.thumbnail_url}" alt="Image ${item.id}" loading="lazy" />
+                        <span>${new Date(item.timestamp).toLocaleTimeString()}</span>
+                    </a>
+                `).join('');
+            }
+
+            const pages = Math.max(Math.ceil(page.total / page.limit), 1);
+            document.getElementById('galleryPage').textContent =
+                `${Math.floor(page.offset / page.limit) + 1} / ${pages}`;
+            document.getElementById('galleryPrev').disabled = page.offset === 0;
+            document.getElementById('galleryNext').disabled = page.offset + page.limit >= page.total;
+        } catch (error) {
+            console.error('Error loading gallery:', error);
+        }
+    },
+
     /**
      * Format runtime in HH:MM:SS
      * @param {number} seconds - Runtime in seconds
@@ -0,0 +1,282 @@
+/**
+ * Live view with client-side overlay for Circle Measurement System Web Dashboard
+ *
+ * The clean MJPEG stream is read part by part, so the X-Frame-Seq of every
+ * image is known. Circle geometry arrives over the WebSocket ("overlay"
+ * events, tagged with frame_seq) and is drawn on a canvas above the image,
+ * matched to the frame being shown. Overlays stay sharp at any zoom.
+ */
+
+const LiveView = {
+    cameraId: 'default',
+    maxOverlays: 30,
+    retryInterval: 3000,
+    overlays: new Map(),
+    frameSeq: null,
+    image: null,
+    canvas: null,
+    imageUrl: null,
+    nextFrame: null,
+    loading: false,
+    onFrame: null,
+    onError: null,
+
+    // Status colors (same as CircleVisualizer)
+    colors: {
+        OK: '#00ff00',
+        NG: '#ff0000',
+        PARTIAL: '#ffa500',
+        NONE: '#00ffff'
+    },
+    diameterColor: '#0000ff',
+
+    /**
+     * Start streaming into an image element with an overlay canvas
+     * @param {HTMLImageElement} image - Image element showing the frames
+     * @param {HTMLCanvasElement} canvas - Canvas stacked above the image
+     * @param {function} onFrame - Called when a frame was shown
+     * @param {function} onError - Called when the stream failed
+     */
+    start(image, canvas, onFrame, onError) {
+        this.image = image;
+        this.canvas = canvas;
+        this.onFrame = onFrame;
+        this.onError = onError;
+
+        window.addEventListener('resize', () => this.draw());
+
+        if (window.fetch && window.ReadableStream) {
+            this.readStream();
+        } else {
+            // No streaming fetch: let the browser decode the stream and draw
+            // the latest overlay (frames cannot be matched)
+            image.onload = () => this.showOverlay(null);
+            image.onerror = () => this.onError && this.onError();
+            image.src = API.getVideoStreamUrl(false);
+        }
+    },
+
+    /**
+     * Read the multipart stream and show each JPEG part
+     */
+    async readStream() {
+        try {
+            const response = await fetch(API.getVideoStreamUrl(false));
+            if (!response.ok || !response.body) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+
+            const reader = response.body.getReader();
+            let buffer = new Uint8Array(0);
+
+            for (;;) {
+                const { value, done } = await reader.read();
+                if (done) break;
+
+                const joined = new Uint8Array(buffer.length + value.length);
+                joined.set(buffer);
+                joined.set(value, buffer.length);
+                buffer = joined;
+
+                let part;
+                while ((part = this.parsePart(buffer)) !== null) {
+                    buffer = buffer.subarray(part.end);
+                    this.showFrame(part.jpeg, part.seq);
+                }
+            }
+        } catch (error) {
+            console.error('Video stream error:', error);
+        }
+
+        if (this.onError) this.onError();
+        setTimeout(() => this.readStream(), this.retryInterval);
+    },
+
+    /**
+     * Parse one complete part from the start of the buffer
+     * @param {Uint8Array} buffer - Received bytes
+     * @returns {object|null} {jpeg, seq, end} or null if incomplete
+     */
+    parsePart(buffer) {
+        // Headers end with an empty line
+        let headerEnd = -1;
+        for (let i = 0; i + 3 < buffer.length; i++) {
+            if (buffer[i] === 13 && buffer[i + 1] === 10 && buffer[i + 2] === 13 && buffer[i + 3] === 10) {
+                headerEnd = i;
+                break;
+            }
+        }
+        if (headerEnd < 0) return null;
+
+        const headers = new TextDecoder().decode(buffer.subarray(0, headerEnd));
+        const lengthMatch = headers.match(/Content-Length:\s*(\d+)/i);
+        if (!lengthMatch) {
+            throw new Error('Stream part without Content-Length');
+        }
+
+        const start = headerEnd + 4;
+        const length = Number(lengthMatch[1]);
+        if (buffer.length < start + length + 2) return null;
+
+        const seqMatch = headers.match(/X-Frame-Seq:\s*(\d+)/i);
+        return {
+            jpeg: buffer.slice(start, start + length),
+            seq: seqMatch ? Number(seqMatch[1]) : null,
+            end: start + length + 2
+        };
+    },
+
+    /**
+     * Show a JPEG frame, then its overlay
+     * @param {Uint8Array} jpeg - JPEG bytes
+     * @param {number|null} seq - Frame sequence number
+     */
+    showFrame(jpeg, seq) {
+        // Latest frame wins while the previous one is still decoding
+        this.nextFrame = { jpeg, seq };
+        if (!this.loading) this.loadNextFrame();
+    },
+
+    /**
+     * Decode the latest received frame into the image element
+     */
+    loadNextFrame() {
+        const frame = this.nextFrame;
+        this.nextFrame = null;
+        if (!frame) return;
+
+        const url = URL.createObjectURL(new Blob([frame.jpeg], { type: 'image/jpeg' }));
+        this.loading = true;
+
+        this.image.onload = () => {
+            if (this.imageUrl) URL.revokeObjectURL(this.imageUrl);
+            this.imageUrl = url;
+            this.loading = false;
+            // Parts without a sequence number (placeholder image) get no overlay
+            this.showOverlay(frame.seq === null ? -1 : frame.seq);
+            if (this.onFrame) this.onFrame();
+            this.loadNextFrame();
+        };
+        this.image.onerror = () => {
+            URL.revokeObjectURL(url);
+            this.loading = false;
+            this.loadNextFrame();
+        };
+        this.image.src = url;
+    },
+
+    /**
+     * Set the shown frame and redraw its overlay
+     * @param {number|null} seq - Frame sequence number (null: unknown)
+     */
+    showOverlay(seq) {
+        this.frameSeq = seq;
+        this.draw();
+    },
+
+    /**
+     * Store overlay geometry received over the WebSocket
+     * @param {object} data - OverlayFrame (camera_id, frame_seq, width, height, circles)
+     */
+    addOverlay(data) {
+        if (!data || data.camera_id !== this.cameraId) return;
+
+        this.overlays.set(data.frame_seq, data);
+        while (this.overlays.size > this.maxOverlays) {
+            this.overlays.delete(this.overlays.keys().next().value);
+        }
+
+        // Geometry for the frame on screen may arrive after the image
+        if (this.frameSeq === null || data.frame_seq === this.frameSeq) {
+            this.draw();
+        }
+    },
+
+    /**
+     * Find the overlay of the shown frame (or the newest older one)
+     * @returns {object|null} Overlay data
+     */
+    findOverlay() {
+        let best = null;
+        for (const [seq, overlay] of this.overlays) {
+            if (this.frameSeq !== null && seq > this.frameSeq) continue;
+            if (best === null || seq > best.frame_seq) best = overlay;
+        }
+        return best;
+    },
+
+    /**
+     * Draw the overlay on the canvas
+     */
+    draw() {
+        const canvas = this.canvas;
+        const image = this.image;
+        if (!canvas || !image) return;
+
+        // Canvas in device pixels, drawing in CSS pixels
+        const ratio = window.devicePixelRatio || 1;
+        const boxWidth = canvas.clientWidth;
+        const boxHeight = canvas.clientHeight;
+        if (canvas.width !== Math.round(boxWidth * ratio) || canvas.height !== Math.round(boxHeight * ratio)) {
+            canvas.width = Math.round(boxWidth * ratio);
+            canvas.height = Math.round(boxHeight * ratio);
+        }
+
+        const ctx = canvas.getContext('2d');
+        ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+        ctx.clearRect(0, 0, boxWidth, boxHeight);
+
+        const overlay = this.findOverlay();
+        if (!overlay || !overlay.width || !overlay.height) return;
+
+        // Same placement as the image (object-fit: contain)
+        const scale = Math.min(boxWidth / overlay.width, boxHeight / overlay.height);
+        const offsetX = (boxWidth - overlay.width * scale) / 2;
+        const offsetY = (boxHeight - overlay.height * scale) / 2;
+
+        ctx.font = '12px sans-serif';
+        ctx.textBaseline = 'bottom';
+
+        overlay.circles.forEach(circle => {
+            const x = offsetX + circle.center_x * scale;
+            const y = offsetY + circle.center_y * scale;
+            const r = circle.radius * scale;
+            const color = this.colors[circle.status] || this.colors.NONE;
+
+            // Circle edge
+            ctx.strokeStyle = color;
+            ctx.lineWidth = 2;
+            ctx.beginPath();
+            ctx.arc(x, y, r, 0, 2 * Math.PI);
+            ctx.stroke();
+
+            // Diameter lines and center point
+            ctx.strokeStyle = this.diameterColor;
+            ctx.lineWidth = 1;
+            ctx.beginPath();
+            ctx.moveTo(x - r, y);
+            ctx.lineTo(x + r, y);
+            ctx.moveTo(x, y - r);
+            ctx.lineTo(x, y + r);
+            ctx.stroke();
+            ctx.fillStyle = this.diameterColor;
+            ctx.beginPath();
+            ctx.arc(x, y, 2, 0, 2 * Math.PI);
+            ctx.fill();
+
+            // Label above the circle (below it at the top edge)
+            const label = `D=${(circle.diameter_mm || 0).toFixed(3)}mm`;
+            const labelX = x - r;
+            const labelY = y - r - 8 < 16 ? y + r + 20 : y - r - 8;
+            const width = ctx.measureText(label).width;
+            ctx.fillStyle = '#000000';
+            ctx.fillRect(labelX - 3, labelY - 15, width + 6, 18);
+            ctx.fillStyle = color;
+            ctx.fillText(label, labelX, labelY);
+
+            // Hole ID
+            ctx.fillStyle = '#ffffff';
+            ctx.fillText(`#${circle.hole_id}`, x - 8, y + 5);
+        });
+    }
+};